@@ -0,0 +1,238 @@
+"""Latency, throughput and memory of the core file tools.
+
+Generates a synthetic repository (see ``synthetic_repo.py``) and calls each
+tool against it in a loop, from its own process so that the peak RSS
+reported belongs to that tool alone. Each tool is called with a
+reproducible sequence of arguments drawn from the repository, and is
+measured by ops/s and p50/p95/p99 latency.
+
+Results are written as JSON. Pass an earlier results file to ``--compare``
+to see the change for each tool, for example between two commits:
+
+    git checkout main && python benchmarks/core_tools.py --output base.json
+    git checkout my-branch && python benchmarks/core_tools.py --compare base.json
+
+Usage:
+    python benchmarks/core_tools.py --files 5000 --tools grep_search,file_search
+    python benchmarks/core_tools.py --repo-dir /tmp/synthetic --duration 5
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from synthetic_repo import SyntheticRepo, add_spec_arguments, generate_repo, spec_from_arguments
+
+from ai_coding_agent.core.code_modification import ViewFileTool
+from ai_coding_agent.core.file_system import (
+    EditFileTool, FileSearchTool, GrepSearchTool, ListDirectoryTool, ReadFileTool
+)
+
+ArgumentFactory = Callable[[random.Random, SyntheticRepo], Dict[str, Any]]
+
+
+def _list_dir(rng: random.Random, repo: SyntheticRepo) -> Dict[str, Any]:
+    return {"directory_path": rng.choice(repo.directories), "sort_by": rng.choice(["name", "size", "modified"])}
+
+
+def _grep_search(rng: random.Random, repo: SyntheticRepo) -> Dict[str, Any]:
+    return rng.choice([
+        {"query": "TODO"},
+        {"query": r"def \w+_handler\("},
+        {"query": "class cache", "case_sensitive": False},
+        {"query": "FIXME", "include_pattern": "*.py"}
+    ])
+
+
+def _file_search(rng: random.Random, repo: SyntheticRepo) -> Dict[str, Any]:
+    name = Path(rng.choice(repo.text_files)).name
+    # Part of a real name, so the search has matches to rank
+    return {"query": name[:rng.randint(4, len(name))]}
+
+
+def _read_file(rng: random.Random, repo: SyntheticRepo) -> Dict[str, Any]:
+    target = rng.choice(repo.text_files)
+    if rng.random() < 0.5:
+        return {"target_file": target, "should_read_entire_file": True}
+    return {"target_file": target, "start_line_one_indexed": 1, "end_line_one_indexed_inclusive": 1}
+
+
+def _view_file(rng: random.Random, repo: SyntheticRepo) -> Dict[str, Any]:
+    return {"file_path": rng.choice(repo.text_files), "include_summary": rng.random() < 0.5}
+
+
+def _edit_file(rng: random.Random, repo: SyntheticRepo) -> Dict[str, Any]:
+    target = rng.choice(repo.text_files)
+    content = (repo.root / target).read_text(encoding="utf-8")
+    # Prepared here, outside the timed call, like an edit the model sent
+    return {
+        "target_file": target,
+        "instructions": "Append a line",
+        "code_edit": f"{content}value_{rng.randint(0, 999)} = None\n"
+    }
+
+
+# Tool class and the function drawing the arguments of its next call
+BENCHMARKS: Dict[str, Tuple[type, ArgumentFactory]] = {
+    "list_dir": (ListDirectoryTool, _list_dir),
+    "grep_search": (GrepSearchTool, _grep_search),
+    "file_search": (FileSearchTool, _file_search),
+    "read_file": (ReadFileTool, _read_file),
+    "view_file": (ViewFileTool, _view_file),
+    "edit_file": (EditFileTool, _edit_file)
+}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = max(0, min(len(values) - 1, int(round(percent / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _measure(tool_name: str, repo: SyntheticRepo, duration: float, max_ops: int, warmup: int) -> Dict[str, Any]:
+    tool_class, arguments_for = BENCHMARKS[tool_name]
+    tool = tool_class()
+    rng = random.Random(f"{repo.spec.seed}-{tool_name}")
+
+    for _ in range(warmup):
+        await tool.execute(**arguments_for(rng, repo))
+
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while not latencies or (time.perf_counter() < deadline and len(latencies) < max_ops):
+        arguments = arguments_for(rng, repo)
+        start = time.perf_counter()
+        result = await tool.execute(**arguments)
+        latencies.append(time.perf_counter() - start)
+        if not result.success:
+            errors += 1
+
+    latencies.sort()
+    return {
+        "tool": tool_name,
+        "ops": len(latencies),
+        "errors": errors,
+        "ops_per_second": len(latencies) / sum(latencies) if sum(latencies) else float("inf"),
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def run_benchmark(tool_name: str, repo: SyntheticRepo, duration: float, max_ops: int, warmup: int) -> Dict[str, Any]:
+    """Benchmark one tool with the repository as working directory.
+
+    Meant to run in a fresh process, so the peak RSS is the tool's own.
+    """
+    os.chdir(repo.root)
+    return asyncio.run(_measure(tool_name, repo, duration, max_ops, warmup))
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the checked-out source, if it is in a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    """Print how each tool changed against an earlier results file."""
+    before = {result["tool"]: result for result in baseline["results"]}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for result in results:
+        old = before.get(result["tool"])
+        if old is None:
+            continue
+        changes = "  ".join(
+            f"{key}={(result[key] - old[key]) / old[key] * 100:+6.1f}%"
+            for key in ("ops_per_second", "p50_ms", "p99_ms", "peak_rss_mb")
+            if old[key]
+        )
+        print(f"{result['tool']:<12} {changes}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", default=",".join(BENCHMARKS), help="Comma-separated tools to benchmark")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds to call each tool for")
+    parser.add_argument("--max-ops", type=int, default=10000, help="Stop a tool after this many calls")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls before measuring")
+    parser.add_argument("--repo-dir", type=Path, help="Generate the repository here and keep it")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare with")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    tools = args.tools.split(",")
+    unknown = set(tools) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown tools: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        repo = generate_repo(args.repo_dir or Path(scratch) / "repo", spec_from_arguments(args))
+        repo.root = repo.root.resolve()
+        summary = repo.summary()
+        print(f"repository: {summary['text_files']} text files, {summary['binary_files']} binary files, "
+              f"{summary['total_bytes'] / (1024 * 1024):.1f} MiB")
+
+        results = []
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        # One process per tool, so peak RSS is not inherited from earlier tools
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            for tool_name in tools:
+                result = await loop.run_in_executor(None, lambda: pool.apply(
+                    run_benchmark, (tool_name, repo, args.duration, args.max_ops, args.warmup)
+                ))
+                results.append(result)
+                print(
+                    f"{result['tool']:<12} ops/s={result['ops_per_second']:9.1f} "
+                    f"p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+                    f"p99={result['p99_ms']:8.2f}ms rss={result['peak_rss_mb']:6.1f}MiB"
+                    + (f" errors={result['errors']}" if result["errors"] else "")
+                )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repo": summary,
+        "results": results
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("repo") != summary:
+            print("\nWarning: the baseline was measured on a different repository")
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""Throughput of an MCP cluster as the number of workers grows.
+
+Starts ``MCPCluster`` with each requested worker count, opens a number of
+concurrent MCP sessions from separate client processes, and reports the
+tool calls per second the cluster sustained.
+
+Usage:
+    python benchmarks/mcp_cluster_throughput.py --workers 1,2,4 --sessions 16
+    python benchmarks/mcp_cluster_throughput.py --tool grep_search --arguments '{"query": "def "}'
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from ai_coding_agent.interfaces.mcp_cluster import MCPCluster
+
+
+def free_port_range(count: int) -> int:
+    """Find ``count`` consecutive free ports and return the first."""
+    while True:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            first = probe.getsockname()[1]
+        sockets = []
+        try:
+            for port in range(first, first + count):
+                sock = socket.socket()
+                sockets.append(sock)
+                sock.bind(("127.0.0.1", port))
+            return first
+        except OSError:
+            continue
+        finally:
+            for sock in sockets:
+                sock.close()
+
+
+async def run_sessions(url: str, sessions: int, tool: str, arguments: Dict[str, Any], duration: float) -> List[float]:
+    """Call a tool in a loop from several sessions and return the call latencies."""
+    latencies: List[float] = []
+
+    async def session_loop() -> None:
+        async with sse_client(url) as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                deadline = time.perf_counter() + duration
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    result = await session.call_tool(tool, arguments)
+                    if result.isError:
+                        raise RuntimeError(result.content[0].text)
+                    latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(session_loop() for _ in range(sessions)))
+    return latencies
+
+
+def client_process(url: str, sessions: int, tool: str, arguments: Dict[str, Any], duration: float) -> List[float]:
+    """Entry point of a client process."""
+    return asyncio.run(run_sessions(url, sessions, tool, arguments, duration))
+
+
+async def measure(workers: int, args: argparse.Namespace, state_dir: Path) -> Dict[str, Any]:
+    """Start a cluster with ``workers`` workers and measure its throughput."""
+    port = free_port_range(workers + 1)
+    cluster = MCPCluster(workers=workers, port=port, state_dir=state_dir / f"workers-{workers}")
+    server = uvicorn.Server(uvicorn.Config(
+        cluster.create_starlette_app(), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if serving.done():
+                serving.result()
+                raise RuntimeError("cluster failed to start")
+            await asyncio.sleep(0.05)
+
+        url = f"http://127.0.0.1:{port}/sse"
+        # Clients run in their own processes so they do not limit the cluster
+        per_process = [args.sessions // args.client_processes] * args.client_processes
+        for i in range(args.sessions % args.client_processes):
+            per_process[i] += 1
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(args.client_processes) as pool:
+            start = time.perf_counter()
+            results = await loop.run_in_executor(None, lambda: pool.starmap(
+                client_process,
+                [(url, sessions, args.tool, args.arguments, args.duration) for sessions in per_process if sessions]
+            ))
+            elapsed = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        await serving
+
+    latencies = sorted(latency for result in results for latency in result)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "workers": workers,
+        "calls": len(latencies),
+        "calls_per_second": len(latencies) / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare")
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent MCP sessions")
+    parser.add_argument("--client-processes", type=int, default=4, help="Processes driving the sessions")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds each session keeps calling")
+    parser.add_argument("--tool", default="list_dir", help="Tool to call")
+    parser.add_argument("--arguments", type=json.loads, default=None, help="Tool arguments as JSON")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+    if args.arguments is None:
+        args.arguments = {"directory_path": str(Path(__file__).resolve().parent.parent / "src")}
+
+    results = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        for workers in (int(count) for count in args.workers.split(",")):
+            result = await measure(workers, args, Path(state_dir))
+            results.append(result)
+            print(
+                f"workers={result['workers']:<3} calls/s={result['calls_per_second']:8.1f} "
+                f"p50={result['p50_ms']:7.2f}ms p99={result['p99_ms']:7.2f}ms"
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
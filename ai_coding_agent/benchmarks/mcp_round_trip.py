@@ -0,0 +1,419 @@
+"""End-to-end latency and throughput of MCP tool calls.
+
+Starts ``MCPServer`` on a local port, either in a subprocess (the default,
+so client and server do not share an event loop) or in this process, with
+a synthetic repository (see ``synthetic_repo.py``) as its workspace. The
+server is then driven with ``MCPClient`` at each concurrency level with a
+weighted mix of calls:
+
+- ``list_tools``: protocol only, no tool runs
+- ``cheap``: ``list_dir`` of the repository root
+- ``heavy``: ``grep_search`` over the whole repository
+
+For each kind of call the harness reports client-side latency
+percentiles and throughput, the connect and initialize time of the
+session each call opens, and the mean time the server spent in the tool
+itself, read from its ``/metrics``. The gap between the two is protocol
+overhead.
+
+``LLMBridge.process_query`` is measured too, through ``OllamaBridge``
+talking to a fake Ollama endpoint that asks for one ``list_dir`` call and
+then answers after ``--llm-delay`` seconds. Time is broken down into the
+bridge steps, so model time, MCP round trips and bridge overhead show up
+separately.
+
+Needs both packages installed:
+
+    pip install -e . -e ../mcp-sse-client-python
+
+Usage:
+    python benchmarks/mcp_round_trip.py --concurrency 1,4,16 --duration 10
+    python benchmarks/mcp_round_trip.py --mix list_tools=0,cheap=1,heavy=0 --output cheap.json
+    python benchmarks/mcp_round_trip.py --server inprocess --bridge-queries 0
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import re
+import signal
+import socket
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+from mcp_sse_client import MCPClient
+from mcp_sse_client.llm_bridge.ollama_bridge import OllamaBridge
+from mcp_sse_client.tracing import MemorySink, Tracer
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from core_tools import git_commit, percentile
+from synthetic_repo import RepoSpec, SyntheticRepo, generate_repo
+
+from ai_coding_agent.core.registry import create_default_registry
+from ai_coding_agent.interfaces.mcp import MCPServer
+
+# Kind of call -> (MCP tool, arguments); None means list_tools
+CALLS: Dict[str, Optional[Tuple[str, Dict[str, Any]]]] = {
+    "list_tools": None,
+    "cheap": ("list_dir", {"directory_path": "."}),
+    "heavy": ("grep_search", {"query": "TODO"})
+}
+BRIDGE_STEPS = ("bridge.fetch_tools", "bridge.initial_query", "bridge.tool_execution", "bridge.final_processing")
+_LATENCY_SAMPLE = re.compile(r'^ai_coding_agent_tool_latency_seconds_(sum|count)\{tool="([^"]+)"\} (\S+)$')
+
+
+def free_port() -> int:
+    """Find a free local port."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Count and millisecond percentiles of latencies in seconds."""
+    if not latencies:
+        return {"count": 0}
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000
+    }
+
+
+def create_server_app(state_dir: Path):
+    """MCP server application with its shared state kept out of the user's cache."""
+    server = MCPServer(host="127.0.0.1", registry=create_default_registry(state_dir=state_dir))
+    # FastMCP turns on INFO logging, and a line per request would slow
+    # down the server and, in process, the clients
+    for name in ("mcp", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    return server.create_starlette_app()
+
+
+def serve_mcp(port: int, root: Path, state_dir: Path) -> None:
+    """Entry point of the server subprocess."""
+    os.chdir(root)
+    uvicorn.run(create_server_app(state_dir), host="127.0.0.1", port=port, log_level="warning")
+
+
+def create_fake_ollama_app(tool: str, arguments: Dict[str, Any], delay: float) -> Starlette:
+    """Ollama chat endpoint that calls one tool, then answers with a summary."""
+
+    async def chat(request: Request) -> JSONResponse:
+        body = await request.json()
+        await asyncio.sleep(delay)
+        message: Dict[str, Any] = {"role": "assistant", "content": ""}
+        messages = body.get("messages") or []
+        if body.get("tools"):
+            message["tool_calls"] = [{"function": {"name": tool, "arguments": arguments}}]
+        elif messages:
+            message["content"] = f"The tool returned {len(messages[-1].get('content') or '')} characters."
+        # A request without messages only loads the model, as warm_up sends it
+        return JSONResponse({
+            "model": body.get("model"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": message,
+            "done": True,
+            "done_reason": "stop"
+        })
+
+    return Starlette(routes=[Route("/api/chat", endpoint=chat, methods=["POST"])])
+
+
+async def start_uvicorn(app: Any, port: int) -> Tuple[uvicorn.Server, asyncio.Task]:
+    """Serve an application from this event loop, waiting until it listens."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+            raise RuntimeError("server failed to start")
+        await asyncio.sleep(0.05)
+    return server, serving
+
+
+async def wait_for_health(base_url: str, timeout: float = 60.0) -> None:
+    """Wait until a server answers ``/health``."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while True:
+            try:
+                if (await http.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"server at {base_url} did not become healthy")
+            await asyncio.sleep(0.1)
+
+
+async def tool_time(base_url: str) -> Dict[str, Tuple[float, float]]:
+    """Total seconds and number of calls per tool, from the server's metrics."""
+    async with httpx.AsyncClient() as http:
+        text = (await http.get(f"{base_url}/metrics")).text
+    totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+    for line in text.splitlines():
+        match = _LATENCY_SAMPLE.match(line)
+        if match:
+            kind, tool, value = match.groups()
+            totals[tool][0 if kind == "sum" else 1] = float(value)
+    return {tool: (seconds, count) for tool, (seconds, count) in totals.items()}
+
+
+def spans_by_name(sink: MemorySink) -> Dict[str, List[float]]:
+    """Durations of the finished spans, grouped by name."""
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in sink.spans:
+        durations[span.name].append(span.duration)
+    return durations
+
+
+async def run_level(
+    endpoint: str, base_url: str, concurrency: int, mix: Dict[str, float], duration: float, seed: int
+) -> Dict[str, Any]:
+    """Drive the server with ``concurrency`` clients calling the mix for ``duration`` seconds."""
+    sink = MemorySink()
+    client = MCPClient(endpoint, timeout=60.0, max_retries=1, tracer=Tracer([sink]))
+    kinds = [kind for kind, weight in mix.items() if weight > 0]
+    weights = [mix[kind] for kind in kinds]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async def call(kind: str) -> bool:
+        if CALLS[kind] is None:
+            return bool(await client.list_tools())
+        tool, arguments = CALLS[kind]
+        return (await client.invoke_tool(tool, arguments)).error_code == 0
+
+    async def worker(index: int) -> None:
+        rng = random.Random(f"{seed}-{concurrency}-{index}")
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            kind = rng.choices(kinds, weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = await call(kind)
+            except Exception:
+                ok = False
+            latencies[kind].append(time.perf_counter() - start)
+            if not ok:
+                errors[kind] += 1
+
+    before = await tool_time(base_url)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    after = await tool_time(base_url)
+
+    spans = spans_by_name(sink)
+    calls = {}
+    for kind in kinds:
+        calls[kind] = {**summarize(latencies[kind]), "errors": errors[kind]}
+        if CALLS[kind] is not None:
+            tool = CALLS[kind][0]
+            seconds = after.get(tool, (0.0, 0.0))[0] - before.get(tool, (0.0, 0.0))[0]
+            count = after.get(tool, (0.0, 0.0))[1] - before.get(tool, (0.0, 0.0))[1]
+            if count:
+                calls[kind]["server_tool_mean_ms"] = seconds / count * 1000
+                calls[kind]["overhead_mean_ms"] = calls[kind]["mean_ms"] - calls[kind]["server_tool_mean_ms"]
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "concurrency": concurrency,
+        "calls_per_second": total / elapsed,
+        "connect": summarize(spans["mcp.connect"]),
+        "initialize": summarize(spans["mcp.initialize"]),
+        "calls": calls
+    }
+
+
+async def run_bridge(endpoint: str, llm_host: str, queries: int, concurrency: int) -> Dict[str, Any]:
+    """Run ``process_query`` through the fake LLM and break its time down by step."""
+    sink = MemorySink()
+    client = MCPClient(endpoint, timeout=60.0, max_retries=1, tracer=Tracer([sink]))
+    bridge = OllamaBridge(client, model="fake", host=llm_host)
+    await bridge.warm_up()
+    remaining = list(range(queries))
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while remaining:
+            remaining.pop()
+            try:
+                result = await bridge.process_query("What is in the repository root?")
+                if result["tool_result"] is None or result["tool_result"].error_code:
+                    errors += 1
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    spans = spans_by_name(sink)
+    return {
+        "queries": queries,
+        "concurrency": concurrency,
+        "errors": errors,
+        "queries_per_second": queries / elapsed,
+        "process_query": summarize(spans["bridge.process_query"]),
+        "steps": {step.split(".", 1)[1]: summarize(spans[step]) for step in BRIDGE_STEPS if spans[step]}
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse ``kind=weight`` pairs separated by commas."""
+    mix = {}
+    for item in value.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in CALLS:
+            raise argparse.ArgumentTypeError(f"unknown call {kind!r}, expected one of: {', '.join(CALLS)}")
+        mix[kind] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("at least one call needs a positive weight")
+    return mix
+
+
+async def benchmark(args: argparse.Namespace, repo: SyntheticRepo, state_dir: Path) -> Dict[str, Any]:
+    """Start the servers, run every level and the bridge, and stop the servers."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    endpoint = f"{base_url}/sse"
+    cleanups: List[Callable[[], Awaitable[None]]] = []
+    try:
+        if args.server == "subprocess":
+            # Not a daemon: the server starts a process pool for CPU-bound tools
+            process = multiprocessing.get_context("spawn").Process(
+                target=serve_mcp, args=(port, repo.root, state_dir)
+            )
+            process.start()
+
+            async def stop_process() -> None:
+                # SIGINT makes uvicorn shut down cleanly, closing the pools
+                os.kill(process.pid, signal.SIGINT)
+                await asyncio.get_running_loop().run_in_executor(None, process.join, 10)
+                if process.is_alive():
+                    process.terminate()
+            cleanups.append(stop_process)
+        else:
+            os.chdir(repo.root)
+            server, serving = await start_uvicorn(create_server_app(state_dir), port)
+
+            async def stop_server() -> None:
+                server.should_exit = True
+                await serving
+            cleanups.append(stop_server)
+        await wait_for_health(base_url)
+
+        client = MCPClient(endpoint, timeout=60.0, max_retries=1, tracer=Tracer())
+        connect_start = time.perf_counter()
+        if not await client.check_connection():
+            raise RuntimeError(f"cannot list tools at {endpoint}")
+        first_connect = time.perf_counter() - connect_start
+        # Untimed first calls, which start the server's thread and process pools
+        for call in CALLS.values():
+            if call is not None:
+                await client.invoke_tool(*call)
+
+        levels = []
+        for concurrency in args.concurrency:
+            level = await run_level(endpoint, base_url, concurrency, args.mix, args.duration, args.seed)
+            levels.append(level)
+            print(f"concurrency={concurrency:<4} calls/s={level['calls_per_second']:8.1f} "
+                  f"connect p50={level['connect'].get('p50_ms', 0):6.2f}ms")
+            for kind, stats in level["calls"].items():
+                overhead = stats.get("overhead_mean_ms")
+                print(
+                    f"  {kind:<11} n={stats['count']:<6} p50={stats.get('p50_ms', 0):8.2f}ms "
+                    f"p95={stats.get('p95_ms', 0):8.2f}ms p99={stats.get('p99_ms', 0):8.2f}ms"
+                    + (f" tool={stats['server_tool_mean_ms']:.2f}ms overhead={overhead:.2f}ms"
+                       if overhead is not None else "")
+                    + (f" errors={stats['errors']}" if stats["errors"] else "")
+                )
+
+        bridge = None
+        if args.bridge_queries:
+            llm_port = free_port()
+            llm_server, llm_serving = await start_uvicorn(
+                create_fake_ollama_app(*CALLS["cheap"], delay=args.llm_delay), llm_port
+            )
+
+            async def stop_llm() -> None:
+                llm_server.should_exit = True
+                await llm_serving
+            cleanups.append(stop_llm)
+            bridge = await run_bridge(
+                endpoint, f"http://127.0.0.1:{llm_port}", args.bridge_queries, args.bridge_concurrency
+            )
+            steps = "  ".join(f"{step}={stats['mean_ms']:.2f}ms" for step, stats in bridge["steps"].items())
+            print(f"bridge       queries/s={bridge['queries_per_second']:8.1f} "
+                  f"p50={bridge['process_query']['p50_ms']:8.2f}ms mean {steps}"
+                  + (f" errors={bridge['errors']}" if bridge["errors"] else ""))
+    finally:
+        for cleanup in reversed(cleanups):
+            await cleanup()
+
+    return {"first_connect_ms": first_connect * 1000, "levels": levels, "bridge": bridge}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("subprocess", "inprocess"), default="subprocess",
+                        help="Where the MCP server runs")
+    parser.add_argument("--concurrency", type=lambda value: [int(level) for level in value.split(",")],
+                        default=[1, 4, 16], help="Comma-separated numbers of concurrent clients")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("list_tools=1,cheap=4,heavy=1"),
+                        help="Weights of the kinds of call, as kind=weight pairs")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run each concurrency level")
+    parser.add_argument("--files", type=int, default=500, help="Files in the synthetic repository")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the repository and the call mix")
+    parser.add_argument("--bridge-queries", type=int, default=50, help="process_query calls (0 to skip)")
+    parser.add_argument("--bridge-concurrency", type=int, default=4, help="Concurrent process_query calls")
+    parser.add_argument("--llm-delay", type=float, default=0.0, help="Seconds the fake LLM takes to answer")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        repo = generate_repo(Path(scratch) / "repo", RepoSpec(files=args.files, seed=args.seed))
+        repo.root = repo.root.resolve()
+        try:
+            results = await benchmark(args, repo, Path(scratch) / "state")
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": args.server,
+        "mix": args.mix,
+        "duration": args.duration,
+        "llm_delay": args.llm_delay,
+        "repo": repo.summary(),
+        **results
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+"""Reproducible synthetic repositories for benchmarking the file tools.
+
+The same settings and seed always produce the same tree, byte for byte, so
+results from different commits are measured against identical input. A
+repository has source files spread over nested packages, with sizes drawn
+from a log-normal distribution like those of real projects, a share of
+binary files, and directories that real workspaces carry but tools should
+skip (``.git``, ``node_modules``, ``__pycache__``).
+
+Usage:
+    python benchmarks/synthetic_repo.py /tmp/synthetic --files 5000 --depth 4
+"""
+
+import argparse
+import json
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List
+
+WORDS = (
+    "request", "response", "client", "server", "cache", "index", "buffer", "token", "session",
+    "config", "handler", "parser", "worker", "queue", "stream", "record", "entry", "state",
+    "result", "error", "path", "file", "node", "tree", "item", "value", "count", "limit"
+)
+TEXT_EXTENSIONS = (".py", ".py", ".py", ".md", ".txt", ".json", ".yaml")
+BINARY_EXTENSIONS = (".png", ".bin", ".so")
+IGNORED_DIRS = (".git", "node_modules", "__pycache__")
+
+# Lines that grep benchmarks look for, each written at a known rate
+MARKERS = {
+    "TODO": 0.01,
+    "FIXME": 0.002
+}
+
+
+@dataclass
+class RepoSpec:
+    """Shape of a synthetic repository.
+
+    Attributes:
+        files: Number of text and binary files outside ignored directories
+        depth: Maximum directory nesting
+        fanout: Subdirectories per directory
+        median_size: Median file size in bytes
+        size_sigma: Spread of the log-normal file size distribution
+        max_size: Largest file size in bytes
+        binary_ratio: Fraction of files with binary content
+        ignored_files: Files in each ignored directory
+        seed: Random seed
+    """
+    files: int = 2000
+    depth: int = 4
+    fanout: int = 4
+    median_size: int = 4096
+    size_sigma: float = 1.0
+    max_size: int = 1024 * 1024
+    binary_ratio: float = 0.05
+    ignored_files: int = 200
+    seed: int = 0
+
+
+@dataclass
+class SyntheticRepo:
+    """A generated repository.
+
+    Attributes:
+        root: Directory holding the repository
+        spec: Settings it was generated from
+        text_files: Text files, relative to the root
+        binary_files: Binary files, relative to the root
+        directories: Directories outside ignored ones, relative to the root
+        total_bytes: Size of all files, including ignored ones
+    """
+    root: Path
+    spec: RepoSpec
+    text_files: List[str] = field(default_factory=list)
+    binary_files: List[str] = field(default_factory=list)
+    directories: List[str] = field(default_factory=list)
+    total_bytes: int = 0
+
+    def summary(self) -> dict:
+        """Settings and size of the repository, for benchmark results."""
+        return {
+            **asdict(self.spec),
+            "text_files": len(self.text_files),
+            "binary_files": len(self.binary_files),
+            "directories": len(self.directories),
+            "total_bytes": self.total_bytes
+        }
+
+
+def _text_line(rng: random.Random, indent: int) -> str:
+    for marker, rate in MARKERS.items():
+        if rng.random() < rate:
+            return f"{' ' * indent}# {marker}: {rng.choice(WORDS)} {rng.choice(WORDS)}\n"
+    first, second = rng.choice(WORDS), rng.choice(WORDS)
+    kind = rng.random()
+    if kind < 0.1:
+        return f"def {first}_{second}(value, limit={rng.randint(1, 100)}):\n"
+    if kind < 0.15:
+        return f"class {first.title()}{second.title()}:\n"
+    return f"{' ' * indent}{first}_{second} = {rng.choice(WORDS)}.get({rng.randint(0, 999)})\n"
+
+
+def _text_content(rng: random.Random, size: int) -> bytes:
+    lines = []
+    written = 0
+    while written < size:
+        line = _text_line(rng, 4 * rng.randint(0, 2))
+        lines.append(line)
+        written += len(line)
+    return "".join(lines).encode("utf-8")[:size]
+
+
+def _file_size(rng: random.Random, spec: RepoSpec) -> int:
+    size = rng.lognormvariate(math.log(spec.median_size), spec.size_sigma)
+    return max(1, min(spec.max_size, int(size)))
+
+
+def _directories(rng: random.Random, spec: RepoSpec) -> List[Path]:
+    directories = [Path(".")]
+    frontier = [Path(".")]
+    for level in range(spec.depth):
+        next_frontier = []
+        for parent in frontier:
+            for i in range(spec.fanout):
+                child = parent / f"{rng.choice(WORDS)}_{level}_{i}"
+                directories.append(child)
+                next_frontier.append(child)
+        frontier = next_frontier
+    return directories
+
+
+def generate_repo(root: Path, spec: RepoSpec) -> SyntheticRepo:
+    """Write a synthetic repository.
+
+    Args:
+        root: Directory to write into (created if missing, should be empty)
+        spec: Shape of the repository
+
+    Returns:
+        The generated repository
+    """
+    rng = random.Random(spec.seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    repo = SyntheticRepo(root=root, spec=spec)
+
+    directories = _directories(rng, spec)
+    for directory in directories:
+        (root / directory).mkdir(parents=True, exist_ok=True)
+    repo.directories = sorted(str(directory) for directory in directories)
+
+    for i in range(spec.files):
+        directory = rng.choice(directories)
+        binary = rng.random() < spec.binary_ratio
+        extension = rng.choice(BINARY_EXTENSIONS if binary else TEXT_EXTENSIONS)
+        relative = directory / f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{i}{extension}"
+        size = _file_size(rng, spec)
+        if binary:
+            # A NUL early on, like real binaries, then bytes that are not UTF-8
+            content = b"\x89\x00" + rng.randbytes(size)
+            repo.binary_files.append(str(relative))
+        else:
+            content = _text_content(rng, size)
+            repo.text_files.append(str(relative))
+        (root / relative).write_bytes(content)
+        repo.total_bytes += len(content)
+
+    for name in IGNORED_DIRS:
+        ignored = root / name
+        ignored.mkdir(exist_ok=True)
+        for i in range(spec.ignored_files):
+            content = _text_content(rng, _file_size(rng, spec))
+            (ignored / f"{rng.choice(WORDS)}_{i}.txt").write_bytes(content)
+            repo.total_bytes += len(content)
+    (root / ".gitignore").write_text("".join(f"{name}/\n" for name in IGNORED_DIRS), encoding="utf-8")
+
+    return repo
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add an option for each ``RepoSpec`` field to a parser."""
+    for name, default in asdict(RepoSpec()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+
+
+def spec_from_arguments(args: argparse.Namespace) -> RepoSpec:
+    """Build a ``RepoSpec`` from options added by ``add_spec_arguments``."""
+    return RepoSpec(**{name: getattr(args, name) for name in asdict(RepoSpec())})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", type=Path, help="Directory to write the repository into")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    repo = generate_repo(args.root, spec_from_arguments(args))
+    print(json.dumps(repo.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
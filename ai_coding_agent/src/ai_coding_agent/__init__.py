@@ -3,61 +3,46 @@ AI Coding Agent Toolset
 
 A comprehensive Python package that implements an AI coding agent toolset
 with both native LLM and MCP server interfaces.
-"""
 
-# Import core tools first
-from .core import (
-    BaseTool,
-    ToolResult,
-    ListDirectoryTool,
-    ReadFileTool,
-    EditFileTool,
-    DeleteFileTool,
-    GrepSearchTool,
-    FileSearchTool,
-    WebSearchTool,
-    ReadUrlTool,
-    ProposeCodeTool,
-    ViewCodeTool,
-    ViewFileTool,
-    SemanticSearchTool,
-    SymbolInfoTool,
-    CodeNavigationTool,
-    PushActionTool,
-    ShowActionsTool,
-    GetNextActionTool,
-    ClearActionsTool
-)
+Tools and interfaces are imported on first access, so importing a single
+tool does not pull in LangChain or the MCP server.
+"""
 
-# Import interfaces after core tools
-from .interfaces.langchain import AICodingAgentToolkit
-from .interfaces.mcp import MCPServer
+from .core.lazy import lazy_exports
 
 __version__ = "0.1.0"
-__all__ = [
+
+_EXPORTS = {
     # Core Tools
-    "BaseTool",
-    "ToolResult",
-    "ListDirectoryTool",
-    "ReadFileTool",
-    "EditFileTool",
-    "DeleteFileTool",
-    "GrepSearchTool",
-    "FileSearchTool",
-    "WebSearchTool",
-    "ReadUrlTool",
-    "ProposeCodeTool",
-    "ViewCodeTool",
-    "ViewFileTool",
-    "SemanticSearchTool",
-    "SymbolInfoTool",
-    "CodeNavigationTool",
-    "PushActionTool",
-    "ShowActionsTool",
-    "GetNextActionTool",
-    "ClearActionsTool",
-    
+    "BaseTool": ".core.base",
+    "ToolResult": ".core.base",
+    "ListDirectoryTool": ".core.file_system",
+    "ReadFileTool": ".core.file_system",
+    "EditFileTool": ".core.file_system",
+    "DeleteFileTool": ".core.file_system",
+    "GrepSearchTool": ".core.file_system",
+    "FileSearchTool": ".core.file_system",
+    "WebSearchTool": ".core.web",
+    "ReadUrlTool": ".core.web",
+    "ReadUrlsTool": ".core.web",
+    "ProposeCodeTool": ".core.code_modification",
+    "ViewCodeTool": ".core.code_modification",
+    "ViewFileTool": ".core.code_modification",
+    "SemanticSearchTool": ".core.lsp",
+    "SymbolInfoTool": ".core.lsp",
+    "CodeNavigationTool": ".core.lsp",
+    "RepoMapTool": ".core.lsp",
+    "PushActionTool": ".core.control",
+    "ShowActionsTool": ".core.control",
+    "GetNextActionTool": ".core.control",
+    "ClearActionsTool": ".core.control",
+    "ProfilingTool": ".core.control",
+
     # Interfaces
-    "AICodingAgentToolkit",
-    "MCPServer"
-]
\ No newline at end of file
+    "AICodingAgentToolkit": ".interfaces.langchain",
+    "MCPServer": ".interfaces.mcp",
+    "MCPCluster": ".interfaces.mcp_cluster"
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
@@ -1,76 +1,47 @@
-"""Core tools for the AI Coding Agent."""
+"""Core tools for the AI Coding Agent.
 
-# Import base classes first to avoid circular imports
-from .base import BaseTool, ToolResult
+Tools are imported on first access, so importing one tool module does not
+import the others and their dependencies.
+"""
 
-# File System Tools
-from .file_system import (
-    ListDirectoryTool,
-    ReadFileTool,
-    EditFileTool,
-    DeleteFileTool,
-    GrepSearchTool,
-    FileSearchTool
-)
+from .lazy import lazy_exports
 
-# Web Tools
-from .web import (
-    WebSearchTool,
-    ReadUrlTool
-)
-
-# Code Modification Tools
-from .code_modification import (
-    ProposeCodeTool,
-    ViewCodeTool,
-    ViewFileTool
-)
-
-# LSP Tools
-from .lsp import (
-    SemanticSearchTool,
-    SymbolInfoTool,
-    CodeNavigationTool
-)
-
-# Control Tools
-from .control import (
-    PushActionTool,
-    ShowActionsTool,
-    GetNextActionTool,
-    ClearActionsTool
-)
-
-__all__ = [
+_EXPORTS = {
     # Base Classes
-    "BaseTool",
-    "ToolResult",
-    
+    "BaseTool": ".base",
+    "ToolResult": ".base",
+
     # File System Tools
-    "ListDirectoryTool",
-    "ReadFileTool",
-    "EditFileTool",
-    "DeleteFileTool",
-    "GrepSearchTool",
-    "FileSearchTool",
-    
+    "ListDirectoryTool": ".file_system",
+    "ReadFileTool": ".file_system",
+    "EditFileTool": ".file_system",
+    "DeleteFileTool": ".file_system",
+    "GrepSearchTool": ".file_system",
+    "FileSearchTool": ".file_system",
+
     # Web Tools
-    "WebSearchTool",
-    "ReadUrlTool",
-    
+    "WebSearchTool": ".web",
+    "ReadUrlTool": ".web",
+    "ReadUrlsTool": ".web",
+
     # Code Modification Tools
-    "ProposeCodeTool",
-    "ViewCodeTool",
-    "ViewFileTool",
-    
+    "ProposeCodeTool": ".code_modification",
+    "ViewCodeTool": ".code_modification",
+    "ViewFileTool": ".code_modification",
+
     # LSP Tools
-    "SemanticSearchTool",
-    "SymbolInfoTool",
-    "CodeNavigationTool",
-    
+    "SemanticSearchTool": ".lsp",
+    "SymbolInfoTool": ".lsp",
+    "CodeNavigationTool": ".lsp",
+    "RepoMapTool": ".lsp",
+
     # Control Tools
-    "PushActionTool",
-    "ShowActionsTool",
-    "GetNextActionTool",
-    "ClearActionsTool"
-] 
\ No newline at end of file
+    "PushActionTool": ".control",
+    "ShowActionsTool": ".control",
+    "GetNextActionTool": ".control",
+    "ClearActionsTool": ".control",
+    "ProfilingTool": ".control"
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
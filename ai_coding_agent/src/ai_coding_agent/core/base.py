@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from .result_cache import CacheDependency
+
 
 class ToolParameter(BaseModel):
     """Base class for tool parameters."""
@@ -21,11 +24,28 @@ class ToolResult(BaseModel):
 
 
 class BaseTool(ABC):
-    """Base class for all tools in the AI coding agent."""
+    """Base class for all tools in the AI coding agent.
+
+    The class attributes below tell the dispatcher how to run a tool:
+    ``cpu_bound`` tools run in a process pool, ``blocking`` tools (which do
+    synchronous I/O inside ``execute``) run on a thread pool, and
+    ``max_concurrency`` and ``default_timeout`` bound their calls. Setting
+    ``profile`` profiles every call of the tool (see ``ToolProfiler``).
+
+    Results of ``cacheable`` tools are cached by the dispatcher until a
+    file returned by ``cache_dependencies`` changes. Tools that change
+    files return them from ``invalidated_paths`` (see ``ToolResultCache``).
+    """
     
     name: str
     description: str
     parameters: List[ToolParameter]
+    cpu_bound: bool = False
+    blocking: bool = False
+    max_concurrency: Optional[int] = None
+    default_timeout: Optional[float] = None
+    profile: bool = False
+    cacheable: bool = False
     
     def __init__(self):
         self.validate_parameters()
@@ -46,6 +66,14 @@ class BaseTool(ABC):
         """Execute the tool with the given parameters."""
         pass
     
+    def cache_dependencies(self, **kwargs) -> List["CacheDependency"]:
+        """Files and directories the result of a call is computed from."""
+        return []
+
+    def invalidated_paths(self, **kwargs) -> List[str]:
+        """Files and directories a call may change."""
+        return []
+    
     def get_schema(self) -> Dict[str, Any]:
         """Get the tool's schema for API documentation."""
         return {
@@ -1,7 +1,7 @@
 """Tool for viewing code items."""
 
 from typing import Optional, Dict, Any
-from ..base import BaseTool, ToolResult
+from ..base import BaseTool, ToolParameter, ToolResult
 
 class ViewCodeTool(BaseTool):
     """Tool for viewing code items.
@@ -12,6 +12,34 @@ class ViewCodeTool(BaseTool):
     
     name: str = "view_code"
     description: str = "View code items like functions, classes, or modules"
+    parameters = [
+        ToolParameter(
+            name="item_path",
+            type="string",
+            description="Path to the code item (e.g., module.function)",
+            required=True
+        ),
+        ToolParameter(
+            name="item_type",
+            type="string",
+            description="Type of item (function, class, module)",
+            required=False
+        ),
+        ToolParameter(
+            name="include_docstring",
+            type="boolean",
+            description="Whether to include docstring in output",
+            required=False,
+            default=True
+        ),
+        ToolParameter(
+            name="include_metadata",
+            type="boolean",
+            description="Whether to include metadata in output",
+            required=False,
+            default=True
+        )
+    ]
     
     async def execute(
         self,
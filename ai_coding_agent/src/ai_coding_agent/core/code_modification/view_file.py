@@ -1,9 +1,10 @@
 """View file tool."""
 
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from ..result_cache import CacheDependency
 
 
 class ViewFileTool(BaseTool):
@@ -11,6 +12,8 @@ class ViewFileTool(BaseTool):
 
     name = "view_file"
     description = "View file contents"
+    blocking = True
+    cacheable = True
     parameters = [
         ToolParameter(
             name="file_path",
@@ -39,6 +42,10 @@ class ViewFileTool(BaseTool):
         )
     ]
 
+    def cache_dependencies(self, file_path: str, **kwargs) -> List[CacheDependency]:
+        """The result depends on the file viewed."""
+        return [CacheDependency(file_path)]
+
     async def execute(
         self,
         file_path: str,
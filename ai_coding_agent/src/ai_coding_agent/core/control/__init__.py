@@ -1,13 +1,24 @@
 """Control tools for managing actions and system state."""
 
+from .action_queue import Action, ActionQueue, ActionStatus, get_action_queue
+from .executor import ActionExecutor
+from .sqlite_queue import SQLiteActionQueue
 from .push_action import PushActionTool
 from .show_actions import ShowActionsTool
 from .get_next_action import GetNextActionTool
 from .clear_actions import ClearActionsTool
+from .profiling import ProfilingTool
 
 __all__ = [
+    "Action",
+    "ActionQueue",
+    "ActionStatus",
+    "ActionExecutor",
+    "SQLiteActionQueue",
+    "get_action_queue",
     "PushActionTool",
     "ShowActionsTool",
     "GetNextActionTool",
-    "ClearActionsTool"
-] 
\ No newline at end of file
+    "ClearActionsTool",
+    "ProfilingTool"
+] 
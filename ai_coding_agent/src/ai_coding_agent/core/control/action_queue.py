@@ -0,0 +1,280 @@
+"""Shared action queue used by the control tools and the action executor."""
+
+import asyncio
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class ActionStatus(str, Enum):
+    """Lifecycle states of a queued action."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+FINISHED_STATUSES = {ActionStatus.COMPLETED, ActionStatus.FAILED, ActionStatus.SKIPPED}
+
+
+class Action(BaseModel):
+    """Represents a single tool invocation waiting in the action queue."""
+    id: int
+    tool_name: str
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[int] = Field(default_factory=list)
+    priority: int = 0
+    timeout: Optional[float] = None
+    status: ActionStatus = ActionStatus.PENDING
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the action reached a terminal state."""
+        return self.status in FINISHED_STATUSES
+
+
+class ActionQueue:
+    """Thread-safe queue of actions with dependency edges between them.
+
+    Actions may only depend on actions that are already queued, so the
+    dependency graph is always a DAG. An action becomes ready once all of
+    its dependencies completed successfully; if any dependency fails or is
+    skipped, the action is skipped as well.
+    """
+
+    def __init__(self):
+        self._actions: Dict[int, Action] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def push(
+        self,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        depends_on: Optional[List[int]] = None,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Action:
+        """Add a new action to the queue.
+
+        Args:
+            tool_name: Name of the tool to execute
+            parameters: Parameters passed to the tool
+            depends_on: IDs of actions that must complete first
+            priority: Higher numbers are scheduled first among ready actions
+            timeout: Per-action timeout in seconds
+
+        Returns:
+            The queued action
+
+        Raises:
+            ValueError: If a dependency refers to an unknown action
+        """
+        depends_on = list(dict.fromkeys(depends_on or []))
+        with self._lock:
+            unknown = [dep for dep in depends_on if dep not in self._actions]
+            if unknown:
+                raise ValueError(f"Unknown dependency action IDs: {unknown}")
+
+            action = Action(
+                id=self._next_id,
+                tool_name=tool_name,
+                parameters=parameters or {},
+                depends_on=depends_on,
+                priority=priority or 0,
+                timeout=timeout
+            )
+            self._actions[action.id] = action
+            self._next_id += 1
+            self._notify_locked()
+        return action
+
+    def get(self, action_id: int) -> Optional[Action]:
+        """Get an action by ID."""
+        with self._lock:
+            return self._actions.get(action_id)
+
+    def list(self, include_completed: bool = False) -> List[Action]:
+        """List queued actions in insertion order.
+
+        Args:
+            include_completed: Whether to include finished actions
+
+        Returns:
+            List of actions
+        """
+        with self._lock:
+            self._skip_blocked_locked()
+            return [
+                a for a in self._actions.values()
+                if include_completed or not a.finished
+            ]
+
+    def peek_next(self) -> Optional[Action]:
+        """Return the next ready action without claiming it."""
+        with self._lock:
+            return self._next_ready_locked()
+
+    def claim_next(self) -> Optional[Action]:
+        """Claim the next ready action and mark it as running."""
+        with self._lock:
+            action = self._next_ready_locked()
+            if action is not None:
+                action.status = ActionStatus.RUNNING
+                action.started_at = datetime.utcnow()
+                self._notify_locked()
+            return action
+
+    async def claim(self) -> Action:
+        """Wait until an action is ready, then claim it."""
+        while True:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                action = self._next_ready_locked()
+                if action is not None:
+                    action.status = ActionStatus.RUNNING
+                    action.started_at = datetime.utcnow()
+                    self._notify_locked()
+                    return action
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+            await self._wait(waiter, None)
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> None:
+        """Wait until the queue changes or the timeout expires."""
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            self._waiters.append(waiter)
+        await self._wait(waiter, timeout)
+
+    def complete(self, action_id: int, result: Any = None) -> None:
+        """Mark a running action as successfully completed."""
+        self._finish(action_id, ActionStatus.COMPLETED, result=result)
+
+    def fail(self, action_id: int, error: str, result: Any = None) -> None:
+        """Mark a running action as failed."""
+        self._finish(action_id, ActionStatus.FAILED, result=result, error=error)
+
+    def clear(self, include_completed: bool = False) -> int:
+        """Remove pending actions, and optionally finished ones.
+
+        Running actions are never removed. Pending actions that depend on a
+        removed action are removed as well.
+
+        Returns:
+            Number of removed actions
+        """
+        with self._lock:
+            removed = {
+                a.id for a in self._actions.values()
+                if a.status == ActionStatus.PENDING
+                or (include_completed and a.finished)
+            }
+            for action in self._actions.values():
+                if action.status == ActionStatus.PENDING and removed.intersection(action.depends_on):
+                    removed.add(action.id)
+            for action_id in removed:
+                del self._actions[action_id]
+            # Dependencies on finished actions that were cleared are satisfied
+            for action in self._actions.values():
+                action.depends_on = [d for d in action.depends_on if d in self._actions]
+            self._notify_locked()
+            return len(removed)
+
+    def is_idle(self) -> bool:
+        """Whether there are no pending or running actions left."""
+        with self._lock:
+            self._skip_blocked_locked()
+            return all(a.finished for a in self._actions.values())
+
+    def _finish(
+        self,
+        action_id: int,
+        status: ActionStatus,
+        result: Any = None,
+        error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            action = self._actions.get(action_id)
+            if action is None:
+                return
+            action.status = status
+            action.result = result
+            action.error = error
+            action.finished_at = datetime.utcnow()
+            self._skip_blocked_locked()
+            self._notify_locked()
+
+    def _next_ready_locked(self) -> Optional[Action]:
+        self._skip_blocked_locked()
+        best = None
+        for action in self._actions.values():
+            if action.status != ActionStatus.PENDING:
+                continue
+            if any(self._actions[d].status != ActionStatus.COMPLETED for d in action.depends_on):
+                continue
+            if best is None or action.priority > best.priority:
+                best = action
+        return best
+
+    def _skip_blocked_locked(self) -> None:
+        # Actions are stored in insertion order and can only depend on earlier
+        # actions, so a single pass propagates failures transitively.
+        for action in self._actions.values():
+            if action.status != ActionStatus.PENDING:
+                continue
+            for dep in action.depends_on:
+                dep_status = self._actions[dep].status
+                if dep_status in (ActionStatus.FAILED, ActionStatus.SKIPPED):
+                    action.status = ActionStatus.SKIPPED
+                    action.error = f"Dependency {dep} {dep_status.value}"
+                    action.finished_at = datetime.utcnow()
+                    break
+
+    def _notify_locked(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The waiting loop has already been closed
+                pass
+
+    async def _wait(self, waiter, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter[1]), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_default_queue: Optional[ActionQueue] = None
+_default_queue_lock = threading.Lock()
+
+
+def get_action_queue() -> ActionQueue:
+    """Get the process-wide action queue shared by the control tools."""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = ActionQueue()
+        return _default_queue
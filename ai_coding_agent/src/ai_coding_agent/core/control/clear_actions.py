@@ -3,6 +3,7 @@
 from typing import Optional
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from .action_queue import ActionQueue, get_action_queue
 
 
 class ClearActionsTool(BaseTool):
@@ -20,12 +21,18 @@ class ClearActionsTool(BaseTool):
         )
     ]
 
+    def __init__(self, queue: Optional[ActionQueue] = None):
+        super().__init__()
+        self.queue = queue or get_action_queue()
+
     async def execute(
         self,
         include_completed: bool = False
     ) -> ToolResult:
         """Execute the clear actions operation.
 
+        Pending actions are removed; running actions are left untouched.
+
         Args:
             include_completed: Whether to include completed actions
 
@@ -33,13 +40,12 @@ class ClearActionsTool(BaseTool):
             ToolResult containing the clear result
         """
         try:
-            # TODO: Implement actual action queue clearing functionality
-            # This is a placeholder implementation
+            cleared_count = self.queue.clear(include_completed=include_completed)
             return ToolResult(
                 success=True,
                 data={
                     "message": "Action queue cleared successfully",
-                    "cleared_count": 5
+                    "cleared_count": cleared_count
                 }
             )
 
@@ -47,4 +53,4 @@ class ClearActionsTool(BaseTool):
             return ToolResult(
                 success=False,
                 error=f"Error clearing actions: {str(e)}"
-            ) 
\ No newline at end of file
+            ) 
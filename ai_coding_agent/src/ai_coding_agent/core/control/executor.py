@@ -0,0 +1,154 @@
+"""Concurrent executor that drains the action queue."""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from ..base import BaseTool, ToolResult
+from ..dispatch import ToolDispatcher
+from .action_queue import Action, ActionQueue, get_action_queue
+
+logger = logging.getLogger(__name__)
+
+
+def default_tools() -> List[BaseTool]:
+    """Instantiate the core tools that actions can be dispatched to."""
+    from ..registry import create_default_registry
+
+    return list(create_default_registry(include_control=False))
+
+
+class ActionExecutor:
+    """Executes queued actions on a bounded pool of asyncio workers.
+
+    Each action is run through a ``ToolDispatcher`` on the tool with the
+    matching name, so blocking and CPU-bound tools are offloaded to worker
+    threads and processes instead of stalling the event loop. Results and
+    errors are written back to the queue, where they are visible through
+    ``show_actions``.
+
+    Example:
+        async with ActionExecutor(max_workers=4) as executor:
+            queue.push("list_dir", {"directory_path": "."})
+            await executor.join()
+    """
+
+    def __init__(
+        self,
+        tools: Optional[Iterable[BaseTool]] = None,
+        queue: Optional[ActionQueue] = None,
+        max_workers: int = 4,
+        max_process_workers: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        dispatcher: Optional[ToolDispatcher] = None
+    ):
+        """Initialize the executor.
+
+        Args:
+            tools: Tools available for dispatch (defaults to the core tools)
+            queue: Queue to drain (defaults to the shared action queue)
+            max_workers: Number of concurrent asyncio workers
+            max_process_workers: Size of the process pool for CPU-bound tools
+            default_timeout: Timeout in seconds for actions without their own
+            dispatcher: Dispatcher shared with other callers (by default the
+                executor creates and owns one)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        self.queue = queue or get_action_queue()
+        self.tools: Dict[str, BaseTool] = {
+            tool.name: tool for tool in (tools if tools is not None else default_tools())
+        }
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._owns_dispatcher = dispatcher is None
+        self.dispatcher = dispatcher if dispatcher is not None else ToolDispatcher(
+            max_processes=max_process_workers
+        )
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool is started."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Start the worker pool."""
+        if self.running:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"action-worker-{i}")
+            for i in range(self.max_workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers and shut down the dispatcher's pools if owned.
+
+        Actions that are running when the executor stops are marked failed.
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if self._owns_dispatcher:
+            self.dispatcher.shutdown()
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queue has no pending or running actions.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the queue drained, False if the timeout expired
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not self.queue.is_idle():
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await self.queue.wait_for_change(timeout=remaining)
+        return True
+
+    async def __aenter__(self) -> "ActionExecutor":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _worker(self) -> None:
+        while True:
+            action = await self.queue.claim()
+            try:
+                result = await self.run_action(action)
+            except asyncio.CancelledError:
+                self.queue.fail(action.id, "Executor stopped before the action finished")
+                raise
+            # Queues backed by a database may wait on a lock to record the result
+            if result.success:
+                await asyncio.to_thread(self.queue.complete, action.id, result.data)
+            else:
+                await asyncio.to_thread(self.queue.fail, action.id, result.error or "Unknown error", result.data)
+
+    async def run_action(self, action: Action) -> ToolResult:
+        """Run a single action and return the tool result.
+
+        Args:
+            action: The action to run
+
+        Returns:
+            ToolResult produced by the tool, or an error result
+        """
+        tool = self.tools.get(action.tool_name)
+        if tool is None:
+            return ToolResult(success=False, error=f"Unknown tool: {action.tool_name}")
+
+        timeout = action.timeout if action.timeout is not None else self.default_timeout
+        try:
+            return await self.dispatcher.dispatch(tool, action.parameters, timeout=timeout)
+        except Exception as e:
+            logger.exception("Action %s (%s) raised", action.id, action.tool_name)
+            return ToolResult(success=False, error=f"Error executing action: {str(e)}")
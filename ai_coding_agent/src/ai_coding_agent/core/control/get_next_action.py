@@ -1,8 +1,10 @@
 """Get next action tool."""
 
+import asyncio
 from typing import Optional, Dict, Any
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from .action_queue import ActionQueue, get_action_queue
 
 
 class GetNextActionTool(BaseTool):
@@ -20,29 +22,39 @@ class GetNextActionTool(BaseTool):
         )
     ]
 
+    def __init__(self, queue: Optional[ActionQueue] = None):
+        super().__init__()
+        self.queue = queue or get_action_queue()
+
     async def execute(
         self,
         timeout: Optional[int] = 5
     ) -> ToolResult:
         """Execute the get next action operation.
 
+        Returns the next action whose dependencies are satisfied, waiting up
+        to ``timeout`` seconds for one to become ready. The action is left in
+        the queue for the executor to run.
+
         Args:
             timeout: Timeout in seconds
 
         Returns:
-            ToolResult containing the next action
+            ToolResult containing the next action, or None if none is ready
         """
         try:
-            # TODO: Implement actual next action getting functionality
-            # This is a placeholder implementation
+            action = self.queue.peek_next()
+            if action is None and timeout:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout
+                while action is None and loop.time() < deadline:
+                    await self.queue.wait_for_change(timeout=deadline - loop.time())
+                    action = self.queue.peek_next()
+
             return ToolResult(
                 success=True,
                 data={
-                    "action": {
-                        "id": 1,
-                        "action": "example_action",
-                        "parameters": {}
-                    }
+                    "action": action.model_dump(mode="json") if action else None
                 }
             )
 
@@ -50,4 +62,4 @@ class GetNextActionTool(BaseTool):
             return ToolResult(
                 success=False,
                 error=f"Error getting next action: {str(e)}"
-            ) 
\ No newline at end of file
+            ) 
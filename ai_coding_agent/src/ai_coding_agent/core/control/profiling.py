@@ -0,0 +1,138 @@
+"""Profiling admin tool."""
+
+from typing import List, Optional
+
+from ..base import BaseTool, ToolParameter, ToolResult
+from ..profiling import ToolProfiler, get_profiler
+
+PROFILING_ACTIONS = ("status", "enable", "disable", "list", "get")
+
+
+class ProfilingTool(BaseTool):
+    """Tool for switching tool profiling on and off and reading the reports."""
+
+    name = "profiling"
+    description = (
+        "Profile tool calls in the running server. Actions: status, enable "
+        "(tools, sample_rate, mode, memory), disable, list (tool_name, limit) "
+        "and get (profile_id)"
+    )
+    parameters = [
+        ToolParameter(
+            name="action",
+            type="string",
+            description=f"What to do: {', '.join(PROFILING_ACTIONS)}",
+            required=True
+        ),
+        ToolParameter(
+            name="tools",
+            type="array",
+            description="Tool names to profile when enabling (\"*\" for all tools)",
+            required=False
+        ),
+        ToolParameter(
+            name="sample_rate",
+            type="number",
+            description="Fraction of calls to profile when enabling",
+            required=False
+        ),
+        ToolParameter(
+            name="mode",
+            type="string",
+            description="Profiler to use when enabling: cprofile or sampling",
+            required=False
+        ),
+        ToolParameter(
+            name="memory",
+            type="boolean",
+            description="Whether to record allocations with tracemalloc when enabling",
+            required=False
+        ),
+        ToolParameter(
+            name="tool_name",
+            type="string",
+            description="Only list profiles of this tool",
+            required=False
+        ),
+        ToolParameter(
+            name="limit",
+            type="integer",
+            description="Maximum number of profiles to list",
+            required=False,
+            default=20
+        ),
+        ToolParameter(
+            name="profile_id",
+            type="string",
+            description="ID of the profile to get",
+            required=False
+        )
+    ]
+
+    def __init__(self, profiler: Optional[ToolProfiler] = None):
+        super().__init__()
+        self.profiler = profiler or get_profiler()
+
+    async def execute(
+        self,
+        action: str,
+        tools: Optional[List[str]] = None,
+        sample_rate: Optional[float] = None,
+        mode: Optional[str] = None,
+        memory: Optional[bool] = None,
+        tool_name: Optional[str] = None,
+        limit: int = 20,
+        profile_id: Optional[str] = None
+    ) -> ToolResult:
+        """Execute the profiling operation.
+
+        Args:
+            action: What to do
+            tools: Tool names to profile
+            sample_rate: Fraction of calls to profile
+            mode: Profiler to use
+            memory: Whether to record allocations
+            tool_name: Only list profiles of this tool
+            limit: Maximum number of profiles to list
+            profile_id: ID of the profile to get
+
+        Returns:
+            ToolResult containing the profiler settings, profile summaries,
+            or a profile with its reports
+        """
+        try:
+            if action == "status":
+                return ToolResult(success=True, data={"settings": self.profiler.settings()})
+            if action == "enable":
+                if tools is None and not self.profiler.tools:
+                    return ToolResult(success=False, error="tools is required to enable profiling")
+                settings = self.profiler.configure(
+                    tools=tools, sample_rate=sample_rate, mode=mode, memory=memory
+                )
+                return ToolResult(success=True, data={"settings": settings})
+            if action == "disable":
+                return ToolResult(success=True, data={"settings": self.profiler.disable()})
+            if action == "list":
+                return ToolResult(
+                    success=True,
+                    data={"profiles": self.profiler.list_profiles(tool_name=tool_name, limit=limit)}
+                )
+            if action == "get":
+                if not profile_id:
+                    return ToolResult(success=False, error="profile_id is required")
+                profile = self.profiler.get_profile(profile_id)
+                if profile is None:
+                    return ToolResult(success=False, error=f"Profile not found: {profile_id}")
+                return ToolResult(success=True, data={"profile": profile})
+            return ToolResult(
+                success=False,
+                error=f"Invalid action: {action}. Must be one of: {', '.join(PROFILING_ACTIONS)}"
+            )
+
+        except ValueError as e:
+            return ToolResult(success=False, error=str(e))
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                error=f"Error managing profiling: {str(e)}"
+            )
@@ -1,47 +1,90 @@
 """Tool for pushing actions to the action queue."""
 
-from typing import Dict, Any, Optional
-from ..base import BaseTool, ToolResult
+from typing import Dict, Any, List, Optional
+from ..base import BaseTool, ToolParameter, ToolResult
+from .action_queue import ActionQueue, get_action_queue
 
 class PushActionTool(BaseTool):
     """Tool for pushing actions to the action queue.
     
     This tool allows pushing new actions to the action queue for execution.
-    Actions can be any valid action type supported by the system.
+    Each action names the tool to run and its parameters, and may depend on
+    previously queued actions so that a whole plan can be enqueued at once.
     """
     
     name: str = "push_action"
     description: str = "Push a new action to the action queue"
+    parameters = [
+        ToolParameter(
+            name="tool_name",
+            type="string",
+            description="Name of the tool to execute",
+            required=True
+        ),
+        ToolParameter(
+            name="parameters",
+            type="object",
+            description="Parameters for the tool",
+            required=False
+        ),
+        ToolParameter(
+            name="depends_on",
+            type="array",
+            description="IDs of actions that must complete before this one runs",
+            required=False
+        ),
+        ToolParameter(
+            name="priority",
+            type="integer",
+            description="Priority of the action (higher numbers = higher priority)",
+            required=False
+        ),
+        ToolParameter(
+            name="timeout",
+            type="number",
+            description="Timeout for the action in seconds",
+            required=False
+        )
+    ]
+    
+    def __init__(self, queue: Optional[ActionQueue] = None):
+        super().__init__()
+        self.queue = queue or get_action_queue()
     
     async def execute(
         self,
-        action_type: str,
-        action_data: Dict[str, Any],
-        priority: Optional[int] = None
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        depends_on: Optional[List[int]] = None,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None
     ) -> ToolResult:
         """Execute the push action tool.
         
         Args:
-            action_type: Type of action to push
-            action_data: Data for the action
+            tool_name: Name of the tool to execute
+            parameters: Parameters for the tool
+            depends_on: IDs of actions that must complete first
             priority: Optional priority for the action (higher numbers = higher priority)
+            timeout: Optional timeout for the action in seconds
             
         Returns:
             ToolResult containing success status and action details
         """
         try:
-            # TODO: Implement actual action queue pushing
-            # For now, just return success
+            action = self.queue.push(
+                tool_name=tool_name,
+                parameters=parameters,
+                depends_on=depends_on,
+                priority=priority,
+                timeout=timeout
+            )
             return ToolResult(
                 success=True,
-                data={
-                    "action_type": action_type,
-                    "action_data": action_data,
-                    "priority": priority
-                }
+                data={"action": action.model_dump(mode="json")}
             )
         except Exception as e:
             return ToolResult(
                 success=False,
                 error=str(e)
-            ) 
\ No newline at end of file
+            ) 
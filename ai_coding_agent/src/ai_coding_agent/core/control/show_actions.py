@@ -3,6 +3,7 @@
 from typing import Optional, List, Dict
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from .action_queue import ActionQueue, get_action_queue
 
 
 class ShowActionsTool(BaseTool):
@@ -20,6 +21,10 @@ class ShowActionsTool(BaseTool):
         )
     ]
 
+    def __init__(self, queue: Optional[ActionQueue] = None):
+        super().__init__()
+        self.queue = queue or get_action_queue()
+
     async def execute(
         self,
         include_completed: bool = False
@@ -30,22 +35,15 @@ class ShowActionsTool(BaseTool):
             include_completed: Whether to include completed actions
 
         Returns:
-            ToolResult containing the action queue
+            ToolResult containing the action queue, including status, results
+            and errors of finished actions
         """
         try:
-            # TODO: Implement actual action queue showing functionality
-            # This is a placeholder implementation
+            actions = self.queue.list(include_completed=include_completed)
             return ToolResult(
                 success=True,
                 data={
-                    "actions": [
-                        {
-                            "id": 1,
-                            "action": "example_action",
-                            "status": "pending",
-                            "parameters": {}
-                        }
-                    ]
+                    "actions": [a.model_dump(mode="json") for a in actions]
                 }
             )
 
@@ -53,4 +51,4 @@ class ShowActionsTool(BaseTool):
             return ToolResult(
                 success=False,
                 error=f"Error showing actions: {str(e)}"
-            ) 
\ No newline at end of file
+            ) 
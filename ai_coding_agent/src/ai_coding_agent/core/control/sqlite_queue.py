@@ -0,0 +1,371 @@
+"""Action queue stored in SQLite, shared by several server processes."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+from .action_queue import Action, ActionQueue, ActionStatus
+
+_FINISHED = ("completed", "failed", "skipped")
+
+
+def _from_timestamp(value: Optional[float]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+class SQLiteActionQueue(ActionQueue):
+    """Action queue whose state lives in a SQLite database.
+
+    Every process that opens the same database file sees the same queue,
+    so several MCP server workers can push, claim and finish actions
+    together. Claims run in ``BEGIN IMMEDIATE`` transactions, so an action
+    is only ever claimed by one worker. Waiters in the same process are
+    woken directly; changes made by other processes are noticed by polling
+    ``PRAGMA data_version`` every ``poll_interval`` seconds.
+
+    ``claim()`` callers on one event loop share a single poller task, which
+    claims actions on a worker thread and hands them out in arrival order.
+    An action still running ``lease`` seconds after its timeout (or after
+    it started, if it has none) is assumed to belong to a worker that died
+    and returns to pending.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tool_name TEXT NOT NULL,
+            parameters TEXT NOT NULL,
+            depends_on TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            timeout REAL,
+            status TEXT NOT NULL,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS actions_ready ON actions(status, priority DESC, id);
+    """
+
+    # Pending actions whose dependencies all completed. Dependencies that
+    # were cleared from the queue no longer exist and count as satisfied.
+    _READY = """
+        SELECT * FROM actions a
+        WHERE a.status = 'pending' AND NOT EXISTS (
+            SELECT 1 FROM json_each(a.depends_on) d
+            JOIN actions x ON x.id = d.value
+            WHERE x.status != 'completed'
+        )
+        ORDER BY a.priority DESC, a.id
+        LIMIT 1
+    """
+
+    _RECLAIM = """
+        UPDATE actions SET status = 'pending', started_at = NULL
+        WHERE status = 'running' AND started_at + COALESCE(timeout, 0) + ? < ?
+    """
+
+    _SKIP_BLOCKED = """
+        UPDATE actions SET
+            status = 'skipped',
+            finished_at = ?,
+            error = (
+                SELECT 'Dependency ' || x.id || ' ' || x.status FROM json_each(actions.depends_on) d
+                JOIN actions x ON x.id = d.value
+                WHERE x.status IN ('failed', 'skipped')
+                ORDER BY d.key LIMIT 1
+            )
+        WHERE status = 'pending' AND EXISTS (
+            SELECT 1 FROM json_each(actions.depends_on) d
+            JOIN actions x ON x.id = d.value
+            WHERE x.status IN ('failed', 'skipped')
+        )
+    """
+
+    def __init__(self, path: Union[str, Path], poll_interval: float = 0.05, lease: float = 300.0):
+        """Open (or create) the queue database.
+
+        Args:
+            path: Database file path
+            poll_interval: Seconds between checks for changes made by other processes
+            lease: Seconds past its timeout before a running action is
+                returned to pending
+        """
+        super().__init__()
+        self.path = str(path)
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._db_lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        # Polled from event loops, so it must never wait behind a transaction
+        self._version_lock = threading.Lock()
+        self._version_conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._claimers: Dict[asyncio.AbstractEventLoop, Deque[asyncio.Future]] = {}
+        self._pollers: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+    def push(
+        self,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        depends_on: Optional[List[int]] = None,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> Action:
+        depends_on = list(dict.fromkeys(depends_on or []))
+        with self._transaction():
+            if depends_on:
+                placeholders = ", ".join("?" for _ in depends_on)
+                known = {
+                    row[0] for row in self._conn.execute(
+                        f"SELECT id FROM actions WHERE id IN ({placeholders})", depends_on
+                    )
+                }
+                unknown = [dep for dep in depends_on if dep not in known]
+                if unknown:
+                    raise ValueError(f"Unknown dependency action IDs: {unknown}")
+            row = self._conn.execute(
+                "INSERT INTO actions (tool_name, parameters, depends_on, priority, timeout, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 'pending', ?) RETURNING *",
+                (tool_name, json.dumps(parameters or {}), json.dumps(depends_on), priority or 0, timeout, time.time())
+            ).fetchone()
+        self._notify()
+        return self._action(row)
+
+    def get(self, action_id: int) -> Optional[Action]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT * FROM actions WHERE id = ?", (action_id,)).fetchone()
+        return self._action(row) if row is not None else None
+
+    def list(self, include_completed: bool = False) -> List[Action]:
+        with self._transaction():
+            self._reclaim_expired()
+            self._skip_blocked()
+            sql = "SELECT * FROM actions"
+            if not include_completed:
+                sql += " WHERE status IN ('pending', 'running')"
+            rows = self._conn.execute(sql + " ORDER BY id").fetchall()
+        return [self._action(row) for row in rows]
+
+    def peek_next(self) -> Optional[Action]:
+        with self._transaction():
+            self._reclaim_expired()
+            self._skip_blocked()
+            row = self._conn.execute(self._READY).fetchone()
+        return self._action(row) if row is not None else None
+
+    def claim_next(self) -> Optional[Action]:
+        with self._transaction():
+            self._reclaim_expired()
+            self._skip_blocked()
+            row = self._conn.execute(self._READY).fetchone()
+            if row is not None:
+                row = self._conn.execute(
+                    "UPDATE actions SET status = 'running', started_at = ? WHERE id = ? RETURNING *",
+                    (time.time(), row["id"])
+                ).fetchone()
+        if row is None:
+            return None
+        self._notify()
+        return self._action(row)
+
+    async def claim(self) -> Action:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._claimers.setdefault(loop, deque()).append(future)
+            if loop not in self._pollers:
+                self._pollers[loop] = loop.create_task(self._poll(loop))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The action was handed over as the caller was cancelled
+                self._release(future.result().id)
+            else:
+                future.cancel()
+            with self._lock:
+                claimers = self._claimers.get(loop)
+                if claimers is not None and all(f.done() for f in claimers) and loop in self._pollers:
+                    self._pollers.pop(loop).cancel()
+            raise
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        version = self._data_version()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            self._waiters.append(waiter)
+        try:
+            while not waiter[1].done():
+                wait = self.poll_interval
+                if deadline is not None:
+                    wait = min(wait, deadline - loop.time())
+                    if wait <= 0:
+                        return
+                await asyncio.wait([waiter[1]], timeout=wait)
+                if self._data_version() != version:
+                    return
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def clear(self, include_completed: bool = False) -> int:
+        with self._transaction():
+            rows = self._conn.execute("SELECT id, status, depends_on FROM actions ORDER BY id").fetchall()
+            removed = {
+                row["id"] for row in rows
+                if row["status"] == "pending" or (include_completed and row["status"] in _FINISHED)
+            }
+            for row in rows:
+                if row["status"] == "pending" and removed.intersection(json.loads(row["depends_on"])):
+                    removed.add(row["id"])
+            self._conn.executemany("DELETE FROM actions WHERE id = ?", [(i,) for i in removed])
+            # Dependencies on finished actions that were cleared are satisfied
+            for row in rows:
+                depends_on = json.loads(row["depends_on"])
+                if row["id"] not in removed and removed.intersection(depends_on):
+                    self._conn.execute(
+                        "UPDATE actions SET depends_on = ? WHERE id = ?",
+                        (json.dumps([d for d in depends_on if d not in removed]), row["id"])
+                    )
+        self._notify()
+        return len(removed)
+
+    def is_idle(self) -> bool:
+        with self._transaction():
+            self._reclaim_expired()
+            self._skip_blocked()
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM actions WHERE status IN ('pending', 'running')"
+            ).fetchone()
+        return row[0] == 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._db_lock:
+            self._conn.close()
+        with self._version_lock:
+            self._version_conn.close()
+
+    def _finish(
+        self,
+        action_id: int,
+        status: ActionStatus,
+        result: Any = None,
+        error: Optional[str] = None
+    ) -> None:
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE actions SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status.value, json.dumps(result, default=str), error, time.time(), action_id)
+            )
+            self._skip_blocked()
+        self._notify()
+
+    async def _poll(self, loop: asyncio.AbstractEventLoop) -> None:
+        claimers = self._claimers[loop]
+        try:
+            while True:
+                with self._lock:
+                    while claimers and claimers[0].done():
+                        claimers.popleft()
+                    if not claimers:
+                        return
+                claiming = asyncio.ensure_future(asyncio.to_thread(self.claim_next))
+                try:
+                    action = await asyncio.shield(claiming)
+                except asyncio.CancelledError:
+                    claiming.add_done_callback(self._release_claimed)
+                    raise
+                if action is None:
+                    await self.wait_for_change(timeout=self.poll_interval)
+                    continue
+                with self._lock:
+                    while claimers and claimers[0].done():
+                        claimers.popleft()
+                    claimer = claimers.popleft() if claimers else None
+                if claimer is not None:
+                    claimer.set_result(action)
+                else:
+                    await asyncio.to_thread(self._release, action.id)
+        finally:
+            with self._lock:
+                if self._pollers.get(loop) is asyncio.current_task():
+                    del self._pollers[loop]
+                    if not claimers:
+                        del self._claimers[loop]
+
+    def _release_claimed(self, claiming: "asyncio.Future[Optional[Action]]") -> None:
+        if not claiming.cancelled() and claiming.exception() is None and claiming.result() is not None:
+            self._release(claiming.result().id)
+
+    def _release(self, action_id: int) -> None:
+        """Return a claimed action that nobody will run to pending."""
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE actions SET status = 'pending', started_at = NULL WHERE id = ? AND status = 'running'",
+                (action_id,)
+            )
+        self._notify()
+
+    def _reclaim_expired(self) -> None:
+        self._conn.execute(self._RECLAIM, (self.lease, time.time()))
+
+    def _skip_blocked(self) -> None:
+        # Each pass skips the direct dependents of failed or skipped actions
+        while self._conn.execute(self._SKIP_BLOCKED, (time.time(),)).rowcount:
+            pass
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    def _data_version(self) -> int:
+        with self._version_lock:
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _notify(self) -> None:
+        with self._lock:
+            self._notify_locked()
+
+    @staticmethod
+    def _action(row: sqlite3.Row) -> Action:
+        return Action(
+            id=row["id"],
+            tool_name=row["tool_name"],
+            parameters=json.loads(row["parameters"]),
+            depends_on=json.loads(row["depends_on"]),
+            priority=row["priority"],
+            timeout=row["timeout"],
+            status=ActionStatus(row["status"]),
+            result=json.loads(row["result"]) if row["result"] is not None else None,
+            error=row["error"],
+            created_at=_from_timestamp(row["created_at"]),
+            started_at=_from_timestamp(row["started_at"]),
+            finished_at=_from_timestamp(row["finished_at"])
+        )
+
@@ -0,0 +1,399 @@
+"""Dispatching tool calls off the event loop."""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple, Type
+
+from .base import BaseTool, ToolResult
+from .metrics import ToolMetrics
+from .profiling import ToolProfiler, get_profiler
+from .result_cache import PendingResult, ToolResultCache
+from .tracing import Tracer, get_tracer
+
+logger = logging.getLogger(__name__)
+
+_thread_state = threading.local()
+
+# Cancellation flags shared with the process pool, one slot per call in flight
+PROCESS_CANCEL_SLOTS = 256
+
+# The flags as seen by a worker process, set when the process starts
+_process_cancel_flags: Optional[Any] = None
+
+
+class ToolCancelledError(Exception):
+    """Raised inside a tool when its caller gave up on the call."""
+
+
+def cancellation_requested() -> bool:
+    """Whether the call running on this thread has been cancelled.
+
+    Tools that loop over many files can poll this (or call
+    ``check_cancelled``) to stop early once a dispatch timed out. It is
+    always False outside of dispatcher worker threads and processes.
+    """
+    event = getattr(_thread_state, "cancel_event", None)
+    if event is not None:
+        return event.is_set()
+    slot = getattr(_thread_state, "cancel_slot", None)
+    return slot is not None and _process_cancel_flags is not None and bool(_process_cancel_flags[slot])
+
+
+def check_cancelled() -> None:
+    """Raise ToolCancelledError if the current call has been cancelled."""
+    if cancellation_requested():
+        raise ToolCancelledError("Tool call was cancelled")
+
+
+class _ThreadCall:
+    """A tool call running on a worker thread, and the means to cancel it."""
+
+    def __init__(self):
+        self.cancel_event = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    def run(self, tool: BaseTool, parameters: Dict[str, Any]) -> ToolResult:
+        loop = getattr(_thread_state, "loop", None)
+        if loop is None:
+            # One long-lived loop per worker thread keeps per-call overhead low
+            loop = _thread_state.loop = asyncio.new_event_loop()
+        with self._lock:
+            if self.cancel_event.is_set():
+                raise ToolCancelledError("Tool call was cancelled")
+            self._loop = loop
+            self._task = loop.create_task(tool.execute(**parameters))
+        _thread_state.cancel_event = self.cancel_event
+        try:
+            return loop.run_until_complete(self._task)
+        finally:
+            _thread_state.cancel_event = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancel_event.set()
+            if self._loop is not None and self._task is not None:
+                # Takes effect at the tool's next await point
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+def _retrieve_exception(future: "asyncio.Future") -> None:
+    # Calls abandoned after a timeout may still fail; mark the error as seen
+    if not future.cancelled():
+        future.exception()
+
+
+def _init_process(cancel_flags: Any) -> None:
+    """Keep the dispatcher's cancellation flags in a new worker process."""
+    global _process_cancel_flags
+    _process_cancel_flags = cancel_flags
+
+
+def _run_tool_in_process(tool_cls: Type[BaseTool], kwargs: Dict, cancel_slot: Optional[int] = None) -> ToolResult:
+    """Instantiate and run a tool inside a worker process.
+
+    ``cancel_slot`` is the call's index into the cancellation flags, which
+    ``cancellation_requested`` reads.
+    """
+    _thread_state.cancel_slot = cancel_slot
+    try:
+        return asyncio.run(tool_cls().execute(**kwargs))
+    finally:
+        _thread_state.cancel_slot = None
+
+
+class ToolDispatcher:
+    """Runs tool calls where they cannot stall the event loop.
+
+    Tools are classified by their class attributes:
+
+    - ``cpu_bound`` tools run in a process pool,
+    - ``blocking`` tools (synchronous file I/O) run on a bounded thread pool,
+    - all other tools are awaited directly on the event loop.
+
+    Each tool's concurrency is capped by ``max_concurrency`` (per event
+    loop, when one dispatcher serves several) and each call by a timeout,
+    both of which can be overridden per tool name. A call that times out
+    is cancelled: tasks on the event loop are cancelled outright, thread
+    calls are cancelled at their next await point and can poll
+    ``cancellation_requested()``, and process calls are dropped if they
+    have not started yet and can poll ``cancellation_requested()`` once
+    they have (through a flag in shared memory). A concurrency slot is only freed once the
+    underlying work has really stopped, so timed-out calls cannot pile up.
+
+    Every call is recorded in ``metrics``: its outcome, latency, result size
+    and the number of calls in flight, per tool. Each call is also a
+    ``tool.execute`` span of ``tracer``. Calls selected by ``profiler`` run
+    on a worker thread regardless of their kind, so the profile only
+    contains that call.
+
+    Results of ``cacheable`` tools are kept in ``result_cache`` and reused
+    for identical calls until the files they were read from change, and
+    calls of tools that change files drop the results depending on them.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 8,
+        max_processes: Optional[int] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: Optional[float] = None,
+        metrics: Optional[ToolMetrics] = None,
+        tracer: Optional[Tracer] = None,
+        profiler: Optional[ToolProfiler] = None,
+        result_cache: Optional[ToolResultCache] = None,
+        cache_results: bool = True
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            max_threads: Size of the thread pool for blocking tools
+            max_processes: Size of the process pool for CPU-bound tools
+            concurrency_limits: Maximum concurrent calls per tool name,
+                overriding the tools' ``max_concurrency``
+            timeouts: Timeout in seconds per tool name, overriding the
+                tools' ``default_timeout``
+            default_timeout: Timeout for tools without one of their own
+            metrics: Where calls are recorded (defaults to the process-wide
+                metrics registry)
+            tracer: Tracer recording call spans (defaults to the process-wide tracer)
+            profiler: Profiler deciding which calls to profile (defaults to
+                the process-wide profiler)
+            result_cache: Cache of tool results (defaults to a new one)
+            cache_results: Whether to cache tool results at all
+        """
+        if max_threads < 1:
+            raise ValueError("max_threads must be >= 1")
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self.metrics = metrics if metrics is not None else ToolMetrics()
+        self.tracer = tracer if tracer is not None else get_tracer()
+        self.profiler = profiler if profiler is not None else get_profiler()
+        self.result_cache: Optional[ToolResultCache] = None
+        if cache_results:
+            self.result_cache = result_cache if result_cache is not None else ToolResultCache()
+        self._thread_pool: Optional[Executor] = None
+        self._process_pool: Optional[Executor] = None
+        self._cancel_flags: Optional[Any] = None
+        self._free_slots = list(range(PROCESS_CANCEL_SLOTS))
+        # Semaphores belong to one event loop, so each loop gets its own
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._pool_lock = threading.Lock()
+
+    def concurrency_limit(self, tool: BaseTool) -> Optional[int]:
+        """Maximum number of concurrent calls of a tool, or None if unbounded."""
+        return self.concurrency_limits.get(tool.name, tool.max_concurrency)
+
+    def timeout_for(self, tool: BaseTool) -> Optional[float]:
+        """Timeout in seconds applied to calls of a tool, or None."""
+        timeout = self.timeouts.get(tool.name, tool.default_timeout)
+        return timeout if timeout is not None else self.default_timeout
+
+    async def dispatch(
+        self,
+        tool: BaseTool,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> ToolResult:
+        """Run a tool call.
+
+        Args:
+            tool: Tool to run
+            parameters: Tool arguments
+            timeout: Timeout in seconds, overriding the tool's timeout
+
+        Returns:
+            ToolResult of the tool, or an error result if it raised or
+            timed out
+        """
+        timeout = timeout if timeout is not None else self.timeout_for(tool)
+        cache = self.result_cache if tool.cacheable else None
+        self.metrics.started(tool.name)
+        start = time.perf_counter()
+        outcome, result = "error", None
+        with self.tracer.span("tool.execute", {"tool": tool.name}) as span:
+            try:
+                pending = None
+                if cache is not None:
+                    cached, pending = await self._cache_lookup(cache, tool, parameters)
+                    span.set_attribute("cache", "miss" if cached is None else "hit")
+                    if cached is not None:
+                        self.metrics.cache_hit(tool.name)
+                        outcome, result = "success", cached
+                        return result
+                outcome, result = await self._dispatch(tool, parameters, timeout)
+                if pending is not None:
+                    cache.put(pending, result)
+                return result
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                if self.result_cache is not None:
+                    self._invalidate(tool, parameters)
+                span.set_attribute("outcome", outcome)
+                if result is not None and not result.success:
+                    span.status, span.error = "error", result.error
+                self.metrics.finished(tool.name, outcome, time.perf_counter() - start, result)
+
+    async def _cache_lookup(
+        self,
+        cache: ToolResultCache,
+        tool: BaseTool,
+        parameters: Dict[str, Any]
+    ) -> Tuple[Optional[ToolResult], Optional[PendingResult]]:
+        def lookup() -> Tuple[Optional[ToolResult], Optional[PendingResult]]:
+            cached = cache.get(tool, parameters)
+            return cached, (cache.begin(tool, parameters) if cached is None else None)
+
+        try:
+            if cache.validate:
+                # Validating stats the dependencies, which can mean walking a tree
+                return await asyncio.get_running_loop().run_in_executor(self._pool("thread"), lookup)
+            return lookup()
+        except Exception:
+            logger.exception("Result cache lookup for %s failed", tool.name)
+            return None, None
+
+    def _invalidate(self, tool: BaseTool, parameters: Dict[str, Any]) -> None:
+        # Also after failed or timed-out calls, which may have changed files before stopping
+        try:
+            self.result_cache.changed_by(tool, parameters)
+        except Exception:
+            logger.exception("Result cache invalidation for %s failed", tool.name)
+
+    async def _dispatch(
+        self,
+        tool: BaseTool,
+        parameters: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> Tuple[str, ToolResult]:
+        semaphore = self._semaphore(tool)
+        if semaphore is not None:
+            await semaphore.acquire()
+
+        try:
+            future, cancel = self._submit(tool, parameters)
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        if semaphore is not None:
+            future.add_done_callback(lambda _: semaphore.release())
+        future.add_done_callback(_retrieve_exception)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            cancel()
+            return "timeout", ToolResult(
+                success=False,
+                error=f"{tool.name} timed out after {timeout} seconds"
+            )
+        except asyncio.CancelledError:
+            cancel()
+            raise
+        except ToolCancelledError:
+            return "cancelled", ToolResult(success=False, error=f"{tool.name} was cancelled")
+        except Exception as e:
+            logger.exception("Tool %s raised", tool.name)
+            return "error", ToolResult(success=False, error=f"Error executing {tool.name}: {str(e)}")
+        return ("success" if result.success else "failure"), result
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the worker pools."""
+        with self._pool_lock:
+            pools = (self._thread_pool, self._process_pool)
+            self._thread_pool = self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _semaphore(self, tool: BaseTool) -> Optional[asyncio.Semaphore]:
+        limit = self.concurrency_limit(tool)
+        if limit is None:
+            return None
+        with self._pool_lock:
+            semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+            semaphore = semaphores.get(tool.name)
+            if semaphore is None:
+                semaphore = semaphores[tool.name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _submit(self, tool: BaseTool, parameters: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        if self.profiler.should_profile(tool):
+            call = _ThreadCall()
+            run = functools.partial(self.profiler.run, tool.name, call.run)
+            future = loop.run_in_executor(self._pool("thread"), run, tool, parameters)
+            return future, call.cancel
+
+        if tool.cpu_bound:
+            return self._submit_to_process(tool, parameters)
+
+        if tool.blocking:
+            call = _ThreadCall()
+            future = loop.run_in_executor(self._pool("thread"), call.run, tool, parameters)
+            return future, call.cancel
+
+        task = asyncio.ensure_future(tool.execute(**parameters))
+        return task, task.cancel
+
+    def _submit_to_process(self, tool: BaseTool, parameters: Dict[str, Any]):
+        pool = self._pool("process")
+        flags = self._cancel_flags
+        with self._pool_lock:
+            # Without a free slot the call still runs, but cannot be stopped once started
+            slot = self._free_slots.pop() if self._free_slots else None
+        try:
+            call = pool.submit(_run_tool_in_process, type(tool), parameters, slot)
+        except BaseException:
+            self._release_slot(slot)
+            raise
+        # The slot is reused only after the worker has really finished with it
+        call.add_done_callback(lambda _: self._release_slot(slot))
+
+        def cancel() -> None:
+            if slot is not None:
+                flags[slot] = 1
+            call.cancel()
+
+        # Stays pending while a cancelled call is still running in its process
+        return asyncio.wrap_future(call), cancel
+
+    def _release_slot(self, slot: Optional[int]) -> None:
+        if slot is None:
+            return
+        with self._pool_lock:
+            self._cancel_flags[slot] = 0
+            self._free_slots.append(slot)
+
+    def _pool(self, kind: str) -> Executor:
+        with self._pool_lock:
+            if kind == "process":
+                if self._process_pool is None:
+                    if self._cancel_flags is None:
+                        self._cancel_flags = multiprocessing.RawArray("b", PROCESS_CANCEL_SLOTS)
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.max_processes,
+                        initializer=_init_process,
+                        initargs=(self._cancel_flags,)
+                    )
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_threads,
+                    thread_name_prefix="tool-worker"
+                )
+            return self._thread_pool
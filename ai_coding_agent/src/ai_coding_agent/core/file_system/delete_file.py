@@ -1,6 +1,7 @@
 """Delete file tool."""
 
 from pathlib import Path
+from typing import List
 
 from ..base import BaseTool, ToolParameter, ToolResult
 
@@ -10,6 +11,7 @@ class DeleteFileTool(BaseTool):
 
     name = "delete_file"
     description = "Delete a file"
+    blocking = True
     parameters = [
         ToolParameter(
             name="target_file",
@@ -19,6 +21,10 @@ class DeleteFileTool(BaseTool):
         )
     ]
 
+    def invalidated_paths(self, target_file: str, **kwargs) -> List[str]:
+        """The file deleted."""
+        return [target_file]
+
     async def execute(self, target_file: str) -> ToolResult:
         """Execute the delete file operation.
 
@@ -1,7 +1,7 @@
 """Edit file contents tool."""
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from ..base import BaseTool, ToolParameter, ToolResult
 
@@ -11,6 +11,7 @@ class EditFileTool(BaseTool):
 
     name = "edit_file"
     description = "Edit contents of a file"
+    blocking = True
     parameters = [
         ToolParameter(
             name="target_file",
@@ -32,6 +33,10 @@ class EditFileTool(BaseTool):
         )
     ]
 
+    def invalidated_paths(self, target_file: str, **kwargs) -> List[str]:
+        """The file edited."""
+        return [target_file]
+
     async def execute(
         self,
         target_file: str,
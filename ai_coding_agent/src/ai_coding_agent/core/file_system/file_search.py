@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import List
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from ..dispatch import check_cancelled
+from ..result_cache import CacheDependency, TREE
 
 
 class FileSearchTool(BaseTool):
@@ -11,6 +13,8 @@ class FileSearchTool(BaseTool):
 
     name = "file_search"
     description = "Search for files by name"
+    blocking = True
+    cacheable = True
     parameters = [
         ToolParameter(
             name="query",
@@ -20,6 +24,10 @@ class FileSearchTool(BaseTool):
         )
     ]
 
+    def cache_dependencies(self, **kwargs) -> List[CacheDependency]:
+        """The result depends on every path in the workspace."""
+        return [CacheDependency(".", TREE)]
+
     async def execute(self, query: str) -> ToolResult:
         """Execute the file search operation.
 
@@ -43,6 +51,7 @@ class FileSearchTool(BaseTool):
             # Find matches
             matches: List[str] = []
             for file_path in files:
+                check_cancelled()
                 # Check if query is in the filename (case-insensitive)
                 if query_lower in file_path.name.lower():
                     matches.append(str(file_path))
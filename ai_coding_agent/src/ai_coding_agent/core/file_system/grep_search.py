@@ -5,6 +5,8 @@ from pathlib import Path
 from typing import Optional, List, Dict
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from ..dispatch import check_cancelled
+from ..result_cache import CacheDependency, TREE
 
 
 class GrepSearchTool(BaseTool):
@@ -12,6 +14,8 @@ class GrepSearchTool(BaseTool):
 
     name = "grep_search"
     description = "Search for text in files"
+    cpu_bound = True
+    cacheable = True
     parameters = [
         ToolParameter(
             name="query",
@@ -40,6 +44,10 @@ class GrepSearchTool(BaseTool):
         )
     ]
 
+    def cache_dependencies(self, **kwargs) -> List[CacheDependency]:
+        """The result depends on every file in the workspace."""
+        return [CacheDependency(".", TREE)]
+
     async def execute(
         self,
         query: str,
@@ -79,6 +87,7 @@ class GrepSearchTool(BaseTool):
             # Search in each file
             matches: List[Dict] = []
             for file_path in all_files:
+                check_cancelled()
                 if not file_path.is_file():
                     continue
 
@@ -3,6 +3,7 @@
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 from ai_coding_agent.core.base import BaseTool, ToolResult, ToolParameter
+from ai_coding_agent.core.result_cache import CacheDependency, LISTING
 
 class ListDirectoryTool(BaseTool):
     """Tool for listing directory contents.
@@ -13,6 +14,8 @@ class ListDirectoryTool(BaseTool):
     
     name: str = "list_dir"
     description: str = "List contents of a directory"
+    blocking = True
+    cacheable = True
     parameters = [
         ToolParameter(
             name="directory_path",
@@ -46,12 +49,17 @@ class ListDirectoryTool(BaseTool):
         )
     ]
     
+    def cache_dependencies(self, directory_path: str, **kwargs) -> List[CacheDependency]:
+        """The result depends on the directory and the entries in it."""
+        return [CacheDependency(directory_path, LISTING)]
+    
     async def execute(
         self,
         directory_path: str,
         include_pattern: Optional[str] = None,
         exclude_pattern: Optional[str] = None,
-        sort_by: Optional[str] = None
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None
     ) -> ToolResult:
         """Execute the list directory tool.
         
@@ -60,11 +68,18 @@ class ListDirectoryTool(BaseTool):
             include_pattern: Optional glob pattern for files to include
             exclude_pattern: Optional glob pattern for files to exclude
             sort_by: Optional field to sort by (name, type, size, modified)
+            sort_order: Optional sorting order (asc or desc). Defaults to asc.
             
         Returns:
             ToolResult containing success status and directory contents
         """
         try:
+            if sort_order not in (None, "asc", "desc"):
+                return ToolResult(
+                    success=False,
+                    error=f"Invalid sort_order value: {sort_order}. Must be one of: asc, desc"
+                )
+
             path = Path(directory_path)
             if not path.exists():
                 return ToolResult(
@@ -114,6 +129,9 @@ class ListDirectoryTool(BaseTool):
             else:
                 # Default sort by name
                 items.sort(key=lambda x: x["name"].lower())
+
+            if sort_order == "desc":
+                items.reverse()
                 
             return ToolResult(
                 success=True,
@@ -1,9 +1,10 @@
 """Read file contents tool."""
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from ..result_cache import CacheDependency
 
 
 class ReadFileTool(BaseTool):
@@ -11,6 +12,8 @@ class ReadFileTool(BaseTool):
 
     name = "read_file"
     description = "Read contents of a file"
+    blocking = True
+    cacheable = True
     parameters = [
         ToolParameter(
             name="target_file",
@@ -39,6 +42,10 @@ class ReadFileTool(BaseTool):
         )
     ]
 
+    def cache_dependencies(self, target_file: str, **kwargs) -> List[CacheDependency]:
+        """The result depends on the file read."""
+        return [CacheDependency(target_file)]
+
     async def execute(
         self,
         target_file: str,
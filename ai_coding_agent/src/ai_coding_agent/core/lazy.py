@@ -0,0 +1,37 @@
+"""Lazy re-exports for package ``__init__`` modules."""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Create a package's ``__getattr__`` and ``__dir__`` for lazy re-exports.
+
+    Re-exported names are imported from their modules on first access
+    instead of when the package is imported, so importing one tool does not
+    import LangChain, the MCP server and every other tool with it.
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {"MCPServer": ".mcp"})
+
+    Args:
+        package: ``__name__`` of the package
+        exports: Exported name -> module defining it, relative to the package
+
+    Returns:
+        The ``__getattr__`` and ``__dir__`` functions of the package
+    """
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Later lookups find the attribute without calling __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,114 @@
+"""Running coroutines from synchronous code on a shared background event loop."""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An event loop running forever on a daemon thread.
+
+    Synchronous callers hand it coroutines with ``run``, which blocks until
+    they finish. Unlike ``asyncio.run``, the loop is not created and torn
+    down per call, so resources bound to it (the shared HTTP clients, tool
+    caches, connection pools) are reused across calls. It can also be used
+    while another event loop is running in the calling thread, and several
+    threads can run coroutines on it at once.
+    """
+
+    def __init__(self, name: str = "ai-coding-agent-loop"):
+        """Initialize the runner. The thread starts on first use.
+
+        Args:
+            name: Name of the loop's thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started if needed."""
+        with self._lock:
+            # A forked child inherits the loop but not its thread
+            if self._loop is None or self._loop.is_closed() or self._pid != os.getpid():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run_forever() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run_forever, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+        self._loop, self._pid = loop, os.getpid()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling it
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the loop's own thread, which would
+                wait on itself forever
+            TimeoutError: If the coroutine did not finish in time
+        """
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run cannot be called from the loop's own thread")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Coroutine did not finish within {timeout} seconds") from None
+        except BaseException:
+            # KeyboardInterrupt while waiting: do not leave the call running
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Stop the loop and wait for its thread to end."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            loop.close()
+
+
+_background_loop: Optional[BackgroundLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Get the process-wide background loop."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundLoop()
+        return _background_loop
@@ -3,9 +3,11 @@
 from .semantic_search import SemanticSearchTool
 from .symbol_info import SymbolInfoTool
 from .code_navigation import CodeNavigationTool
+from .repo_map import RepoMapTool
 
 __all__ = [
     "SemanticSearchTool",
     "SymbolInfoTool",
-    "CodeNavigationTool"
+    "CodeNavigationTool",
+    "RepoMapTool"
 ] 
\ No newline at end of file
@@ -0,0 +1,315 @@
+"""Repository map tool."""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..base import BaseTool, ToolParameter, ToolResult
+from ..result_cache import TREE, CacheDependency
+from ..watcher import ChangeSet, FileWatcher
+from .symbol_index import FileSymbols, SymbolIndex
+
+# Estimated characters per token of code outlines
+CHARS_PER_TOKEN = 4
+
+# Names defined in more files than this say little about which file is meant
+MAX_DEFINERS = 8
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def reference_graph(index: SymbolIndex) -> Dict[str, Dict[str, float]]:
+    """Weighted edges from each file to the files defining names it uses.
+
+    A name defined in several files splits its weight between them, and
+    names defined almost everywhere (``run``, ``main``) are skipped.
+    """
+    definitions = index.definitions()
+    graph: Dict[str, Dict[str, float]] = {}
+    for path, entry in index.files.items():
+        edges: Dict[str, float] = {}
+        for name in entry.references:
+            definers = definitions.get(name)
+            if not definers or len(definers) > MAX_DEFINERS:
+                continue
+            targets = [target for target in definers if target != path]
+            for target in targets:
+                edges[target] = edges.get(target, 0.0) + 1.0 / len(definers)
+        if edges:
+            graph[path] = edges
+    return graph
+
+
+def pagerank(
+    nodes: Iterable[str],
+    graph: Dict[str, Dict[str, float]],
+    personalization: Optional[Dict[str, float]] = None,
+    damping: float = 0.85,
+    iterations: int = 50,
+    tolerance: float = 1e-9
+) -> Dict[str, float]:
+    """PageRank of the nodes of a weighted directed graph.
+
+    Args:
+        nodes: All nodes, including those without edges
+        graph: Edge weights, ``graph[source][target]``
+        personalization: Relative weight of each node in random jumps
+            (defaults to uniform)
+        damping: Probability of following an edge rather than jumping
+        iterations: Maximum number of iterations
+        tolerance: Total change below which the ranks have converged
+
+    Returns:
+        Rank of each node; the ranks sum to 1
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return {}
+    if personalization:
+        total = sum(personalization.get(node, 0.0) for node in nodes)
+    if not personalization or total <= 0:
+        jump = {node: 1.0 / len(nodes) for node in nodes}
+    else:
+        jump = {node: personalization.get(node, 0.0) / total for node in nodes}
+    out_weight = {source: sum(edges.values()) for source, edges in graph.items()}
+    rank = dict(jump)
+    for _ in range(iterations):
+        # Rank of nodes without outgoing edges is spread like a random jump
+        dangling = sum(rank[node] for node in nodes if not out_weight.get(node))
+        updated = {node: (1 - damping + damping * dangling) * jump[node] for node in nodes}
+        for source, edges in graph.items():
+            share = damping * rank.get(source, 0.0) / out_weight[source]
+            for target, weight in edges.items():
+                if target in updated:
+                    updated[target] += share * weight
+        change = sum(abs(updated[node] - rank[node]) for node in nodes)
+        rank = updated
+        if change < tolerance:
+            break
+    return rank
+
+
+def render_file(entry: FileSymbols) -> str:
+    """Outline of one file: its path, then its symbols with signatures."""
+    lines = [f"{entry.path}:"] if entry.symbols else [entry.path]
+    for symbol in entry.symbols:
+        lines.append(f"  {symbol.signature}")
+        lines.extend(f"    {member}" for member in symbol.members)
+    return "\n".join(lines)
+
+
+def render_map(index: SymbolIndex, ranks: Dict[str, float], max_tokens: int) -> Tuple[str, int]:
+    """Outline of the highest ranked files that fits a token budget.
+
+    Files are outlined in rank order. Once a file's outline no longer fits,
+    the remaining files are listed by path only, as long as they fit.
+
+    Returns:
+        The map and the number of files it mentions
+    """
+    ordered = sorted(index.files.values(), key=lambda entry: (-ranks.get(entry.path, 0.0), entry.path))
+    parts: List[str] = []
+    used = 0
+    outlines = True
+    for entry in ordered:
+        block = render_file(entry) if outlines else entry.path
+        cost = estimate_tokens(block) + 1
+        if used + cost > max_tokens and outlines:
+            outlines = False
+            block = entry.path
+            cost = estimate_tokens(block) + 1
+        if used + cost > max_tokens:
+            break
+        parts.append(block)
+        used += cost
+    shown = len(parts)
+    if shown < len(ordered):
+        parts.append(f"... {len(ordered) - shown} more files")
+    return "\n".join(parts), shown
+
+
+class RepoMapTool(BaseTool):
+    """Tool for outlining a repository within a token budget.
+
+    Symbol indexes are kept across calls. By default each call walks the
+    tree to find changed files; once ``watch`` subscribes the tool to a
+    running file watcher covering the root, the tree is walked once and
+    later changes are applied from the watcher's change sets.
+    """
+
+    name = "repo_map"
+    description = (
+        "Outline the repository: its most important files with their top-level classes "
+        "and functions and their signatures, ranked by how much the rest of the code "
+        "refers to them, within a token budget. Use it first to get oriented instead of "
+        "listing directories and reading files one by one."
+    )
+    blocking = True
+    cacheable = True
+    parameters = [
+        ToolParameter(
+            name="directory_path",
+            type="string",
+            description="Root of the repository to map",
+            required=False,
+            default="."
+        ),
+        ToolParameter(
+            name="max_tokens",
+            type="integer",
+            description="Approximate token budget of the map",
+            required=False,
+            default=2000
+        ),
+        ToolParameter(
+            name="focus_files",
+            type="array",
+            description="Files of current interest, relative to the root; files they use rank higher",
+            required=False
+        )
+    ]
+
+    def __init__(self, max_cached_maps: int = 32):
+        """Initialize the tool.
+
+        Args:
+            max_cached_maps: Number of rendered maps kept for reuse
+        """
+        super().__init__()
+        self.max_cached_maps = max_cached_maps
+        self._indexes: Dict[str, SymbolIndex] = {}
+        self._maps: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._watchers: List[FileWatcher] = []
+        # Roots whose index is kept current by a watcher since a full refresh
+        self._synced: Set[str] = set()
+
+    def watch(self, watcher: FileWatcher) -> None:
+        """Update the indexes below a watcher's root from its change sets.
+
+        Args:
+            watcher: Watcher whose changes are applied while it runs
+        """
+        self._watchers.append(watcher)
+        watcher.subscribe(self._files_changed)
+
+    async def _files_changed(self, changes: ChangeSet) -> None:
+        """Re-parse the changed files of every index, off the event loop."""
+        with self._lock:
+            indexes = list(self._indexes.values())
+            if changes.overflow:
+                # Events were lost; the next call walks the tree again
+                self._synced.clear()
+        if not changes.overflow:
+            paths = changes.paths
+            await asyncio.to_thread(lambda: [index.update(paths) for index in indexes])
+
+    def _watched(self, root: str) -> bool:
+        """Whether a running watcher reports every change below a root."""
+        return any(
+            watcher.running and (root == watcher.root or root.startswith(watcher.root + os.sep))
+            for watcher in self._watchers
+        )
+
+    def _refresh(self, index: SymbolIndex) -> None:
+        """Bring an index up to date, walking the tree only when needed."""
+        if not self._watched(index.root):
+            with self._lock:
+                self._synced.discard(index.root)
+            index.refresh()
+            return
+        with self._lock:
+            if index.root in self._synced:
+                return
+            # Marked first, so an overflow during the walk forces another one
+            self._synced.add(index.root)
+        try:
+            index.refresh()
+        except BaseException:
+            with self._lock:
+                self._synced.discard(index.root)
+            raise
+
+    def cache_dependencies(self, directory_path: str = ".", **kwargs) -> List[CacheDependency]:
+        """The map depends on every file below the root."""
+        return [CacheDependency(directory_path, TREE)]
+
+    def index(self, directory_path: str = ".") -> SymbolIndex:
+        """The symbol index of a directory, kept across calls."""
+        root = os.path.abspath(directory_path)
+        with self._lock:
+            index = self._indexes.get(root)
+            if index is None:
+                index = self._indexes[root] = SymbolIndex(root)
+            return index
+
+    async def execute(
+        self,
+        directory_path: str = ".",
+        max_tokens: int = 2000,
+        focus_files: Optional[List[str]] = None
+    ) -> ToolResult:
+        """Execute the repository map operation.
+
+        Args:
+            directory_path: Root of the repository to map
+            max_tokens: Approximate token budget of the map
+            focus_files: Files to rank the map around
+
+        Returns:
+            ToolResult containing the map
+        """
+        try:
+            if not os.path.isdir(directory_path):
+                return ToolResult(
+                    success=False,
+                    error=f"Path is not a directory: {directory_path}"
+                )
+            if max_tokens < 1:
+                return ToolResult(
+                    success=False,
+                    error="max_tokens must be >= 1"
+                )
+
+            index = self.index(directory_path)
+            # Only files changed since the last call are parsed again
+            self._refresh(index)
+            focus = tuple(sorted(os.path.normpath(path) for path in focus_files or ()))
+            key = (index.root, index.version, max_tokens, focus)
+            with self._lock:
+                cached = self._maps.get(key)
+                if cached is not None:
+                    self._maps.move_to_end(key)
+                    return ToolResult(success=True, data=cached)
+
+            personalization = None
+            if focus:
+                # Random jumps land on the focus files and the files they use
+                personalization = {path: 1.0 for path in index.files}
+                for path in focus:
+                    if path in personalization:
+                        personalization[path] = 100.0
+            ranks = pagerank(index.files, reference_graph(index), personalization)
+            text, shown = render_map(index, ranks, max_tokens)
+            data = {
+                "map": text,
+                "files": len(index.files),
+                "files_shown": shown,
+                "estimated_tokens": estimate_tokens(text)
+            }
+            with self._lock:
+                self._maps[key] = data
+                while len(self._maps) > self.max_cached_maps:
+                    self._maps.popitem(last=False)
+            return ToolResult(success=True, data=data)
+
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                error=f"Error building repository map: {str(e)}"
+            )
@@ -0,0 +1,266 @@
+"""Index of the top-level symbols defined and referenced by each source file."""
+
+import ast
+import os
+import re
+import threading
+from stat import S_ISREG
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+from ..watcher import DEFAULT_IGNORED
+
+# Directories that hold dependencies or build output rather than the project's code
+IGNORED_DIRS = DEFAULT_IGNORED | {".venv", "venv", ".tox", "build", "dist", ".eggs", "site-packages"}
+
+# Files larger than this are listed without their symbols
+MAX_FILE_BYTES = 512 * 1024
+
+_IDENTIFIER = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+# Declarations of languages without a parser here: (pattern, kind)
+_DECLARATIONS: Dict[str, List[Tuple["re.Pattern[str]", str]]] = {
+    "javascript": [
+        (re.compile(r"^(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+(\w+)[^{]*"), "class"),
+        (re.compile(r"^(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(\w+)\s*(?:<[^>]*>)?\([^)]*\)[^{]*"), "function"),
+        (re.compile(r"^(?:export\s+)?(?:const|let)\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*(?::[^=]+)?=>"), "function"),
+        (re.compile(r"^(?:export\s+)?(?:interface|type|enum)\s+(\w+)[^{=]*"), "type")
+    ],
+    "go": [
+        (re.compile(r"^func\s+(?:\([^)]*\)\s*)?(\w+)\s*\([^{]*"), "function"),
+        (re.compile(r"^type\s+(\w+)\s+\w+"), "type")
+    ],
+    "rust": [
+        (re.compile(r"^(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?fn\s+(\w+)[^{;]*"), "function"),
+        (re.compile(r"^(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait)\s+(\w+)[^{;]*"), "type")
+    ]
+}
+
+LANGUAGES = {
+    ".py": "python",
+    ".pyi": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".ts": "javascript",
+    ".tsx": "javascript",
+    ".go": "go",
+    ".rs": "rust"
+}
+
+
+@dataclass
+class Symbol:
+    """A top-level class, function or type, and the members shown under it."""
+    name: str
+    kind: str
+    line: int
+    signature: str
+    members: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileSymbols:
+    """Symbols of one file, and the stat values they were parsed from."""
+    path: str
+    mtime_ns: int
+    size: int
+    symbols: List[Symbol] = field(default_factory=list)
+    references: FrozenSet[str] = frozenset()
+
+    @property
+    def defined(self) -> Set[str]:
+        """Names defined at the top level of the file."""
+        return {symbol.name for symbol in self.symbols}
+
+
+def _python_signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def parse_python(source: str) -> Tuple[List[Symbol], Set[str]]:
+    """Top-level symbols of a Python module and the names it uses.
+
+    Raises:
+        SyntaxError: If the source does not parse
+    """
+    tree = ast.parse(source)
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(Symbol(node.name, "function", node.lineno, _python_signature(node)))
+        elif isinstance(node, ast.ClassDef):
+            bases = ", ".join(ast.unparse(base) for base in node.bases)
+            symbol = Symbol(node.name, "class", node.lineno, f"class {node.name}({bases})" if bases else f"class {node.name}")
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+                    not member.name.startswith("_") or member.name == "__init__"
+                ):
+                    symbol.members.append(_python_signature(member))
+            symbols.append(symbol)
+    references = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            references.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            references.add(node.attr)
+        elif isinstance(node, ast.alias):
+            references.add(node.name.rsplit(".", 1)[-1])
+    return symbols, references
+
+
+def parse_declarations(source: str, language: str) -> Tuple[List[Symbol], Set[str]]:
+    """Top-level declarations found by pattern, and the identifiers used."""
+    symbols = []
+    for number, line in enumerate(source.splitlines(), 1):
+        if not line or line[0].isspace():
+            continue
+        for pattern, kind in _DECLARATIONS[language]:
+            match = pattern.match(line)
+            if match:
+                symbols.append(Symbol(match.group(1), kind, number, match.group(0).strip().rstrip("{").strip()))
+                break
+    return symbols, set(_IDENTIFIER.findall(source))
+
+
+def parse_file(path: str, language: str) -> Tuple[List[Symbol], Set[str]]:
+    """Symbols and references of a source file, empty if it cannot be parsed."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        if language == "python":
+            return parse_python(source)
+        return parse_declarations(source, language)
+    except (OSError, UnicodeDecodeError, SyntaxError, ValueError, RecursionError):
+        return [], set()
+
+
+class SymbolIndex:
+    """Symbols of the source files below a directory, kept up to date cheaply.
+
+    ``refresh`` stats every file but only parses files whose modification
+    time or size changed since the last refresh, so keeping the index
+    current costs one directory walk plus work proportional to the changed
+    files. When a file watcher reports the changed paths, ``update`` avoids
+    the walk as well. ``version`` changes whenever the indexed content does,
+    which lets anything derived from the index (such as the repository map)
+    be cached until then.
+    """
+
+    def __init__(self, root: Union[str, Path] = ".", ignored: Iterable[str] = IGNORED_DIRS):
+        """Initialize the index. Nothing is read until ``refresh``.
+
+        Args:
+            root: Directory to index
+            ignored: Names of directories that are not indexed
+        """
+        self.root = os.path.abspath(root)
+        self.ignored = frozenset(ignored)
+        self.files: Dict[str, FileSymbols] = {}
+        self.version = 0
+        self.parsed = 0
+        self._lock = threading.Lock()
+
+    def _walk(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name in self.ignored:
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                stat = entry.stat()
+                                found[os.path.relpath(entry.path, self.root)] = (stat.st_mtime_ns, stat.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return found
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the files on disk.
+
+        Returns:
+            True if anything changed
+        """
+        with self._lock:
+            found = self._walk()
+            changed = False
+            for path in self.files.keys() - found.keys():
+                del self.files[path]
+                changed = True
+            for path, (mtime_ns, size) in found.items():
+                changed = self._index_file(path, mtime_ns, size) or changed
+            if changed:
+                self.version += 1
+            return changed
+
+    def update(self, paths: Iterable[str]) -> bool:
+        """Bring the given paths up to date, without walking the tree.
+
+        Paths that no longer exist are dropped along with everything indexed
+        below them; directories are skipped, as a watcher reports the files
+        in them separately.
+
+        Args:
+            paths: Absolute paths, or paths relative to the root; paths
+                outside the root or in ignored directories are skipped
+
+        Returns:
+            True if anything changed
+        """
+        with self._lock:
+            changed = False
+            for path in paths:
+                relative = os.path.relpath(os.path.join(self.root, path), self.root)
+                if relative == "." or relative.startswith(os.pardir):
+                    continue
+                if self.ignored.intersection(relative.split(os.sep)):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.root, relative))
+                except OSError:
+                    prefix = relative + os.sep
+                    for gone in [p for p in self.files if p == relative or p.startswith(prefix)]:
+                        del self.files[gone]
+                        changed = True
+                    continue
+                if S_ISREG(stat.st_mode):
+                    changed = self._index_file(relative, stat.st_mtime_ns, stat.st_size) or changed
+            if changed:
+                self.version += 1
+            return changed
+
+    def _index_file(self, path: str, mtime_ns: int, size: int) -> bool:
+        """Parse a file again if its stat values changed, returning whether they did."""
+        entry = self.files.get(path)
+        if entry is not None and entry.mtime_ns == mtime_ns and entry.size == size:
+            return False
+        symbols, references = [], set()
+        language = LANGUAGES.get(os.path.splitext(path)[1])
+        if language is not None and size <= MAX_FILE_BYTES:
+            symbols, references = parse_file(os.path.join(self.root, path), language)
+            self.parsed += 1
+        self.files[path] = FileSymbols(path, mtime_ns, size, symbols, frozenset(references))
+        return True
+
+    def definitions(self) -> Dict[str, List[str]]:
+        """Files defining each top-level name."""
+        defined: Dict[str, List[str]] = {}
+        for path, entry in self.files.items():
+            for name in entry.defined:
+                defined.setdefault(name, []).append(path)
+        return defined
+
+    def get(self, path: str) -> Optional[FileSymbols]:
+        """Symbols of a file, by path relative to the root."""
+        return self.files.get(os.path.normpath(path))
@@ -1,15 +1,21 @@
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import ContextManager, List, Optional, Set
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
+from .memory_storage import InMemoryStorage, MemoryStorage
+
 
 class Memory(BaseModel):
-    """Represents a memory item in the system."""
+    """Represents a memory item in the system.
+
+    ``content`` is None when a storage backend returned the memory without
+    loading its body.
+    """
     id: UUID = Field(default_factory=uuid4)
     title: str
-    content: str
+    content: Optional[str]
     corpus_names: Set[str] = Field(default_factory=set)
     tags: Set[str] = Field(default_factory=set)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -19,10 +25,22 @@ class Memory(BaseModel):
 
 class MemoryManager:
     """Manages the storage and retrieval of memories."""
-    
-    def __init__(self):
-        self._memories: Dict[UUID, Memory] = {}
-    
+
+    def __init__(
+        self,
+        storage: Optional[MemoryStorage] = None,
+        half_life: Optional[float] = 30 * 24 * 3600.0
+    ):
+        """Initialize the memory manager.
+
+        Args:
+            storage: Storage backend (defaults to an in-memory store)
+            half_life: Seconds after which the recency boost of a memory
+                halves in search ranking, or None to rank by relevance only.
+                Only used for the default in-memory store.
+        """
+        self.storage = storage if storage is not None else InMemoryStorage(half_life=half_life)
+
     def create_memory(
         self,
         title: str,
@@ -39,9 +57,9 @@ class MemoryManager:
             tags=tags or set(),
             user_triggered=user_triggered
         )
-        self._memories[memory.id] = memory
+        self.storage.put(memory)
         return memory
-    
+
     def update_memory(
         self,
         memory_id: UUID,
@@ -51,10 +69,10 @@ class MemoryManager:
         tags: Optional[Set[str]] = None
     ) -> Optional[Memory]:
         """Update an existing memory."""
-        if memory_id not in self._memories:
+        memory = self.storage.get(memory_id)
+        if memory is None:
             return None
-        
-        memory = self._memories[memory_id]
+
         if title is not None:
             memory.title = title
         if content is not None:
@@ -63,48 +81,51 @@ class MemoryManager:
             memory.corpus_names = corpus_names
         if tags is not None:
             memory.tags = tags
-        
+
         memory.updated_at = datetime.utcnow()
+        self.storage.put(memory)
         return memory
-    
+
     def delete_memory(self, memory_id: UUID) -> bool:
         """Delete a memory."""
-        if memory_id not in self._memories:
-            return False
-        
-        del self._memories[memory_id]
-        return True
-    
+        return self.storage.delete(memory_id)
+
     def get_memory(self, memory_id: UUID) -> Optional[Memory]:
         """Get a memory by ID."""
-        return self._memories.get(memory_id)
-    
+        return self.storage.get(memory_id)
+
     def search_memories(
         self,
         query: Optional[str] = None,
         corpus_names: Optional[Set[str]] = None,
-        tags: Optional[Set[str]] = None
+        tags: Optional[Set[str]] = None,
+        limit: Optional[int] = None,
+        include_content: bool = True
     ) -> List[Memory]:
-        """Search memories by various criteria."""
-        results = list(self._memories.values())
-        
-        if query:
-            query = query.lower()
-            results = [
-                m for m in results
-                if query in m.title.lower() or query in m.content.lower()
-            ]
-        
-        if corpus_names:
-            results = [
-                m for m in results
-                if corpus_names.issubset(m.corpus_names)
-            ]
-        
-        if tags:
-            results = [
-                m for m in results
-                if tags.issubset(m.tags)
-            ]
-        
-        return results 
\ No newline at end of file
+        """Search memories by various criteria.
+
+        Memories matching any query word are ranked by BM25 relevance with
+        a recency decay; without a query, matching memories are returned
+        most recently updated first.
+
+        Args:
+            query: Free-text query matched against titles and contents
+            corpus_names: Corpus names every result must belong to
+            tags: Tags every result must have
+            limit: Maximum number of results
+            include_content: Whether to load content bodies of the results
+
+        Returns:
+            List of matching memories, best match first
+        """
+        return self.storage.search(
+            query=query,
+            corpus_names=corpus_names,
+            tags=tags,
+            limit=limit,
+            include_content=include_content
+        )
+
+    def batch(self) -> ContextManager[None]:
+        """Group several writes so the storage backend commits them together."""
+        return self.storage.batch()
@@ -0,0 +1,217 @@
+"""Inverted index with BM25 ranking for memories."""
+
+import math
+import re
+import time
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class MemoryIndex:
+    """Inverted token index plus tag and corpus postings.
+
+    Documents are identified by any hashable key. Full-text postings map a
+    token to the term frequency per document, while tag and corpus postings
+    are plain sets of document keys. Search cost therefore scales with the
+    size of the postings that match the query and filters, not with the
+    number of indexed documents.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        title_weight: int = 2,
+        half_life: Optional[float] = 30 * 24 * 3600.0
+    ):
+        """Initialize the index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            title_weight: How many times title tokens are counted
+            half_life: Seconds after which the recency factor halves,
+                or None to disable recency decay
+        """
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.half_life = half_life
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._doc_terms: Dict[Hashable, Counter] = {}
+        self._doc_lengths: Dict[Hashable, int] = {}
+        self._timestamps: Dict[Hashable, float] = {}
+        self._total_length = 0
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._corpora: Dict[str, Set[Hashable]] = {}
+        self._doc_tags: Dict[Hashable, Set[str]] = {}
+        self._doc_corpora: Dict[Hashable, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_lengths
+
+    def add(
+        self,
+        key: Hashable,
+        title: str,
+        content: str,
+        tags: Iterable[str] = (),
+        corpus_names: Iterable[str] = (),
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Index a document, replacing any previous version with the same key."""
+        if key in self._doc_lengths:
+            self.remove(key)
+
+        terms = Counter(tokenize(content))
+        for token in tokenize(title):
+            terms[token] += self.title_weight
+
+        for token, tf in terms.items():
+            self._postings.setdefault(token, {})[key] = tf
+        length = sum(terms.values())
+        self._doc_terms[key] = terms
+        self._doc_lengths[key] = length
+        self._total_length += length
+        self._timestamps[key] = timestamp if timestamp is not None else time.time()
+
+        self._doc_tags[key] = set(tags)
+        for tag in self._doc_tags[key]:
+            self._tags.setdefault(tag, set()).add(key)
+        self._doc_corpora[key] = set(corpus_names)
+        for corpus in self._doc_corpora[key]:
+            self._corpora.setdefault(corpus, set()).add(key)
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a document from the index.
+
+        Returns:
+            True if the document was indexed
+        """
+        terms = self._doc_terms.pop(key, None)
+        if terms is None:
+            return False
+
+        for token in terms:
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._doc_lengths.pop(key)
+        del self._timestamps[key]
+
+        _discard_postings(self._tags, self._doc_tags.pop(key), key)
+        _discard_postings(self._corpora, self._doc_corpora.pop(key), key)
+        return True
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        corpus_names: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+        now: Optional[float] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """Search the index.
+
+        Documents must carry all given tags and corpus names. When a query
+        is given, documents matching any query token are ranked by BM25
+        multiplied by the recency factor; otherwise the filtered documents
+        are ranked by recency alone.
+
+        Args:
+            query: Free-text query
+            tags: Tags every result must have
+            corpus_names: Corpus names every result must belong to
+            limit: Maximum number of results
+            now: Reference time for recency decay (defaults to now)
+
+        Returns:
+            List of (key, score) tuples sorted by descending score
+        """
+        allowed = self._filter(tags, corpus_names)
+        if allowed is not None and not allowed:
+            return []
+
+        now = now if now is not None else time.time()
+        tokens = list(dict.fromkeys(tokenize(query))) if query else []
+
+        if tokens:
+            scores = self._bm25(tokens, allowed)
+        elif query:
+            # The query has no indexable tokens, so nothing can match
+            return []
+        else:
+            candidates = allowed if allowed is not None else self._doc_lengths.keys()
+            scores = {key: 1.0 for key in candidates}
+
+        ranked = [
+            (key, score * self._recency(key, now))
+            for key, score in scores.items()
+        ]
+        ranked.sort(key=lambda item: (-item[1], -self._timestamps[item[0]]))
+        return ranked[:limit] if limit is not None else ranked
+
+    def _filter(
+        self,
+        tags: Optional[Iterable[str]],
+        corpus_names: Optional[Iterable[str]]
+    ) -> Optional[Set[Hashable]]:
+        postings = [self._tags.get(tag, set()) for tag in tags or ()]
+        postings += [self._corpora.get(corpus, set()) for corpus in corpus_names or ()]
+        if not postings:
+            return None
+        postings.sort(key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _bm25(
+        self,
+        tokens: List[str],
+        allowed: Optional[Set[Hashable]]
+    ) -> Dict[Hashable, float]:
+        doc_count = len(self._doc_lengths)
+        avg_length = self._total_length / doc_count if doc_count else 0.0
+        scores: Dict[Hashable, float] = {}
+        for token in tokens:
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            if allowed is not None and len(allowed) < len(postings):
+                matches = ((key, postings[key]) for key in allowed if key in postings)
+            else:
+                matches = postings.items()
+            for key, tf in matches:
+                if allowed is not None and key not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def _recency(self, key: Hashable, now: float) -> float:
+        if not self.half_life:
+            return 1.0
+        age = max(0.0, now - self._timestamps[key])
+        return 0.5 ** (age / self.half_life)
+
+
+def _discard_postings(
+    postings: Dict[str, Set[Hashable]],
+    values: Set[str],
+    key: Hashable
+) -> None:
+    for value in values:
+        keys = postings[value]
+        keys.discard(key)
+        if not keys:
+            del postings[value]
@@ -0,0 +1,460 @@
+"""Storage backends for the memory manager."""
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterable, Iterator, List, Optional, Set, Union
+from uuid import UUID
+
+from .memory_index import MemoryIndex, tokenize
+
+if TYPE_CHECKING:
+    from .memory import Memory
+
+EVICTION_POLICIES = ("lru", "age")
+
+
+def _to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+class MemoryStorage(ABC):
+    """Base class for memory storage backends.
+
+    Backends persist memories, answer searches and enforce an optional
+    capacity limit. When more than ``max_memories`` are stored, the least
+    recently used ("lru") or the oldest ("age") memories are evicted.
+    """
+
+    def __init__(self, max_memories: Optional[int] = None, eviction_policy: str = "lru"):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(
+                f"Invalid eviction_policy: {eviction_policy}. Must be one of: {', '.join(EVICTION_POLICIES)}"
+            )
+        if max_memories is not None and max_memories < 1:
+            raise ValueError("max_memories must be >= 1")
+        self.max_memories = max_memories
+        self.eviction_policy = eviction_policy
+
+    @abstractmethod
+    def put(self, memory: "Memory") -> None:
+        """Insert or replace a memory."""
+        pass
+
+    def put_many(self, memories: Iterable["Memory"]) -> None:
+        """Insert or replace several memories in one batch."""
+        with self.batch():
+            for memory in memories:
+                self.put(memory)
+
+    @abstractmethod
+    def get(self, memory_id: UUID) -> Optional["Memory"]:
+        """Get a memory by ID, marking it as recently used."""
+        pass
+
+    @abstractmethod
+    def delete(self, memory_id: UUID) -> bool:
+        """Delete a memory.
+
+        Returns:
+            True if the memory existed
+        """
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query: Optional[str] = None,
+        corpus_names: Optional[Set[str]] = None,
+        tags: Optional[Set[str]] = None,
+        limit: Optional[int] = None,
+        include_content: bool = True
+    ) -> List["Memory"]:
+        """Search memories, best match first.
+
+        Args:
+            query: Free-text query matched against titles and contents
+            corpus_names: Corpus names every result must belong to
+            tags: Tags every result must have
+            limit: Maximum number of results
+            include_content: Whether to load content bodies; when False,
+                ``content`` is None on the returned memories
+
+        Returns:
+            List of matching memories
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def batch(self) -> ContextManager[None]:
+        """Group several writes so they are committed together."""
+        return nullcontext()
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+        pass
+
+
+class InMemoryStorage(MemoryStorage):
+    """Keeps memories in a dict with an in-process search index."""
+
+    def __init__(
+        self,
+        max_memories: Optional[int] = None,
+        eviction_policy: str = "lru",
+        half_life: Optional[float] = 30 * 24 * 3600.0
+    ):
+        """Initialize the storage.
+
+        Args:
+            max_memories: Maximum number of memories kept before eviction
+            eviction_policy: "lru" or "age"
+            half_life: Seconds after which the recency boost halves in
+                search ranking, or None to rank by relevance only
+        """
+        super().__init__(max_memories, eviction_policy)
+        self._memories: "OrderedDict[UUID, Memory]" = OrderedDict()
+        self._index = MemoryIndex(half_life=half_life)
+
+    def put(self, memory: "Memory") -> None:
+        if self.eviction_policy == "lru" or memory.id not in self._memories:
+            self._memories.pop(memory.id, None)
+        self._memories[memory.id] = memory
+        self._index.add(
+            memory.id,
+            title=memory.title,
+            content=memory.content or "",
+            tags=memory.tags,
+            corpus_names=memory.corpus_names,
+            timestamp=_to_timestamp(memory.updated_at)
+        )
+        self._evict()
+
+    def get(self, memory_id: UUID) -> Optional["Memory"]:
+        memory = self._memories.get(memory_id)
+        if memory is not None and self.eviction_policy == "lru":
+            self._memories.move_to_end(memory_id)
+        return memory
+
+    def delete(self, memory_id: UUID) -> bool:
+        if self._memories.pop(memory_id, None) is None:
+            return False
+        self._index.remove(memory_id)
+        return True
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        corpus_names: Optional[Set[str]] = None,
+        tags: Optional[Set[str]] = None,
+        limit: Optional[int] = None,
+        include_content: bool = True
+    ) -> List["Memory"]:
+        ranked = self._index.search(
+            query=query,
+            tags=tags,
+            corpus_names=corpus_names,
+            limit=limit
+        )
+        results = [self.get(memory_id) for memory_id, _ in ranked]
+        if not include_content:
+            results = [m.model_copy(update={"content": None}) for m in results]
+        return results
+
+    def __len__(self) -> int:
+        return len(self._memories)
+
+    def _evict(self) -> None:
+        if self.max_memories is None:
+            return
+        while len(self._memories) > self.max_memories:
+            memory_id, _ = self._memories.popitem(last=False)
+            self._index.remove(memory_id)
+
+
+class SQLiteMemoryStorage(MemoryStorage):
+    """Durable storage in an SQLite database.
+
+    The database runs in WAL mode so readers do not block the writer, and
+    titles and contents are indexed with FTS5 for BM25 ranked search.
+    Memories are only materialized when they are returned, and content
+    bodies are only read when requested, so the store can grow far beyond
+    what fits in RAM.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memories (
+            rowid INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            user_triggered INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS memories_created_at ON memories(created_at);
+        CREATE INDEX IF NOT EXISTS memories_accessed_at ON memories(accessed_at);
+        CREATE TABLE IF NOT EXISTS memory_tags (
+            memory_rowid INTEGER NOT NULL REFERENCES memories(rowid) ON DELETE CASCADE,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (tag, memory_rowid)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS memory_corpora (
+            memory_rowid INTEGER NOT NULL REFERENCES memories(rowid) ON DELETE CASCADE,
+            corpus TEXT NOT NULL,
+            PRIMARY KEY (corpus, memory_rowid)
+        ) WITHOUT ROWID;
+        CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+            title, content, content='memories', content_rowid='rowid'
+        );
+        CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+            INSERT INTO memory_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+            INSERT INTO memory_fts(memory_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF title, content ON memories BEGIN
+            INSERT INTO memory_fts(memory_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+            INSERT INTO memory_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END;
+    """
+
+    _COLUMNS = "m.rowid, m.id, m.title, m.user_triggered, m.created_at, m.updated_at"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_memories: Optional[int] = None,
+        eviction_policy: str = "lru",
+        half_life: Optional[float] = 30 * 24 * 3600.0,
+        title_weight: float = 2.0
+    ):
+        """Open (or create) the database.
+
+        Args:
+            path: Database file path, or ":memory:"
+            max_memories: Maximum number of memories kept before eviction
+            eviction_policy: "lru" or "age"
+            half_life: Seconds after which the recency boost halves in
+                search ranking, or None to rank by relevance only
+            title_weight: BM25 weight of title matches relative to content
+        """
+        super().__init__(max_memories, eviction_policy)
+        self.path = str(path)
+        self.half_life = half_life
+        self.title_weight = title_weight
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.create_function("recency", 1, self._recency, deterministic=False)
+        self._conn.executescript(self._SCHEMA)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several writes into a single transaction."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._evict()
+                    self._conn.execute("COMMIT")
+
+    def put(self, memory: "Memory") -> None:
+        with self.batch():
+            now = time.time()
+            row = self._conn.execute(
+                "SELECT rowid FROM memories WHERE id = ?", (str(memory.id),)
+            ).fetchone()
+            values = (
+                memory.title,
+                memory.content or "",
+                int(memory.user_triggered),
+                _to_timestamp(memory.created_at),
+                _to_timestamp(memory.updated_at),
+                now
+            )
+            if row is None:
+                rowid = self._conn.execute(
+                    "INSERT INTO memories (id, title, content, user_triggered, created_at, updated_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (str(memory.id),) + values
+                ).lastrowid
+            else:
+                rowid = row[0]
+                self._conn.execute(
+                    "UPDATE memories SET title = ?, content = ?, user_triggered = ?, "
+                    "created_at = ?, updated_at = ?, accessed_at = ? WHERE rowid = ?",
+                    values + (rowid,)
+                )
+                self._conn.execute("DELETE FROM memory_tags WHERE memory_rowid = ?", (rowid,))
+                self._conn.execute("DELETE FROM memory_corpora WHERE memory_rowid = ?", (rowid,))
+            self._conn.executemany(
+                "INSERT INTO memory_tags (memory_rowid, tag) VALUES (?, ?)",
+                [(rowid, tag) for tag in memory.tags]
+            )
+            self._conn.executemany(
+                "INSERT INTO memory_corpora (memory_rowid, corpus) VALUES (?, ?)",
+                [(rowid, corpus) for corpus in memory.corpus_names]
+            )
+
+    def get(self, memory_id: UUID) -> Optional["Memory"]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM memories m WHERE m.id = ?", (str(memory_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._load([row], include_content=True)[0]
+
+    def delete(self, memory_id: UUID) -> bool:
+        with self.batch():
+            cursor = self._conn.execute("DELETE FROM memories WHERE id = ?", (str(memory_id),))
+            return cursor.rowcount > 0
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        corpus_names: Optional[Set[str]] = None,
+        tags: Optional[Set[str]] = None,
+        limit: Optional[int] = None,
+        include_content: bool = True
+    ) -> List["Memory"]:
+        conditions: List[str] = []
+        params: List = []
+        for table, column, values in (
+            ("memory_tags", "tag", tags),
+            ("memory_corpora", "corpus", corpus_names)
+        ):
+            if values:
+                placeholders = ", ".join("?" for _ in values)
+                conditions.append(
+                    f"m.rowid IN (SELECT memory_rowid FROM {table} WHERE {column} IN ({placeholders}) "
+                    f"GROUP BY memory_rowid HAVING COUNT(*) = ?)"
+                )
+                params.extend(values)
+                params.append(len(values))
+
+        if query:
+            tokens = list(dict.fromkeys(tokenize(query)))
+            if not tokens:
+                return []
+            match = " OR ".join(f'"{token}"' for token in tokens)
+            sql = (
+                f"SELECT {self._COLUMNS} FROM memory_fts f JOIN memories m ON m.rowid = f.rowid "
+                f"WHERE memory_fts MATCH ?"
+            )
+            params.insert(0, match)
+            order = f"bm25(memory_fts, {float(self.title_weight)}, 1.0) * recency(m.updated_at)"
+        else:
+            sql = f"SELECT {self._COLUMNS} FROM memories m WHERE 1"
+            order = "m.updated_at DESC"
+
+        for condition in conditions:
+            sql += f" AND {condition}"
+        sql += f" ORDER BY {order}, m.updated_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            return self._load(rows, include_content=include_content)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, rows: List[tuple], include_content: bool) -> List["Memory"]:
+        """Materialize memories for the given rows and mark them as used."""
+        from .memory import Memory
+
+        if not rows:
+            return []
+        rowids = [row[0] for row in rows]
+        placeholders = ", ".join("?" for _ in rowids)
+        tags: Dict[int, Set[str]] = {rowid: set() for rowid in rowids}
+        corpora: Dict[int, Set[str]] = {rowid: set() for rowid in rowids}
+        for rowid, tag in self._conn.execute(
+            f"SELECT memory_rowid, tag FROM memory_tags WHERE memory_rowid IN ({placeholders})", rowids
+        ):
+            tags[rowid].add(tag)
+        for rowid, corpus in self._conn.execute(
+            f"SELECT memory_rowid, corpus FROM memory_corpora WHERE memory_rowid IN ({placeholders})", rowids
+        ):
+            corpora[rowid].add(corpus)
+        contents: Dict[int, str] = {}
+        if include_content:
+            contents = dict(self._conn.execute(
+                f"SELECT rowid, content FROM memories WHERE rowid IN ({placeholders})", rowids
+            ))
+        self._conn.execute(
+            f"UPDATE memories SET accessed_at = ? WHERE rowid IN ({placeholders})",
+            [time.time()] + rowids
+        )
+
+        return [
+            Memory.model_construct(
+                id=UUID(memory_id),
+                title=title,
+                content=contents.get(rowid),
+                corpus_names=corpora[rowid],
+                tags=tags[rowid],
+                created_at=_from_timestamp(created_at),
+                updated_at=_from_timestamp(updated_at),
+                user_triggered=bool(user_triggered)
+            )
+            for rowid, memory_id, title, user_triggered, created_at, updated_at in rows
+        ]
+
+    def _evict(self) -> None:
+        if self.max_memories is None:
+            return
+        excess = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0] - self.max_memories
+        if excess <= 0:
+            return
+        column = "accessed_at" if self.eviction_policy == "lru" else "created_at"
+        self._conn.execute(
+            f"DELETE FROM memories WHERE rowid IN "
+            f"(SELECT rowid FROM memories ORDER BY {column}, rowid LIMIT ?)",
+            (excess,)
+        )
+
+    def _recency(self, updated_at: float) -> float:
+        if not self.half_life:
+            return 1.0
+        age = max(0.0, time.time() - updated_at)
+        return 0.5 ** (age / self.half_life)
@@ -0,0 +1,340 @@
+"""Counters, gauges and histograms in the Prometheus text format."""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .base import ToolResult
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(float(256 * 4 ** i) for i in range(9))  # 256 B .. 16 MiB
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {list(self.label_names)}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """Yield ``(name, label names, label values, value)`` for each sample."""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape(self.description)}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        for name, label_names, label_values, value in self.samples():
+            lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Value that only goes up, such as a number of calls."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, self.label_names, key, value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, such as the number of open sessions."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, self.label_names, key, value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: bucket counts (the last one is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            counts, _ = self._values.get(self._key(labels)) or ([0], 0.0)
+            return sum(counts)
+
+    def sum(self, **labels) -> float:
+        with self._lock:
+            _, total = self._values.get(self._key(labels)) or ([0], 0.0)
+            return total
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        bucket_labels = self.label_names + ("le",)
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", bucket_labels, key + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", self.label_names, key, total
+            yield f"{self.name}_count", self.label_names, key, cumulative
+
+
+class MetricsRegistry:
+    """Named collection of metrics that renders them for scraping.
+
+    Example:
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls made", ["tool"])
+        calls.inc(tool="list_dir")
+        text = registry.render()
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str, labels: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, description, labels)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a metric by name."""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, cls, name: str, description: str, labels: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+
+def result_size(result: ToolResult) -> int:
+    """Approximate size in bytes of a tool result's data as JSON.
+
+    The data is walked rather than serialized, so measuring a multi-megabyte
+    result on the event loop costs a pass over its containers, not a copy of
+    its strings. Strings count one byte per character.
+    """
+    if result.data is None:
+        return 0
+    if isinstance(result.data, (str, bytes)):
+        return len(result.data)
+    size = 0
+    stack = [result.data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (str, bytes)):
+            size += len(value) + 2
+        elif isinstance(value, dict):
+            # Braces, plus a quoted key, colon and comma per item
+            size += 2 + sum(len(str(key)) + 4 for key in value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            size += 2 + len(value)
+            stack.extend(value)
+        elif value is None or isinstance(value, bool):
+            size += 5
+        else:
+            size += len(str(value))
+    return size
+
+
+class ToolMetrics:
+    """Metrics recorded for every tool call.
+
+    - ``ai_coding_agent_tool_calls_total{tool, outcome}`` counts calls by
+      outcome: ``success``, ``failure`` (the tool returned an error),
+      ``error`` (the tool raised), ``timeout`` or ``cancelled``,
+    - ``ai_coding_agent_tool_latency_seconds{tool}`` is the call latency,
+      including time spent waiting for a concurrency slot,
+    - ``ai_coding_agent_tool_in_flight{tool}`` is the number of running calls,
+    - ``ai_coding_agent_tool_result_bytes{tool}`` is the approximate JSON
+      size of results,
+    - ``ai_coding_agent_tool_cache_hits_total{tool}`` counts calls answered
+      from the result cache.
+    """
+
+    OUTCOMES = ("success", "failure", "error", "timeout", "cancelled")
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """Initialize the tool metrics.
+
+        Args:
+            registry: Registry to record into (defaults to the process-wide one)
+        """
+        self.registry = registry if registry is not None else get_metrics_registry()
+        self.calls = self.registry.counter(
+            "ai_coding_agent_tool_calls_total", "Tool calls by outcome", ["tool", "outcome"]
+        )
+        self.latency = self.registry.histogram(
+            "ai_coding_agent_tool_latency_seconds", "Tool call latency in seconds", ["tool"]
+        )
+        self.in_flight = self.registry.gauge(
+            "ai_coding_agent_tool_in_flight", "Tool calls currently running", ["tool"]
+        )
+        self.result_bytes = self.registry.histogram(
+            "ai_coding_agent_tool_result_bytes", "Size of tool results in bytes", ["tool"],
+            buckets=SIZE_BUCKETS
+        )
+        self.cache_hits = self.registry.counter(
+            "ai_coding_agent_tool_cache_hits_total", "Tool calls answered from the result cache", ["tool"]
+        )
+
+    def started(self, tool_name: str) -> None:
+        """Record that a call started."""
+        self.in_flight.inc(tool=tool_name)
+
+    def cache_hit(self, tool_name: str) -> None:
+        """Record that a call was answered from the result cache."""
+        self.cache_hits.inc(tool=tool_name)
+
+    def finished(
+        self,
+        tool_name: str,
+        outcome: str,
+        elapsed: float,
+        result: Optional[ToolResult] = None
+    ) -> None:
+        """Record that a call finished.
+
+        Args:
+            tool_name: Tool name
+            outcome: One of ``OUTCOMES``
+            elapsed: Call latency in seconds
+            result: Result of the call, if it produced one
+        """
+        self.in_flight.dec(tool=tool_name)
+        self.calls.inc(tool=tool_name, outcome=outcome)
+        self.latency.observe(elapsed, tool=tool_name)
+        if result is not None and result.success:
+            self.result_bytes.observe(result_size(result), tool=tool_name)
+
+
+_default_registry: Optional[MetricsRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+        return _default_registry
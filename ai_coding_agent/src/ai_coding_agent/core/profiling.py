@@ -0,0 +1,298 @@
+"""Opt-in profiling of individual tool calls."""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TypeVar, Union
+
+from .web.http_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_MODES = ("cprofile", "sampling")
+DEFAULT_PROFILE_DIR = Path(os.environ.get("AI_CODING_AGENT_PROFILE_DIR", DEFAULT_CACHE_DIR / "profiles"))
+
+
+class _StackSampler:
+    """Samples one thread's call stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tool-profile-sampler", daemon=True)
+
+    def __enter__(self) -> "_StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Stacks in the folded format read by flamegraph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ToolProfiler:
+    """Profiles selected tool calls and keeps the most recent reports.
+
+    Every call of a tool that sets ``profile = True`` is profiled. Tools can
+    also be enabled by name with ``configure``, in which case a
+    ``sample_rate`` fraction of their calls is profiled. Settings can be
+    changed at any time, so profiling can be switched on in a running
+    server.
+
+    Each profiled call gets a directory under ``directory`` with a
+    ``summary.json`` and, depending on the settings, a cProfile dump and
+    report, folded stacks from the sampling profiler, and the allocations
+    that ``tracemalloc`` saw grow during the call. Only the newest
+    ``max_profiles`` directories are kept.
+
+    Only one call is profiled at a time. cProfile and ``tracemalloc`` are
+    process-wide, so overlapping calls would pollute each other's reports;
+    calls arriving while another one is profiled run unprofiled.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_profiles: int = 50,
+        sample_interval: float = 0.005,
+        top: int = 40
+    ):
+        """Initialize the profiler.
+
+        Args:
+            directory: Where reports are written
+            max_profiles: Number of reports kept
+            sample_interval: Seconds between stack samples in sampling mode
+            top: Number of functions or allocation sites in text reports
+        """
+        self.directory = Path(directory) if directory is not None else DEFAULT_PROFILE_DIR
+        self.max_profiles = max_profiles
+        self.sample_interval = sample_interval
+        self.top = top
+        self.tools: Set[str] = set()
+        self.sample_rate = 1.0
+        self.mode = "cprofile"
+        self.memory = False
+        self._busy = threading.Lock()
+        self._rotate_lock = threading.Lock()
+
+    def configure(
+        self,
+        tools: Optional[Iterable[str]] = None,
+        sample_rate: Optional[float] = None,
+        mode: Optional[str] = None,
+        memory: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Change what is profiled.
+
+        Args:
+            tools: Tool names to profile ("*" for all tools)
+            sample_rate: Fraction of matching calls to profile
+            mode: "cprofile" or "sampling"
+            memory: Whether to record allocations with tracemalloc
+
+        Returns:
+            The settings now in effect
+
+        Raises:
+            ValueError: If the mode or sample rate is invalid
+        """
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Invalid mode: {mode}. Must be one of: {', '.join(PROFILE_MODES)}")
+        if sample_rate is not None and not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if tools is not None:
+            self.tools = set(tools)
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if mode is not None:
+            self.mode = mode
+        if memory is not None:
+            self.memory = memory
+        return self.settings()
+
+    def disable(self) -> Dict[str, Any]:
+        """Stop profiling tools enabled by name."""
+        self.tools = set()
+        return self.settings()
+
+    def settings(self) -> Dict[str, Any]:
+        """Current settings."""
+        return {
+            "tools": sorted(self.tools),
+            "sample_rate": self.sample_rate,
+            "mode": self.mode,
+            "memory": self.memory,
+            "directory": str(self.directory)
+        }
+
+    def should_profile(self, tool: Any) -> bool:
+        """Whether to profile the next call of a tool."""
+        if getattr(tool, "profile", False):
+            return True
+        if tool.name not in self.tools and "*" not in self.tools:
+            return False
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def run(self, tool_name: str, func: Callable[..., T], *args: Any) -> T:
+        """Call ``func(*args)`` on the current thread and profile it.
+
+        Args:
+            tool_name: Name of the tool being called, for the report
+            func: Function running the tool call
+            *args: Arguments of ``func``
+
+        Returns:
+            Whatever ``func`` returns
+        """
+        if not self._busy.acquire(blocking=False):
+            return func(*args)
+        try:
+            return self._run_profiled(tool_name, func, args)
+        finally:
+            self._busy.release()
+
+    def list_profiles(self, tool_name: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Summaries of the newest reports, newest first."""
+        summaries = []
+        for path in self._profile_dirs()[::-1]:
+            try:
+                summary = json.loads((path / "summary.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if tool_name is None or summary.get("tool") == tool_name:
+                summaries.append(summary)
+            if len(summaries) >= limit:
+                break
+        return summaries
+
+    def get_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Summary and text reports of one profiled call, or None if it is gone."""
+        path = self.directory / Path(profile_id).name
+        try:
+            profile = json.loads((path / "summary.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        profile["reports"] = {
+            report.stem: report.read_text(encoding="utf-8")
+            for report in sorted(path.iterdir())
+            if report.suffix in (".txt", ".folded")
+        }
+        return profile
+
+    def _run_profiled(self, tool_name: str, func: Callable[..., T], args: tuple) -> T:
+        profile_id = f"{time.time_ns() // 1000}-{tool_name}-{os.urandom(3).hex()}"
+        mode, memory = self.mode, self.memory
+        started_tracemalloc = memory and not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(25)
+        before = tracemalloc.take_snapshot() if memory else None
+
+        profiler = cProfile.Profile() if mode == "cprofile" else None
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval) if mode == "sampling" else None
+        error = None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                return profiler.runcall(func, *args)
+            with sampler:
+                return func(*args)
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot() if memory else None
+            if started_tracemalloc:
+                tracemalloc.stop()
+            try:
+                self._write(profile_id, tool_name, mode, elapsed, error, profiler, sampler, before, after)
+            except Exception:
+                logger.exception("Failed to write profile of %s", tool_name)
+
+    def _write(self, profile_id, tool_name, mode, elapsed, error, profiler, sampler, before, after) -> None:
+        path = self.directory / profile_id
+        path.mkdir(parents=True, exist_ok=True)
+        files = []
+        if profiler is not None:
+            profiler.dump_stats(str(path / "cprofile.prof"))
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(self.top)
+            (path / "cprofile.txt").write_text(report.getvalue(), encoding="utf-8")
+            files.extend(["cprofile.prof", "cprofile.txt"])
+        if sampler is not None:
+            (path / "stacks.folded").write_text(sampler.folded(), encoding="utf-8")
+            files.append("stacks.folded")
+        if after is not None:
+            diff = after.compare_to(before, "lineno")
+            lines = [str(stat) for stat in diff[:self.top] if stat.size_diff > 0]
+            (path / "memory.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+            files.append("memory.txt")
+
+        summary = {
+            "id": profile_id,
+            "tool": tool_name,
+            "mode": mode,
+            "memory": after is not None,
+            "started_at": time.time() - elapsed,
+            "elapsed": elapsed,
+            "error": error,
+            "files": files
+        }
+        (path / "summary.json").write_text(json.dumps(summary), encoding="utf-8")
+        self._rotate()
+
+    def _profile_dirs(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        # IDs start with a timestamp, so name order is age order
+        return sorted(path for path in self.directory.iterdir() if path.is_dir())
+
+    def _rotate(self) -> None:
+        with self._rotate_lock:
+            dirs = self._profile_dirs()
+            for path in dirs[:max(0, len(dirs) - self.max_profiles)]:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+_default_profiler: Optional[ToolProfiler] = None
+_default_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> ToolProfiler:
+    """Get the process-wide tool profiler."""
+    global _default_profiler
+    with _default_profiler_lock:
+        if _default_profiler is None:
+            _default_profiler = ToolProfiler()
+        return _default_profiler
@@ -0,0 +1,263 @@
+"""Registry of long-lived tool instances and the resources they share."""
+
+import inspect
+from pathlib import Path
+from typing import Annotated, Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Type, Union
+
+from pydantic import Field
+
+from .base import BaseTool, ToolResult
+from .dispatch import ToolDispatcher
+
+# Python types of the JSON schema types used in ToolParameter.type
+PARAMETER_TYPES: Dict[str, Type] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": List[Any],
+    "object": Dict[str, Any]
+}
+
+# Tools that manage the server (the action queue, profiling) rather than doing work themselves
+CONTROL_TOOL_NAMES = ("push_action", "show_actions", "get_next_action", "clear_actions", "profiling")
+
+
+def tool_signature(tool: BaseTool) -> inspect.Signature:
+    """Build a keyword-only signature from a tool's declared parameters.
+
+    Required parameters come first and have no default. Optional parameters
+    default to their declared default, or to None.
+
+    Args:
+        tool: Tool to describe
+
+    Returns:
+        Signature whose annotations carry the parameter descriptions
+    """
+    parameters = []
+    for param in sorted(tool.parameters, key=lambda p: not p.required):
+        annotation = Annotated[PARAMETER_TYPES.get(param.type, Any), Field(description=param.description)]
+        if param.required:
+            default = inspect.Parameter.empty
+        else:
+            if param.default is None:
+                annotation = Optional[annotation]
+            default = param.default
+        parameters.append(
+            inspect.Parameter(param.name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation, default=default)
+        )
+    return inspect.Signature(parameters, return_annotation=Dict[str, Any])
+
+
+class ToolRegistry:
+    """Holds one instance of each tool plus the resources they share.
+
+    Tools are created once and reused for every call, so per-tool caches,
+    indexes and connection pools survive across requests. Resources such as
+    the response cache and search index are kept in ``resources`` so that
+    all tools using them get the same instance. When a ``dispatcher`` is
+    set, calls go through it so blocking tools run off the event loop.
+
+    Example:
+        registry = create_default_registry()
+        result = await registry.execute("list_dir", directory_path=".")
+    """
+
+    def __init__(
+        self,
+        tools: Optional[Iterable[BaseTool]] = None,
+        resources: Optional[Dict[str, Any]] = None,
+        dispatcher: Optional[ToolDispatcher] = None
+    ):
+        """Initialize the registry.
+
+        Args:
+            tools: Tools to register
+            resources: Shared resources, keyed by name
+            dispatcher: Dispatcher that runs tool calls (by default tools
+                are awaited directly)
+        """
+        self.resources: Dict[str, Any] = dict(resources or {})
+        self.dispatcher = dispatcher
+        self._tools: Dict[str, BaseTool] = {}
+        for tool in tools or ():
+            self.register(tool)
+
+    def register(self, tool: BaseTool) -> BaseTool:
+        """Register a tool instance.
+
+        Raises:
+            ValueError: If a tool with the same name is already registered
+        """
+        if tool.name in self._tools:
+            raise ValueError(f"Tool already registered: {tool.name}")
+        self._tools[tool.name] = tool
+        return tool
+
+    def get(self, name: str) -> Optional[BaseTool]:
+        """Get a tool by name."""
+        return self._tools.get(name)
+
+    def names(self) -> List[str]:
+        """Names of the registered tools, in registration order."""
+        return list(self._tools)
+
+    def subset(self, exclude: Iterable[str] = ()) -> "ToolRegistry":
+        """Registry sharing this registry's tools, resources and dispatcher, minus some tools."""
+        excluded = set(exclude)
+        return ToolRegistry(
+            (tool for name, tool in self._tools.items() if name not in excluded),
+            resources=self.resources,
+            dispatcher=self.dispatcher
+        )
+
+    def __getitem__(self, name: str) -> BaseTool:
+        return self._tools[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._tools
+
+    def __iter__(self) -> Iterator[BaseTool]:
+        return iter(self._tools.values())
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    async def execute(self, name: str, **kwargs) -> ToolResult:
+        """Execute a registered tool.
+
+        Args:
+            name: Tool name
+            **kwargs: Tool arguments
+
+        Returns:
+            ToolResult of the tool, or an error result for unknown tools
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            return ToolResult(success=False, error=f"Unknown tool: {name}")
+        if self.dispatcher is not None:
+            return await self.dispatcher.dispatch(tool, kwargs)
+        return await tool.execute(**kwargs)
+
+    def handler(self, name: str) -> Callable[..., Awaitable[Dict[str, Any]]]:
+        """Build an MCP handler for a tool.
+
+        The handler has the tool's parameters as its signature, so MCP
+        frameworks derive the input schema from it. Arguments left unset
+        are not passed on, so the tool's own defaults apply.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Async function returning ``success``, ``data`` and ``error``
+        """
+        tool = self[name]
+
+        async def handle(**kwargs) -> Dict[str, Any]:
+            arguments = {key: value for key, value in kwargs.items() if value is not None}
+            result = await self.execute(tool.name, **arguments)
+            return {"success": result.success, "data": result.data, "error": result.error}
+
+        handle.__name__ = tool.name
+        handle.__doc__ = tool.description
+        handle.__signature__ = tool_signature(tool)
+        return handle
+
+
+def create_default_registry(
+    queue: Optional[Any] = None,
+    include_control: bool = True,
+    state_dir: Union[str, Path, None] = None
+) -> ToolRegistry:
+    """Create a registry with the core tools wired to shared resources.
+
+    By default the response cache and search index are the process-wide
+    instances, so the registry shares them with any tool created outside of
+    it. With a ``state_dir`` all state lives in files under that directory
+    instead (an SQLite action queue and search index, and an on-disk
+    response cache), so several server processes opened on the same
+    directory share it.
+
+    Args:
+        queue: Action queue for the control tools (defaults to the shared queue)
+        include_control: Whether to register the action queue and profiling tools
+        state_dir: Directory holding state shared between processes
+
+    Returns:
+        Registry holding one instance of each core tool
+    """
+    from .file_system import (
+        ListDirectoryTool,
+        ReadFileTool,
+        EditFileTool,
+        DeleteFileTool,
+        GrepSearchTool,
+        FileSearchTool
+    )
+    from .web import (
+        WebSearchTool,
+        ReadUrlTool,
+        ReadUrlsTool,
+        get_response_cache,
+        get_search_index
+    )
+    from .code_modification import ProposeCodeTool, ViewCodeTool, ViewFileTool
+    from .lsp import SemanticSearchTool, SymbolInfoTool, CodeNavigationTool, RepoMapTool
+    from .control import (
+        get_action_queue,
+        SQLiteActionQueue,
+        PushActionTool,
+        ShowActionsTool,
+        GetNextActionTool,
+        ClearActionsTool,
+        ProfilingTool
+    )
+
+    if state_dir is None:
+        resources: Dict[str, Any] = {
+            "response_cache": get_response_cache(),
+            "search_index": get_search_index()
+        }
+    else:
+        from .web import DocumentIndex, ResponseCache
+
+        state_dir = Path(state_dir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        resources = {
+            "response_cache": ResponseCache(state_dir / "http"),
+            "search_index": DocumentIndex(state_dir / "search.sqlite3")
+        }
+    read_url = ReadUrlTool(cache=resources["response_cache"], search_index=resources["search_index"])
+    tools: List[BaseTool] = [
+        ListDirectoryTool(),
+        ReadFileTool(),
+        EditFileTool(),
+        DeleteFileTool(),
+        GrepSearchTool(),
+        FileSearchTool(),
+        WebSearchTool(index=resources["search_index"]),
+        read_url,
+        ReadUrlsTool(reader=read_url),
+        ProposeCodeTool(),
+        ViewCodeTool(),
+        ViewFileTool(),
+        SemanticSearchTool(),
+        SymbolInfoTool(),
+        CodeNavigationTool(),
+        RepoMapTool()
+    ]
+    if include_control:
+        if queue is None:
+            queue = get_action_queue() if state_dir is None else SQLiteActionQueue(state_dir / "actions.sqlite3")
+        resources["action_queue"] = queue
+        tools.extend([
+            PushActionTool(queue=resources["action_queue"]),
+            ShowActionsTool(queue=resources["action_queue"]),
+            GetNextActionTool(queue=resources["action_queue"]),
+            ClearActionsTool(queue=resources["action_queue"]),
+            ProfilingTool()
+        ])
+    return ToolRegistry(tools, resources=resources)
@@ -0,0 +1,285 @@
+"""In-memory cache of tool results, invalidated when the files they read change."""
+
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from .base import ToolResult
+from .metrics import result_size
+
+if TYPE_CHECKING:
+    from .base import BaseTool
+
+FILE = "file"
+LISTING = "listing"
+TREE = "tree"
+
+
+class CacheDependency(NamedTuple):
+    """A file or directory a tool result was computed from.
+
+    ``scope`` is ``"file"`` for a single file, ``"listing"`` for a directory
+    and the entries directly in it, and ``"tree"`` for a directory and
+    everything below it.
+    """
+    path: str
+    scope: str = FILE
+
+
+def _listing_stamp(directory: str) -> int:
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                stat = entry.stat()
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                entries.append((entry.name, None, None))
+    return hash(frozenset(entries))
+
+
+def _tree_stamp(root: str) -> int:
+    entries = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            entries.append((entry.path, None, None))
+                        else:
+                            stat = entry.stat()
+                            entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+                    except OSError:
+                        entries.append((entry.path, None, None))
+        except OSError:
+            entries.append((directory, None, None))
+    return hash(frozenset(entries))
+
+
+def stamp(dependency: CacheDependency) -> Optional[int]:
+    """Fingerprint of a dependency's current state from file metadata.
+
+    Files are stamped by modification time and size, directories by those
+    of their entries. Contents are never read.
+
+    Returns:
+        The stamp, or None if the path does not exist
+    """
+    try:
+        if dependency.scope == LISTING:
+            return _listing_stamp(dependency.path)
+        if dependency.scope == TREE:
+            os.stat(dependency.path)
+            return _tree_stamp(dependency.path)
+        stat = os.stat(dependency.path)
+        return hash((stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        return None
+
+
+def _affects(dependency: CacheDependency, path: str) -> bool:
+    """Whether a change to ``path`` can change a dependency."""
+    if path == dependency.path or dependency.path.startswith(path + os.sep):
+        # The path itself, or a directory containing it
+        return True
+    if dependency.scope == LISTING:
+        return os.path.dirname(path) == dependency.path
+    if dependency.scope == TREE:
+        return path.startswith(dependency.path.rstrip(os.sep) + os.sep)
+    return False
+
+
+@dataclass
+class _Entry:
+    result: ToolResult
+    dependencies: Tuple[CacheDependency, ...]
+    stamps: Tuple[Optional[int], ...]
+    size: int
+
+
+@dataclass
+class PendingResult:
+    """State captured before a call whose result may be cached (see ``ToolResultCache.begin``)."""
+    key: str
+    dependencies: Tuple[CacheDependency, ...]
+    stamps: Tuple[Optional[int], ...]
+    generation: int
+
+
+class ToolResultCache:
+    """LRU cache of the results of read-only tool calls.
+
+    Tools opt in by setting ``cacheable`` and returning the files and
+    directories a call reads from ``cache_dependencies``. Results are keyed
+    by tool name, working directory and arguments (with declared defaults
+    filled in), and bounded by entry count and total result size.
+
+    With ``validate`` set, every hit first compares the metadata stamps of
+    its dependencies (see ``stamp``) with those taken before the call ran,
+    so files changed by anyone are noticed without reading them. Without
+    it, hits do no I/O at all and entries are only dropped by
+    ``invalidate``, which suits setups where a file watcher reports every
+    change. Either way, calls of tools that declare ``invalidated_paths``
+    (edits, deletes) drop the entries depending on those paths at once.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        validate: bool = True
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total JSON size of cached results
+            validate: Whether hits check their dependencies' stamps
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.validate = validate
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._total_bytes = 0
+        # Bumped by every invalidation; results of calls that overlap one are not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of cached results."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(tool: "BaseTool", arguments: Dict[str, Any]) -> str:
+        """Cache key of a call."""
+        normalized = {p.name: p.default for p in tool.parameters if p.default is not None}
+        normalized.update((name, value) for name, value in arguments.items() if value is not None)
+        return json.dumps([tool.name, os.getcwd(), normalized], sort_keys=True, default=str)
+
+    @staticmethod
+    def dependencies(tool: "BaseTool", arguments: Dict[str, Any]) -> Tuple[CacheDependency, ...]:
+        """Dependencies of a call, with absolute paths."""
+        return tuple(
+            CacheDependency(os.path.abspath(dependency.path), dependency.scope)
+            for dependency in tool.cache_dependencies(**arguments)
+        )
+
+    def get(self, tool: "BaseTool", arguments: Dict[str, Any]) -> Optional[ToolResult]:
+        """Get the cached result of a call, if it is still valid.
+
+        Returns:
+            A copy of the cached result, or None
+        """
+        key = self.key(tool, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and self.validate:
+            if tuple(stamp(dependency) for dependency in entry.dependencies) != entry.stamps:
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        self._remove(key)
+                entry = None
+        with self._lock:
+            if entry is None or self._entries.get(key) is not entry:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry.result)
+
+    def begin(self, tool: "BaseTool", arguments: Dict[str, Any]) -> PendingResult:
+        """Capture the state a call's result will be checked against.
+
+        Called before the tool runs, so changes made while it runs make the
+        stored result stale rather than being missed.
+        """
+        dependencies = self.dependencies(tool, arguments)
+        stamps = tuple(stamp(dependency) for dependency in dependencies) if self.validate else ()
+        with self._lock:
+            generation = self._generation
+        return PendingResult(self.key(tool, arguments), dependencies, stamps, generation)
+
+    def put(self, pending: PendingResult, result: ToolResult) -> bool:
+        """Store a call's result.
+
+        Returns:
+            True if the result was stored
+        """
+        if not result.success:
+            return False
+        size = result_size(result)
+        if size > self.max_bytes:
+            return False
+        entry = _Entry(copy.deepcopy(result), pending.dependencies, pending.stamps, size)
+        with self._lock:
+            if pending.generation != self._generation:
+                return False
+            self._remove(pending.key)
+            self._entries[pending.key] = entry
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, paths: Iterable[str]) -> int:
+        """Drop the results depending on any of the given paths.
+
+        Args:
+            paths: Files or directories that changed
+
+        Returns:
+            Number of results dropped
+        """
+        paths = [os.path.abspath(path).rstrip(os.sep) or os.sep for path in paths]
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, entry in self._entries.items()
+                if any(_affects(dependency, path) for dependency in entry.dependencies for path in paths)
+            ]
+            for key in stale:
+                self._remove(key)
+        return len(stale)
+
+    def changed_by(self, tool: "BaseTool", arguments: Dict[str, Any]) -> int:
+        """Drop the results a call of a mutating tool may have made stale."""
+        paths = tool.invalidated_paths(**arguments)
+        return self.invalidate(paths) if paths else 0
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, size and hit counts of the cache."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
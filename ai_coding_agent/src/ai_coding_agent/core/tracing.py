@@ -0,0 +1,298 @@
+"""Lightweight tracing of tool execution.
+
+Spans follow the OpenTelemetry model (trace ID, span ID, parent, attributes,
+status). A client can pass a W3C ``traceparent`` in the MCP request
+metadata, and the server's spans then continue the client's trace. No
+exporter is needed: finished spans go to local sinks, either JSON lines or
+the Chrome trace event format, which chrome://tracing and Perfetto show as
+a flame view. Pointing the client and server at the same file puts both
+sides of a call in one view.
+
+Tracing is off until a sink is added, either in code or by setting the
+``AI_CODING_AGENT_TRACE_FILE`` environment variable to a file path. Paths
+ending in ``.jsonl`` get JSON lines, anything else a Chrome trace.
+
+The MCP client package ships a copy of this module, since the two are
+installed separately. ``tests/test_tracing.py`` checks that both write and
+parse the same ``traceparent`` strings and span records; change them
+together.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE_ENV = "AI_CODING_AGENT_TRACE_FILE"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifies a span, possibly one recorded in another process.
+
+    Attributes:
+        trace_id: 32 hex digit trace ID
+        span_id: 16 hex digit span ID
+    """
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent string for this context."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional["SpanContext"]:
+        """Parse a W3C traceparent string, returning None if it is invalid."""
+        match = _TRACEPARENT.match((value or "").strip().lower())
+        if match is None:
+            return None
+        return cls(trace_id=match.group(1), span_id=match.group(2))
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace.
+
+    Attributes:
+        name: Operation name
+        context: IDs of this span
+        parent_id: Span ID of the parent, or None for a root span
+        start_ns: Start time in nanoseconds since the epoch
+        end_ns: End time in nanoseconds since the epoch
+        attributes: Key-value details of the operation
+        status: "ok" or "error"
+        error: Error message when the status is "error"
+        thread_id: Thread the span ran on
+    """
+    name: str
+    context: SpanContext
+    parent_id: Optional[str] = None
+    start_ns: int = 0
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+    thread_id: int = 0
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, once the span has ended."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        """Mark the span as failed."""
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the span with OpenTelemetry field names."""
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.error},
+            "resource": {"process.pid": os.getpid(), "thread.id": self.thread_id}
+        }
+
+
+class JSONLinesSink:
+    """Appends each finished span to a file as one JSON object per line.
+
+    Every span is written with a single append, so several processes can
+    share one file.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the sink.
+
+        Args:
+            path: File to append spans to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class ChromeTraceSink:
+    """Appends finished spans to a file in the Chrome trace event format.
+
+    The file uses the format's array form, whose closing bracket is
+    optional, so spans can be appended as they finish and several
+    processes can share one file.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the sink.
+
+        Args:
+            path: File to append spans to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        event = {
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": span.start_ns / 1000,
+            "dur": (span.end_ns - span.start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": span.thread_id,
+            "args": {
+                **span.attributes,
+                "trace_id": span.context.trace_id,
+                "span_id": span.context.span_id,
+                "parent_span_id": span.parent_id,
+                "status": span.status,
+                "error": span.error
+            }
+        }
+        data = json.dumps(event, default=str) + ",\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            if f.tell() == 0:
+                data = "[\n" + data
+            f.write(data)
+
+
+class MemorySink:
+    """Keeps finished spans in a list."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+def sink_for_path(path: str):
+    """Create the sink matching a file name: JSON lines for ``.jsonl``, else Chrome trace."""
+    if path.endswith(".jsonl"):
+        return JSONLinesSink(path)
+    return ChromeTraceSink(path)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to its sinks.
+
+    The current span is tracked in a context variable, so spans opened in a
+    coroutine become the parents of spans opened in the coroutines it awaits.
+    """
+
+    def __init__(self, sinks: Optional[List[Any]] = None):
+        """Initialize the tracer.
+
+        Args:
+            sinks: Objects with an ``export(span)`` method receiving finished spans
+        """
+        self.sinks: List[Any] = list(sinks or [])
+        self._current: contextvars.ContextVar[Optional[SpanContext]] = contextvars.ContextVar(
+            f"current_span_{id(self)}", default=None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded anywhere."""
+        return bool(self.sinks)
+
+    def add_sink(self, sink: Any) -> None:
+        """Add a sink with an ``export(span)`` method."""
+        self.sinks.append(sink)
+
+    def current(self) -> Optional[SpanContext]:
+        """Context of the innermost open span."""
+        return self._current.get()
+
+    def traceparent(self) -> Optional[str]:
+        """W3C traceparent of the innermost open span, for propagation."""
+        current = self._current.get()
+        return current.traceparent if current is not None else None
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None
+    ) -> Iterator[Span]:
+        """Open a span for the duration of a ``with`` block.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+            parent: Parent context (defaults to the current span, so pass a
+                context extracted from a remote traceparent to continue
+                another process's trace)
+
+        Yields:
+            The span, which records any exception raised in the block
+        """
+        parent = parent if parent is not None else self._current.get()
+        context = SpanContext(
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex()
+        )
+        span = Span(
+            name=name,
+            context=context,
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+            thread_id=threading.get_ident()
+        )
+        token = self._current.set(context)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end_ns = time.time_ns()
+            for sink in self.sinks:
+                try:
+                    sink.export(span)
+                except Exception as e:
+                    logger.warning("Failed to export span %s: %s", span.name, e)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, configured from the environment on first use."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+            path = os.environ.get(TRACE_FILE_ENV)
+            if path:
+                _tracer.add_sink(sink_for_path(path))
+        return _tracer
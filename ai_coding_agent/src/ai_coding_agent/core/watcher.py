@@ -0,0 +1,482 @@
+"""Watching a directory tree for changes, with inotify or by polling."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+# Directories that are not watched: version control data and caches
+DEFAULT_IGNORED = frozenset({".git", ".hg", ".svn", "__pycache__", ".mypy_cache", ".pytest_cache", "node_modules"})
+
+
+@dataclass
+class ChangeSet:
+    """Paths that changed during one debounce window.
+
+    A path appears in at most one of the sets. ``overflow`` means events
+    were lost (the kernel queue overflowed, or the watched root itself was
+    moved or deleted), so anything under the root may have changed.
+    """
+    added: Set[str] = field(default_factory=set)
+    modified: Set[str] = field(default_factory=set)
+    deleted: Set[str] = field(default_factory=set)
+    overflow: bool = False
+
+    @property
+    def paths(self) -> Set[str]:
+        """All changed paths."""
+        return self.added | self.modified | self.deleted
+
+    def __bool__(self) -> bool:
+        return self.overflow or bool(self.added or self.modified or self.deleted)
+
+
+Subscriber = Callable[[ChangeSet], Optional[Awaitable[None]]]
+Emit = Callable[[str, str], None]
+
+
+class _Coalescer:
+    """Merges the events of one window into a change per path."""
+
+    def __init__(self):
+        self.kinds: Dict[str, str] = {}
+        self.overflow = False
+
+    def add(self, path: str, kind: str) -> None:
+        previous = self.kinds.get(path)
+        if previous == ADDED:
+            # Created and deleted again within the window: nothing happened
+            if kind == DELETED:
+                del self.kinds[path]
+            return
+        if previous == DELETED and kind == ADDED:
+            kind = MODIFIED
+        self.kinds[path] = kind
+
+    def take(self) -> ChangeSet:
+        changes = ChangeSet(overflow=self.overflow)
+        for path, kind in self.kinds.items():
+            getattr(changes, kind).add(path)
+        self.kinds, self.overflow = {}, False
+        return changes
+
+
+def _walk_dirs(root: str, ignored: Iterable[str]) -> Iterable[Tuple[str, List[os.DirEntry]]]:
+    """Directories under ``root`` with their entries, skipping ignored names."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = [entry for entry in it if entry.name not in ignored]
+        except OSError:
+            continue
+        yield directory, entries
+        stack.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+
+
+def scan(root: str, ignored: Iterable[str] = DEFAULT_IGNORED) -> Dict[str, Optional[Tuple[int, int]]]:
+    """Snapshot of a tree: modification time and size of each file.
+
+    Directories are included with None, so that they are reported when
+    they appear or disappear but not when their entries change.
+    """
+    snapshot: Dict[str, Optional[Tuple[int, int]]] = {}
+    for _, entries in _walk_dirs(root, ignored):
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    snapshot[entry.path] = None
+                else:
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+    return snapshot
+
+
+class _PollingBackend:
+    """Finds changes by comparing snapshots of the tree, on any platform."""
+
+    name = "polling"
+
+    def __init__(self, root: str, ignored: Iterable[str], interval: float):
+        self.root = root
+        self.ignored = frozenset(ignored)
+        self.interval = interval
+        self._snapshot: Optional[Dict[str, Optional[Tuple[int, int]]]] = None
+
+    async def prepare(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._snapshot = await loop.run_in_executor(None, scan, self.root, self.ignored)
+
+    async def run(self, emit: Emit, overflow: Callable[[], None]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            current = await loop.run_in_executor(None, scan, self.root, self.ignored)
+            previous, self._snapshot = self._snapshot, current
+            for path in current.keys() - previous.keys():
+                emit(path, ADDED)
+            for path in previous.keys() - current.keys():
+                emit(path, DELETED)
+            for path, stamp in current.items():
+                if stamp is not None and path in previous and previous[path] != stamp:
+                    emit(path, MODIFIED)
+
+    def close(self) -> None:
+        self._snapshot = None
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+class _InotifyBackend:
+    """Linux inotify, read on the event loop without a thread.
+
+    inotify is not recursive, so every directory gets its own watch, and
+    directories created later are watched as they appear.
+    """
+
+    name = "inotify"
+
+    def __init__(self, root: str, ignored: Iterable[str], libc: ctypes.CDLL):
+        self.root = root
+        self.ignored = frozenset(ignored)
+        self._libc = libc
+        self._fd: Optional[int] = None
+        self._directories: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+
+    async def prepare(self) -> None:
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        loop = asyncio.get_running_loop()
+        # Raises if the user's watch limit is reached, before any event is lost
+        await loop.run_in_executor(None, self._watch_tree, self.root)
+
+    def _watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(err, f"Cannot watch {directory}: {os.strerror(err)}")
+        self._directories[wd] = directory
+        self._watches[directory] = wd
+
+    def _watch_tree(self, root: str) -> List[str]:
+        """Watch a directory and all directories below it.
+
+        Returns:
+            Paths found below it, which may have appeared before their
+            directory was watched
+        """
+        found = []
+        for directory, entries in _walk_dirs(root, self.ignored):
+            self._watch(directory)
+            found.extend(entry.path for entry in entries)
+        return found
+
+    def _unwatch_tree(self, root: str) -> None:
+        prefix = root + os.sep
+        for directory in [d for d in self._watches if d == root or d.startswith(prefix)]:
+            wd = self._watches.pop(directory)
+            self._directories.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    async def run(self, emit: Emit, overflow: Callable[[], None]) -> None:
+        loop = asyncio.get_running_loop()
+        closed = loop.create_future()
+        loop.add_reader(self._fd, self._read, emit, overflow)
+        try:
+            await closed
+        finally:
+            loop.remove_reader(self._fd)
+
+    def _read(self, emit: Emit, overflow: Callable[[], None]) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            except OSError:
+                logger.exception("Reading inotify events failed")
+                overflow()
+                return
+            if not data:
+                return
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                self._handle(wd, mask, os.fsdecode(name), emit, overflow)
+
+    def _handle(self, wd: int, mask: int, name: str, emit: Emit, overflow: Callable[[], None]) -> None:
+        if mask & IN_Q_OVERFLOW:
+            overflow()
+            return
+        directory = self._directories.get(wd)
+        if mask & IN_IGNORED:
+            if directory is not None:
+                self._directories.pop(wd, None)
+                self._watches.pop(directory, None)
+            return
+        if directory is None:
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            if directory == self.root:
+                overflow()
+            return
+        if name in self.ignored:
+            return
+        path = os.path.join(directory, name) if name else directory
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            emit(path, ADDED)
+            if mask & IN_ISDIR:
+                try:
+                    for found in self._watch_tree(path):
+                        emit(found, ADDED)
+                except OSError:
+                    logger.exception("Cannot watch %s", path)
+                    overflow()
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            emit(path, DELETED)
+            if mask & IN_ISDIR:
+                self._unwatch_tree(path)
+        elif mask & (IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB) and not mask & IN_ISDIR:
+            emit(path, MODIFIED)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._directories.clear()
+        self._watches.clear()
+
+
+class FileWatcher:
+    """Reports changes below a directory to subscribers in batches.
+
+    Uses inotify on Linux and falls back to polling elsewhere, or when
+    inotify is unavailable or out of watches. Events are debounced: they
+    are collected until none arrived for ``debounce`` seconds (but at most
+    ``max_delay`` seconds), coalesced into one ``ChangeSet`` with a single
+    change per path, and passed to every subscriber. Subscribers run on the
+    event loop the watcher was started on and may be coroutine functions.
+    They can update whatever they derived from the files by looking only
+    at the changed paths.
+
+    Example:
+        watcher = FileWatcher(".")
+        watcher.subscribe(lambda changes: cache.invalidate(changes.paths))
+        await watcher.start()
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        debounce: float = 0.05,
+        max_delay: float = 1.0,
+        poll_interval: float = 1.0,
+        ignored: Iterable[str] = DEFAULT_IGNORED,
+        backend: str = "auto"
+    ):
+        """Initialize the watcher.
+
+        Args:
+            root: Directory to watch, with everything below it
+            debounce: Seconds without events that end a batch
+            max_delay: Maximum seconds a change waits before it is published
+            poll_interval: Seconds between scans when polling
+            ignored: Names of directories and files that are not watched
+            backend: ``inotify``, ``polling``, or ``auto`` for inotify when
+                available
+        """
+        if backend not in ("auto", "inotify", "polling"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.ignored = frozenset(ignored)
+        self.requested_backend = backend
+        self._backend: Optional[Union[_InotifyBackend, _PollingBackend]] = None
+        self._subscribers: List[Subscriber] = []
+        self._pending = _Coalescer()
+        self._task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._first_event: Optional[float] = None
+        self._deliveries: Set[asyncio.Task] = set()
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Name of the backend in use, once started."""
+        return self._backend.name if self._backend is not None else None
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher is started."""
+        return self._task is not None
+
+    def subscribe(self, callback: Subscriber) -> Subscriber:
+        """Call ``callback`` with every batch of changes."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        """Stop calling a subscriber."""
+        self._subscribers.remove(callback)
+
+    async def start(self) -> None:
+        """Start watching. Changes made after this returns are reported."""
+        if self.running:
+            return
+        self._backend = await self._create_backend()
+        self._task = asyncio.create_task(self._run(self._backend))
+
+    async def _create_backend(self) -> Union[_InotifyBackend, _PollingBackend]:
+        if self.requested_backend != "polling":
+            libc = _load_libc()
+            if libc is not None:
+                backend = _InotifyBackend(self.root, self.ignored, libc)
+                try:
+                    await backend.prepare()
+                    return backend
+                except OSError as e:
+                    backend.close()
+                    if self.requested_backend == "inotify":
+                        raise
+                    logger.warning("inotify unavailable for %s (%s), polling instead", self.root, e)
+            elif self.requested_backend == "inotify":
+                raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        backend = _PollingBackend(self.root, self.ignored, self.poll_interval)
+        await backend.prepare()
+        return backend
+
+    async def _run(self, backend: Union[_InotifyBackend, _PollingBackend]) -> None:
+        try:
+            await backend.run(self._event, self._overflow)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("File watcher for %s stopped", self.root)
+            self._overflow()
+
+    async def stop(self) -> None:
+        """Stop watching and deliver the changes still pending."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._backend.close()
+        self.flush()
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    async def __aenter__(self) -> "FileWatcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _event(self, path: str, kind: str) -> None:
+        self._pending.add(path, kind)
+        self._schedule()
+
+    def _overflow(self) -> None:
+        self._pending.overflow = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        now = time.monotonic()
+        if self._first_event is None:
+            self._first_event = now
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = min(self.debounce, max(0.0, self._first_event + self.max_delay - now))
+        self._timer = asyncio.get_running_loop().call_later(delay, self.flush)
+
+    def flush(self) -> Optional[ChangeSet]:
+        """Publish the pending changes now.
+
+        Returns:
+            The published changes, or None if there were none
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._first_event = None
+        changes = self._pending.take()
+        if not changes:
+            return None
+        for callback in list(self._subscribers):
+            try:
+                result = callback(changes)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.ensure_future(result)
+                    self._deliveries.add(task)
+                    task.add_done_callback(self._delivered)
+            except Exception:
+                logger.exception("File watcher subscriber %r failed", callback)
+        return changes
+
+    def _delivered(self, task: asyncio.Task) -> None:
+        self._deliveries.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("File watcher subscriber failed", exc_info=task.exception())
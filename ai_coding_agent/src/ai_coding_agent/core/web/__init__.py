@@ -1,9 +1,22 @@
-"""Web tools for the AI Coding Agent."""
+"""Web tools for the AI Coding Agent.
 
-from ai_coding_agent.core.web.web_search import WebSearchTool
-from ai_coding_agent.core.web.read_url import ReadUrlTool
+Names are imported on first access, so modules that only need the cache
+settings do not import the HTTP client and HTML parsers.
+"""
 
-__all__ = [
-    "WebSearchTool",
-    "ReadUrlTool"
-] 
\ No newline at end of file
+from ai_coding_agent.core.lazy import lazy_exports
+
+_EXPORTS = {
+    "WebSearchTool": "ai_coding_agent.core.web.web_search",
+    "ReadUrlTool": "ai_coding_agent.core.web.read_url",
+    "ReadUrlsTool": "ai_coding_agent.core.web.read_urls",
+    "extract_main_text": "ai_coding_agent.core.web.text_extraction",
+    "ResponseCache": "ai_coding_agent.core.web.http_cache",
+    "get_response_cache": "ai_coding_agent.core.web.http_cache",
+    "get_http_client": "ai_coding_agent.core.web.http_client",
+    "DocumentIndex": "ai_coding_agent.core.web.search_index",
+    "get_search_index": "ai_coding_agent.core.web.search_index"
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
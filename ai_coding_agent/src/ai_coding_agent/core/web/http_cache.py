@@ -0,0 +1,400 @@
+"""On-disk HTTP response cache with conditional revalidation."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("AI_CODING_AGENT_CACHE_DIR", Path.home() / ".cache" / "ai_coding_agent")
+)
+
+_HOP_HEADERS = ("content-length", "content-encoding", "transfer-encoding", "connection")
+
+# Request headers that make a response specific to the caller
+CREDENTIAL_HEADERS = ("authorization", "proxy-authorization", "cookie")
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a directive mapping."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def has_credentials(request_headers: Optional[Dict[str, str]]) -> bool:
+    """Whether a request carries credentials, making its response unshareable."""
+    return any(name.lower() in CREDENTIAL_HEADERS for name in request_headers or {})
+
+
+def vary_headers(headers: Dict[str, str]) -> List[str]:
+    """Request header names listed in a response's Vary header, lowercased."""
+    return sorted({
+        name.strip().lower() for value in (v for k, v in headers.items() if k.lower() == "vary")
+        for name in value.split(",") if name.strip()
+    })
+
+
+def _selected_headers(request_headers: Optional[Dict[str, str]], names: List[str]) -> Dict[str, str]:
+    """Values of the named request headers, keyed by lowercased name."""
+    lowered = {k.lower(): v for k, v in (request_headers or {}).items()}
+    return {name: lowered.get(name, "") for name in names}
+
+
+@dataclass
+class CachedResponse:
+    """A cached response and the metadata needed to revalidate it."""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    stored_at: float
+    size: int
+    vary: Dict[str, str] = field(default_factory=dict)
+    body: Optional[bytes] = field(default=None, repr=False)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+    def freshness_lifetime(self) -> float:
+        """Seconds the response may be served without revalidation."""
+        directives = parse_cache_control(self.headers.get("cache-control"))
+        if "no-cache" in directives:
+            return 0.0
+        if directives.get("max-age") is not None:
+            try:
+                return max(0.0, float(directives["max-age"]))
+            except ValueError:
+                return 0.0
+        expires = self.headers.get("expires")
+        if expires:
+            try:
+                date = self.headers.get("date")
+                base = parsedate_to_datetime(date).timestamp() if date else self.stored_at
+                return max(0.0, parsedate_to_datetime(expires).timestamp() - base)
+            except (TypeError, ValueError):
+                return 0.0
+        return 0.0
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Whether the response can be served without contacting the server."""
+        now = now if now is not None else time.time()
+        return now - self.stored_at < self.freshness_lifetime()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that revalidate this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of HTTP responses stored on disk.
+
+    Each entry is a ``<key>.body`` file with a ``<key>.json`` metadata file
+    next to it. Only successful GET responses are cached. Responses with
+    ``Cache-Control: no-store`` or ``private``, with ``Vary: *`` or to
+    requests carrying credentials are never written. The request headers
+    named in ``Vary`` are stored with the entry, and a lookup only hits when
+    the request has the same values. Responses without a freshness lifetime
+    are kept for conditional revalidation with their ``ETag`` or
+    ``Last-Modified`` validators.
+
+    Entry sizes and the access order are kept in a SQLite index next to the
+    entries, so every process using the same directory shares one cache and
+    one size bound.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            accessed INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+    """
+
+    # Access order is a counter rather than a clock so that it has no ties
+    _TOUCH = """
+        UPDATE entries SET accessed = (SELECT COALESCE(MAX(accessed), 0) + 1 FROM entries)
+        WHERE key = ?
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory holding cache entries
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.directory = Path(directory) if directory is not None else DEFAULT_CACHE_DIR / "http"
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.directory / "index.sqlite3"),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        self._load()
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Cache key for a URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of cached bodies."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, url: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """Get a cached response, including its body.
+
+        Args:
+            url: Requested URL
+            request_headers: Headers of the request, matched against the
+                headers named in the cached response's ``Vary``
+        """
+        if has_credentials(request_headers):
+            return None
+        key = self.key(url)
+        with self._lock:
+            if not self._contains(key):
+                return None
+            entry = self._read_meta(key)
+            if entry is None or entry.url != url:
+                return None
+            if entry.vary and _selected_headers(request_headers, list(entry.vary)) != entry.vary:
+                return None
+            try:
+                entry.body = self._body_path(key).read_bytes()
+            except OSError:
+                self._remove(key)
+                return None
+            if len(entry.body) != entry.size:
+                # Another process replaced the entry between the two reads
+                return None
+            self._conn.execute(self._TOUCH, (key,))
+            return entry
+
+    def put(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        body: bytes,
+        request_headers: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Store a response.
+
+        Args:
+            url: Requested URL
+            status_code: Response status
+            headers: Response headers
+            body: Decoded response body
+            request_headers: Headers of the request that was answered
+
+        Returns:
+            True if the response was cacheable and stored
+        """
+        # Bodies are stored decoded, so transfer-level headers no longer apply
+        headers = {
+            k.lower(): v for k, v in headers.items()
+            if k.lower() not in _HOP_HEADERS
+        }
+        directives = parse_cache_control(headers.get("cache-control"))
+        vary = vary_headers(headers)
+        if (
+            status_code != 200
+            or "no-store" in directives
+            or "private" in directives
+            or "*" in vary
+            or has_credentials(request_headers)
+            or len(body) > self.max_bytes
+        ):
+            self.invalidate(url)
+            return False
+
+        key = self.key(url)
+        entry = CachedResponse(
+            url=url,
+            status_code=status_code,
+            headers=headers,
+            stored_at=time.time(),
+            size=len(body),
+            vary=_selected_headers(request_headers, vary)
+        )
+        with self._transaction():
+            _atomic_write(self._body_path(key), body)
+            self._write_meta(key, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, size, accessed) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(accessed), 0) + 1 FROM entries))",
+                (key, entry.size)
+            )
+            self._evict()
+        return True
+
+    def refresh(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        request_headers: Optional[Dict[str, str]] = None
+    ) -> Optional[CachedResponse]:
+        """Update a cached response after a 304 Not Modified revalidation."""
+        key = self.key(url)
+        with self._transaction():
+            entry = self._read_meta(key) if self._contains(key) else None
+            if entry is None:
+                return None
+            for name, value in headers.items():
+                name = name.lower()
+                if name not in _HOP_HEADERS:
+                    entry.headers[name] = value
+            entry.stored_at = time.time()
+            self._write_meta(key, entry)
+        return self.get(url, request_headers)
+
+    def invalidate(self, url: str) -> None:
+        """Drop the cached response for a URL."""
+        with self._transaction():
+            self._remove(self.key(url))
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._transaction():
+            for (key,) in self._conn.execute("SELECT key FROM entries").fetchall():
+                self._remove(key)
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def _load(self) -> None:
+        # Adopt entries written before the directory had an index
+        with self._transaction():
+            if self._conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is not None:
+                return
+            metas = []
+            for meta_path in self.directory.glob("*.json"):
+                key = meta_path.stem
+                try:
+                    size = self._body_path(key).stat().st_size
+                    metas.append((meta_path.stat().st_mtime, key, size))
+                except OSError:
+                    continue
+            self._conn.executemany(
+                "INSERT INTO entries (key, size, accessed) VALUES (?, ?, ?)",
+                [(key, size, accessed) for accessed, (_, key, size) in enumerate(sorted(metas), 1)]
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def _contains(self, key: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def _remove(self, key: str) -> None:
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        for path in (self._body_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    def _read_meta(self, key: str) -> Optional[CachedResponse]:
+        try:
+            data = json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+            return CachedResponse(**data)
+        except (OSError, ValueError, TypeError):
+            self._remove(key)
+            return None
+
+    def _write_meta(self, key: str, entry: CachedResponse) -> None:
+        data = {
+            "url": entry.url,
+            "status_code": entry.status_code,
+            "headers": entry.headers,
+            "stored_at": entry.stored_at,
+            "size": entry.size,
+            "vary": entry.vary
+        }
+        _atomic_write(self._meta_path(key), json.dumps(data).encode("utf-8"))
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
@@ -0,0 +1,61 @@
+"""Process-wide pooled HTTP client for the web tools."""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0
+)
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def create_http_client(limits: Optional[httpx.Limits] = None) -> httpx.AsyncClient:
+    """Create a pooled client with keep-alive, and HTTP/2 when ``h2`` is installed.
+
+    Args:
+        limits: Connection pool limits (defaults to DEFAULT_LIMITS)
+
+    Returns:
+        A new AsyncClient
+    """
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=limits or DEFAULT_LIMITS,
+        follow_redirects=True
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client for the running event loop.
+
+    Connection pools are bound to the event loop they were created on, so
+    one client is kept per loop. Within a loop every caller shares the same
+    pool, and repeated requests to a host reuse DNS, TCP and TLS setup.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = create_http_client()
+            _clients[loop] = client
+        return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -1,60 +1,161 @@
 """Tool for reading content from URLs."""
 
-from typing import Optional
+import asyncio
+import logging
+from email.message import Message
+from typing import Any, Dict, Optional
 import httpx
-from ..base import BaseTool, ToolResult
+from ..base import BaseTool, ToolParameter, ToolResult
+from .http_cache import CachedResponse, ResponseCache, get_response_cache, has_credentials
+from .http_client import get_http_client
+from .search_index import DocumentIndex, get_search_index
+from .text_extraction import is_html
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BODY_BYTES = 10 * 1024 * 1024
+
 
 class ReadUrlTool(BaseTool):
     """Tool for reading content from URLs.
-    
+
     This tool allows fetching and reading content from web URLs.
     It supports both GET and POST requests with optional headers and data.
+
+    Requests go through a process-wide pooled client, and GET responses are
+    kept in an on-disk cache that honors ``Cache-Control`` and revalidates
+    stale entries with ``ETag``/``Last-Modified``. Requests sending
+    ``Authorization`` or ``Cookie`` headers bypass the cache, since the cache
+    is shared by every caller of the process. Bodies are streamed and cut
+    off at ``max_bytes`` so a huge page cannot exhaust memory.
+
+    Fetched HTML pages are added to the local search index that backs
+    ``web_search``.
     """
-    
+
     name: str = "read_url"
     description: str = "Read content from a URL"
-    
+    parameters = [
+        ToolParameter(
+            name="url",
+            type="string",
+            description="URL to read from",
+            required=True
+        ),
+        ToolParameter(
+            name="method",
+            type="string",
+            description="HTTP method to use (GET or POST)",
+            required=False,
+            default="GET"
+        ),
+        ToolParameter(
+            name="headers",
+            type="object",
+            description="Optional HTTP headers",
+            required=False
+        ),
+        ToolParameter(
+            name="data",
+            type="object",
+            description="Optional data to send with POST request",
+            required=False
+        ),
+        ToolParameter(
+            name="timeout",
+            type="number",
+            description="Timeout in seconds",
+            required=False,
+            default=30.0
+        ),
+        ToolParameter(
+            name="use_cache",
+            type="boolean",
+            description="Whether GET responses may be served from and stored in the cache",
+            required=False,
+            default=True
+        )
+    ]
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ResponseCache] = None,
+        max_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        search_index: Optional[DocumentIndex] = None,
+        index_pages: bool = True
+    ):
+        """Initialize the tool.
+
+        Args:
+            client: HTTP client to use (defaults to the shared pooled client)
+            cache: Response cache (defaults to the process-wide cache)
+            max_bytes: Maximum number of body bytes read per response
+            search_index: Index fetched pages are added to (defaults to the
+                process-wide index)
+            index_pages: Whether to add fetched HTML pages to the search index
+        """
+        super().__init__()
+        self._client = client
+        self._cache = cache
+        self.max_bytes = max_bytes
+        self._search_index = search_index
+        self.index_pages = index_pages
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client used for requests."""
+        return self._client if self._client is not None else get_http_client()
+
+    @property
+    def cache(self) -> ResponseCache:
+        """Response cache used for GET requests."""
+        if self._cache is None:
+            self._cache = get_response_cache()
+        return self._cache
+
+    @property
+    def search_index(self) -> DocumentIndex:
+        """Search index fetched pages are added to."""
+        if self._search_index is None:
+            self._search_index = get_search_index()
+        return self._search_index
+
     async def execute(
         self,
         url: str,
         method: str = "GET",
         headers: Optional[dict] = None,
         data: Optional[dict] = None,
-        timeout: Optional[float] = 30.0
+        timeout: Optional[float] = 30.0,
+        use_cache: bool = True
     ) -> ToolResult:
         """Execute the read URL tool.
-        
+
         Args:
             url: URL to read from
             method: HTTP method to use (GET or POST)
             headers: Optional HTTP headers
             data: Optional data to send with POST request
             timeout: Optional timeout in seconds
-            
+            use_cache: Whether GET responses may be cached
+
         Returns:
             ToolResult containing success status and URL content
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
+            return ToolResult(
+                success=True,
+                data=await self.fetch(
+                    url,
                     method=method,
-                    url=url,
                     headers=headers,
-                    json=data if method == "POST" else None,
-                    timeout=timeout
+                    data=data,
+                    timeout=timeout,
+                    use_cache=use_cache
                 )
-                
-                response.raise_for_status()
-                
-                return ToolResult(
-                    success=True,
-                    data={
-                        "content": response.text,
-                        "status_code": response.status_code,
-                        "headers": dict(response.headers)
-                    }
-                )
-                
+            )
+
         except httpx.HTTPError as e:
             return ToolResult(
                 success=False,
@@ -64,4 +165,103 @@ class ReadUrlTool(BaseTool):
             return ToolResult(
                 success=False,
                 error=str(e)
-            ) 
\ No newline at end of file
+            )
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[dict] = None,
+        data: Optional[dict] = None,
+        timeout: Optional[float] = 30.0,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Fetch a URL, using the response cache for GET requests.
+
+        Args:
+            url: URL to read from
+            method: HTTP method to use (GET or POST)
+            headers: Optional HTTP headers
+            data: Optional data to send with POST request
+            timeout: Optional timeout in seconds
+            use_cache: Whether GET responses may be cached
+
+        Returns:
+            Dictionary with content, status_code, headers and the
+            ``cached``/``truncated`` flags
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        method = method.upper()
+        request_headers = dict(headers or {})
+        # Responses to requests with credentials belong to that caller only
+        cacheable = use_cache and method == "GET" and not has_credentials(request_headers)
+
+        # Cache entries are files read and written off the event loop
+        cached = await asyncio.to_thread(self.cache.get, url, request_headers) if cacheable else None
+        if cached is not None:
+            if cached.is_fresh():
+                return self._cached_result(cached)
+            request_headers.update(cached.conditional_headers())
+
+        async with self.client.stream(
+            method,
+            url,
+            headers=request_headers,
+            json=data if method == "POST" else None,
+            timeout=timeout
+        ) as response:
+            if response.status_code == 304 and cached is not None:
+                refreshed = await asyncio.to_thread(self.cache.refresh, url, dict(response.headers), headers)
+                return self._cached_result(refreshed or cached)
+
+            response.raise_for_status()
+
+            body = bytearray()
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                remaining = self.max_bytes - len(body)
+                if len(chunk) > remaining:
+                    body.extend(chunk[:remaining])
+                    truncated = True
+                    break
+                body.extend(chunk)
+
+            response_headers = dict(response.headers)
+            if cacheable and not truncated:
+                await asyncio.to_thread(self.cache.put, url, response.status_code, response_headers, bytes(body), headers)
+
+            result = {
+                "content": bytes(body).decode(response.charset_encoding or "utf-8", errors="replace"),
+                "status_code": response.status_code,
+                "headers": response_headers,
+                "cached": False,
+                "truncated": truncated
+            }
+
+        if self.index_pages and method == "GET" and result["status_code"] == 200 and is_html(result):
+            try:
+                await asyncio.to_thread(self.search_index.add_html, url, result["content"])
+            except Exception:
+                logger.warning("Failed to index %s", url, exc_info=True)
+        return result
+
+    @staticmethod
+    def _cached_result(cached: CachedResponse) -> Dict[str, Any]:
+        return {
+            "content": cached.body.decode(_charset(cached.headers.get("content-type")), errors="replace"),
+            "status_code": cached.status_code,
+            "headers": cached.headers,
+            "cached": True,
+            "truncated": False
+        }
+
+
+def _charset(content_type: Optional[str]) -> str:
+    """Charset declared in a Content-Type header, defaulting to UTF-8."""
+    if not content_type:
+        return "utf-8"
+    message = Message()
+    message["content-type"] = content_type
+    return message.get_content_charset() or "utf-8"
@@ -0,0 +1,211 @@
+"""Tool for reading content from many URLs concurrently."""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..base import BaseTool, ToolParameter, ToolResult
+from .read_url import ReadUrlTool
+from .text_extraction import extract_main_text, is_html
+
+
+class ReadUrlsTool(BaseTool):
+    """Tool for reading content from many URLs concurrently.
+
+    URLs are fetched through a ``ReadUrlTool``, so they share its pooled
+    client and response cache. The number of requests in flight is bounded
+    both overall and per host, and the whole batch is bounded by a
+    deadline: URLs that have not finished by then are reported as failed
+    while the completed ones are still returned.
+    """
+
+    name: str = "read_urls"
+    description: str = "Read content from several URLs concurrently"
+    parameters = [
+        ToolParameter(
+            name="urls",
+            type="array",
+            description="URLs to read from",
+            required=True
+        ),
+        ToolParameter(
+            name="extract_text",
+            type="boolean",
+            description="Return the main text of HTML pages instead of raw HTML",
+            required=False,
+            default=False
+        ),
+        ToolParameter(
+            name="max_concurrency",
+            type="integer",
+            description="Maximum number of requests in flight",
+            required=False,
+            default=10
+        ),
+        ToolParameter(
+            name="per_host_limit",
+            type="integer",
+            description="Maximum number of requests in flight to one host",
+            required=False,
+            default=4
+        ),
+        ToolParameter(
+            name="timeout",
+            type="number",
+            description="Timeout in seconds for each request",
+            required=False,
+            default=30.0
+        ),
+        ToolParameter(
+            name="deadline",
+            type="number",
+            description="Total time in seconds for the whole batch",
+            required=False,
+            default=60.0
+        )
+    ]
+
+    def __init__(self, reader: Optional[ReadUrlTool] = None):
+        """Initialize the tool.
+
+        Args:
+            reader: Tool used for individual fetches (defaults to a new
+                ``ReadUrlTool`` using the shared client and cache)
+        """
+        super().__init__()
+        self.reader = reader if reader is not None else ReadUrlTool()
+
+    async def execute(
+        self,
+        urls: List[str],
+        extract_text: bool = False,
+        max_concurrency: int = 10,
+        per_host_limit: int = 4,
+        timeout: Optional[float] = 30.0,
+        deadline: Optional[float] = 60.0
+    ) -> ToolResult:
+        """Execute the read URLs tool.
+
+        Args:
+            urls: URLs to read from
+            extract_text: Whether to return the main text of HTML pages
+            max_concurrency: Maximum number of requests in flight
+            per_host_limit: Maximum number of requests in flight to one host
+            timeout: Timeout in seconds for each request
+            deadline: Total time in seconds for the whole batch
+
+        Returns:
+            ToolResult containing one result per URL, in input order
+        """
+        try:
+            if max_concurrency < 1 or per_host_limit < 1:
+                return ToolResult(
+                    success=False,
+                    error="max_concurrency and per_host_limit must be at least 1"
+                )
+
+            results = await self.fetch_all(
+                urls,
+                extract_text=extract_text,
+                max_concurrency=max_concurrency,
+                per_host_limit=per_host_limit,
+                timeout=timeout,
+                deadline=deadline
+            )
+            succeeded = sum(1 for result in results if result["success"])
+            return ToolResult(
+                success=True,
+                data={
+                    "results": results,
+                    "succeeded": succeeded,
+                    "failed": len(results) - succeeded,
+                    "timed_out": any(result.get("timed_out") for result in results)
+                }
+            )
+
+        except Exception as e:
+            return ToolResult(
+                success=False,
+                error=str(e)
+            )
+
+    async def fetch_all(
+        self,
+        urls: List[str],
+        extract_text: bool = False,
+        max_concurrency: int = 10,
+        per_host_limit: int = 4,
+        timeout: Optional[float] = 30.0,
+        deadline: Optional[float] = 60.0
+    ) -> List[Dict[str, Any]]:
+        """Fetch URLs concurrently.
+
+        Duplicate URLs are fetched once. Failures are reported per URL and
+        never abort the batch.
+
+        Args:
+            urls: URLs to read from
+            extract_text: Whether to return the main text of HTML pages
+            max_concurrency: Maximum number of requests in flight
+            per_host_limit: Maximum number of requests in flight to one host
+            timeout: Timeout in seconds for each request
+            deadline: Total time in seconds for the whole batch
+
+        Returns:
+            One result dictionary per input URL, in input order. Each has
+            ``url`` and ``success``, plus either the fetched fields of
+            ``ReadUrlTool.fetch`` or an ``error``.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return []
+
+        global_limit = asyncio.Semaphore(max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_host_limit)
+        )
+
+        async def fetch_one(url: str) -> Dict[str, Any]:
+            host = urlsplit(url).netloc.lower()
+            async with host_limits[host], global_limit:
+                start = time.perf_counter()
+                try:
+                    result = await self.reader.fetch(url, timeout=timeout)
+                except Exception as e:
+                    return {"url": url, "success": False, "error": str(e) or type(e).__name__}
+                elapsed = time.perf_counter() - start
+
+            if extract_text and is_html(result):
+                extracted = await asyncio.to_thread(extract_main_text, result["content"])
+                result["title"] = extracted["title"]
+                result["content"] = extracted["text"]
+                result.pop("headers", None)
+            result.update(url=url, success=True, elapsed=elapsed)
+            return result
+
+        tasks = {url: asyncio.create_task(fetch_one(url)) for url in unique_urls}
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        except BaseException:
+            pending = set(tasks.values())
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        by_url = {}
+        for url, task in tasks.items():
+            if task.done() and not task.cancelled():
+                by_url[url] = task.result()
+            else:
+                by_url[url] = {
+                    "url": url,
+                    "success": False,
+                    "timed_out": True,
+                    "error": f"Deadline of {deadline} seconds exceeded"
+                }
+        return [dict(by_url[url]) for url in urls]
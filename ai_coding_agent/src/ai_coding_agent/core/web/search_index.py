@@ -0,0 +1,311 @@
+"""Local full-text index of web pages and mirrored documentation."""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from ..memory_index import tokenize
+from .http_cache import DEFAULT_CACHE_DIR
+from .text_extraction import extract_main_text
+
+DOCS_DIRS_ENV = "AI_CODING_AGENT_DOCS_DIRS"
+
+DOCUMENT_EXTENSIONS = (".html", ".htm", ".md", ".rst", ".txt")
+
+_MARKDOWN_TITLE_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+# Source of documents fetched from the network, as opposed to a docs directory
+WEB_SOURCE = "web"
+
+
+def url_domain(url: str) -> str:
+    """Host name of a URL, lowercased and without port."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def docs_dirs_from_env() -> List[Tuple[Path, Optional[str]]]:
+    """Read the docs directories configured in ``AI_CODING_AGENT_DOCS_DIRS``.
+
+    The variable holds ``os.pathsep``-separated entries. Each entry is a
+    directory, optionally followed by ``=`` and the base URL the directory
+    mirrors, e.g. ``/srv/docs/python=https://docs.python.org/3``.
+    """
+    dirs = []
+    for entry in os.environ.get(DOCS_DIRS_ENV, "").split(os.pathsep):
+        entry = entry.strip()
+        if not entry:
+            continue
+        path, sep, base_url = entry.partition("=")
+        dirs.append((Path(path).expanduser(), base_url if sep else None))
+    return dirs
+
+
+class DocumentIndex:
+    """SQLite FTS5 index of documents, ranked with BM25.
+
+    Documents are keyed by URL. Pages fetched over the network are added
+    one at a time, while docs directories are indexed incrementally: only
+    files whose modification time changed are re-read, and files that
+    disappeared are dropped. Queries are answered by the FTS5 index, so
+    their cost does not grow with the amount of indexed text.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            rowid INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            domain TEXT NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            source TEXT NOT NULL,
+            mtime REAL,
+            indexed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS documents_domain ON documents(domain);
+        CREATE INDEX IF NOT EXISTS documents_source ON documents(source);
+        CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+            title, content, content='documents', content_rowid='rowid',
+            tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+            INSERT INTO documents_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF title, content ON documents BEGIN
+            INSERT INTO documents_fts(documents_fts, rowid, title, content)
+            VALUES ('delete', old.rowid, old.title, old.content);
+            INSERT INTO documents_fts(rowid, title, content)
+            VALUES (new.rowid, new.title, new.content);
+        END;
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        title_weight: float = 5.0,
+        snippet_tokens: int = 24
+    ):
+        """Open (or create) the index.
+
+        Args:
+            path: Database file path, or ":memory:" (defaults to a file in
+                the agent's cache directory)
+            title_weight: BM25 weight of title matches relative to content
+            snippet_tokens: Approximate number of tokens in result snippets
+        """
+        if path is None:
+            DEFAULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = DEFAULT_CACHE_DIR / "search.sqlite3"
+        self.path = str(path)
+        self.title_weight = title_weight
+        self.snippet_tokens = snippet_tokens
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+
+    def add(
+        self,
+        url: str,
+        title: str,
+        content: str,
+        source: str = WEB_SOURCE,
+        mtime: Optional[float] = None
+    ) -> None:
+        """Insert or replace a document.
+
+        Args:
+            url: Document URL
+            title: Document title
+            content: Plain text content
+            source: ``WEB_SOURCE`` or the docs directory the document came from
+            mtime: Modification time of the source file
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO documents (url, domain, title, content, source, mtime, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET domain = excluded.domain, title = excluded.title, "
+                "content = excluded.content, source = excluded.source, mtime = excluded.mtime, "
+                "indexed_at = excluded.indexed_at",
+                (url, url_domain(url), title, content, source, mtime, time.time())
+            )
+
+    def add_html(self, url: str, html: str, source: str = WEB_SOURCE, mtime: Optional[float] = None) -> None:
+        """Index the main text of an HTML page."""
+        extracted = extract_main_text(html)
+        self.add(url, extracted["title"] or url, extracted["text"], source=source, mtime=mtime)
+
+    def remove(self, url: str) -> bool:
+        """Remove a document.
+
+        Returns:
+            True if the document was indexed
+        """
+        with self._lock:
+            return self._conn.execute("DELETE FROM documents WHERE url = ?", (url,)).rowcount > 0
+
+    def index_directory(
+        self,
+        directory: Union[str, Path],
+        base_url: Optional[str] = None,
+        extensions: Iterable[str] = DOCUMENT_EXTENSIONS
+    ) -> Dict[str, int]:
+        """Bring the documents of a docs directory up to date.
+
+        Args:
+            directory: Directory to index recursively
+            base_url: URL the directory mirrors; documents get URLs under it
+                so that domain filters apply to them (defaults to file URLs)
+            extensions: File extensions to index
+
+        Returns:
+            Counts of ``added``, ``updated``, ``removed`` and ``unchanged`` documents
+        """
+        root = Path(directory).resolve()
+        source = str(root)
+        extensions = tuple(ext.lower() for ext in extensions)
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT url, mtime FROM documents WHERE source = ?", (source,)
+            ).fetchall())
+
+        seen = set()
+        updates = []
+        for file_path in root.rglob("*"):
+            if file_path.suffix.lower() not in extensions or not file_path.is_file():
+                continue
+            url = self._file_url(root, file_path, base_url)
+            seen.add(url)
+            try:
+                mtime = file_path.stat().st_mtime
+            except OSError:
+                continue
+            if known.get(url) == mtime:
+                counts["unchanged"] += 1
+                continue
+            try:
+                text = file_path.read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            updates.append((url, file_path, text, mtime))
+            counts["updated" if url in known else "added"] += 1
+
+        # Parse outside the lock, then write everything in one transaction
+        documents = [
+            (url, *self._parse_file(file_path, text), mtime)
+            for url, file_path, text, mtime in updates
+        ]
+        removed = [url for url in known if url not in seen]
+        counts["removed"] = len(removed)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for url, title, content, mtime in documents:
+                    self.add(url, title, content, source=source, mtime=mtime)
+                self._conn.executemany("DELETE FROM documents WHERE url = ?", [(url,) for url in removed])
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return counts
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        domain: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Search the index.
+
+        Documents matching any query word are ranked by BM25, with title
+        matches weighted higher than content matches.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            domain: Only return documents from this domain or its subdomains
+
+        Returns:
+            Results with ``title``, ``url``, ``snippet`` and ``score``, best first
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit < 1:
+            return []
+
+        sql = (
+            "SELECT d.title, d.url, snippet(documents_fts, 1, '', '', '...', ?), "
+            "bm25(documents_fts, ?, 1.0) AS rank "
+            "FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        params: List[Any] = [
+            self.snippet_tokens,
+            float(self.title_weight),
+            " OR ".join(f'"{token}"' for token in tokens)
+        ]
+        if domain:
+            domain = url_domain(domain) if "://" in domain else domain.lower().strip(".")
+            # Compared as a plain suffix; LIKE would treat _ and % in it as wildcards
+            sql += " AND (d.domain = ? OR substr(d.domain, -?) = ?)"
+            params.extend([domain, len(domain) + 1, f".{domain}"])
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"title": title, "url": url, "snippet": snippet, "score": -rank}
+            for title, url, snippet, rank in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _file_url(root: Path, file_path: Path, base_url: Optional[str]) -> str:
+        if base_url:
+            return f"{base_url.rstrip('/')}/{file_path.relative_to(root).as_posix()}"
+        return file_path.as_uri()
+
+    @staticmethod
+    def _parse_file(file_path: Path, text: str) -> Tuple[str, str]:
+        if file_path.suffix.lower() in (".html", ".htm"):
+            extracted = extract_main_text(text)
+            return extracted["title"] or file_path.stem, extracted["text"]
+        if file_path.suffix.lower() == ".md":
+            match = _MARKDOWN_TITLE_RE.search(text)
+            if match:
+                return match.group(1).strip(), text
+        return file_path.stem, text
+
+
+_default_index: Optional[DocumentIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_search_index() -> DocumentIndex:
+    """Get the process-wide document index."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = DocumentIndex()
+        return _default_index
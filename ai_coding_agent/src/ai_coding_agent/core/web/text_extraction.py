@@ -0,0 +1,50 @@
+"""Extraction of readable text from fetched documents."""
+
+import re
+from typing import Any, Dict, Optional
+
+from bs4 import BeautifulSoup
+
+# Elements that never carry the main text of a page
+_BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "svg", "canvas",
+    "iframe", "form", "nav", "header", "footer", "aside"
+)
+
+
+def extract_main_text(html: str) -> Dict[str, Optional[str]]:
+    """Extract the title and readable main text from an HTML document.
+
+    Scripts, styles and navigation chrome are dropped. If the page marks
+    up its main content with ``<main>``, ``<article>`` or ``role="main"``,
+    only that part is kept.
+
+    Args:
+        html: HTML document
+
+    Returns:
+        Dictionary with ``title`` and ``text``
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else None
+
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+
+    root = (
+        soup.find("main")
+        or soup.find(attrs={"role": "main"})
+        or soup.find("article")
+        or soup.body
+        or soup
+    )
+    text = root.get_text("\n", strip=True)
+    return {"title": title, "text": re.sub(r"\n{3,}", "\n\n", text)}
+
+
+def is_html(result: Dict[str, Any]) -> bool:
+    """Whether a fetch result holds an HTML document."""
+    content_type = result.get("headers", {}).get("content-type", "")
+    if content_type:
+        return "html" in content_type.lower()
+    return result.get("content", "").lstrip()[:15].lower().startswith(("<!doctype html", "<html"))
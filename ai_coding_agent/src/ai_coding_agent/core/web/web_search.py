@@ -1,12 +1,27 @@
 """Web search tool."""
 
-from typing import Optional
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 from ..base import BaseTool, ToolParameter, ToolResult
+from .search_index import DocumentIndex, docs_dirs_from_env, get_search_index
+
+logger = logging.getLogger(__name__)
 
 
 class WebSearchTool(BaseTool):
-    """Tool for performing web searches."""
+    """Tool for performing web searches.
+
+    Searches run against a local full-text index rather than a search
+    engine, so they work offline. The index holds the pages fetched with
+    ``read_url`` and the documents of the configured docs directories
+    (see ``AI_CODING_AGENT_DOCS_DIRS``), which are re-scanned incrementally
+    at most every ``refresh_interval`` seconds.
+    """
 
     name = "web_search"
     description = "Search the web for information"
@@ -23,41 +38,94 @@ class WebSearchTool(BaseTool):
             description="Number of results to return",
             required=False,
             default=5
+        ),
+        ToolParameter(
+            name="domain",
+            type="string",
+            description="Optional domain to filter results",
+            required=False
         )
     ]
 
+    def __init__(
+        self,
+        index: Optional[DocumentIndex] = None,
+        docs_dirs: Optional[List[Tuple[Path, Optional[str]]]] = None,
+        refresh_interval: float = 300.0
+    ):
+        """Initialize the tool.
+
+        Args:
+            index: Document index to search (defaults to the process-wide index)
+            docs_dirs: ``(directory, base_url)`` pairs to keep indexed
+                (defaults to ``AI_CODING_AGENT_DOCS_DIRS``)
+            refresh_interval: Minimum seconds between re-scans of the docs directories
+        """
+        super().__init__()
+        self._index = index
+        self.docs_dirs = docs_dirs if docs_dirs is not None else docs_dirs_from_env()
+        self.refresh_interval = refresh_interval
+        self._refreshed_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def index(self) -> DocumentIndex:
+        """Document index searched by the tool."""
+        if self._index is None:
+            self._index = get_search_index()
+        return self._index
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-scan the docs directories if the refresh interval has passed."""
+        with self._refresh_lock:
+            now = time.monotonic()
+            if (
+                not force
+                and self._refreshed_at is not None
+                and now - self._refreshed_at < self.refresh_interval
+            ):
+                return
+            for directory, base_url in self.docs_dirs:
+                if not directory.is_dir():
+                    logger.warning("Docs directory %s does not exist", directory)
+                    continue
+                counts = self.index.index_directory(directory, base_url=base_url)
+                logger.debug("Indexed %s: %s", directory, counts)
+            self._refreshed_at = now
+
     async def execute(
         self,
         query: str,
-        num_results: Optional[int] = 5
+        num_results: Optional[int] = 5,
+        domain: Optional[str] = None
     ) -> ToolResult:
         """Execute the web search operation.
 
         Args:
             query: The search query
             num_results: Number of results to return
+            domain: Optional domain to filter results
 
         Returns:
             ToolResult containing the search results
         """
         try:
-            # TODO: Implement actual web search functionality
-            # This is a placeholder implementation
+            if self.docs_dirs:
+                await asyncio.to_thread(self.refresh)
+
+            results = await asyncio.to_thread(
+                self.index.search,
+                query,
+                limit=num_results or 5,
+                domain=domain
+            )
             return ToolResult(
                 success=True,
-                data={
-                    "results": [
-                        {
-                            "title": "Example Result",
-                            "url": "https://example.com",
-                            "snippet": "This is an example search result."
-                        }
-                    ]
-                }
+                data={"results": results}
             )
 
         except Exception as e:
             return ToolResult(
                 success=False,
                 error=f"Error performing web search: {str(e)}"
-            ) 
\ No newline at end of file
+            )
@@ -1,6 +1,16 @@
-"""Interfaces for the AI Coding Agent Toolset."""
+"""Interfaces for the AI Coding Agent Toolset.
 
-from .langchain import AICodingAgentToolkit
-from .mcp import MCPServer
+Each interface is imported on first access, so using one does not import
+the dependencies of the others.
+"""
 
-__all__ = ["AICodingAgentToolkit", "MCPServer"] 
\ No newline at end of file
+from ..core.lazy import lazy_exports
+
+_EXPORTS = {
+    "AICodingAgentToolkit": ".langchain",
+    "MCPServer": ".mcp",
+    "MCPCluster": ".mcp_cluster"
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
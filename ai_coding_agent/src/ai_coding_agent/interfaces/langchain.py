@@ -1,26 +1,55 @@
 """LangChain interface for the AI Coding Agent."""
 
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, Field, create_model
 from langchain.tools import BaseTool as LangChainBaseTool
+from langchain_core.tools import StructuredTool
 
 from ..core.base import BaseTool
+from ..core.dispatch import ToolDispatcher
+from ..core.loop_runner import BackgroundLoop, get_background_loop
+from ..core.registry import PARAMETER_TYPES
 from ..core.file_system import ListDirectoryTool, FileSearchTool, GrepSearchTool
-from ..core.web import WebSearchTool, ReadUrlTool
+from ..core.web import WebSearchTool, ReadUrlTool, ReadUrlsTool
 from ..core.code_modification import ProposeCodeTool, ViewCodeTool, ViewFileTool
-from ..core.lsp import SemanticSearchTool, SymbolInfoTool, CodeNavigationTool
+from ..core.lsp import SemanticSearchTool, SymbolInfoTool, CodeNavigationTool, RepoMapTool
 from ..core.control import PushActionTool, ShowActionsTool, GetNextActionTool, ClearActionsTool
 
 class AICodingAgentToolkit:
-    """Toolkit for integrating AI Coding Agent tools with LangChain."""
-    
-    def __init__(self):
-        """Initialize the toolkit."""
+    """Toolkit for integrating AI Coding Agent tools with LangChain.
+
+    Asynchronous tool calls are awaited on the caller's event loop.
+    Synchronous calls run on a shared background event loop instead of a
+    new loop per call, so they work inside running loops too and resources
+    bound to a loop, such as HTTP connection pools, are reused. Both go
+    through a ``ToolDispatcher``, so blocking tools do not hold up other
+    calls and an agent can run several tool calls at once.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Optional[ToolDispatcher] = None,
+        loop: Optional[BackgroundLoop] = None
+    ):
+        """Initialize the toolkit.
+
+        Args:
+            dispatcher: Dispatcher running the tool calls
+            loop: Loop running synchronous calls (defaults to the
+                process-wide background loop)
+        """
+        self.dispatcher = dispatcher or ToolDispatcher()
+        self.loop = loop or get_background_loop()
         self.tools = self._create_tools()
-        
+
+    def get_tools(self) -> List[LangChainBaseTool]:
+        """Get the LangChain tools of the toolkit."""
+        return list(self.tools)
+
     def _create_tools(self) -> List[LangChainBaseTool]:
         """Create LangChain tools from AI Coding Agent tools.
-        
+
         Returns:
             List of LangChain tools
         """
@@ -31,70 +60,67 @@ class AICodingAgentToolkit:
             self._convert_tool(GrepSearchTool()),
             self._convert_tool(WebSearchTool()),
             self._convert_tool(ReadUrlTool()),
+            self._convert_tool(ReadUrlsTool()),
             self._convert_tool(ProposeCodeTool()),
             self._convert_tool(ViewCodeTool()),
             self._convert_tool(ViewFileTool()),
             self._convert_tool(SemanticSearchTool()),
             self._convert_tool(SymbolInfoTool()),
             self._convert_tool(CodeNavigationTool()),
+            self._convert_tool(RepoMapTool()),
             self._convert_tool(PushActionTool()),
             self._convert_tool(ShowActionsTool()),
             self._convert_tool(GetNextActionTool()),
             self._convert_tool(ClearActionsTool())
         ]
-        
+
+    @staticmethod
+    def _args_schema(tool: BaseTool) -> Type[BaseModel]:
+        """Create a Pydantic model for a tool's arguments."""
+        fields: Dict[str, Any] = {}
+        for param in tool.parameters:
+            annotation = PARAMETER_TYPES.get(param.type, Any)
+            if param.required:
+                fields[param.name] = (annotation, Field(description=param.description))
+            else:
+                fields[param.name] = (
+                    Optional[annotation],
+                    Field(default=param.default, description=param.description)
+                )
+        name = "".join(part.capitalize() for part in tool.name.split("_"))
+        return create_model(f"{name}Arguments", **fields)
+
     def _convert_tool(self, tool: BaseTool) -> LangChainBaseTool:
         """Convert an AI Coding Agent tool to a LangChain tool.
-        
+
         Args:
             tool: AI Coding Agent tool to convert
-            
+
         Returns:
             LangChain tool
         """
-        # Create a Pydantic model for the tool's arguments
-        args_schema_class = type(
-            f'{tool.name.capitalize()}Arguments',
-            (BaseModel,),
-            {
-                '__annotations__': {
-                    param.name: (str if param.type == "string" else bool, Field(
-                        description=param.description,
-                        required=param.required
-                    ))
-                    for param in tool.parameters
-                }
-            }
+        dispatcher = self.dispatcher
+        loop = self.loop
+
+        def run(**kwargs) -> str:
+            """Run the tool on the background loop and wait for it."""
+            result = loop.run(dispatcher.dispatch(tool, _given(kwargs)))
+            return str(result.data if result.success else result.error)
+
+        async def arun(**kwargs) -> str:
+            """Run the tool on the caller's event loop."""
+            result = await dispatcher.dispatch(tool, _given(kwargs))
+            return str(result.data if result.success else result.error)
+
+        return StructuredTool.from_function(
+            func=run,
+            coroutine=arun,
+            name=tool.name,
+            description=tool.description,
+            args_schema=self._args_schema(tool)
         )
-        
-        class LangChainTool(LangChainBaseTool):
-            name = tool.name
-            description = tool.description
-            args_schema = args_schema_class
-            
-            def _run(self, **kwargs) -> str:
-                """Run the tool.
-                
-                Args:
-                    **kwargs: Tool arguments
-                    
-                Returns:
-                    Tool result as string
-                """
-                import asyncio
-                result = asyncio.run(tool.execute(**kwargs))
-                return str(result.data if result.success else result.error)
-                
-            async def _arun(self, **kwargs) -> str:
-                """Run the tool asynchronously.
-                
-                Args:
-                    **kwargs: Tool arguments
-                    
-                Returns:
-                    Tool result as string
-                """
-                result = await tool.execute(**kwargs)
-                return str(result.data if result.success else result.error)
-                
-        return LangChainTool() 
\ No newline at end of file
+
+
+def _given(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Leave unset optional arguments to the tool's own defaults
+    return {name: value for name, value in kwargs.items() if value is not None}
@@ -1,33 +1,25 @@
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+import functools
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
 from starlette.applications import Starlette
 from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Mount, Route
 import uvicorn
 
-from ..core.base import BaseTool
-from ..core.file_system import ListDirectoryTool, GrepSearchTool
-from ..core.web import WebSearchTool, ReadUrlTool
-from ..core.code_modification import (
-    ProposeCodeTool,
-    ViewCodeTool,
-    ViewFileTool
-)
-from ..core.lsp import (
-    SemanticSearchTool,
-    SymbolInfoTool,
-    CodeNavigationTool
-)
-from ..core.control import (
-    PushActionTool,
-    ShowActionsTool,
-    GetNextActionTool,
-    ClearActionsTool
-)
+from ..core.control import ActionExecutor, get_action_queue
+from ..core.dispatch import ToolDispatcher
+from ..core.lsp.repo_map import RepoMapTool
+from ..core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from ..core.registry import CONTROL_TOOL_NAMES, ToolRegistry, create_default_registry
+from ..core.tracing import SpanContext
+from ..core.watcher import ChangeSet, FileWatcher
 
 
 # File System Tool Models
@@ -84,6 +76,7 @@ class GrepSearchRequest(BaseModel):
 class WebSearchRequest(BaseModel):
     query: str = Field(..., description="Search query")
     num_results: int = Field(5, description="Number of results to return")
+    domain: Optional[str] = Field(None, description="Optional domain to filter results")
 
     class Config:
         json_schema_extra = {
@@ -107,6 +100,24 @@ class ReadUrlContentRequest(BaseModel):
         }
 
 
+class ReadUrlsRequest(BaseModel):
+    urls: List[str] = Field(..., description="URLs to read from")
+    extract_text: bool = Field(False, description="Return the main text of HTML pages instead of raw HTML")
+    max_concurrency: int = Field(10, description="Maximum number of requests in flight")
+    per_host_limit: int = Field(4, description="Maximum number of requests in flight to one host")
+    timeout: float = Field(30.0, description="Request timeout in seconds")
+    deadline: float = Field(60.0, description="Total time in seconds for the whole batch")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "urls": ["https://example.com/a", "https://example.com/b"],
+                "extract_text": True,
+                "deadline": 20.0
+            }
+        }
+
+
 # Code Modification Tool Models
 class CodeChange(BaseModel):
     type: str = Field(..., description="Type of change (add, remove, modify)")
@@ -229,6 +240,9 @@ class ToolParameters(BaseModel):
 class PushActionRequest(BaseModel):
     tool_name: str = Field(..., description="Name of the tool to execute")
     parameters: Dict[str, Any] = Field(..., description="Parameters for the tool")
+    depends_on: Optional[List[int]] = Field(None, description="IDs of actions that must complete first")
+    priority: Optional[int] = Field(None, description="Priority of the action (higher runs first)")
+    timeout: Optional[float] = Field(None, description="Timeout for the action in seconds")
 
     class Config:
         json_schema_extra = {
@@ -287,157 +301,190 @@ class ToolResponse(BaseModel):
 class MCPServer:
     """MCP server for exposing AI Coding Agent tools."""
     
-    def __init__(self, host: str = "0.0.0.0", port: int = 8000):
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        action_workers: int = 4,
+        registry: Optional[ToolRegistry] = None,
+        dispatcher: Optional[ToolDispatcher] = None,
+        state_dir: Union[str, Path, None] = None,
+        worker_id: Optional[int] = None,
+        watch_dir: Union[str, Path, None] = None
+    ):
+        """Initialize the server.
+
+        Args:
+            host: Host to bind to
+            port: Port to listen on
+            action_workers: Number of workers draining the action queue
+            registry: Tools to expose (defaults to the core tools)
+            dispatcher: Dispatcher that keeps blocking tools off the event
+                loop (defaults to the registry's, or a new one)
+            state_dir: Directory holding state shared with other server
+                processes (see ``create_default_registry``)
+            worker_id: Worker number when running behind ``MCPCluster``;
+                message URLs then name the worker so they reach this process
+            watch_dir: Directory to watch for file changes while the server
+                runs; changes are published to ``watcher`` subscribers,
+                cached tool results depending on changed files are dropped,
+                and ``repo_map`` re-parses only the changed files. While
+                the watcher runs, cache hits skip checking file stamps.
+        """
         self.host = host
         self.port = port
+        self.worker_id = worker_id
         self.mcp = FastMCP("ai_coding_agent")
+        if registry is None:
+            registry = create_default_registry(state_dir=state_dir)
+        self.registry = registry
+        self.dispatcher = dispatcher or registry.dispatcher or ToolDispatcher()
+        registry.dispatcher = self.dispatcher
+        self.action_queue = registry.resources.get("action_queue") or get_action_queue()
+        self.executor = ActionExecutor(
+            tools=registry.subset(exclude=CONTROL_TOOL_NAMES),
+            queue=self.action_queue,
+            max_workers=action_workers,
+            dispatcher=self.dispatcher
+        )
+        self.metrics = self.dispatcher.metrics.registry
+        self.open_sessions = self.metrics.gauge(
+            "ai_coding_agent_sse_sessions", "Open SSE sessions"
+        )
+        self.sessions_total = self.metrics.counter(
+            "ai_coding_agent_sse_sessions_total", "SSE sessions opened"
+        )
+        self.watcher = FileWatcher(watch_dir) if watch_dir is not None else None
+        if self.watcher is not None:
+            self.watcher.subscribe(self._files_changed)
+            for tool in registry:
+                if isinstance(tool, RepoMapTool):
+                    tool.watch(self.watcher)
         self._register_tools()
     
+    def _files_changed(self, changes: ChangeSet) -> None:
+        """Drop cached tool results made stale by a batch of file changes."""
+        cache = self.dispatcher.result_cache
+        if cache is None:
+            return
+        if changes.overflow:
+            cache.clear()
+        else:
+            cache.invalidate(changes.paths)
+
     def _register_tools(self) -> None:
-        """Register all tools with the MCP server."""
-        
-        @self.mcp.tool()
-        async def list_dir(
-            directory_path: str,
-            include_pattern: Optional[str] = None,
-            exclude_pattern: Optional[str] = None,
-            sort_by: str = "name",
-            sort_order: str = "asc"
-        ) -> Dict[str, Any]:
-            """List directory contents."""
-            tool = ListDirectoryTool()
-            result = await tool.execute(
-                directory_path=directory_path,
-                include_pattern=include_pattern,
-                exclude_pattern=exclude_pattern,
-                sort_by=sort_by
+        """Register all tools with the MCP server.
+
+        Each tool is registered once under its own name, with an input
+        schema generated from its declared parameters. Handlers call the
+        registry's tool instances, so tool state persists across requests.
+        """
+        for tool in self.registry:
+            self.mcp.add_tool(
+                self._traced(self.registry.handler(tool.name), tool.name),
+                name=tool.name,
+                description=tool.description
             )
-            return {
-                "success": result.success,
-                "data": result.data if result.success else None,
-                "error": result.error if not result.success else None
-            }
-        
-        @self.mcp.tool()
-        async def find_by_name(search_path: str, pattern: str, recursive: bool = True) -> Dict[str, Any]:
-            """Find files by name pattern."""
-            tool = FindByNameTool()
-            result = await tool.execute(search_path=search_path, pattern=pattern, recursive=recursive)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def grep_search(search_path: str, query: str, case_insensitive: bool = True) -> Dict[str, Any]:
-            """Search for text in files."""
-            tool = GrepSearchTool()
-            result = await tool.execute(search_path=search_path, query=query, case_insensitive=case_insensitive)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def web_search(query: str, num_results: int = 5) -> Dict[str, Any]:
-            """Search the web."""
-            tool = WebSearchTool()
-            result = await tool.execute(query=query, num_results=num_results)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def read_url_content(url: str, timeout: int = 30) -> Dict[str, Any]:
-            """Read content from a URL."""
-            tool = ReadUrlContentTool()
-            result = await tool.execute(url=url, timeout=timeout)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def propose_code(file_path: str, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
-            """Propose code changes."""
-            tool = ProposeCodeTool()
-            result = await tool.execute(file_path=file_path, changes=changes)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def view_code_item(file_path: str, line: int) -> Dict[str, Any]:
-            """View code item details."""
-            tool = ViewCodeItemTool()
-            result = await tool.execute(file_path=file_path, line=line)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def view_file(file_path: str, start_line: int, end_line: int) -> Dict[str, Any]:
-            """View file contents."""
-            tool = ViewFileTool()
-            result = await tool.execute(file_path=file_path, start_line=start_line, end_line=end_line)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def semantic_search(query: str, workspace_path: str, language: str) -> Dict[str, Any]:
-            """Search code semantically."""
-            tool = SemanticSearchTool()
-            result = await tool.execute(query=query, workspace_path=workspace_path, language=language)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def symbol_info(file_path: str, position: Dict[str, int], language: str) -> Dict[str, Any]:
-            """Get symbol information."""
-            tool = SymbolInfoTool()
-            result = await tool.execute(file_path=file_path, position=position, language=language)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def code_navigation(file_path: str, position: Dict[str, int], language: str, action: str) -> Dict[str, Any]:
-            """Navigate code."""
-            tool = CodeNavigationTool()
-            result = await tool.execute(file_path=file_path, position=position, language=language, action=action)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def push_action(tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
-            """Push an action to the queue."""
-            tool = PushActionTool()
-            result = await tool.execute(tool_name=tool_name, parameters=parameters)
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def show_actions() -> Dict[str, Any]:
-            """Show all actions in the queue."""
-            tool = ShowActionsTool()
-            result = await tool.execute()
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def get_next_action() -> Dict[str, Any]:
-            """Get the next action from the queue."""
-            tool = GetNextActionTool()
-            result = await tool.execute()
-            return {"success": result.success, "data": result.data, "error": result.error}
-        
-        @self.mcp.tool()
-        async def clear_actions() -> Dict[str, Any]:
-            """Clear all actions from the queue."""
-            tool = ClearActionsTool()
-            result = await tool.execute()
-            return {"success": result.success, "data": result.data, "error": result.error}
+
+    def _traced(
+        self,
+        handler: Callable[..., Awaitable[Dict[str, Any]]],
+        tool_name: str
+    ) -> Callable[..., Awaitable[Dict[str, Any]]]:
+        """Wrap a handler in an ``mcp.call_tool`` span.
+
+        A ``traceparent`` in the request metadata makes the span a child of
+        the client's span, so both sides end up in one trace.
+        """
+        tracer = self.dispatcher.tracer
+
+        @functools.wraps(handler)
+        async def handle(**kwargs) -> Dict[str, Any]:
+            try:
+                meta = self.mcp._mcp_server.request_context.meta
+            except LookupError:
+                meta = None
+            parent = SpanContext.from_traceparent(getattr(meta, "traceparent", None))
+            with tracer.span("mcp.call_tool", {"tool": tool_name}, parent=parent):
+                return await handler(**kwargs)
+
+        return handle
     
+    @property
+    def messages_path(self) -> str:
+        """Path that clients post their messages to."""
+        if self.worker_id is None:
+            return "/messages/"
+        return f"/workers/{self.worker_id}/messages/"
+
     def create_starlette_app(self, debug: bool = False) -> Starlette:
         """Create a Starlette application that can serve the MCP server with SSE."""
-        sse = SseServerTransport("/messages/")
+        sse = SseServerTransport(self.messages_path)
         mcp_server = self.mcp._mcp_server
 
-        async def handle_sse(request: Request) -> None:
-            async with sse.connect_sse(
-                    request.scope,
-                    request.receive,
-                    request._send,  # noqa: SLF001
-            ) as (read_stream, write_stream):
-                await mcp_server.run(
-                    read_stream,
-                    write_stream,
-                    mcp_server.create_initialization_options(),
-                )
+        async def handle_sse(request: Request) -> Response:
+            self.sessions_total.inc()
+            self.open_sessions.inc()
+            try:
+                async with sse.connect_sse(
+                        request.scope,
+                        request.receive,
+                        request._send,  # noqa: SLF001
+                ) as (read_stream, write_stream):
+                    await mcp_server.run(
+                        read_stream,
+                        write_stream,
+                        mcp_server.create_initialization_options(),
+                    )
+            finally:
+                self.open_sessions.dec()
+            # The stream has already been sent; this only ends the route
+            return Response()
+
+        async def handle_metrics(request: Request) -> Response:
+            return Response(self.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+        async def handle_health(request: Request) -> Response:
+            return JSONResponse({
+                "status": "ok",
+                "tools": len(self.registry),
+                "sessions": int(self.open_sessions.value()),
+                "worker_id": self.worker_id
+            })
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette):
+            cache = self.dispatcher.result_cache
+            revalidate = False
+            if self.watcher is not None:
+                await self.watcher.start()
+                if cache is not None and cache.validate:
+                    # The watcher reports every change, so hits can skip the stamp walk
+                    cache.clear()
+                    cache.validate = False
+                    revalidate = True
+            # Drain queued actions in the background while the server runs
+            await self.executor.start()
+            try:
+                yield
+            finally:
+                await self.executor.stop()
+                if self.watcher is not None:
+                    await self.watcher.stop()
+                if revalidate:
+                    # Entries stored without stamps cannot be validated
+                    cache.validate = True
+                    cache.clear()
+                self.dispatcher.shutdown()
 
         return Starlette(
             debug=debug,
+            lifespan=lifespan,
             routes=[
                 Route("/sse", endpoint=handle_sse),
-                Mount("/messages/", app=sse.handle_post_message),
+                Mount(self.messages_path, app=sse.handle_post_message),
+                Route("/metrics", endpoint=handle_metrics),
+                Route("/health", endpoint=handle_health),
             ],
         )
     
@@ -0,0 +1,281 @@
+"""Running several MCP server processes behind a single endpoint."""
+
+import asyncio
+import itertools
+import multiprocessing
+import socket
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+import uvicorn
+
+from ..core.web.http_cache import DEFAULT_CACHE_DIR
+
+# Headers that only apply to a single connection and must not be forwarded
+_HOP_BY_HOP = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length"
+})
+
+
+def _forward_headers(headers) -> Dict[str, str]:
+    return {name: value for name, value in headers.items() if name.lower() not in _HOP_BY_HOP}
+
+
+def _run_worker(worker_id: int, port: int, state_dir: str, action_workers: int) -> None:
+    """Entry point of a worker process."""
+    from .mcp import MCPServer
+
+    MCPServer(
+        host="127.0.0.1",
+        port=port,
+        action_workers=action_workers,
+        state_dir=state_dir,
+        worker_id=worker_id
+    ).start()
+
+
+class MCPCluster:
+    """Serves one MCP endpoint from several ``MCPServer`` processes.
+
+    Each worker is a separate process with its own event loop and GIL, so
+    CPU-heavy tool calls on one worker do not slow down sessions on the
+    others. A front proxy accepts SSE connections and hands each new session
+    to the worker with the fewest open sessions. Workers advertise message
+    URLs that contain their worker ID, so every message of a session is
+    routed back to the worker holding it.
+
+    State that must be seen by every session (the action queue, search
+    index and response cache) lives in ``state_dir`` and is shared through
+    SQLite and the file system. Queued actions are drained by
+    all workers together; each action is claimed by exactly one of them.
+
+    Example:
+        cluster = MCPCluster(workers=4, port=8000, state_dir="/var/lib/agent")
+        cluster.start()
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        state_dir: Union[str, Path, None] = None,
+        worker_port: Optional[int] = None,
+        action_workers: int = 4,
+        startup_timeout: float = 30.0
+    ):
+        """Initialize the cluster.
+
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            host: Host the proxy binds to
+            port: Port the proxy listens on
+            state_dir: Directory holding the shared state (defaults to
+                ``state`` in the cache directory)
+            worker_port: Port of the first worker; workers listen on
+                consecutive ports on 127.0.0.1 (defaults to ``port + 1``)
+            action_workers: Number of action queue workers per process
+            startup_timeout: Seconds to wait for the workers to come up
+        """
+        workers = workers if workers is not None else (multiprocessing.cpu_count() or 1)
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.state_dir = Path(state_dir) if state_dir is not None else DEFAULT_CACHE_DIR / "state"
+        self.worker_port = worker_port if worker_port is not None else port + 1
+        self.action_workers = action_workers
+        self.startup_timeout = startup_timeout
+        self.sessions: List[int] = [0] * workers
+        self._processes: List[multiprocessing.Process] = []
+        self._client: Optional[httpx.AsyncClient] = None
+        self._round_robin = itertools.count()
+
+    def worker_url(self, worker_id: int) -> str:
+        """Base URL of a worker."""
+        return f"http://127.0.0.1:{self.worker_port + worker_id}"
+
+    def start_workers(self) -> None:
+        """Start the worker processes and wait until they accept connections.
+
+        Raises:
+            RuntimeError: If a worker exits or does not come up in time
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        # Spawned workers do not inherit the proxy's event loop or sockets
+        context = multiprocessing.get_context("spawn")
+        for worker_id in range(self.workers):
+            process = context.Process(
+                target=_run_worker,
+                args=(worker_id, self.worker_port + worker_id, str(self.state_dir), self.action_workers),
+                name=f"mcp-worker-{worker_id}"
+            )
+            process.start()
+            self._processes.append(process)
+
+        deadline = time.monotonic() + self.startup_timeout
+        for worker_id, process in enumerate(self._processes):
+            while True:
+                try:
+                    with socket.create_connection(("127.0.0.1", self.worker_port + worker_id), timeout=1.0):
+                        break
+                except OSError:
+                    if not process.is_alive():
+                        self.stop_workers()
+                        raise RuntimeError(f"MCP worker {worker_id} exited with code {process.exitcode}")
+                    if time.monotonic() > deadline:
+                        self.stop_workers()
+                        raise RuntimeError(f"MCP worker {worker_id} did not start within {self.startup_timeout} seconds")
+                    time.sleep(0.05)
+
+    def stop_workers(self, timeout: float = 5.0) -> None:
+        """Stop the worker processes."""
+        processes, self._processes = self._processes, []
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    def _pick_worker(self) -> int:
+        # Least open sessions first; ties are broken round-robin
+        offset = next(self._round_robin)
+        order = [(offset + i) % self.workers for i in range(self.workers)]
+        return min(order, key=lambda worker_id: self.sessions[worker_id])
+
+    def create_starlette_app(self, debug: bool = False) -> Starlette:
+        """Create the proxy application in front of the workers."""
+
+        async def handle_sse(request: Request) -> Response:
+            worker_id = self._pick_worker()
+            upstream_request = self._client.build_request(
+                "GET",
+                f"{self.worker_url(worker_id)}/sse",
+                headers=_forward_headers(request.headers),
+                params=request.query_params
+            )
+            try:
+                upstream = await self._client.send(upstream_request, stream=True)
+            except httpx.HTTPError as e:
+                return Response(f"MCP worker {worker_id} unavailable: {e}", status_code=502)
+            self.sessions[worker_id] += 1
+
+            async def stream() -> AsyncIterator[bytes]:
+                try:
+                    async for chunk in upstream.aiter_raw():
+                        yield chunk
+                finally:
+                    self.sessions[worker_id] -= 1
+                    await upstream.aclose()
+
+            return StreamingResponse(
+                stream(),
+                status_code=upstream.status_code,
+                headers=_forward_headers(upstream.headers)
+            )
+
+        async def forward(request: Request, path: str) -> Response:
+            worker_id = request.path_params["worker_id"]
+            if not 0 <= worker_id < self.workers:
+                return Response(f"Unknown MCP worker: {worker_id}", status_code=404)
+            try:
+                upstream = await self._client.request(
+                    request.method,
+                    f"{self.worker_url(worker_id)}{path}",
+                    content=await request.body(),
+                    headers=_forward_headers(request.headers),
+                    params=request.query_params
+                )
+            except httpx.HTTPError as e:
+                return Response(f"MCP worker {worker_id} unavailable: {e}", status_code=502)
+            return Response(
+                upstream.content,
+                status_code=upstream.status_code,
+                headers=_forward_headers(upstream.headers)
+            )
+
+        async def handle_message(request: Request) -> Response:
+            return await forward(request, request.url.path)
+
+        async def handle_worker_metrics(request: Request) -> Response:
+            # Each worker keeps its own metrics; scrape them one by one
+            return await forward(request, "/metrics")
+
+        async def handle_worker_health(request: Request) -> Response:
+            return await forward(request, "/health")
+
+        async def handle_health(request: Request) -> Response:
+            workers = [
+                {"worker_id": worker_id, "alive": process.is_alive(), "sessions": self.sessions[worker_id]}
+                for worker_id, process in enumerate(self._processes)
+            ]
+            healthy = bool(workers) and all(worker["alive"] for worker in workers)
+            return JSONResponse(
+                {"status": "ok" if healthy else "degraded", "workers": workers},
+                status_code=200 if healthy else 503
+            )
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette):
+            await asyncio.to_thread(self.start_workers)
+            # SSE streams stay open indefinitely, so reads must not time out
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, read=None),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=64)
+            )
+            try:
+                yield
+            finally:
+                await self._client.aclose()
+                self._client = None
+                await asyncio.to_thread(self.stop_workers)
+
+        return Starlette(
+            debug=debug,
+            lifespan=lifespan,
+            routes=[
+                Route("/sse", endpoint=handle_sse),
+                Route("/workers/{worker_id:int}/messages/", endpoint=handle_message, methods=["POST"]),
+                Route("/workers/{worker_id:int}/metrics", endpoint=handle_worker_metrics),
+                Route("/workers/{worker_id:int}/health", endpoint=handle_worker_health),
+                Route("/health", endpoint=handle_health),
+            ],
+        )
+
+    def start(self) -> None:
+        """Start the workers and the proxy."""
+        uvicorn.run(
+            self.create_starlette_app(),
+            host=self.host,
+            port=self.port
+        )
+
+    async def start_async(self) -> None:
+        """Start the workers and the proxy asynchronously."""
+        config = uvicorn.Config(
+            self.create_starlette_app(),
+            host=self.host,
+            port=self.port
+        )
+        server = uvicorn.Server(config)
+        await server.serve()
@@ -1,79 +1,46 @@
 """
 Re-export tools from core modules for convenient direct importing.
 This module provides easy access to all tools available in the AI Coding Agent toolset.
+Tools are imported on first access.
 """
 
-# File System Tools
-from ..core.file_system import (
-    ListDirectoryTool,
-    FileSearchTool,
-    GrepSearchTool
-)
+from ..core.lazy import lazy_exports
 
-# Web Tools
-from ..core.web import (
-    WebSearchTool,
-    ReadUrlTool
-)
-
-# Code Modification Tools
-from ..core.code_modification import (
-    ProposeCodeTool,
-    ViewCodeTool,
-    ViewFileTool
-)
-
-# LSP Tools
-from ..core.lsp import (
-    SemanticSearchTool,
-    SymbolInfoTool,
-    CodeNavigationTool
-)
-
-# Control Tools
-from ..core.control import (
-    PushActionTool,
-    ShowActionsTool,
-    GetNextActionTool,
-    ClearActionsTool
-)
-
-# Base Tool Classes
-from ..core.base import (
-    BaseTool,
-    ToolParameter,
-    ToolResult
-)
-
-# Export all tools for convenient importing
-__all__ = [
+_EXPORTS = {
     # Base Tool Classes
-    "BaseTool",
-    "ToolParameter",
-    "ToolResult",
-    
+    "BaseTool": "..core.base",
+    "ToolParameter": "..core.base",
+    "ToolResult": "..core.base",
+
     # File System Tools
-    "ListDirectoryTool",
-    "FindByNameTool", 
-    "GrepSearchTool",
-    
+    "ListDirectoryTool": "..core.file_system",
+    "FileSearchTool": "..core.file_system",
+    "GrepSearchTool": "..core.file_system",
+
     # Web Tools
-    "WebSearchTool",
-    "ReadUrlContentTool",
-    
+    "WebSearchTool": "..core.web",
+    "ReadUrlTool": "..core.web",
+    "ReadUrlsTool": "..core.web",
+
     # Code Modification Tools
-    "ProposeCodeTool",
-    "ViewCodeItemTool",
-    "ViewFileTool",
-    
+    "ProposeCodeTool": "..core.code_modification",
+    "ViewCodeTool": "..core.code_modification",
+    "ViewFileTool": "..core.code_modification",
+
     # LSP Tools
-    "SemanticSearchTool",
-    "SymbolInfoTool",
-    "CodeNavigationTool",
-    
+    "SemanticSearchTool": "..core.lsp",
+    "SymbolInfoTool": "..core.lsp",
+    "CodeNavigationTool": "..core.lsp",
+    "RepoMapTool": "..core.lsp",
+
     # Control Tools
-    "PushActionTool",
-    "ShowActionsTool",
-    "GetNextActionTool",
-    "ClearActionsTool"
-]
+    "PushActionTool": "..core.control",
+    "ShowActionsTool": "..core.control",
+    "GetNextActionTool": "..core.control",
+    "ClearActionsTool": "..core.control",
+    "ProfilingTool": "..core.control"
+}
+
+# Export all tools for convenient importing
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
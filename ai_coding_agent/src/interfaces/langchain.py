@@ -3,6 +3,8 @@ from typing import Any, Dict, List, Optional, Type
 from langchain.tools import BaseTool as LangChainBaseTool
 from langchain.tools.base import ToolException
 
+from ai_coding_agent.core.loop_runner import get_background_loop
+
 from ..core.base import BaseTool
 from ..core.file_system import ListDirectoryTool, FindByNameTool, GrepSearchTool
 from ..core.web import WebSearchTool, ReadUrlContentTool
@@ -47,9 +49,8 @@ class AICodingAgentToolkit:
             
             def _run(self, **kwargs: Any) -> Any:
                 try:
-                    # Convert sync to async execution
-                    import asyncio
-                    result = asyncio.run(tool.execute(**kwargs))
+                    # Run on the shared background loop rather than a new loop per call
+                    result = get_background_loop().run(tool.execute(**kwargs))
                     
                     if not result.success:
                         raise ToolException(result.error)
@@ -58,9 +59,9 @@ class AICodingAgentToolkit:
                 except Exception as e:
                     raise ToolException(str(e))
             
-            def _arun(self, **kwargs: Any) -> Any:
+            async def _arun(self, **kwargs: Any) -> Any:
                 try:
-                    result = asyncio.run(tool.execute(**kwargs))
+                    result = await tool.execute(**kwargs)
                     
                     if not result.success:
                         raise ToolException(result.error)
@@ -55,6 +55,18 @@ def setup_test_environment():
                 file.unlink()
         test_dir.rmdir()
 
+@pytest.fixture(autouse=True)
+def isolated_web_state(tmp_path_factory, monkeypatch):
+    """Keep the process-wide response cache and search index out of the user's cache directory."""
+    from ai_coding_agent.core.web import http_cache, search_index
+
+    cache_dir = tmp_path_factory.mktemp("web-cache")
+    index = search_index.DocumentIndex(cache_dir / "search.sqlite3")
+    monkeypatch.setattr(http_cache, "_default_cache", http_cache.ResponseCache(cache_dir / "http"))
+    monkeypatch.setattr(search_index, "_default_index", index)
+    yield
+    index.close()
+
 @pytest.fixture
 def test_dir(tmp_path):
     """Create a temporary directory with test files."""
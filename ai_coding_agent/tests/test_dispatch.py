@@ -0,0 +1,218 @@
+"""Tests for the tool dispatcher."""
+
+import asyncio
+import statistics
+import threading
+import time
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.dispatch import ToolDispatcher, cancellation_requested
+
+
+class PingTool(BaseTool):
+    """Cheap tool that answers immediately on the event loop."""
+
+    name = "ping"
+    description = "Answer immediately"
+    parameters = []
+
+    async def execute(self) -> ToolResult:
+        return ToolResult(success=True, data={"thread": threading.get_ident()})
+
+
+class BlockingTool(BaseTool):
+    """Tool that blocks its thread like synchronous file I/O does."""
+
+    name = "blocking"
+    description = "Block for a while"
+    blocking = True
+    parameters = [
+        ToolParameter(name="seconds", type="number", description="Seconds to block", required=True)
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self.stopped_early = threading.Event()
+        self._lock = threading.Lock()
+
+    async def execute(self, seconds: float, cooperative: bool = False) -> ToolResult:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if cooperative and cancellation_requested():
+                    self.stopped_early.set()
+                    break
+                time.sleep(0.01)
+            return ToolResult(success=True, data={"thread": threading.get_ident()})
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class SpinTool(BaseTool):
+    """CPU-bound tool that spins until cancelled, then leaves a marker file."""
+
+    name = "spin"
+    description = "Spin until cancelled"
+    cpu_bound = True
+    parameters = [
+        ToolParameter(name="marker", type="string", description="File written when stopped", required=True)
+    ]
+
+    async def execute(self, marker: str) -> ToolResult:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if cancellation_requested():
+                with open(marker, "w") as f:
+                    f.write("cancelled")
+                break
+        return ToolResult(success=True)
+
+
+class SlowAsyncTool(BaseTool):
+    """Async tool that records whether it was cancelled."""
+
+    name = "slow_async"
+    description = "Sleep asynchronously"
+    parameters = []
+
+    def __init__(self):
+        super().__init__()
+        self.cancelled = False
+
+    async def execute(self) -> ToolResult:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return ToolResult(success=True)
+
+
+class FailingTool(BaseTool):
+    """Tool that raises."""
+
+    name = "failing"
+    description = "Raise an error"
+    blocking = True
+    parameters = []
+
+    async def execute(self) -> ToolResult:
+        raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+class TestToolDispatcher:
+    async def test_blocking_tools_run_off_the_event_loop(self):
+        """Test that blocking tools run on a worker thread."""
+        dispatcher = ToolDispatcher()
+        try:
+            result = await dispatcher.dispatch(BlockingTool(), {"seconds": 0})
+            assert result.success
+            assert result.data["thread"] != threading.get_ident()
+
+            result = await dispatcher.dispatch(PingTool(), {})
+            assert result.data["thread"] == threading.get_ident()
+        finally:
+            dispatcher.shutdown()
+
+    async def test_cheap_calls_stay_fast_during_heavy_work(self):
+        """Load test: p99 latency of cheap calls stays flat while blocking tools run."""
+        dispatcher = ToolDispatcher(max_threads=4)
+        heavy, ping = BlockingTool(), PingTool()
+
+        async def measure(calls: int):
+            latencies = []
+            for _ in range(calls):
+                start = time.perf_counter()
+                await dispatcher.dispatch(ping, {})
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+            return latencies
+
+        def p99(latencies):
+            return statistics.quantiles(latencies, n=100)[98]
+
+        try:
+            baseline = await measure(50)
+            heavy_calls = [
+                asyncio.create_task(dispatcher.dispatch(heavy, {"seconds": 0.5}))
+                for _ in range(4)
+            ]
+            loaded = await measure(50)
+            assert all(result.success for result in await asyncio.gather(*heavy_calls))
+        finally:
+            dispatcher.shutdown()
+
+        assert heavy.peak == 4
+        assert p99(loaded) < max(10 * p99(baseline), 0.02)
+
+    async def test_concurrency_limit(self):
+        """Test that per-tool concurrency limits are enforced."""
+        dispatcher = ToolDispatcher(concurrency_limits={"blocking": 1})
+        tool = BlockingTool()
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(dispatcher.dispatch(tool, {"seconds": 0.1}) for _ in range(3)))
+            assert time.perf_counter() - start >= 0.3
+            assert tool.peak == 1
+        finally:
+            dispatcher.shutdown()
+
+    async def test_timeout_cancels_blocking_call(self):
+        """Test that timed-out thread calls are asked to stop."""
+        dispatcher = ToolDispatcher(timeouts={"blocking": 0.1}, concurrency_limits={"blocking": 1})
+        tool = BlockingTool()
+        try:
+            result = await dispatcher.dispatch(tool, {"seconds": 5, "cooperative": True})
+            assert not result.success
+            assert result.error == "blocking timed out after 0.1 seconds"
+            assert await asyncio.to_thread(tool.stopped_early.wait, 1.0)
+
+            # The concurrency slot is released once the call has stopped
+            result = await dispatcher.dispatch(tool, {"seconds": 0}, timeout=1.0)
+            assert result.success
+        finally:
+            dispatcher.shutdown()
+
+    async def test_timeout_cancels_process_call(self, tmp_path):
+        """Test that timed-out process calls see the cancellation and stop."""
+        dispatcher = ToolDispatcher(max_processes=1, concurrency_limits={"spin": 1})
+        marker = tmp_path / "stopped"
+        try:
+            result = await dispatcher.dispatch(SpinTool(), {"marker": str(marker)}, timeout=0.5)
+            assert result.error == "spin timed out after 0.5 seconds"
+
+            for _ in range(100):
+                if marker.exists():
+                    break
+                await asyncio.sleep(0.05)
+            assert marker.read_text() == "cancelled"
+        finally:
+            dispatcher.shutdown()
+
+    async def test_timeout_cancels_async_call(self):
+        """Test that timed-out event loop calls are cancelled."""
+        dispatcher = ToolDispatcher()
+        tool = SlowAsyncTool()
+        result = await dispatcher.dispatch(tool, {}, timeout=0.05)
+        await asyncio.sleep(0)
+        assert not result.success
+        assert "timed out" in result.error
+        assert tool.cancelled
+
+    async def test_exceptions_become_error_results(self):
+        """Test that tool exceptions are reported as failed results."""
+        dispatcher = ToolDispatcher()
+        try:
+            result = await dispatcher.dispatch(FailingTool(), {})
+            assert not result.success
+            assert result.error == "Error executing failing: boom"
+        finally:
+            dispatcher.shutdown()
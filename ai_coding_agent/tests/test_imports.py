@@ -0,0 +1,64 @@
+"""Import-time regression tests.
+
+The package and its tool modules must stay cheap to import: CLI tools and
+short-lived workers pay for every import before doing any work.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Modules that only the interfaces and some tools need
+HEAVY_MODULES = ("langchain", "langchain_core", "mcp", "starlette", "uvicorn", "httpx", "bs4")
+
+# Cumulative import time budgets in seconds, with room for slow machines
+BUDGETS = {
+    "ai_coding_agent": 0.1,
+    "ai_coding_agent.core.file_system.list_dir": 1.0
+}
+
+
+def import_times(module: str) -> dict:
+    """Cumulative import time in seconds of each module imported by ``import module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=SRC
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_does_not_load_heavy_dependencies(module):
+    """Test that importing the package or a tool stays within its budget."""
+    times = import_times(module)
+    loaded = sorted(name for name in HEAVY_MODULES if name in times)
+    assert loaded == [], f"importing {module} loads {', '.join(loaded)}"
+    assert times[module] < BUDGETS[module], f"importing {module} took {times[module]:.3f}s"
+
+
+def test_exports_resolve_on_access():
+    """Test that lazily exported names are importable and importing them loads their modules."""
+    import ai_coding_agent
+    from ai_coding_agent import interfaces, tools
+    from ai_coding_agent.core import web
+
+    for package in (ai_coding_agent, ai_coding_agent.core, interfaces, tools, web):
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+        assert set(package.__all__) <= set(dir(package))
+
+    from ai_coding_agent import MCPServer
+    from ai_coding_agent.interfaces.mcp import MCPServer as DefinedServer
+    assert MCPServer is DefinedServer
+    with pytest.raises(AttributeError):
+        ai_coding_agent.NoSuchTool
@@ -0,0 +1,104 @@
+"""Tests for the background loop runner and the LangChain toolkit."""
+
+import asyncio
+import time
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.dispatch import ToolDispatcher
+from ai_coding_agent.core.loop_runner import BackgroundLoop
+from ai_coding_agent.interfaces.langchain import AICodingAgentToolkit
+
+
+class LoopTool(BaseTool):
+    """Async tool that sleeps and reports the event loop it ran on."""
+
+    name = "loop_info"
+    description = "Report the running event loop"
+    max_concurrency = 2
+    parameters = [
+        ToolParameter(name="seconds", type="number", description="Seconds to sleep", required=False, default=0)
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.loops = set()
+
+    async def execute(self, seconds: float = 0) -> ToolResult:
+        loop = asyncio.get_running_loop()
+        self.loops.add(id(loop))
+        await asyncio.sleep(seconds)
+        return ToolResult(success=True, data=id(loop))
+
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def toolkit(background_loop):
+    toolkit = AICodingAgentToolkit(dispatcher=ToolDispatcher(), loop=background_loop)
+    yield toolkit
+    toolkit.dispatcher.shutdown()
+
+
+class TestBackgroundLoop:
+    def test_calls_share_one_loop(self, background_loop):
+        """Test that every call runs on the same long-lived loop."""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = background_loop.run(current_loop())
+        assert background_loop.run(current_loop()) is first
+        assert first.is_running()
+
+    def test_timeout_and_own_thread(self, background_loop):
+        """Test timeouts and that the loop cannot wait on itself."""
+        with pytest.raises(TimeoutError):
+            background_loop.run(asyncio.sleep(5), timeout=0.05)
+
+        async def nested():
+            background_loop.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError, match="own thread"):
+            background_loop.run(nested())
+
+
+class TestToolkit:
+    def test_sync_calls_reuse_the_background_loop(self, toolkit):
+        """Test that sync calls work inside a running loop and share one loop."""
+        core_tool = LoopTool()
+        tool = toolkit._convert_tool(core_tool)
+
+        async def call_sync_from_running_loop():
+            return tool.invoke({})
+
+        first = asyncio.run(call_sync_from_running_loop())
+        assert tool.invoke({}) == first
+        assert len(core_tool.loops) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_calls_run_concurrently(self, toolkit):
+        """Test that async calls run on the caller's loop and overlap."""
+        core_tool = LoopTool()
+        tool = toolkit._convert_tool(core_tool)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(tool.ainvoke({"seconds": 0.2}) for _ in range(2)))
+        assert time.perf_counter() - start < 0.35
+        assert set(results) == {str(id(asyncio.get_running_loop()))}
+
+        # The tool's concurrency limit holds on both loops
+        assert tool.invoke({"seconds": 0}) != results[0]
+
+    def test_default_tools_have_schemas(self, toolkit):
+        """Test that every default tool converts with a typed argument schema."""
+        tools = {tool.name: tool for tool in toolkit.tools}
+        assert "list_dir" in tools
+        schema = tools["grep_search"].args_schema.model_json_schema()
+        assert schema["required"] == ["query"]
+        assert schema["properties"]["case_sensitive"]["default"] is True
+        assert "'contents'" in tools["list_dir"].invoke({"directory_path": "."})
@@ -0,0 +1,252 @@
+"""Tests for multi-worker MCP deployment and its shared state."""
+
+import asyncio
+import json
+import socket
+
+import httpx
+import pytest
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+import uvicorn
+
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.control import ActionExecutor, ActionStatus, SQLiteActionQueue
+from ai_coding_agent.core.registry import create_default_registry
+from ai_coding_agent.interfaces.mcp_cluster import MCPCluster
+
+
+class SleepTool(BaseTool):
+    """Tool that sleeps and reports which executor ran it."""
+
+    name = "sleep"
+    description = "Sleep for a while"
+    parameters = [
+        ToolParameter(name="seconds", type="number", description="Seconds to sleep", required=True)
+    ]
+
+    def __init__(self, label: str = ""):
+        super().__init__()
+        self.label = label
+
+    async def execute(self, seconds: float, fail: bool = False) -> ToolResult:
+        await asyncio.sleep(seconds)
+        if fail:
+            return ToolResult(success=False, error="requested failure")
+        return ToolResult(success=True, data={"worker": self.label})
+
+
+def free_port_range(count: int) -> int:
+    """Find ``count`` consecutive free ports and return the first."""
+    for _ in range(50):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            first = probe.getsockname()[1]
+        if first + count >= 65535:
+            continue
+        sockets = []
+        try:
+            for port in range(first, first + count):
+                sock = socket.socket()
+                sockets.append(sock)
+                sock.bind(("127.0.0.1", port))
+            return first
+        except OSError:
+            continue
+        finally:
+            for sock in sockets:
+                sock.close()
+    raise RuntimeError("No free port range found")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "actions.sqlite3"
+
+
+@pytest.mark.asyncio
+class TestSQLiteActionQueue:
+    async def test_state_is_shared_between_instances(self, db_path):
+        """Test that two queues on the same file see the same actions."""
+        first, second = SQLiteActionQueue(db_path), SQLiteActionQueue(db_path)
+        try:
+            action = first.push("list_dir", {"directory_path": "."}, priority=3, timeout=5)
+            seen = second.get(action.id)
+            assert seen.tool_name == "list_dir"
+            assert seen.parameters == {"directory_path": "."}
+            assert seen.priority == 3
+            assert seen.status == ActionStatus.PENDING
+
+            with pytest.raises(ValueError, match="Unknown dependency"):
+                second.push("list_dir", depends_on=[action.id + 1])
+        finally:
+            first.close()
+            second.close()
+
+    async def test_claims_are_exclusive(self, db_path):
+        """Test that each action is claimed by exactly one queue."""
+        queues = [SQLiteActionQueue(db_path) for _ in range(3)]
+        try:
+            for _ in range(30):
+                queues[0].push("sleep", {"seconds": 0})
+            claimed = []
+            for queue in queues * 20:
+                action = queue.claim_next()
+                if action is not None:
+                    claimed.append(action.id)
+            assert sorted(claimed) == list(range(1, 31))
+            assert all(queue.claim_next() is None for queue in queues)
+        finally:
+            for queue in queues:
+                queue.close()
+
+    async def test_waiters_see_changes_from_other_instances(self, db_path):
+        """Test that claim() wakes up when another process pushes an action."""
+        consumer, producer = SQLiteActionQueue(db_path, poll_interval=0.01), SQLiteActionQueue(db_path)
+        try:
+            claim = asyncio.create_task(consumer.claim())
+            await asyncio.sleep(0.05)
+            assert not claim.done()
+            action = producer.push("sleep", {"seconds": 0})
+            claimed = await asyncio.wait_for(claim, timeout=2)
+            assert claimed.id == action.id
+            assert producer.get(action.id).status == ActionStatus.RUNNING
+        finally:
+            consumer.close()
+            producer.close()
+
+    async def test_claimers_share_one_poller(self, db_path):
+        """Test that claim() callers on one loop are fed by a single poller."""
+        queue = SQLiteActionQueue(db_path, poll_interval=0.01)
+        try:
+            claims = [asyncio.create_task(queue.claim()) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            assert len(queue._pollers) == 1
+
+            first = queue.push("sleep", {"seconds": 0})
+            second = queue.push("sleep", {"seconds": 0})
+            done, pending = await asyncio.wait(claims, timeout=2, return_when=asyncio.ALL_COMPLETED)
+            assert sorted(task.result().id for task in done) == [first.id, second.id]
+
+            # Cancelling the last claimer stops the poller
+            pending.pop().cancel()
+            await asyncio.sleep(0.05)
+            assert queue._pollers == {}
+            assert queue.claim_next() is None
+        finally:
+            queue.close()
+
+    async def test_expired_leases_return_to_pending(self, db_path):
+        """Test that actions left running by a dead worker are claimed again."""
+        queue = SQLiteActionQueue(db_path, lease=0.1)
+        try:
+            action = queue.push("sleep", {"seconds": 0}, timeout=0.1)
+            assert queue.claim_next().id == action.id
+            assert queue.claim_next() is None
+
+            await asyncio.sleep(0.3)
+            reclaimed = queue.claim_next()
+            assert reclaimed.id == action.id
+            assert reclaimed.status == ActionStatus.RUNNING
+        finally:
+            queue.close()
+
+    async def test_dependencies_and_clear(self, db_path):
+        """Test that dependency and clear semantics match the in-memory queue."""
+        queue = SQLiteActionQueue(db_path)
+        try:
+            first = queue.push("sleep", {"seconds": 0})
+            second = queue.push("sleep", {"seconds": 0}, depends_on=[first.id])
+            third = queue.push("sleep", {"seconds": 0}, depends_on=[second.id])
+            urgent = queue.push("sleep", {"seconds": 0}, priority=10)
+
+            assert queue.peek_next().id == urgent.id
+            assert queue.claim_next().id == urgent.id
+            claimed = queue.claim_next()
+            assert claimed.id == first.id
+            assert queue.claim_next() is None
+
+            queue.fail(first.id, "boom")
+            assert queue.get(second.id).status == ActionStatus.SKIPPED
+            assert queue.get(third.id).status == ActionStatus.SKIPPED
+            assert queue.get(third.id).error == f"Dependency {second.id} skipped"
+
+            queue.complete(urgent.id, {"ok": True})
+            assert queue.get(urgent.id).result == {"ok": True}
+            assert queue.is_idle()
+            assert queue.clear(include_completed=True) == 4
+            assert queue.list(include_completed=True) == []
+        finally:
+            queue.close()
+
+    async def test_executors_share_the_queue(self, db_path):
+        """Test that executors on separate queue instances split the work."""
+        queues = [SQLiteActionQueue(db_path, poll_interval=0.01) for _ in range(2)]
+        try:
+            actions = [queues[0].push("sleep", {"seconds": 0.05}) for _ in range(8)]
+            async with ActionExecutor(tools=[SleepTool("a")], queue=queues[0], max_workers=2) as first, \
+                    ActionExecutor(tools=[SleepTool("b")], queue=queues[1], max_workers=2) as second:
+                assert await first.join(timeout=5)
+                assert await second.join(timeout=5)
+
+            finished = [queues[1].get(action.id) for action in actions]
+            assert all(action.status == ActionStatus.COMPLETED for action in finished)
+            assert {action.result["worker"] for action in finished} == {"a", "b"}
+        finally:
+            for queue in queues:
+                queue.close()
+
+
+@pytest.mark.asyncio
+class TestMCPCluster:
+    async def test_state_dir_registry_uses_shared_backends(self, tmp_path):
+        """Test that a state directory gives the registry file-backed state."""
+        registry = create_default_registry(state_dir=tmp_path)
+        assert isinstance(registry.resources["action_queue"], SQLiteActionQueue)
+        assert (tmp_path / "actions.sqlite3").exists()
+        assert (tmp_path / "search.sqlite3").exists()
+        assert not (tmp_path / "memories.sqlite3").exists()
+        registry.resources["action_queue"].close()
+
+    async def test_sessions_are_spread_and_state_is_shared(self, tmp_path):
+        """Test that sessions land on different workers and share the action queue."""
+        port = free_port_range(3)
+        cluster = MCPCluster(workers=2, port=port, state_dir=tmp_path, action_workers=1)
+        config = uvicorn.Config(cluster.create_starlette_app(), host="127.0.0.1", port=port, log_level="warning")
+        server = uvicorn.Server(config)
+        serving = asyncio.create_task(server.serve())
+        try:
+            while not server.started:
+                assert not serving.done(), "cluster failed to start"
+                await asyncio.sleep(0.05)
+
+            url = f"http://127.0.0.1:{port}/sse"
+            async with sse_client(url) as first_streams, sse_client(url) as second_streams:
+                async with ClientSession(*first_streams) as first, ClientSession(*second_streams) as second:
+                    await first.initialize()
+                    await second.initialize()
+                    assert sorted(cluster.sessions) == [1, 1]
+
+                    pushed = await first.call_tool(
+                        "push_action",
+                        {"tool_name": "list_dir", "parameters": {"directory_path": str(tmp_path)}}
+                    )
+                    action_id = json.loads(pushed.content[0].text)["data"]["action"]["id"]
+
+                    shown = await second.call_tool("show_actions", {"include_completed": True})
+                    actions = json.loads(shown.content[0].text)["data"]["actions"]
+                    assert action_id in [action["id"] for action in actions]
+
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+                health = (await client.get("/health")).json()
+                assert health["status"] == "ok"
+                assert [worker["alive"] for worker in health["workers"]] == [True, True]
+
+                metrics = await client.get("/workers/1/metrics")
+                assert metrics.status_code == 200
+                assert "ai_coding_agent_sse_sessions_total" in metrics.text
+        finally:
+            server.should_exit = True
+            await asyncio.wait_for(serving, timeout=30)
+
+        assert cluster.sessions == [0, 0]
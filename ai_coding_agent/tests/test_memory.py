@@ -0,0 +1,176 @@
+"""Tests for the memory manager and its search index."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from ai_coding_agent.core.memory import MemoryManager
+from ai_coding_agent.core.memory_index import MemoryIndex
+from ai_coding_agent.core.memory_storage import InMemoryStorage, SQLiteMemoryStorage
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def manager(request, tmp_path):
+    """Create a memory manager for each storage backend."""
+    if request.param == "memory":
+        storage = InMemoryStorage()
+    else:
+        storage = SQLiteMemoryStorage(tmp_path / "memories.sqlite3")
+    yield MemoryManager(storage=storage)
+    storage.close()
+
+
+class TestMemoryManager:
+    def test_search_ranks_by_relevance(self, manager):
+        """Test that memories mentioning the query more often rank first."""
+        manager.create_memory("Deployment", "We deploy with docker compose")
+        best = manager.create_memory("Docker notes", "Docker images are built by docker buildx")
+        manager.create_memory("Testing", "Run pytest before pushing")
+
+        results = manager.search_memories(query="docker")
+        assert [m.id for m in results][0] == best.id
+        assert len(results) == 2
+
+    def test_search_is_case_insensitive(self, manager):
+        """Test that queries match regardless of case."""
+        memory = manager.create_memory("API Keys", "Stored in the VAULT")
+        assert [m.id for m in manager.search_memories(query="vault")] == [memory.id]
+        assert [m.id for m in manager.search_memories(query="api KEYS")] == [memory.id]
+
+    def test_search_filters_by_tags_and_corpora(self, manager):
+        """Test that results must carry all requested tags and corpora."""
+        both = manager.create_memory("a", "shared text", tags={"x", "y"}, corpus_names={"repo"})
+        manager.create_memory("b", "shared text", tags={"x"}, corpus_names={"repo"})
+        manager.create_memory("c", "shared text", tags={"x", "y"}, corpus_names={"other"})
+
+        results = manager.search_memories(query="shared", tags={"x", "y"}, corpus_names={"repo"})
+        assert [m.id for m in results] == [both.id]
+        assert manager.search_memories(tags={"missing"}) == []
+
+    def test_update_and_delete_maintain_index(self, manager):
+        """Test that updates and deletions are reflected in search results."""
+        memory = manager.create_memory("title", "old content", tags={"old"})
+
+        manager.update_memory(memory.id, content="new content", tags={"new"})
+        assert manager.search_memories(query="old") == []
+        assert [m.id for m in manager.search_memories(query="new")] == [memory.id]
+        assert manager.search_memories(tags={"old"}) == []
+        assert [m.id for m in manager.search_memories(tags={"new"})] == [memory.id]
+
+        assert manager.delete_memory(memory.id)
+        assert manager.search_memories(query="new") == []
+        assert manager.search_memories() == []
+
+    def test_search_without_query_returns_most_recent_first(self, manager):
+        """Test that unfiltered results are ordered by recency."""
+        older = manager.create_memory("one", "first")
+        newer = manager.create_memory("two", "second")
+        older.updated_at = datetime.utcnow() - timedelta(days=1)
+        manager.storage.put(older)
+
+        assert [m.id for m in manager.search_memories()] == [newer.id, older.id]
+        assert [m.id for m in manager.search_memories(limit=1)] == [newer.id]
+
+    def test_search_without_content(self, manager):
+        """Test that content bodies can be left unloaded."""
+        memory = manager.create_memory("title", "a long body")
+        result = manager.search_memories(query="body", include_content=False)[0]
+        assert result.id == memory.id
+        assert result.content is None
+        assert manager.get_memory(memory.id).content == "a long body"
+
+    def test_lru_eviction(self, manager):
+        """Test that the least recently used memory is evicted at capacity."""
+        manager.storage.max_memories = 2
+        first = manager.create_memory("first", "one")
+        second = manager.create_memory("second", "two")
+        manager.get_memory(first.id)
+        manager.create_memory("third", "three")
+
+        assert len(manager.storage) == 2
+        assert manager.get_memory(second.id) is None
+        assert manager.get_memory(first.id) is not None
+
+
+class TestSQLiteMemoryStorage:
+    def test_memories_survive_restart(self, tmp_path):
+        """Test that memories persist across storage instances."""
+        path = tmp_path / "memories.sqlite3"
+        storage = SQLiteMemoryStorage(path)
+        memory = MemoryManager(storage=storage).create_memory(
+            "Build", "use make build", tags={"ci"}, corpus_names={"repo"}
+        )
+        storage.close()
+
+        storage = SQLiteMemoryStorage(path)
+        loaded = MemoryManager(storage=storage).get_memory(memory.id)
+        assert loaded.title == "Build"
+        assert loaded.content == "use make build"
+        assert loaded.tags == {"ci"}
+        assert loaded.corpus_names == {"repo"}
+        assert loaded.created_at == pytest.approx(memory.created_at, abs=timedelta(milliseconds=1))
+        storage.close()
+
+    def test_batched_writes(self, tmp_path):
+        """Test that batched writes are committed together."""
+        storage = SQLiteMemoryStorage(tmp_path / "memories.sqlite3")
+        manager = MemoryManager(storage=storage)
+        with manager.batch():
+            for i in range(100):
+                manager.create_memory(f"note {i}", f"content {i}")
+        assert len(storage) == 100
+        assert len(manager.search_memories(query="note", limit=10)) == 10
+        storage.close()
+
+    def test_failed_batch_is_rolled_back(self, tmp_path):
+        """Test that an exception inside a batch discards its writes."""
+        storage = SQLiteMemoryStorage(tmp_path / "memories.sqlite3")
+        manager = MemoryManager(storage=storage)
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.create_memory("lost", "never committed")
+                raise RuntimeError("abort")
+        assert len(storage) == 0
+        storage.close()
+
+    def test_age_eviction(self, tmp_path):
+        """Test that the oldest memory is evicted under the age policy."""
+        storage = SQLiteMemoryStorage(tmp_path / "memories.sqlite3", max_memories=1, eviction_policy="age")
+        manager = MemoryManager(storage=storage)
+        first = manager.create_memory("first", "one")
+        manager.get_memory(first.id)
+        second = manager.create_memory("second", "two")
+
+        assert manager.get_memory(first.id) is None
+        assert manager.get_memory(second.id) is not None
+        storage.close()
+
+    def test_invalid_eviction_policy(self, tmp_path):
+        """Test that unknown eviction policies are rejected."""
+        with pytest.raises(ValueError):
+            SQLiteMemoryStorage(tmp_path / "memories.sqlite3", eviction_policy="random")
+
+
+class TestMemoryIndex:
+    def test_recency_decay(self):
+        """Test that equally relevant documents are ordered by age."""
+        index = MemoryIndex(half_life=10.0)
+        index.add("old", "", "python tips", timestamp=0.0)
+        index.add("new", "", "python tips", timestamp=100.0)
+
+        ranked = index.search("python", now=100.0)
+        assert [key for key, _ in ranked] == ["new", "old"]
+        assert ranked[1][1] < ranked[0][1] / 100
+
+    def test_title_matches_outweigh_content(self):
+        """Test that title tokens are weighted higher than body tokens."""
+        index = MemoryIndex(half_life=None)
+        index.add("body", "notes", "cache invalidation strategy")
+        index.add("title", "cache", "notes about invalidation strategy")
+
+        assert index.search("cache")[0][0] == "title"
+
+    def test_query_without_tokens_matches_nothing(self):
+        """Test that punctuation-only queries return no results."""
+        index = MemoryIndex()
+        index.add("a", "title", "content")
+        assert index.search("!!!") == []
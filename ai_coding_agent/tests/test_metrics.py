@@ -0,0 +1,125 @@
+"""Tests for tool metrics and the MCP server's metrics routes."""
+
+import asyncio
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.dispatch import ToolDispatcher
+from ai_coding_agent.core.metrics import MetricsRegistry, ToolMetrics, result_size
+from ai_coding_agent.core.registry import ToolRegistry
+from ai_coding_agent.interfaces.mcp import MCPServer
+
+
+class EchoTool(BaseTool):
+    """Tool that echoes its input, fails or hangs on request."""
+
+    name = "echo"
+    description = "Echo the given text"
+    parameters = [
+        ToolParameter(name="text", type="string", description="Text to echo", required=True)
+    ]
+
+    async def execute(self, text: str) -> ToolResult:
+        if text == "fail":
+            return ToolResult(success=False, error="requested failure")
+        if text == "raise":
+            raise RuntimeError("boom")
+        if text == "hang":
+            await asyncio.sleep(10)
+        return ToolResult(success=True, data=text)
+
+
+def test_result_size_approximates_json_size():
+    """Test that structured results are measured close to their JSON size."""
+    data = {
+        "matches": [{"file": "src/a.py", "line": i, "content": "x" * 80} for i in range(50)],
+        "truncated": False
+    }
+    expected = len(json.dumps(data))
+    assert abs(result_size(ToolResult(success=True, data=data)) - expected) < expected * 0.1
+    assert result_size(ToolResult(success=True, data="hello")) == 5
+    assert result_size(ToolResult(success=False, error="boom")) == 0
+
+
+def test_render_prometheus_text_format():
+    """Test that metrics render in the Prometheus exposition format."""
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls made", ["tool"])
+    calls.inc(tool='say "hi"')
+    latency = registry.histogram("latency_seconds", "Latency", ["tool"], buckets=[0.1, 1.0])
+    latency.observe(0.05, tool="a")
+    latency.observe(0.5, tool="a")
+    latency.observe(5, tool="a")
+    registry.gauge("sessions", "Open sessions").set(3)
+
+    text = registry.render()
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{tool="say \\"hi\\""} 1.0' in text
+    assert 'latency_seconds_bucket{tool="a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{tool="a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{tool="a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{tool="a"} 3' in text
+    assert 'latency_seconds_sum{tool="a"} 5.55' in text
+    assert "sessions 3.0" in text
+
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Same name, other type")
+    with pytest.raises(ValueError):
+        calls.inc(other="x")
+
+
+@pytest.mark.asyncio
+class TestToolMetrics:
+    async def test_dispatcher_records_every_outcome(self):
+        """Test that calls are counted by outcome with latency and result size."""
+        metrics = ToolMetrics(MetricsRegistry())
+        dispatcher = ToolDispatcher(metrics=metrics)
+        tool = EchoTool()
+
+        await dispatcher.dispatch(tool, {"text": "hello"})
+        await dispatcher.dispatch(tool, {"text": "fail"})
+        await dispatcher.dispatch(tool, {"text": "raise"})
+        await dispatcher.dispatch(tool, {"text": "hang"}, timeout=0.01)
+
+        for outcome in ("success", "failure", "error", "timeout"):
+            assert metrics.calls.value(tool="echo", outcome=outcome) == 1
+        assert metrics.latency.count(tool="echo") == 4
+        assert metrics.result_bytes.count(tool="echo") == 1
+        assert metrics.result_bytes.sum(tool="echo") == len("hello")
+        assert metrics.in_flight.value(tool="echo") == 0
+
+    async def test_cancelled_calls_leave_no_call_in_flight(self):
+        """Test that cancelling the caller is recorded and frees the gauge."""
+        metrics = ToolMetrics(MetricsRegistry())
+        dispatcher = ToolDispatcher(metrics=metrics)
+        call = asyncio.create_task(dispatcher.dispatch(EchoTool(), {"text": "hang"}))
+        await asyncio.sleep(0.01)
+        assert metrics.in_flight.value(tool="echo") == 1
+
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        assert metrics.in_flight.value(tool="echo") == 0
+        assert metrics.calls.value(tool="echo", outcome="cancelled") == 1
+
+
+def test_server_exposes_metrics_and_health():
+    """Test the /metrics and /health routes of the MCP server."""
+    dispatcher = ToolDispatcher(metrics=ToolMetrics(MetricsRegistry()))
+    server = MCPServer(registry=ToolRegistry([EchoTool()]), dispatcher=dispatcher)
+
+    with TestClient(server.create_starlette_app()) as client:
+        asyncio.run(server.registry.execute("echo", text="hello"))
+
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok", "tools": 1, "sessions": 0, "worker_id": None}
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'ai_coding_agent_tool_calls_total{tool="echo",outcome="success"} 1.0' in response.text
+        assert "# TYPE ai_coding_agent_sse_sessions gauge" in response.text
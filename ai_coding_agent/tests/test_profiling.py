@@ -0,0 +1,113 @@
+"""Tests for tool call profiling and the profiling admin tool."""
+
+import threading
+import time
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.control import ProfilingTool
+from ai_coding_agent.core.dispatch import ToolDispatcher
+from ai_coding_agent.core.metrics import MetricsRegistry, ToolMetrics
+from ai_coding_agent.core.profiling import ToolProfiler
+
+
+def crunch_numbers(seconds: float) -> list:
+    """Burn CPU and allocate memory for a while."""
+    kept = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        kept.append([i * i for i in range(1000)])
+    return kept
+
+
+class CrunchTool(BaseTool):
+    """Async tool doing CPU work, reporting the thread it ran on."""
+
+    name = "crunch"
+    description = "Crunch numbers"
+    parameters = [
+        ToolParameter(name="seconds", type="number", description="Seconds to crunch", required=True)
+    ]
+
+    async def execute(self, seconds: float) -> ToolResult:
+        crunch_numbers(seconds)
+        return ToolResult(success=True, data={"thread": threading.get_ident()})
+
+
+class AlwaysProfiledTool(CrunchTool):
+    """Tool that asks for every call to be profiled."""
+
+    name = "always_profiled"
+    profile = True
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    return ToolProfiler(tmp_path / "profiles", max_profiles=3, sample_interval=0.001)
+
+
+@pytest.fixture
+def dispatcher(profiler):
+    dispatcher = ToolDispatcher(metrics=ToolMetrics(MetricsRegistry()), profiler=profiler)
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+@pytest.mark.asyncio
+class TestProfiling:
+    async def test_enable_and_read_cprofile_report(self, profiler, dispatcher):
+        """Test enabling profiling at runtime and reading the report back."""
+        admin = ProfilingTool(profiler=profiler)
+        await dispatcher.dispatch(CrunchTool(), {"seconds": 0.01})
+        assert (await admin.execute(action="list")).data["profiles"] == []
+
+        result = await admin.execute(action="enable", tools=["crunch"])
+        assert result.success
+        assert result.data["settings"]["tools"] == ["crunch"]
+
+        result = await dispatcher.dispatch(CrunchTool(), {"seconds": 0.05})
+        assert result.success
+        # Profiled calls run on a worker thread, away from other coroutines
+        assert result.data["thread"] != threading.get_ident()
+
+        profiles = (await admin.execute(action="list")).data["profiles"]
+        assert [p["tool"] for p in profiles] == ["crunch"]
+        assert profiles[0]["elapsed"] >= 0.05
+
+        profile = (await admin.execute(action="get", profile_id=profiles[0]["id"])).data["profile"]
+        assert "crunch_numbers" in profile["reports"]["cprofile"]
+        assert (profiler.directory / profiles[0]["id"] / "cprofile.prof").exists()
+
+        await admin.execute(action="disable")
+        await dispatcher.dispatch(CrunchTool(), {"seconds": 0.01})
+        assert len((await admin.execute(action="list")).data["profiles"]) == 1
+
+    async def test_sampling_and_memory(self, profiler, dispatcher):
+        """Test folded stacks from the sampler and the tracemalloc report."""
+        profiler.configure(tools=["*"], mode="sampling", memory=True)
+        await dispatcher.dispatch(CrunchTool(), {"seconds": 0.1})
+
+        [summary] = profiler.list_profiles()
+        assert summary["files"] == ["stacks.folded", "memory.txt"]
+        reports = profiler.get_profile(summary["id"])["reports"]
+        assert "crunch_numbers" in reports["stacks"]
+        assert "test_profiling.py" in reports["memory"]
+
+    async def test_sampling_rate_rotation_and_tool_opt_in(self, profiler, dispatcher):
+        """Test sample rates, rotation and tools that always profile."""
+        profiler.configure(tools=["crunch"], sample_rate=0)
+        await dispatcher.dispatch(CrunchTool(), {"seconds": 0})
+        assert profiler.list_profiles() == []
+
+        for _ in range(5):
+            await dispatcher.dispatch(AlwaysProfiledTool(), {"seconds": 0})
+        assert len(profiler.list_profiles()) == 3
+        assert len(list(profiler.directory.iterdir())) == 3
+
+    async def test_invalid_requests(self, profiler):
+        """Test that invalid admin requests are rejected."""
+        admin = ProfilingTool(profiler=profiler)
+        assert "Invalid action" in (await admin.execute(action="explode")).error
+        assert "tools is required" in (await admin.execute(action="enable")).error
+        assert "Invalid mode" in (await admin.execute(action="enable", tools=["x"], mode="perf")).error
+        assert "not found" in (await admin.execute(action="get", profile_id="missing")).error
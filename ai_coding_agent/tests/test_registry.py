@@ -0,0 +1,119 @@
+"""Tests for the tool registry and the MCP registrations generated from it."""
+
+import inspect
+import json
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.registry import ToolRegistry, create_default_registry
+from ai_coding_agent.interfaces.mcp import MCPServer
+
+
+class CountingTool(BaseTool):
+    """Tool that counts its calls."""
+
+    name = "count"
+    description = "Count calls"
+    parameters = [
+        ToolParameter(name="label", type="string", description="Label to echo", required=True),
+        ToolParameter(name="step", type="integer", description="Increment", required=False, default=1),
+        ToolParameter(name="tags", type="array", description="Optional tags", required=False)
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def execute(self, label: str, step: int = 1, tags=("default",)) -> ToolResult:
+        self.calls += step
+        return ToolResult(success=True, data={"label": label, "calls": self.calls, "tags": list(tags)})
+
+
+def call_result(content):
+    """Decode the JSON payload of an MCP call_tool response."""
+    if isinstance(content, tuple):
+        content = content[0]
+    return json.loads(content[0].text)
+
+
+class TestToolRegistry:
+    def test_register_and_execute(self):
+        """Test that tools are looked up by name."""
+        registry = ToolRegistry([CountingTool()])
+        assert "count" in registry
+        assert registry.names() == ["count"]
+
+    @pytest.mark.asyncio
+    async def test_execute_unknown_tool(self):
+        """Test that unknown tools produce an error result."""
+        result = await ToolRegistry().execute("missing")
+        assert not result.success
+        assert result.error == "Unknown tool: missing"
+
+    def test_duplicate_names_are_rejected(self):
+        """Test that a tool name can only be registered once."""
+        with pytest.raises(ValueError):
+            ToolRegistry([CountingTool(), CountingTool()])
+
+    def test_subset_shares_instances(self):
+        """Test that subsets reuse the same tool instances and resources."""
+        registry = create_default_registry()
+        subset = registry.subset(exclude=["push_action"])
+        assert "push_action" not in subset
+        assert subset["list_dir"] is registry["list_dir"]
+        assert subset.resources is not registry.resources
+        assert subset.resources["search_index"] is registry.resources["search_index"]
+
+    def test_default_registry_shares_resources(self):
+        """Test that web tools are wired to the registry's shared resources."""
+        registry = create_default_registry()
+        assert registry["read_urls"].reader is registry["read_url"]
+        assert registry["read_url"].cache is registry.resources["response_cache"]
+        assert registry["web_search"].index is registry.resources["search_index"]
+        assert registry["push_action"].queue is registry.resources["action_queue"]
+
+    def test_handler_signature(self):
+        """Test that handlers expose the tool parameters as their signature."""
+        handler = ToolRegistry([CountingTool()]).handler("count")
+        params = inspect.signature(handler).parameters
+        assert list(params) == ["label", "step", "tags"]
+        assert params["step"].default == 1
+        assert params["tags"].default is None
+
+
+@pytest.mark.asyncio
+class TestMCPServerRegistration:
+    async def test_tools_are_generated_from_schemas(self):
+        """Test that every registry tool is exposed with a generated input schema."""
+        server = MCPServer()
+        tools = {tool.name: tool for tool in await server.mcp.list_tools()}
+        assert set(tools) == set(server.registry.names())
+
+        schema = tools["list_dir"].inputSchema
+        assert schema["required"] == ["directory_path"]
+        assert set(schema["properties"]) == {
+            "directory_path", "include_pattern", "exclude_pattern", "sort_by", "sort_order"
+        }
+        assert schema["properties"]["directory_path"]["description"] == "Path to list contents from"
+
+    async def test_tool_instances_persist_across_calls(self):
+        """Test that repeated calls reach the same tool instance."""
+        tool = CountingTool()
+        server = MCPServer(registry=ToolRegistry([tool]))
+
+        await server.mcp.call_tool("count", {"label": "a"})
+        result = call_result(await server.mcp.call_tool("count", {"label": "b", "step": 2}))
+        assert result["success"]
+        assert result["data"] == {"label": "b", "calls": 3, "tags": ["default"]}
+        assert tool.calls == 3
+
+    async def test_registered_tool_executes(self, tmp_path):
+        """Test calling a core tool through the MCP server."""
+        (tmp_path / "b.txt").write_text("b")
+        (tmp_path / "a.txt").write_text("a")
+        server = MCPServer()
+
+        result = call_result(await server.mcp.call_tool(
+            "list_dir", {"directory_path": str(tmp_path), "sort_order": "desc"}
+        ))
+        assert [item["name"] for item in result["data"]["contents"]] == ["b.txt", "a.txt"]
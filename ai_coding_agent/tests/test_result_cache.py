@@ -0,0 +1,170 @@
+"""Tests for the tool result cache."""
+
+import os
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.dispatch import ToolDispatcher
+from ai_coding_agent.core.file_system import EditFileTool, ListDirectoryTool
+from ai_coding_agent.core.metrics import MetricsRegistry, ToolMetrics
+from ai_coding_agent.core.result_cache import TREE, CacheDependency, ToolResultCache
+
+
+class CountingReadTool(BaseTool):
+    """Cacheable tool counting how often it really reads its file."""
+
+    name = "counting_read"
+    description = "Read a file and count the reads"
+    blocking = True
+    cacheable = True
+    parameters = [
+        ToolParameter(name="path", type="string", description="File to read", required=True),
+        ToolParameter(name="upper", type="boolean", description="Upper-case the text", default=False)
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def cache_dependencies(self, path: str, **kwargs):
+        return [CacheDependency(path)]
+
+    async def execute(self, path: str, upper: bool = False) -> ToolResult:
+        self.reads += 1
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        return ToolResult(success=True, data={"text": text.upper() if upper else text})
+
+
+class CountingTreeTool(CountingReadTool):
+    """Cacheable tool depending on a whole directory tree."""
+
+    name = "counting_tree"
+
+    def cache_dependencies(self, path: str, **kwargs):
+        return [CacheDependency(path, TREE)]
+
+    async def execute(self, path: str, upper: bool = False) -> ToolResult:
+        self.reads += 1
+        return ToolResult(success=True, data={"files": sorted(os.listdir(path))})
+
+
+def _dispatcher(**cache_options) -> ToolDispatcher:
+    return ToolDispatcher(
+        metrics=ToolMetrics(MetricsRegistry()),
+        result_cache=ToolResultCache(**cache_options)
+    )
+
+
+@pytest.mark.asyncio
+class TestDispatcherCache:
+    async def test_repeated_call_is_a_hit(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("hello")
+        dispatcher = _dispatcher()
+        tool = CountingReadTool()
+
+        first = await dispatcher.dispatch(tool, {"path": str(path)})
+        # Declared defaults are part of the key, so spelling them out is the same call
+        second = await dispatcher.dispatch(tool, {"path": str(path), "upper": False})
+
+        assert first.data == second.data == {"text": "hello"}
+        assert tool.reads == 1
+        assert dispatcher.metrics.cache_hits.value(tool="counting_read") == 1
+        assert (await dispatcher.dispatch(tool, {"path": str(path), "upper": True})).data == {"text": "HELLO"}
+        assert tool.reads == 2
+
+    async def test_external_change_is_noticed(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("hello")
+        dispatcher = _dispatcher()
+        tool = CountingReadTool()
+        await dispatcher.dispatch(tool, {"path": str(path)})
+
+        path.write_text("hello, world")
+        result = await dispatcher.dispatch(tool, {"path": str(path)})
+
+        assert result.data == {"text": "hello, world"}
+        assert tool.reads == 2
+
+    async def test_tree_dependency_sees_new_files(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        dispatcher = _dispatcher()
+        tool = CountingTreeTool()
+        await dispatcher.dispatch(tool, {"path": str(tmp_path)})
+        await dispatcher.dispatch(tool, {"path": str(tmp_path)})
+        assert tool.reads == 1
+
+        (tmp_path / "sub" / "new.txt").write_text("x")
+        await dispatcher.dispatch(tool, {"path": str(tmp_path)})
+        assert tool.reads == 2
+
+    async def test_edit_invalidates_without_validation(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("old")
+        # Without validation only invalidations drop entries, so the edit must cause one
+        dispatcher = _dispatcher(validate=False)
+        tool = CountingReadTool()
+        await dispatcher.dispatch(tool, {"path": str(path)})
+
+        edited = await dispatcher.dispatch(
+            EditFileTool(), {"target_file": str(path), "instructions": "Replace", "code_edit": "new"}
+        )
+        result = await dispatcher.dispatch(tool, {"path": str(path)})
+
+        assert edited.success
+        assert result.data == {"text": "new"}
+        assert tool.reads == 2
+
+    async def test_list_dir_sees_added_file(self, tmp_path):
+        dispatcher = _dispatcher()
+        (tmp_path / "a.txt").write_text("a")
+        first = await dispatcher.dispatch(ListDirectoryTool(), {"directory_path": str(tmp_path)})
+
+        (tmp_path / "b.txt").write_text("b")
+        second = await dispatcher.dispatch(ListDirectoryTool(), {"directory_path": str(tmp_path)})
+
+        assert [item["name"] for item in first.data["contents"]] == ["a.txt"]
+        assert [item["name"] for item in second.data["contents"]] == ["a.txt", "b.txt"]
+
+
+class TestToolResultCache:
+    def test_lru_eviction_by_count_and_size(self, tmp_path):
+        cache = ToolResultCache(max_entries=2)
+        tool = CountingReadTool()
+        for name in ("a", "b", "c"):
+            (tmp_path / name).write_text(name)
+            pending = cache.begin(tool, {"path": str(tmp_path / name)})
+            cache.put(pending, ToolResult(success=True, data=name))
+            if name == "b":
+                # Touch "a" so that "b" is the least recently used
+                assert cache.get(tool, {"path": str(tmp_path / "a")}).data == "a"
+
+        assert len(cache) == 2
+        assert cache.get(tool, {"path": str(tmp_path / "b")}) is None
+
+        small = ToolResultCache(max_bytes=10)
+        pending = small.begin(tool, {"path": str(tmp_path / "a")})
+        assert not small.put(pending, ToolResult(success=True, data="x" * 11))
+        assert len(small) == 0
+
+    def test_invalidating_a_directory_drops_entries_below_it(self, tmp_path):
+        cache = ToolResultCache(validate=False)
+        tool = CountingReadTool()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a").write_text("a")
+        pending = cache.begin(tool, {"path": str(tmp_path / "sub" / "a")})
+        cache.put(pending, ToolResult(success=True, data="a"))
+
+        assert cache.invalidate([str(tmp_path / "other")]) == 0
+        assert cache.invalidate([str(tmp_path / "sub")]) == 1
+        assert len(cache) == 0
+
+    def test_results_overlapping_an_invalidation_are_not_stored(self, tmp_path):
+        cache = ToolResultCache()
+        tool = CountingReadTool()
+        (tmp_path / "a").write_text("a")
+        pending = cache.begin(tool, {"path": str(tmp_path / "a")})
+        cache.invalidate([str(tmp_path / "a")])
+
+        assert not cache.put(pending, ToolResult(success=True, data="a"))
@@ -0,0 +1,47 @@
+"""Tests for the synthetic repository generator used by the benchmarks."""
+
+import hashlib
+from pathlib import Path
+
+from benchmarks.synthetic_repo import IGNORED_DIRS, RepoSpec, generate_repo
+
+
+def tree_digest(root: Path) -> str:
+    """Hash of every path and file content under a directory."""
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*")):
+        digest.update(str(path.relative_to(root)).encode())
+        if path.is_file():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def test_same_spec_gives_same_tree(tmp_path):
+    """Test that generation is reproducible and depends on the seed."""
+    spec = RepoSpec(files=60, depth=2, fanout=2, ignored_files=5, binary_ratio=0.2)
+    first = generate_repo(tmp_path / "first", spec)
+    second = generate_repo(tmp_path / "second", spec)
+    other = generate_repo(tmp_path / "other", RepoSpec(files=60, depth=2, fanout=2, ignored_files=5, seed=1))
+
+    assert tree_digest(first.root) == tree_digest(second.root)
+    assert tree_digest(first.root) != tree_digest(other.root)
+    assert first.summary() == second.summary()
+
+
+def test_repo_contents(tmp_path):
+    """Test the file counts, binaries and ignored directories of a repository."""
+    spec = RepoSpec(files=100, depth=3, fanout=2, median_size=512, max_size=2048, binary_ratio=0.2, ignored_files=4)
+    repo = generate_repo(tmp_path, spec)
+
+    assert len(repo.text_files) + len(repo.binary_files) == 100
+    assert repo.binary_files
+    assert len(repo.directories) == 1 + 2 + 4 + 8
+    assert all(b"\0" in (tmp_path / path).read_bytes() for path in repo.binary_files)
+    for path in repo.text_files:
+        content = (tmp_path / path).read_text(encoding="utf-8")
+        assert 0 < len(content) <= 2048
+    for name in IGNORED_DIRS:
+        assert len(list((tmp_path / name).iterdir())) == 4
+    assert repo.total_bytes == sum(path.stat().st_size for path in tmp_path.rglob("*") if path.is_file()) - len(
+        (tmp_path / ".gitignore").read_bytes()
+    )
@@ -0,0 +1,186 @@
+"""Tests for tracing of tool execution."""
+
+import asyncio
+import importlib.util
+import json
+import socket
+from pathlib import Path
+
+import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.dispatch import ToolDispatcher
+from ai_coding_agent.core.metrics import MetricsRegistry, ToolMetrics
+from ai_coding_agent.core.registry import ToolRegistry
+from ai_coding_agent.core import tracing
+from ai_coding_agent.core.tracing import ChromeTraceSink, MemorySink, SpanContext, Tracer
+from ai_coding_agent.interfaces.mcp import MCPServer
+
+
+class EchoTool(BaseTool):
+    """Tool that echoes its input or fails on request."""
+
+    name = "echo"
+    description = "Echo the given text"
+    parameters = [
+        ToolParameter(name="text", type="string", description="Text to echo", required=True)
+    ]
+
+    async def execute(self, text: str) -> ToolResult:
+        if text == "fail":
+            return ToolResult(success=False, error="requested failure")
+        return ToolResult(success=True, data=text)
+
+
+def test_spans_nest_and_propagate():
+    """Test parent/child links and traceparent round trips."""
+    sink = MemorySink()
+    tracer = Tracer([sink])
+
+    with tracer.span("outer") as outer:
+        with tracer.span("inner", {"key": "value"}) as inner:
+            traceparent = tracer.traceparent()
+    assert [span.name for span in sink.spans] == ["inner", "outer"]
+    assert inner.parent_id == outer.context.span_id
+    assert inner.context.trace_id == outer.context.trace_id
+    assert outer.parent_id is None
+    assert tracer.current() is None
+
+    remote = SpanContext.from_traceparent(traceparent)
+    assert remote == inner.context
+    with tracer.span("remote child", parent=remote) as child:
+        pass
+    assert child.context.trace_id == outer.context.trace_id
+    assert SpanContext.from_traceparent("garbage") is None
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("failing"):
+            raise RuntimeError("boom")
+    assert sink.spans[-1].status == "error"
+    assert sink.spans[-1].error == "RuntimeError: boom"
+
+
+def test_chrome_trace_sink(tmp_path):
+    """Test that spans are appended in the Chrome trace event format."""
+    path = tmp_path / "trace.json"
+    tracer = Tracer([ChromeTraceSink(str(path))])
+    with tracer.span("outer"):
+        with tracer.span("inner", {"tool": "echo"}):
+            pass
+
+    # The array form may omit the closing bracket
+    events = json.loads(path.read_text().rstrip().rstrip(",") + "]")
+    assert [event["name"] for event in events] == ["inner", "outer"]
+    assert all(event["ph"] == "X" for event in events)
+    assert events[0]["args"]["tool"] == "echo"
+    assert events[0]["args"]["parent_span_id"] == events[1]["args"]["span_id"]
+
+
+# The client package keeps its own copy of the tracing module
+CLIENT_TRACING = Path(__file__).resolve().parents[2] / "mcp-sse-client-python" / "mcp_sse_client" / "tracing.py"
+
+
+@pytest.fixture
+def client_tracing():
+    """Load the client's tracing module from the source tree."""
+    if not CLIENT_TRACING.exists():
+        pytest.skip("mcp-sse-client-python sources not available")
+    spec = importlib.util.spec_from_file_location("client_tracing", CLIENT_TRACING)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_client_tracing_is_compatible(client_tracing, tmp_path):
+    """Test that the client and server copies write and read the same traces."""
+    def finished_span(module):
+        context = module.SpanContext(trace_id="0af7651916cd43dd8448eb211c80319c", span_id="b7ad6b7169203331")
+        span = module.Span(
+            name="tool.execute", context=context, parent_id="00f067aa0ba902b7",
+            start_ns=1_000_000, end_ns=3_500_000, thread_id=7
+        )
+        span.set_attribute("tool", "echo")
+        span.record_error(ValueError("bad input"))
+        return span
+
+    outputs = []
+    for module, name in ((tracing, "server"), (client_tracing, "client")):
+        span = finished_span(module)
+        for suffix in (".jsonl", ".json"):
+            module.sink_for_path(str(tmp_path / f"{name}{suffix}")).export(span)
+        outputs.append((
+            span.to_dict(),
+            span.context.traceparent,
+            (tmp_path / f"{name}.jsonl").read_text(),
+            (tmp_path / f"{name}.json").read_text()
+        ))
+    assert outputs[0] == outputs[1]
+
+    # Traceparents cross in both directions and continue the same trace
+    for sender, receiver in ((client_tracing, tracing), (tracing, client_tracing)):
+        sink = receiver.MemorySink()
+        sending = sender.Tracer([sender.MemorySink()])
+        with sending.span("caller") as caller:
+            traceparent = sending.traceparent()
+        with receiver.Tracer([sink]).span("callee", parent=receiver.SpanContext.from_traceparent(traceparent)):
+            pass
+        assert sink.spans[0].context.trace_id == caller.context.trace_id
+        assert sink.spans[0].parent_id == caller.context.span_id
+    for value in ("00-0AF7651916CD43DD8448EB211C80319C-b7ad6b7169203331-01 ", "01-00-00-00", "", None):
+        parsed = [module.SpanContext.from_traceparent(value) for module in (tracing, client_tracing)]
+        assert [vars(context) if context else None for context in parsed] == \
+            [vars(parsed[1]) if parsed[1] else None] * 2
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_records_tool_spans():
+    """Test that every dispatched call is a span with its outcome."""
+    sink = MemorySink()
+    dispatcher = ToolDispatcher(metrics=ToolMetrics(MetricsRegistry()), tracer=Tracer([sink]))
+
+    await dispatcher.dispatch(EchoTool(), {"text": "hello"})
+    await dispatcher.dispatch(EchoTool(), {"text": "fail"})
+
+    assert [(span.name, span.attributes["outcome"], span.status) for span in sink.spans] == [
+        ("tool.execute", "success", "ok"),
+        ("tool.execute", "failure", "error")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_server_continues_client_trace():
+    """Test that a traceparent in the request metadata links server spans to the client."""
+    sink = MemorySink()
+    dispatcher = ToolDispatcher(metrics=ToolMetrics(MetricsRegistry()), tracer=Tracer([sink]))
+    server = MCPServer(registry=ToolRegistry([EchoTool()]), dispatcher=dispatcher)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    uvicorn_server = uvicorn.Server(uvicorn.Config(
+        server.create_starlette_app(), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    serving = asyncio.create_task(uvicorn_server.serve())
+    try:
+        while not uvicorn_server.started:
+            assert not serving.done(), "server failed to start"
+            await asyncio.sleep(0.05)
+
+        client_span = SpanContext(trace_id="ab" * 16, span_id="cd" * 8)
+        async with sse_client(f"http://127.0.0.1:{port}/sse") as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                result = await session.call_tool(
+                    "echo", {"text": "hi"}, meta={"traceparent": client_span.traceparent}
+                )
+                assert not result.isError
+    finally:
+        uvicorn_server.should_exit = True
+        await serving
+
+    spans = {span.name: span for span in sink.spans}
+    assert spans["mcp.call_tool"].parent_id == client_span.span_id
+    assert spans["mcp.call_tool"].context.trace_id == client_span.trace_id
+    assert spans["tool.execute"].parent_id == spans["mcp.call_tool"].context.span_id
@@ -0,0 +1,162 @@
+"""Tests for the file watcher."""
+
+import asyncio
+import sys
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.dispatch import ToolDispatcher
+from ai_coding_agent.core.metrics import MetricsRegistry, ToolMetrics
+from ai_coding_agent.core.registry import ToolRegistry
+from ai_coding_agent.core.result_cache import CacheDependency, ToolResultCache
+from ai_coding_agent.core.watcher import ADDED, DELETED, MODIFIED, ChangeSet, FileWatcher, _Coalescer
+from ai_coding_agent.interfaces.mcp import MCPServer
+
+BACKENDS = [
+    "polling",
+    pytest.param("inotify", marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only"))
+]
+
+
+class CountingReadTool(BaseTool):
+    """Cacheable tool counting how often it really reads its file."""
+
+    name = "counting_read"
+    description = "Read a file and count the reads"
+    cacheable = True
+    parameters = [ToolParameter(name="path", type="string", description="File to read", required=True)]
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def cache_dependencies(self, path: str, **kwargs):
+        return [CacheDependency(path)]
+
+    async def execute(self, path: str) -> ToolResult:
+        self.reads += 1
+        with open(path, encoding="utf-8") as f:
+            return ToolResult(success=True, data={"text": f.read()})
+
+
+async def _next_changes(queue: "asyncio.Queue[ChangeSet]") -> ChangeSet:
+    return await asyncio.wait_for(queue.get(), timeout=5)
+
+
+def test_coalescing_keeps_one_change_per_path():
+    pending = _Coalescer()
+    pending.add("created-then-deleted", ADDED)
+    pending.add("created-then-deleted", DELETED)
+    pending.add("created-then-written", ADDED)
+    pending.add("created-then-written", MODIFIED)
+    pending.add("replaced", DELETED)
+    pending.add("replaced", ADDED)
+    pending.add("written-then-deleted", MODIFIED)
+    pending.add("written-then-deleted", DELETED)
+
+    changes = pending.take()
+
+    assert changes.added == {"created-then-written"}
+    assert changes.modified == {"replaced"}
+    assert changes.deleted == {"written-then-deleted"}
+    assert not pending.take()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", BACKENDS)
+class TestFileWatcher:
+    async def test_changes_are_batched(self, tmp_path, backend):
+        (tmp_path / "old.txt").write_text("old")
+        (tmp_path / ".git").mkdir()
+        queue: "asyncio.Queue[ChangeSet]" = asyncio.Queue()
+        watcher = FileWatcher(tmp_path, debounce=0.1, poll_interval=0.05, backend=backend)
+        watcher.subscribe(queue.put_nowait)
+
+        async with watcher:
+            assert watcher.backend == backend
+            (tmp_path / "src" / "pkg").mkdir(parents=True)
+            (tmp_path / "src" / "pkg" / "a.py").write_text("a")
+            (tmp_path / "old.txt").unlink()
+            (tmp_path / ".git" / "index").write_text("ignored")
+            changes = await _next_changes(queue)
+            while {str(tmp_path / "src" / "pkg" / "a.py"), str(tmp_path / "old.txt")} - changes.paths:
+                # A polling scan can fall between the writes
+                more = await _next_changes(queue)
+                changes = ChangeSet(changes.added | more.added, changes.modified | more.modified,
+                                    changes.deleted | more.deleted)
+
+            assert str(tmp_path / "src" / "pkg" / "a.py") in changes.added
+            assert changes.deleted == {str(tmp_path / "old.txt")}
+            assert not any(".git" in path for path in changes.paths)
+
+            with open(tmp_path / "src" / "pkg" / "a.py", "a") as f:
+                f.write("more")
+            changes = await _next_changes(queue)
+            assert changes.modified == {str(tmp_path / "src" / "pkg" / "a.py")}
+
+    async def test_async_subscribers_are_awaited_on_stop(self, tmp_path, backend):
+        seen = []
+
+        async def subscriber(changes: ChangeSet) -> None:
+            await asyncio.sleep(0)
+            seen.append(changes)
+
+        watcher = FileWatcher(tmp_path, debounce=10, poll_interval=0.05, backend=backend)
+        watcher.subscribe(subscriber)
+        await watcher.start()
+        (tmp_path / "a.txt").write_text("a")
+        await asyncio.sleep(0.3)
+        # Still inside the debounce window; stopping delivers it
+        await watcher.stop()
+
+        assert seen and str(tmp_path / "a.txt") in seen[0].added
+
+
+@pytest.mark.asyncio
+async def test_server_watcher_invalidates_cached_results(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("old")
+    # Without validation, only the watcher can tell the cache about the change
+    dispatcher = ToolDispatcher(metrics=ToolMetrics(MetricsRegistry()), result_cache=ToolResultCache(validate=False))
+    tool = CountingReadTool()
+    server = MCPServer(registry=ToolRegistry([tool]), dispatcher=dispatcher, watch_dir=tmp_path)
+    changed = asyncio.Event()
+    server.watcher.subscribe(lambda changes: changed.set())
+    app = server.create_starlette_app()
+
+    async with app.router.lifespan_context(app):
+        assert (await dispatcher.dispatch(tool, {"path": str(path)})).data == {"text": "old"}
+        path.write_text("new")
+        await asyncio.wait_for(changed.wait(), timeout=5)
+        result = await dispatcher.dispatch(tool, {"path": str(path)})
+
+    assert result.data == {"text": "new"}
+    assert tool.reads == 2
+    assert not server.watcher.running
+
+
+@pytest.mark.asyncio
+async def test_server_watcher_turns_off_cache_validation(tmp_path, monkeypatch):
+    """Test that cache hits do no stamp I/O while the server's watcher runs."""
+    path = tmp_path / "a.txt"
+    path.write_text("old")
+    cache = ToolResultCache()
+    dispatcher = ToolDispatcher(metrics=ToolMetrics(MetricsRegistry()), result_cache=cache)
+    tool = CountingReadTool()
+    server = MCPServer(registry=ToolRegistry([tool]), dispatcher=dispatcher, watch_dir=tmp_path)
+    app = server.create_starlette_app()
+
+    async with app.router.lifespan_context(app):
+        assert not cache.validate
+        await dispatcher.dispatch(tool, {"path": str(path)})
+
+        def no_stamps(dependency):
+            raise AssertionError("hit checked file stamps")
+
+        monkeypatch.setattr("ai_coding_agent.core.result_cache.stamp", no_stamps)
+        assert (await dispatcher.dispatch(tool, {"path": str(path)})).data == {"text": "old"}
+        monkeypatch.undo()
+
+    assert cache.validate
+    assert len(cache) == 0
+    assert tool.reads == 1
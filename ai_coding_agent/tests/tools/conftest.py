@@ -1,3 +1,7 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from pathlib import Path
 
@@ -9,4 +13,78 @@ def test_dir(tmp_path):
     (tmp_path / "test.py").write_text("def test_function():\n    pass")
     (tmp_path / "subdir").mkdir()
     (tmp_path / "subdir" / "test2.txt").write_text("Test content")
-    return tmp_path 
\ No newline at end of file
+    return tmp_path 
+
+class StubHTTPServer:
+    """Local HTTP server that serves canned responses and records requests."""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        handler = self._make_handler()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return f"{self.base_url}{path}"
+
+    def route(self, path, body=b"", status=200, headers=None, delay=0.0, handler=None):
+        """Register a response for a path, or a handler(request_headers) -> (status, headers, body)."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.routes[path] = handler or (lambda request_headers: (status, headers or {}, body))
+        self.routes[path].delay = delay
+
+    def hits(self, path):
+        return sum(1 for p, _ in self.requests if p == path)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers)))
+                route = stub.routes.get(self.path)
+                if route is None:
+                    status, headers, body = 404, {}, b"not found"
+                else:
+                    time.sleep(getattr(route, "delay", 0.0))
+                    status, headers, body = route(self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Start a local stub HTTP server."""
+    server = StubHTTPServer()
+    server.start()
+    yield server
+    server.stop()
+
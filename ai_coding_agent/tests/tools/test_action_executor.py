@@ -0,0 +1,169 @@
+"""Tests for the action queue control tools and the action executor."""
+
+import asyncio
+import os
+
+import pytest
+from ai_coding_agent.core.base import BaseTool, ToolParameter, ToolResult
+from ai_coding_agent.core.control import (
+    ActionExecutor,
+    ActionQueue,
+    ActionStatus,
+    ClearActionsTool,
+    GetNextActionTool,
+    PushActionTool,
+    ShowActionsTool
+)
+from ai_coding_agent.core.file_system import ListDirectoryTool
+
+
+class SleepTool(BaseTool):
+    """Tool that sleeps and records when it ran."""
+
+    name = "sleep"
+    description = "Sleep for a while"
+    parameters = [
+        ToolParameter(name="seconds", type="number", description="Seconds to sleep", required=True)
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self.started = []
+
+    async def execute(self, seconds: float, fail: bool = False) -> ToolResult:
+        self.started.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(seconds)
+        if fail:
+            return ToolResult(success=False, error="requested failure")
+        return ToolResult(success=True, data={"slept": seconds})
+
+
+class PidTool(BaseTool):
+    """CPU-bound tool that reports the process it ran in."""
+
+    name = "pid"
+    description = "Return the current process ID"
+    parameters = []
+    cpu_bound = True
+
+    async def execute(self) -> ToolResult:
+        return ToolResult(success=True, data={"pid": os.getpid()})
+
+
+@pytest.mark.asyncio
+class TestActionExecutor:
+    async def test_push_and_show_actions(self):
+        """Test that pushed actions are visible through show_actions."""
+        queue = ActionQueue()
+        result = await PushActionTool(queue=queue).execute(
+            tool_name="list_dir",
+            parameters={"directory_path": "."}
+        )
+        assert result.success
+        assert result.data["action"]["id"] == 1
+
+        result = await ShowActionsTool(queue=queue).execute()
+        assert result.success
+        assert [a["status"] for a in result.data["actions"]] == ["pending"]
+
+    async def test_push_unknown_dependency(self):
+        """Test that dependencies must refer to queued actions."""
+        result = await PushActionTool(queue=ActionQueue()).execute(
+            tool_name="list_dir",
+            depends_on=[42]
+        )
+        assert not result.success
+        assert "Unknown dependency" in result.error
+
+    async def test_executor_runs_actions_and_captures_results(self, test_dir):
+        """Test that the executor dispatches actions to the named tools."""
+        queue = ActionQueue()
+        queue.push("list_dir", {"directory_path": str(test_dir)})
+        queue.push("missing_tool", {})
+
+        async with ActionExecutor(tools=[ListDirectoryTool()], queue=queue) as executor:
+            assert await executor.join(timeout=5)
+
+        result = await ShowActionsTool(queue=queue).execute(include_completed=True)
+        listed, missing = result.data["actions"]
+        assert listed["status"] == "completed"
+        assert {item["name"] for item in listed["result"]["contents"]} == {"test.txt", "test.py", "subdir"}
+        assert missing["status"] == "failed"
+        assert "Unknown tool" in missing["error"]
+
+    async def test_independent_actions_run_in_parallel(self):
+        """Test that independent actions share the worker pool."""
+        queue = ActionQueue()
+        for _ in range(4):
+            queue.push("sleep", {"seconds": 0.2})
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with ActionExecutor(tools=[SleepTool()], queue=queue, max_workers=4) as executor:
+            assert await executor.join(timeout=5)
+        assert loop.time() - start < 0.6
+
+    async def test_dependencies_are_respected(self):
+        """Test that an action only starts after its dependencies completed."""
+        queue = ActionQueue()
+        sleep_tool = SleepTool()
+        first = queue.push("sleep", {"seconds": 0.1})
+        second = queue.push("sleep", {"seconds": 0}, depends_on=[first.id])
+
+        async with ActionExecutor(tools=[sleep_tool], queue=queue) as executor:
+            assert await executor.join(timeout=5)
+
+        assert queue.get(second.id).started_at >= queue.get(first.id).finished_at
+        assert queue.get(second.id).status == ActionStatus.COMPLETED
+
+    async def test_failed_dependency_skips_dependents(self):
+        """Test that dependents of a failed action are skipped."""
+        queue = ActionQueue()
+        first = queue.push("sleep", {"seconds": 0, "fail": True})
+        second = queue.push("sleep", {"seconds": 0}, depends_on=[first.id])
+        third = queue.push("sleep", {"seconds": 0}, depends_on=[second.id])
+
+        async with ActionExecutor(tools=[SleepTool()], queue=queue) as executor:
+            assert await executor.join(timeout=5)
+
+        assert queue.get(first.id).status == ActionStatus.FAILED
+        assert queue.get(second.id).status == ActionStatus.SKIPPED
+        assert queue.get(third.id).status == ActionStatus.SKIPPED
+
+    async def test_action_timeout(self):
+        """Test that per-action timeouts fail the action."""
+        queue = ActionQueue()
+        action = queue.push("sleep", {"seconds": 5}, timeout=0.05)
+
+        async with ActionExecutor(tools=[SleepTool()], queue=queue) as executor:
+            assert await executor.join(timeout=5)
+
+        assert queue.get(action.id).status == ActionStatus.FAILED
+        assert "timed out" in queue.get(action.id).error
+
+    async def test_cpu_bound_tools_run_in_process_pool(self):
+        """Test that CPU-bound tools are offloaded to another process."""
+        queue = ActionQueue()
+        action = queue.push("pid")
+
+        async with ActionExecutor(tools=[PidTool()], queue=queue, max_process_workers=1) as executor:
+            assert await executor.join(timeout=30)
+
+        assert queue.get(action.id).status == ActionStatus.COMPLETED
+        assert queue.get(action.id).result["pid"] != os.getpid()
+
+    async def test_get_next_action_and_clear(self):
+        """Test peeking at the next ready action and clearing the queue."""
+        queue = ActionQueue()
+        first = queue.push("sleep", {"seconds": 0})
+        queue.push("sleep", {"seconds": 0}, depends_on=[first.id])
+        queue.push("sleep", {"seconds": 0}, priority=10)
+
+        result = await GetNextActionTool(queue=queue).execute(timeout=0)
+        assert result.success
+        assert result.data["action"]["priority"] == 10
+
+        result = await ClearActionsTool(queue=queue).execute()
+        assert result.success
+        assert result.data["cleared_count"] == 3
+        assert queue.list() == []
@@ -0,0 +1,217 @@
+"""Tests for the read URL tool and its response cache."""
+
+import pytest
+from ai_coding_agent.core.web import ReadUrlTool, ResponseCache, get_http_client
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an empty response cache."""
+    return ResponseCache(tmp_path / "http-cache")
+
+
+@pytest.mark.asyncio
+class TestReadUrlTool:
+    async def test_read_url_basic(self, http_server, cache):
+        """Test fetching a page."""
+        http_server.route("/page", "<h1>Hello</h1>", headers={"Content-Type": "text/html; charset=utf-8"})
+
+        tool = ReadUrlTool(cache=cache)
+        result = await tool.execute(url=http_server.url("/page"))
+        assert result.success
+        assert result.data["content"] == "<h1>Hello</h1>"
+        assert result.data["status_code"] == 200
+        assert not result.data["cached"]
+
+    async def test_read_url_http_error(self, http_server, cache):
+        """Test that error statuses are reported as failures."""
+        tool = ReadUrlTool(cache=cache)
+        result = await tool.execute(url=http_server.url("/missing"))
+        assert not result.success
+        assert "HTTP error" in result.error
+
+    async def test_fresh_responses_are_served_from_cache(self, http_server, cache):
+        """Test that responses with max-age are not refetched while fresh."""
+        http_server.route("/fresh", "cached body", headers={"Cache-Control": "max-age=60"})
+
+        tool = ReadUrlTool(cache=cache)
+        first = await tool.execute(url=http_server.url("/fresh"))
+        second = await tool.execute(url=http_server.url("/fresh"))
+        assert second.success
+        assert second.data["cached"]
+        assert second.data["content"] == first.data["content"] == "cached body"
+        assert http_server.hits("/fresh") == 1
+
+    async def test_stale_responses_are_revalidated_with_etag(self, http_server, cache):
+        """Test conditional revalidation with If-None-Match."""
+        def handler(request_headers):
+            if request_headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"ETag": '"v1"', "Cache-Control": "no-cache"}, b"versioned body"
+
+        http_server.route("/etag", handler=handler)
+
+        tool = ReadUrlTool(cache=cache)
+        first = await tool.execute(url=http_server.url("/etag"))
+        second = await tool.execute(url=http_server.url("/etag"))
+        assert not first.data["cached"]
+        assert second.data["cached"]
+        assert second.data["content"] == "versioned body"
+        assert http_server.hits("/etag") == 2
+        assert http_server.requests[-1][1].get("If-None-Match") == '"v1"'
+
+    async def test_revalidation_with_last_modified(self, http_server, cache):
+        """Test conditional revalidation with If-Modified-Since."""
+        modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+        def handler(request_headers):
+            if request_headers.get("If-Modified-Since") == modified:
+                return 304, {}, b""
+            return 200, {"Last-Modified": modified}, b"dated body"
+
+        http_server.route("/dated", handler=handler)
+
+        tool = ReadUrlTool(cache=cache)
+        await tool.execute(url=http_server.url("/dated"))
+        result = await tool.execute(url=http_server.url("/dated"))
+        assert result.data["cached"]
+        assert result.data["content"] == "dated body"
+
+    async def test_no_store_is_not_cached(self, http_server, cache):
+        """Test that no-store responses are always fetched."""
+        http_server.route("/private", "secret", headers={"Cache-Control": "no-store"})
+
+        tool = ReadUrlTool(cache=cache)
+        await tool.execute(url=http_server.url("/private"))
+        await tool.execute(url=http_server.url("/private"))
+        assert http_server.hits("/private") == 2
+        assert len(cache) == 0
+
+    async def test_private_is_not_cached(self, http_server, cache):
+        """Test that responses marked private are not stored in the shared cache."""
+        http_server.route("/account", "mine", headers={"Cache-Control": "private, max-age=60"})
+
+        tool = ReadUrlTool(cache=cache)
+        await tool.execute(url=http_server.url("/account"))
+        await tool.execute(url=http_server.url("/account"))
+        assert http_server.hits("/account") == 2
+        assert len(cache) == 0
+
+    async def test_requests_with_credentials_bypass_cache(self, http_server, cache):
+        """Test that responses to authenticated requests are neither stored nor served."""
+        def handler(request_headers):
+            body = b"secret" if request_headers.get("Authorization") else b"public"
+            return 200, {"Cache-Control": "max-age=60"}, body
+
+        http_server.route("/data", handler=handler)
+
+        tool = ReadUrlTool(cache=cache)
+        private = await tool.execute(url=http_server.url("/data"), headers={"Authorization": "Bearer a"})
+        assert private.data["content"] == "secret"
+        assert len(cache) == 0
+        public = await tool.execute(url=http_server.url("/data"))
+        assert public.data["content"] == "public"
+        assert not public.data["cached"]
+        # A cached public response is not served to a caller sending cookies either
+        with_cookie = await tool.execute(url=http_server.url("/data"), headers={"Cookie": "session=1"})
+        assert not with_cookie.data["cached"]
+        assert http_server.hits("/data") == 3
+
+    async def test_vary_headers_are_part_of_the_key(self, http_server, cache):
+        """Test that a response varying on Accept is only served for the same Accept."""
+        def handler(request_headers):
+            accept = request_headers.get("Accept", "")
+            body = b'{"a": 1}' if accept == "application/json" else b"<p>a</p>"
+            return 200, {"Cache-Control": "max-age=60", "Vary": "Accept"}, body
+
+        http_server.route("/negotiated", handler=handler)
+
+        tool = ReadUrlTool(cache=cache)
+        json_headers = {"Accept": "application/json"}
+        await tool.execute(url=http_server.url("/negotiated"), headers=json_headers)
+        html = await tool.execute(url=http_server.url("/negotiated"), headers={"Accept": "text/html"})
+        assert not html.data["cached"]
+        assert html.data["content"] == "<p>a</p>"
+        again = await tool.execute(url=http_server.url("/negotiated"), headers={"accept": "text/html"})
+        assert again.data["cached"]
+        assert again.data["content"] == "<p>a</p>"
+        assert http_server.hits("/negotiated") == 2
+
+    async def test_use_cache_false_bypasses_cache(self, http_server, cache):
+        """Test that the cache can be disabled per call."""
+        http_server.route("/fresh", "body", headers={"Cache-Control": "max-age=60"})
+
+        tool = ReadUrlTool(cache=cache)
+        await tool.execute(url=http_server.url("/fresh"), use_cache=False)
+        await tool.execute(url=http_server.url("/fresh"), use_cache=False)
+        assert http_server.hits("/fresh") == 2
+
+    async def test_body_is_cut_off_at_max_bytes(self, http_server, cache):
+        """Test that oversized bodies are truncated and not cached."""
+        http_server.route("/huge", b"x" * 100_000, headers={"Cache-Control": "max-age=60"})
+
+        tool = ReadUrlTool(cache=cache, max_bytes=1000)
+        result = await tool.execute(url=http_server.url("/huge"))
+        assert result.success
+        assert result.data["truncated"]
+        assert len(result.data["content"]) == 1000
+        assert len(cache) == 0
+
+    async def test_shared_client_is_reused(self):
+        """Test that calls on one event loop share the pooled client."""
+        assert get_http_client() is get_http_client()
+        assert ReadUrlTool().client is get_http_client()
+
+
+class TestResponseCache:
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test that the least recently used entries are evicted first."""
+        cache = ResponseCache(tmp_path, max_bytes=25)
+        cache.put("http://a", 200, {}, b"a" * 10)
+        cache.put("http://b", 200, {}, b"b" * 10)
+        assert cache.get("http://a") is not None
+        cache.put("http://c", 200, {}, b"c" * 10)
+
+        assert cache.get("http://b") is None
+        assert cache.get("http://a").body == b"a" * 10
+        assert cache.total_bytes == 20
+
+    def test_entries_survive_restart(self, tmp_path):
+        """Test that the cache is reloaded from disk."""
+        ResponseCache(tmp_path).put("http://a", 200, {"ETag": '"x"'}, b"body")
+
+        cached = ResponseCache(tmp_path).get("http://a")
+        assert cached.body == b"body"
+        assert cached.etag == '"x"'
+
+    def test_caches_on_one_directory_share_entries(self, tmp_path):
+        """Test that caches in different workers see each other's entries and size."""
+        first = ResponseCache(tmp_path, max_bytes=25)
+        second = ResponseCache(tmp_path, max_bytes=25)
+        first.put("http://a", 200, {}, b"a" * 10)
+        assert second.get("http://a").body == b"a" * 10
+
+        second.put("http://b", 200, {}, b"b" * 10)
+        first.put("http://c", 200, {}, b"c" * 10)
+        assert second.get("http://a") is None
+        assert second.get("http://c") is not None
+        assert len(first) == len(second) == 2
+        assert second.total_bytes == 20
+
+    def test_expires_header(self, tmp_path):
+        """Test freshness from Date and Expires headers."""
+        cache = ResponseCache(tmp_path)
+        cache.put("http://a", 200, {
+            "Date": "Wed, 21 Oct 2015 07:28:00 GMT",
+            "Expires": "Wed, 21 Oct 2015 07:29:00 GMT"
+        }, b"body")
+        cached = cache.get("http://a")
+        assert cached.freshness_lifetime() == 60
+        assert cached.is_fresh(now=cached.stored_at + 30)
+        assert not cached.is_fresh(now=cached.stored_at + 90)
+
+    def test_vary_star_is_not_cached(self, tmp_path):
+        """Test that responses varying on everything are not stored."""
+        cache = ResponseCache(tmp_path)
+        assert not cache.put("http://a", 200, {"Vary": "*"}, b"body")
+        assert cache.get("http://a") is None
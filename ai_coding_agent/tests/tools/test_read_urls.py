@@ -0,0 +1,141 @@
+"""Tests for the batch read URLs tool."""
+
+import threading
+import time
+
+import pytest
+from ai_coding_agent.core.web import ReadUrlTool, ReadUrlsTool, ResponseCache, extract_main_text
+
+PAGE = """<!doctype html>
+<html>
+<head><title>Docs</title><style>body { color: red; }</style></head>
+<body>
+<nav>Home | About</nav>
+<main><h1>Install</h1><p>Run pip install.</p><script>track()</script></main>
+<footer>Copyright</footer>
+</body>
+</html>"""
+
+
+@pytest.fixture
+def tool(tmp_path):
+    """Create a read URLs tool with an isolated response cache."""
+    return ReadUrlsTool(reader=ReadUrlTool(cache=ResponseCache(tmp_path / "http-cache")))
+
+
+def concurrency_probe(delay):
+    """Create a route handler that records the peak number of concurrent requests."""
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def handler(request_headers):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(delay)
+        with lock:
+            state["active"] -= 1
+        return 200, {}, b"ok"
+
+    return handler, state
+
+
+@pytest.mark.asyncio
+class TestReadUrlsTool:
+    async def test_results_follow_input_order(self, http_server, tool):
+        """Test that every URL gets a result in input order."""
+        http_server.route("/a", "first")
+        http_server.route("/b", "second")
+
+        urls = [http_server.url("/b"), http_server.url("/missing"), http_server.url("/a")]
+        result = await tool.execute(urls=urls)
+        assert result.success
+        results = result.data["results"]
+        assert [r["url"] for r in results] == urls
+        assert results[0]["content"] == "second"
+        assert not results[1]["success"]
+        assert results[2]["content"] == "first"
+        assert result.data["succeeded"] == 2
+        assert result.data["failed"] == 1
+
+    async def test_fetches_concurrently(self, http_server, tool):
+        """Test that a batch takes about as long as its slowest request."""
+        for i in range(5):
+            http_server.route(f"/slow{i}", "body", delay=0.3)
+
+        start = time.perf_counter()
+        result = await tool.execute(urls=[http_server.url(f"/slow{i}") for i in range(5)])
+        assert result.data["succeeded"] == 5
+        assert time.perf_counter() - start < 1.0
+
+    async def test_per_host_limit(self, http_server, tool):
+        """Test that no more than per_host_limit requests hit one host at once."""
+        handler, state = concurrency_probe(0.1)
+        for i in range(6):
+            http_server.route(f"/p{i}", handler=handler)
+
+        urls = [http_server.url(f"/p{i}") for i in range(6)]
+        result = await tool.execute(urls=urls, per_host_limit=2)
+        assert result.data["succeeded"] == 6
+        assert state["peak"] <= 2
+
+    async def test_global_limit(self, http_server, tool):
+        """Test that max_concurrency bounds requests across the batch."""
+        handler, state = concurrency_probe(0.1)
+        for i in range(4):
+            http_server.route(f"/g{i}", handler=handler)
+
+        urls = [http_server.url(f"/g{i}") for i in range(4)]
+        await tool.execute(urls=urls, max_concurrency=1)
+        assert state["peak"] == 1
+
+    async def test_deadline_returns_partial_results(self, http_server, tool):
+        """Test that finished URLs are returned when the deadline expires."""
+        http_server.route("/fast", "done")
+        http_server.route("/slow", "late", delay=2.0)
+
+        start = time.perf_counter()
+        result = await tool.execute(
+            urls=[http_server.url("/fast"), http_server.url("/slow")],
+            deadline=0.5
+        )
+        assert time.perf_counter() - start < 1.5
+        fast, slow = result.data["results"]
+        assert fast["success"] and fast["content"] == "done"
+        assert not slow["success"] and slow["timed_out"]
+        assert result.data["timed_out"]
+
+    async def test_duplicate_urls_are_fetched_once(self, http_server, tool):
+        """Test that repeated URLs share one request."""
+        http_server.route("/dup", "body")
+
+        url = http_server.url("/dup")
+        result = await tool.execute(urls=[url, url])
+        assert [r["content"] for r in result.data["results"]] == ["body", "body"]
+        assert http_server.hits("/dup") == 1
+
+    async def test_extract_text(self, http_server, tool):
+        """Test that HTML pages are reduced to their main text."""
+        http_server.route("/page", PAGE, headers={"Content-Type": "text/html"})
+        http_server.route("/plain", "<b>not html</b>", headers={"Content-Type": "text/plain"})
+
+        result = await tool.execute(
+            urls=[http_server.url("/page"), http_server.url("/plain")],
+            extract_text=True
+        )
+        page, plain = result.data["results"]
+        assert page["title"] == "Docs"
+        assert page["content"] == "Install\nRun pip install."
+        assert plain["content"] == "<b>not html</b>"
+
+    async def test_invalid_limits(self, tool):
+        """Test that non-positive limits are rejected."""
+        result = await tool.execute(urls=["http://example.com"], per_host_limit=0)
+        assert not result.success
+
+
+def test_extract_main_text_without_main_element():
+    """Test that the body is used when the page has no main element."""
+    extracted = extract_main_text("<html><body><p>One</p><aside>ad</aside><p>Two</p></body></html>")
+    assert extracted["title"] is None
+    assert extracted["text"] == "One\nTwo"
@@ -0,0 +1,194 @@
+"""Tests for the repository map tool."""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+from ai_coding_agent.core.lsp import RepoMapTool
+from ai_coding_agent.core.lsp.repo_map import pagerank
+from ai_coding_agent.core.lsp.symbol_index import SymbolIndex, parse_python
+from ai_coding_agent.core.registry import ToolRegistry
+from ai_coding_agent.interfaces.mcp import MCPServer
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a small project where most modules use models.py."""
+    (tmp_path / "models.py").write_text(
+        "class User(Base):\n"
+        "    def __init__(self, name: str):\n"
+        "        self.name = name\n\n"
+        "    def display_name(self) -> str:\n"
+        "        return self.name\n\n"
+        "    def _secret(self):\n"
+        "        pass\n"
+    )
+    for name in ("api", "views", "cli"):
+        (tmp_path / f"{name}.py").write_text(
+            "from models import User\n\n"
+            f"def {name}_handler(user_id: int) -> User:\n"
+            "    return User(str(user_id))\n"
+        )
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "client.ts").write_text(
+        "export class ApiClient {\n"
+        "  fetchUser(id) { return id; }\n"
+        "}\n"
+        "export async function loadUser(id: number): Promise<User> {\n"
+        "  return new ApiClient().fetchUser(id);\n"
+        "}\n"
+    )
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("function ignored() {}\n")
+    return tmp_path
+
+
+def test_parse_python_outlines_public_members():
+    symbols, references = parse_python(
+        "import os\n\n"
+        "class A(B):\n"
+        "    def __init__(self, x=1): ...\n"
+        "    def run(self): ...\n"
+        "    def _hidden(self): ...\n\n"
+        "async def main(argv: list) -> int:\n"
+        "    return os.getpid()\n"
+    )
+
+    assert [(symbol.name, symbol.signature) for symbol in symbols] == [
+        ("A", "class A(B)"),
+        ("main", "async def main(argv: list) -> int")
+    ]
+    assert symbols[0].members == ["def __init__(self, x=1)", "def run(self)"]
+    assert {"os", "B", "getpid"} <= references
+
+
+def test_pagerank_favours_referenced_nodes():
+    graph = {"a": {"hub": 1.0}, "b": {"hub": 1.0}, "c": {"hub": 0.5, "b": 0.5}}
+
+    ranks = pagerank(["a", "b", "c", "hub", "lonely"], graph)
+
+    assert max(ranks, key=ranks.get) == "hub"
+    assert ranks["b"] > ranks["a"] == pytest.approx(ranks["lonely"])
+    assert sum(ranks.values()) == pytest.approx(1.0)
+    focused = pagerank(["a", "b", "c", "hub", "lonely"], graph, {"lonely": 1.0})
+    assert focused["lonely"] > ranks["lonely"]
+
+
+def test_symbol_index_only_reparses_changed_files(repo):
+    index = SymbolIndex(repo)
+    assert index.refresh()
+    assert index.parsed == 5
+    assert "node_modules/dep.js" not in index.files
+    assert [symbol.name for symbol in index.get("web/client.ts").symbols] == ["ApiClient", "loadUser"]
+    version = index.version
+
+    assert not index.refresh()
+    assert index.version == version
+
+    (repo / "cli.py").write_text("def cli_main():\n    pass\n")
+    (repo / "views.py").unlink()
+    assert index.refresh()
+    assert index.parsed == 6
+    assert index.version == version + 1
+    assert "views.py" not in index.files
+
+
+def test_symbol_index_updates_reported_paths(repo):
+    index = SymbolIndex(repo)
+    index.refresh()
+    version = index.version
+
+    (repo / "cli.py").write_text("def cli_main():\n    pass\n")
+    (repo / "web" / "client.ts").unlink()
+    (repo / "web").rmdir()
+    (repo / "node_modules" / "dep.js").write_text("function changed() {}\n")
+    with patch.object(SymbolIndex, "_walk", side_effect=AssertionError("walked the tree")):
+        assert index.update([str(repo / "cli.py"), "web", str(repo / "node_modules" / "dep.js"), "/elsewhere/x.py"])
+    assert index.parsed == 6
+    assert index.version == version + 1
+    assert [symbol.name for symbol in index.get("cli.py").symbols] == ["cli_main"]
+    assert "web/client.ts" not in index.files
+    assert "node_modules/dep.js" not in index.files
+    assert not index.update(["cli.py"])
+
+
+@pytest.mark.asyncio
+async def test_server_watcher_keeps_the_index_current(repo):
+    tool = RepoMapTool()
+    server = MCPServer(registry=ToolRegistry([tool]), watch_dir=repo)
+    changed = asyncio.Event()
+    server.watcher.subscribe(lambda changes: changed.set())
+    app = server.create_starlette_app()
+
+    async with app.router.lifespan_context(app):
+        assert (await tool.execute(directory_path=str(repo))).success
+        index = tool.index(str(repo))
+        with patch.object(SymbolIndex, "_walk", side_effect=AssertionError("walked the tree")):
+            (repo / "jobs.py").write_text("from models import User\n\ndef nightly_job():\n    pass\n")
+            await asyncio.wait_for(changed.wait(), timeout=5)
+            # Subscribers run as separate tasks; wait for the index update
+            for _ in range(100):
+                if index.get("jobs.py") is not None:
+                    break
+                await asyncio.sleep(0.01)
+            result = await tool.execute(directory_path=str(repo))
+        assert "def nightly_job()" in result.data["map"]
+        assert index.parsed == 6
+
+    # Without a running watcher, calls walk the tree again
+    (repo / "late.py").write_text("def late():\n    pass\n")
+    result = await tool.execute(directory_path=str(repo))
+    assert "def late()" in result.data["map"]
+
+
+@pytest.mark.asyncio
+class TestRepoMapTool:
+    async def test_most_referenced_file_comes_first(self, repo):
+        tool = RepoMapTool()
+        result = await tool.execute(directory_path=str(repo))
+
+        assert result.success
+        text = result.data["map"]
+        assert text.startswith("models.py:\n  class User(Base)\n    def __init__(self, name: str)\n")
+        assert "def display_name(self) -> str" in text
+        assert "_secret" not in text
+        assert "  def api_handler(user_id: int) -> User" in text
+        assert "  export async function loadUser(id: number): Promise<User>" in text
+        assert result.data["files"] == result.data["files_shown"] == 5
+
+    async def test_map_fits_the_budget(self, repo):
+        for number in range(50):
+            (repo / f"module_{number}.py").write_text(f"def function_{number}(argument):\n    pass\n")
+        tool = RepoMapTool()
+
+        result = await tool.execute(directory_path=str(repo), max_tokens=100)
+
+        assert result.success
+        assert result.data["estimated_tokens"] <= 100 + 10
+        assert result.data["map"].startswith("models.py:")
+        assert result.data["map"].endswith(f"... {55 - result.data['files_shown']} more files")
+
+    async def test_focus_files_and_caching(self, repo):
+        tool = RepoMapTool()
+        first = await tool.execute(directory_path=str(repo), max_tokens=30)
+        parsed = tool.index(str(repo)).parsed
+
+        focused = await tool.execute(directory_path=str(repo), max_tokens=30, focus_files=["web/client.ts"])
+        again = await tool.execute(directory_path=str(repo), max_tokens=30)
+
+        assert focused.data["map"].startswith("web/client.ts:")
+        assert again.data is first.data
+        assert tool.index(str(repo)).parsed == parsed
+
+        (repo / "api.py").write_text("def renamed():\n    pass\n")
+        os.utime(repo / "api.py", ns=(1, 1))
+        updated = await tool.execute(directory_path=str(repo))
+        assert "def renamed()" in updated.data["map"]
+        assert tool.index(str(repo)).parsed == parsed + 1
+
+    async def test_missing_directory(self, tmp_path):
+        result = await RepoMapTool().execute(directory_path=str(tmp_path / "missing"))
+
+        assert not result.success
+        assert "not a directory" in result.error
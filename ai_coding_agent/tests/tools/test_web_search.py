@@ -0,0 +1,132 @@
+"""Tests for the offline web search tool."""
+
+import os
+
+import pytest
+from ai_coding_agent.core.web import DocumentIndex, ReadUrlTool, ResponseCache, WebSearchTool
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Create an empty document index."""
+    index = DocumentIndex(tmp_path / "search.sqlite3")
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def docs(tmp_path):
+    """Create a small mirrored docs directory."""
+    root = tmp_path / "docs"
+    (root / "library").mkdir(parents=True)
+    (root / "library" / "asyncio.html").write_text(
+        "<html><head><title>asyncio</title></head><body><nav>Index</nav>"
+        "<main><p>asyncio is a library to write concurrent code using async and await.</p></main>"
+        "</body></html>"
+    )
+    (root / "library" / "sqlite3.html").write_text(
+        "<html><head><title>sqlite3</title></head><body>"
+        "<p>DB-API interface for SQLite databases. Queries run synchronously.</p></body></html>"
+    )
+    (root / "tutorial.md").write_text("# Tutorial\n\nWrite your first async program.\n")
+    (root / "image.png").write_bytes(b"\x89PNG")
+    return root
+
+
+@pytest.mark.asyncio
+class TestWebSearchTool:
+    async def test_search_docs_directory(self, index, docs):
+        """Test that documents of a docs directory are ranked by relevance."""
+        tool = WebSearchTool(index=index, docs_dirs=[(docs, "https://docs.python.org/3")])
+        result = await tool.execute(query="async concurrent code")
+        assert result.success
+        results = result.data["results"]
+        assert results[0]["url"] == "https://docs.python.org/3/library/asyncio.html"
+        assert results[0]["title"] == "asyncio"
+        assert "concurrent code" in results[0]["snippet"]
+        assert "Index" not in results[0]["snippet"]
+        assert {r["url"] for r in results} == {
+            "https://docs.python.org/3/library/asyncio.html",
+            "https://docs.python.org/3/tutorial.md"
+        }
+
+    async def test_num_results(self, index, docs):
+        """Test that num_results limits the result count."""
+        tool = WebSearchTool(index=index, docs_dirs=[(docs, None)])
+        result = await tool.execute(query="async", num_results=1)
+        assert len(result.data["results"]) == 1
+
+    async def test_domain_filter(self, index):
+        """Test that the domain filter matches the domain and its subdomains."""
+        index.add("https://docs.python.org/3/a.html", "Python", "generators and iterators")
+        index.add("https://peps.python.org/pep-0255/", "PEP 255", "simple generators")
+        index.add("https://example.com/gen", "Example", "generators everywhere")
+
+        tool = WebSearchTool(index=index, docs_dirs=[])
+        result = await tool.execute(query="generators", domain="python.org")
+        assert sorted(r["url"] for r in result.data["results"]) == [
+            "https://docs.python.org/3/a.html",
+            "https://peps.python.org/pep-0255/"
+        ]
+        result = await tool.execute(query="generators", domain="example.com")
+        assert [r["url"] for r in result.data["results"]] == ["https://example.com/gen"]
+
+    async def test_domain_filter_has_no_wildcards(self, index):
+        """Test that _ and % in the domain filter match only themselves."""
+        index.add("https://docs.axb.com/a", "Axb", "generators")
+        index.add("https://a_b.com/a", "A_b", "generators")
+
+        tool = WebSearchTool(index=index, docs_dirs=[])
+        result = await tool.execute(query="generators", domain="a_b.com")
+        assert [r["url"] for r in result.data["results"]] == ["https://a_b.com/a"]
+        result = await tool.execute(query="generators", domain="%.com")
+        assert result.data["results"] == []
+
+    async def test_fetched_pages_are_searchable(self, http_server, index, tmp_path):
+        """Test that pages read with read_url are added to the index."""
+        http_server.route(
+            "/guide",
+            "<html><head><title>Guide</title></head><body><p>Configure the frobnicator.</p></body></html>",
+            headers={"Content-Type": "text/html"}
+        )
+        reader = ReadUrlTool(cache=ResponseCache(tmp_path / "http-cache"), search_index=index)
+        await reader.execute(url=http_server.url("/guide"))
+
+        result = await WebSearchTool(index=index, docs_dirs=[]).execute(query="frobnicator")
+        assert [r["url"] for r in result.data["results"]] == [http_server.url("/guide")]
+        assert result.data["results"][0]["title"] == "Guide"
+
+    async def test_empty_index(self, index):
+        """Test that searching an empty index returns no results."""
+        result = await WebSearchTool(index=index, docs_dirs=[]).execute(query="anything")
+        assert result.success
+        assert result.data["results"] == []
+
+
+class TestDocumentIndex:
+    def test_incremental_directory_indexing(self, index, docs):
+        """Test that only changed files are re-read and deleted files are dropped."""
+        assert index.index_directory(docs) == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+        assert index.index_directory(docs) == {"added": 0, "updated": 0, "removed": 0, "unchanged": 3}
+
+        page = docs / "library" / "sqlite3.html"
+        page.write_text("<html><body><p>Now with transactions.</p></body></html>")
+        stat = page.stat()
+        os.utime(page, (stat.st_atime, stat.st_mtime + 10))
+        (docs / "tutorial.md").unlink()
+
+        assert index.index_directory(docs) == {"added": 0, "updated": 1, "removed": 1, "unchanged": 1}
+        assert len(index) == 2
+        assert [r["title"] for r in index.search("transactions")] == ["sqlite3"]
+        assert index.search("first program") == []
+
+    def test_title_matches_rank_first(self, index):
+        """Test that title matches outweigh content matches."""
+        index.add("https://a.test/1", "Notes", "the cache is invalidated on write")
+        index.add("https://a.test/2", "Cache", "notes about invalidation")
+        assert index.search("cache")[0]["url"] == "https://a.test/2"
+
+    def test_stemming(self, index):
+        """Test that queries match other forms of the same word."""
+        index.add("https://a.test/run", "Runner", "running tests in parallel")
+        assert [r["url"] for r in index.search("run")] == ["https://a.test/run"]
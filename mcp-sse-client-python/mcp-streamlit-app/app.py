@@ -501,7 +501,9 @@ async def connect_to_server_async():
                 )
         elif st.session_state.llm_provider == "ollama":
             host = st.session_state.ollama_host if st.session_state.ollama_host else None
-            llm_bridge = OllamaBridge(client, model=st.session_state.ollama_model, host=host)
+            llm_bridge = OllamaBridge(client, model=st.session_state.ollama_model, host=host, warm_up=True)
+            # The event loop ends with this function, so let the model finish loading
+            await llm_bridge.warm_up_task
         
         # Update session state
         st.session_state.client = client
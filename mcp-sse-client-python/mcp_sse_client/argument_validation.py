@@ -0,0 +1,242 @@
+"""
+Validating tool call arguments before they are sent to the MCP server.
+
+LLMs regularly produce arguments that are not valid JSON, miss required
+parameters or give numbers as strings. Sending such a call costs a round
+trip to the server and a tool error; checking it locally costs
+microseconds and gives the LLM a precise error it can correct.
+
+``ToolValidator`` compiles a tool's parameters into one check per
+parameter once, so validating a call is a dictionary walk. Values of the
+wrong type are coerced when the intent is unambiguous (``"5"`` for an
+integer, ``"true"`` for a boolean, a JSON string for an array or object)
+and rejected otherwise.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .client import ToolDef, ToolInvocationResult, ToolParameter, schema_type
+from .format_converters import TYPE_MAPPING
+
+_INTEGER = re.compile(r"^\s*[-+]?\d+\s*$")
+
+
+class _Invalid(Exception):
+    """Raised by a parameter check with the reason the value was rejected."""
+
+
+def _as_string(value: Any) -> Any:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise _Invalid(f"expected a string, got {type(value).__name__}")
+
+
+def _as_integer(value: Any) -> Any:
+    if isinstance(value, bool):
+        raise _Invalid("expected an integer, got a boolean")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and _INTEGER.match(value):
+        return int(value)
+    raise _Invalid(f"expected an integer, got {value!r}")
+
+
+def _as_number(value: Any) -> Any:
+    if isinstance(value, bool):
+        raise _Invalid("expected a number, got a boolean")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value) if _INTEGER.match(value) else float(value)
+        except ValueError:
+            pass
+    raise _Invalid(f"expected a number, got {value!r}")
+
+
+def _as_boolean(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise _Invalid(f"expected a boolean, got {value!r}")
+
+
+def _decoded(value: Any, expected: type, name: str) -> Any:
+    if isinstance(value, expected):
+        return value
+    if isinstance(value, str):
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            decoded = None
+        if isinstance(decoded, expected):
+            return decoded
+    raise _Invalid(f"expected {name}, got {type(value).__name__}")
+
+
+def _as_array(value: Any) -> Any:
+    return _decoded(value, list, "an array")
+
+
+def _as_object(value: Any) -> Any:
+    return _decoded(value, dict, "an object")
+
+
+# Check and coercion of each JSON Schema type; other types are not checked
+_CHECKS: Dict[str, Callable[[Any], Any]] = {
+    "string": _as_string,
+    "integer": _as_integer,
+    "number": _as_number,
+    "boolean": _as_boolean,
+    "array": _as_array,
+    "object": _as_object
+}
+
+
+def _check_for(param: ToolParameter) -> Optional[Callable[[Any], Any]]:
+    """Check of a parameter's values, or None if its type is not known."""
+    if param.schema:
+        # The listed schema is authoritative; parameter_type falls back to
+        # "string" when the server's schema names no single type
+        json_type = schema_type(param.schema)
+    else:
+        json_type = TYPE_MAPPING.get(param.parameter_type, param.parameter_type)
+    return _CHECKS.get(json_type) if json_type else None
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a tool call.
+
+    Attributes:
+        tool_name: Name of the called tool
+        arguments: The arguments, with coerced values
+        errors: One dictionary per problem, with ``parameter`` and ``message``
+    """
+    tool_name: str
+    arguments: Dict[str, Any]
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call can be sent to the server."""
+        return not self.errors
+
+    def message(self) -> str:
+        """The errors as a single sentence for the LLM."""
+        problems = "; ".join(
+            f"{error['parameter']}: {error['message']}" if error["parameter"] else error["message"]
+            for error in self.errors
+        )
+        return f"Invalid arguments for tool '{self.tool_name}': {problems}. Fix the arguments and call it again."
+
+    def to_result(self) -> ToolInvocationResult:
+        """A failed tool result carrying the errors, as the server would return it."""
+        content = json.dumps({"success": False, "data": None, "error": self.message(), "errors": self.errors})
+        return ToolInvocationResult(content=content, error_code=1)
+
+
+class ToolValidator:
+    """Validates and coerces the arguments of one tool.
+
+    Example:
+        validator = ToolValidator(tool_def)
+        result = validator.validate({"target_file": "app.py", "start_line": "10"})
+        if result.ok:
+            await client.invoke_tool(tool_def.name, result.arguments)
+    """
+
+    def __init__(self, tool: ToolDef):
+        """Compile the checks of a tool's parameters.
+
+        Args:
+            tool: Definition of the tool
+        """
+        self.tool_name = tool.name
+        self.required: Tuple[str, ...] = tuple(param.name for param in tool.parameters if param.required)
+        self.checks: Dict[str, Optional[Callable[[Any], Any]]] = {
+            param.name: _check_for(param) for param in tool.parameters
+        }
+
+    def validate(self, arguments: Any) -> ValidationResult:
+        """Validate the arguments of a call.
+
+        Args:
+            arguments: Arguments produced by the LLM; a JSON string is decoded
+
+        Returns:
+            ValidationResult with the coerced arguments and any errors
+        """
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments) if arguments.strip() else {}
+            except ValueError as e:
+                return ValidationResult(self.tool_name, {}, [
+                    {"parameter": "", "message": f"arguments are not valid JSON ({e})"}
+                ])
+        if arguments is None:
+            arguments = {}
+        if not isinstance(arguments, dict):
+            return ValidationResult(self.tool_name, {}, [
+                {"parameter": "", "message": f"arguments must be a JSON object, got {type(arguments).__name__}"}
+            ])
+
+        coerced: Dict[str, Any] = {}
+        errors: List[Dict[str, str]] = []
+        for name, value in arguments.items():
+            if name not in self.checks:
+                errors.append({
+                    "parameter": name,
+                    "message": f"unknown parameter; expected one of {', '.join(self.checks) or 'no parameters'}"
+                })
+                continue
+            check = self.checks[name]
+            if value is None or check is None:
+                # null stands for an omitted optional parameter
+                coerced[name] = value
+                continue
+            try:
+                coerced[name] = check(value)
+            except _Invalid as e:
+                errors.append({"parameter": name, "message": str(e)})
+        for name in self.required:
+            if arguments.get(name) is None:
+                errors.append({"parameter": name, "message": "required parameter is missing"})
+        return ValidationResult(self.tool_name, coerced, errors)
+
+
+class ArgumentValidator:
+    """Validators of all tools of a catalog, compiled once."""
+
+    def __init__(self, tools: Sequence[ToolDef]):
+        """Compile a validator per tool.
+
+        Args:
+            tools: Tool definitions, as listed by the MCP server
+        """
+        self.validators = {tool.name: ToolValidator(tool) for tool in tools}
+
+    def validate(self, tool_name: Optional[str], arguments: Any) -> ValidationResult:
+        """Validate a call of any tool of the catalog.
+
+        Args:
+            tool_name: Name of the called tool
+            arguments: Arguments produced by the LLM
+
+        Returns:
+            ValidationResult, with an error if the tool does not exist
+        """
+        validator = self.validators.get(tool_name or "")
+        if validator is None:
+            return ValidationResult(str(tool_name), {}, [{
+                "parameter": "",
+                "message": f"no such tool; available tools are {', '.join(sorted(self.validators))}"
+            }])
+        return validator.validate(arguments)
@@ -10,13 +10,16 @@ Example: http://localhost:8000/sse
 
 import asyncio
 import logging
+from contextlib import AsyncExitStack
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 from pydantic import BaseModel
 
+from .tracing import Tracer, get_tracer
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -31,12 +34,45 @@ class ToolParameter:
         description: Parameter description
         required: Whether the parameter is required
         default: Default value for the parameter
+        schema: JSON Schema of the parameter as listed by the server, if any
     """
     name: str
     parameter_type: str
     description: str
     required: bool = False
     default: Any = None
+    schema: Dict[str, Any] = field(default_factory=dict)
+
+
+def schema_type(schema: Dict[str, Any]) -> Optional[str]:
+    """JSON Schema type of a value, ignoring that it may be null.
+
+    Optional parameters are often listed as ``anyOf: [{type: X}, {type: null}]``
+    or ``type: [X, null]``; their type is X.
+
+    Returns:
+        The type, or None if the schema allows several types or names none
+    """
+    declared = schema.get("type")
+    if isinstance(declared, str):
+        return declared
+    if isinstance(declared, list):
+        types = {t for t in declared if t != "null"}
+    else:
+        branches = schema.get("anyOf") or schema.get("oneOf") or []
+        types = {schema_type(branch) for branch in branches if isinstance(branch, dict)}
+        types.discard("null")
+    return types.pop() if len(types) == 1 and None not in types else None
+
+
+def _branch_description(schema: Dict[str, Any]) -> str:
+    """Description of a parameter, which may sit on its non-null branch."""
+    if schema.get("description"):
+        return schema["description"]
+    for branch in schema.get("anyOf") or schema.get("oneOf") or []:
+        if isinstance(branch, dict) and branch.get("description"):
+            return branch["description"]
+    return ""
 
 
 @dataclass
@@ -86,13 +122,15 @@ class MCPClient:
     Example: http://localhost:8000/sse
     """
     
-    def __init__(self, endpoint: str, timeout: float = 30.0, max_retries: int = 3):
+    def __init__(self, endpoint: str, timeout: float = 30.0, max_retries: int = 3,
+                 tracer: Optional[Tracer] = None):
         """Initialize MCP client with endpoint URL
         
         Args:
             endpoint: The MCP endpoint URL (must be http or https and should end with '/sse')
             timeout: Connection timeout in seconds
             max_retries: Maximum number of retry attempts
+            tracer: Tracer recording request spans (defaults to the process-wide tracer)
             
         Raises:
             ValueError: If endpoint is not a valid HTTP(S) URL
@@ -113,6 +151,7 @@ class MCPClient:
         self.endpoint = endpoint
         self.timeout = timeout
         self.max_retries = max_retries
+        self.tracer = tracer if tracer is not None else get_tracer()
 
     async def _execute_with_retry(self, operation_name: str, operation_func):
         """Execute an operation with retry logic and proper error handling
@@ -128,40 +167,42 @@ class MCPClient:
             MCPConnectionError: If connection fails after all retries
             MCPTimeoutError: If operation times out
         """
-        last_exception = None
-        
-        for attempt in range(self.max_retries):
-            try:
-                logger.debug(f"Attempting {operation_name} (attempt {attempt + 1}/{self.max_retries})")
-                
-                # Execute with timeout
-                result = await asyncio.wait_for(operation_func(), timeout=self.timeout)
-                logger.debug(f"{operation_name} completed successfully")
-                return result
-                
-            except asyncio.TimeoutError as e:
-                last_exception = MCPTimeoutError(f"{operation_name} timed out after {self.timeout} seconds")
-                logger.warning(f"{operation_name} timed out on attempt {attempt + 1}")
-                
-            except Exception as e:
-                last_exception = e
-                logger.warning(f"{operation_name} failed on attempt {attempt + 1}: {str(e)}")
-                
-                # Don't retry on certain types of errors
-                if isinstance(e, (ValueError, TypeError)):
-                    break
+        with self.tracer.span("mcp.request", {"operation": operation_name, "endpoint": self.endpoint}):
+            last_exception = None
+            
+            for attempt in range(self.max_retries):
+                try:
+                    logger.debug(f"Attempting {operation_name} (attempt {attempt + 1}/{self.max_retries})")
                     
-            # Wait before retry (exponential backoff)
-            if attempt < self.max_retries - 1:
-                wait_time = 2 ** attempt
-                logger.debug(f"Waiting {wait_time} seconds before retry")
-                await asyncio.sleep(wait_time)
-        
-        # All retries failed
-        if isinstance(last_exception, MCPTimeoutError):
-            raise last_exception
-        else:
-            raise MCPConnectionError(f"{operation_name} failed after {self.max_retries} attempts: {str(last_exception)}")
+                    # Execute with timeout
+                    with self.tracer.span("mcp.attempt", {"operation": operation_name, "attempt": attempt + 1}):
+                        result = await asyncio.wait_for(operation_func(), timeout=self.timeout)
+                    logger.debug(f"{operation_name} completed successfully")
+                    return result
+                    
+                except asyncio.TimeoutError as e:
+                    last_exception = MCPTimeoutError(f"{operation_name} timed out after {self.timeout} seconds")
+                    logger.warning(f"{operation_name} timed out on attempt {attempt + 1}")
+                    
+                except Exception as e:
+                    last_exception = e
+                    logger.warning(f"{operation_name} failed on attempt {attempt + 1}: {str(e)}")
+                    
+                    # Don't retry on certain types of errors
+                    if isinstance(e, (ValueError, TypeError)):
+                        break
+                        
+                # Wait before retry (exponential backoff)
+                if attempt < self.max_retries - 1:
+                    wait_time = 2 ** attempt
+                    logger.debug(f"Waiting {wait_time} seconds before retry")
+                    await asyncio.sleep(wait_time)
+            
+            # All retries failed
+            if isinstance(last_exception, MCPTimeoutError):
+                raise last_exception
+            else:
+                raise MCPConnectionError(f"{operation_name} failed after {self.max_retries} attempts: {str(last_exception)}")
 
     async def _safe_sse_operation(self, operation_func):
         """Safely execute an SSE operation with proper task cleanup
@@ -172,18 +213,19 @@ class MCPClient:
         Returns:
             Result of the operation
         """
-        streams = None
         session = None
         
         try:
-            # Create SSE client with proper error handling
-            streams = sse_client(self.endpoint)
-            async with streams as stream_context:
-                # Create session with proper cleanup
-                session = ClientSession(*stream_context)
-                async with session as session_context:
+            async with AsyncExitStack() as stack:
+                with self.tracer.span("mcp.connect", {"endpoint": self.endpoint}):
+                    # Create SSE client with proper error handling
+                    stream_context = await stack.enter_async_context(sse_client(self.endpoint))
+                    # Create session with proper cleanup
+                    session = ClientSession(*stream_context)
+                    session_context = await stack.enter_async_context(session)
+                with self.tracer.span("mcp.initialize"):
                     await session_context.initialize()
-                    return await operation_func(session_context)
+                return await operation_func(session_context)
                     
         except Exception as e:
             logger.error(f"SSE operation failed: {str(e)}")
@@ -214,7 +256,8 @@ class MCPClient:
         """
         async def _list_tools_operation():
             async def _operation(session):
-                tools_result = await session.list_tools()
+                with self.tracer.span("mcp.list_tools"):
+                    tools_result = await session.list_tools()
                 tools = []
                 
                 for tool in tools_result.tools:
@@ -224,10 +267,11 @@ class MCPClient:
                         parameters.append(
                             ToolParameter(
                                 name=param_name,
-                                parameter_type=param_schema.get("type", "string"),
-                                description=param_schema.get("description", ""),
+                                parameter_type=schema_type(param_schema) or "string",
+                                description=_branch_description(param_schema),
                                 required=param_name in required_params,
                                 default=param_schema.get("default"),
+                                schema=param_schema,
                             )
                         )
                     tools.append(
@@ -261,7 +305,14 @@ class MCPClient:
         """
         async def _invoke_tool_operation():
             async def _operation(session):
-                result = await session.call_tool(tool_name, kwargs)
+                with self.tracer.span("mcp.call_tool", {"tool": tool_name}):
+                    if self.tracer.enabled:
+                        # Lets the server attach its spans to this trace
+                        result = await session.call_tool(
+                            tool_name, kwargs, meta={"traceparent": self.tracer.traceparent()}
+                        )
+                    else:
+                        result = await session.call_tool(tool_name, kwargs)
                 return ToolInvocationResult(
                     content="\n".join([result.model_dump_json() for result in result.content]),
                     error_code=1 if result.isError else 0,
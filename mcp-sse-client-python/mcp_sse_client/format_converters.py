@@ -1,9 +1,22 @@
 """
 Format converters for transforming MCP tool definitions to various LLM formats.
+
+Converted tool lists are cached per tool catalog version and format, so
+converting the same tools again costs a dictionary lookup. The cached
+lists are frozen: they are shared by every caller, so any attempt to
+modify them raises TypeError; copy them to make changes.
 """
-from typing import List, Dict, Any
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from .client import ToolDef, ToolParameter
 
+# Number of converted (catalog version, format) pairs kept
+MAX_CACHED_CATALOGS = 32
+
 # Type mapping from Python/MCP types to JSON Schema types
 TYPE_MAPPING = {
     "int": "integer",
@@ -51,16 +64,7 @@ def _infer_array_item_type(param: ToolParameter) -> str:
     return item_type
 
 
-def to_openai_format(tools: List[ToolDef]) -> List[Dict[str, Any]]:
-    """Convert ToolDef objects to OpenAI function format.
-    
-    Args:
-        tools: List of ToolDef objects to convert
-        
-    Returns:
-        List of dictionaries in OpenAI function format
-    """
-    
+def _build_openai_format(tools: Sequence[ToolDef]) -> List[Dict[str, Any]]:
     openai_tools = []
     for tool in tools:
         openai_tool = {
@@ -105,16 +109,7 @@ def to_openai_format(tools: List[ToolDef]) -> List[Dict[str, Any]]:
     return openai_tools
 
 
-def to_anthropic_format(tools: List[ToolDef]) -> List[Dict[str, Any]]:
-    """Convert ToolDef objects to Anthropic tool format.
-    
-    Args:
-        tools: List of ToolDef objects to convert
-        
-    Returns:
-        List of dictionaries in Anthropic tool format
-    """
-    
+def _build_anthropic_format(tools: Sequence[ToolDef]) -> List[Dict[str, Any]]:
     anthropic_tools = []
     for tool in tools:
         anthropic_tool = {
@@ -154,3 +149,144 @@ def to_anthropic_format(tools: List[ToolDef]) -> List[Dict[str, Any]]:
                 
         anthropic_tools.append(anthropic_tool)
     return anthropic_tools
+
+
+class FrozenDict(dict):
+    """Dictionary that cannot be modified.
+    
+    Being a dict, it is serialized like one by json and the LLM SDKs;
+    copies made with ``dict(...)``, ``copy`` or ``deepcopy`` are mutable.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Converted tool schemas are shared and cannot be modified; copy them first")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _immutable
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """List that cannot be modified; see ``FrozenDict``."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Converted tool schemas are shared and cannot be modified; copy them first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = \
+        clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Frozen copy of a structure of dictionaries and lists."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def catalog_version(tools: Sequence[ToolDef]) -> str:
+    """Fingerprint of a tool catalog, changing whenever any definition does.
+    
+    Compute it once when the tools are fetched and pass it to the
+    converters, which then skip hashing the catalog on every call.
+    """
+    digest = hashlib.sha256()
+    for tool in tools:
+        digest.update(json.dumps(asdict(tool), sort_keys=True, default=repr).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+FORMATS: Dict[str, Callable[[Sequence[ToolDef]], List[Dict[str, Any]]]] = {
+    "openai": _build_openai_format,
+    "anthropic": _build_anthropic_format
+}
+
+_converted: "OrderedDict[Tuple[str, str], Tuple[FrozenList, Optional[bytes]]]" = OrderedDict()
+_converted_lock = threading.Lock()
+
+
+def _convert(tools: Sequence[ToolDef], format: str, version: Optional[str]) -> Tuple[Tuple[str, str], FrozenList]:
+    if format not in FORMATS:
+        raise ValueError(f"Unknown tool format: {format}")
+    key = (version or catalog_version(tools), format)
+    with _converted_lock:
+        entry = _converted.get(key)
+        if entry is not None:
+            _converted.move_to_end(key)
+            return key, entry[0]
+    converted = freeze(FORMATS[format](tools))
+    with _converted_lock:
+        entry = _converted.setdefault(key, (converted, None))
+        _converted.move_to_end(key)
+        while len(_converted) > MAX_CACHED_CATALOGS:
+            _converted.popitem(last=False)
+    return key, entry[0]
+
+
+def convert_tools(tools: Sequence[ToolDef], format: str, version: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Convert ToolDef objects to an LLM tool format, reusing earlier conversions.
+    
+    Args:
+        tools: List of ToolDef objects to convert
+        format: Target format, one of ``FORMATS``
+        version: ``catalog_version(tools)``, if already known
+        
+    Returns:
+        Frozen list of tool dictionaries in the target format
+    """
+    return _convert(tools, format, version)[1]
+
+
+def tools_json(tools: Sequence[ToolDef], format: str, version: Optional[str] = None) -> bytes:
+    """Converted tools serialized as compact JSON, for building request bodies directly.
+    
+    Args:
+        tools: List of ToolDef objects to convert
+        format: Target format, one of ``FORMATS``
+        version: ``catalog_version(tools)``, if already known
+        
+    Returns:
+        UTF-8 encoded JSON array, serialized once per catalog version and format
+    """
+    key, converted = _convert(tools, format, version)
+    with _converted_lock:
+        entry = _converted.get(key)
+        if entry is not None and entry[1] is not None:
+            return entry[1]
+    serialized = json.dumps(converted, separators=(",", ":")).encode("utf-8")
+    with _converted_lock:
+        if key in _converted:
+            _converted[key] = (converted, serialized)
+    return serialized
+
+
+def to_openai_format(tools: Sequence[ToolDef], version: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Convert ToolDef objects to OpenAI function format.
+    
+    Args:
+        tools: List of ToolDef objects to convert
+        version: ``catalog_version(tools)``, if already known
+        
+    Returns:
+        Frozen list of dictionaries in OpenAI function format
+    """
+    return convert_tools(tools, "openai", version)
+
+
+def to_anthropic_format(tools: Sequence[ToolDef], version: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Convert ToolDef objects to Anthropic tool format.
+    
+    Args:
+        tools: List of ToolDef objects to convert
+        version: ``catalog_version(tools)``, if already known
+        
+    Returns:
+        Frozen list of dictionaries in Anthropic tool format
+    """
+    return convert_tools(tools, "anthropic", version)
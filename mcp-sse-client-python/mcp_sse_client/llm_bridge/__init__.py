@@ -5,7 +5,7 @@ LLM Bridge for integrating MCP client with various LLM providers.
 from .base import LLMBridge
 from .openai_bridge import OpenAIBridge
 from .anthropic_bridge import AnthropicBridge
-from .ollama_bridge import OllamaBridge
+from .ollama_bridge import OllamaBridge, OllamaScheduler
 from .openrouter_bridge import OpenRouterBridge
 from .openrouter_client import OpenRouterClient, format_model_display
 
@@ -14,6 +14,7 @@ __all__ = [
     "OpenAIBridge",
     "AnthropicBridge",
     "OllamaBridge",
+    "OllamaScheduler",
     "OpenRouterBridge",
     "OpenRouterClient",
     "format_model_display"
@@ -9,20 +9,39 @@ from .base import LLMBridge
 from .models import DEFAULT_ANTHROPIC_MODEL # Import default model
 
 
+# Marks the end of a prompt prefix that Anthropic caches
+CACHE_CONTROL = {"type": "ephemeral"}
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful tool-using assistant."
+
+
 class AnthropicBridge(LLMBridge):
-    """Anthropic-specific implementation of the LLM Bridge."""
+    """Anthropic-specific implementation of the LLM Bridge.
+    
+    With ``prompt_caching`` on, requests mark cache breakpoints after the
+    tools, the system prompt and the latest user message. Tools (sorted by
+    name) and the system prompt are identical in every request, including
+    the final one after a tool call, so they are read from Anthropic's
+    prompt cache instead of being processed again, and each turn of a
+    conversation reuses the cached history of the previous one.
+    """
     
-    def __init__(self, mcp_client, api_key, model=DEFAULT_ANTHROPIC_MODEL): # Use imported default
+    def __init__(self, mcp_client, api_key, model=DEFAULT_ANTHROPIC_MODEL, # Use imported default
+                 system_prompt: str = DEFAULT_SYSTEM_PROMPT, prompt_caching: bool = True):
         """Initialize Anthropic bridge with API key and model.
         
         Args:
             mcp_client: An initialized MCPClient instance
             api_key: Anthropic API key
             model: Anthropic model to use (default: from models.py)
+            system_prompt: System prompt sent with every request
+            prompt_caching: Whether to mark prompt cache breakpoints
         """
         super().__init__(mcp_client)
         self.llm_client = anthropic.Anthropic(api_key=api_key)
         self.model = model
+        self.system_prompt = system_prompt
+        self.prompt_caching = prompt_caching
         
         # Store provider info for metadata
         self.provider_info = {
@@ -40,7 +59,35 @@ class AnthropicBridge(LLMBridge):
         Returns:
             List of tools in Anthropic format
         """
-        return to_anthropic_format(tools)
+        formatted_tools = to_anthropic_format(tools)
+        if self.prompt_caching and formatted_tools:
+            # The converted tools are shared, so the breakpoint goes on a copy
+            return list(formatted_tools[:-1]) + [{**formatted_tools[-1], "cache_control": CACHE_CONTROL}]
+        return formatted_tools
+    
+    def _system(self) -> Any:
+        if not self.prompt_caching:
+            return self.system_prompt
+        return [{"type": "text", "text": self.system_prompt, "cache_control": CACHE_CONTROL}]
+    
+    def _with_cache_breakpoint(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copy of the messages with a cache breakpoint after the last user message."""
+        if not self.prompt_caching:
+            return messages
+        for index in range(len(messages) - 1, -1, -1):
+            message = messages[index]
+            if message.get("role") != "user":
+                continue
+            content = message.get("content")
+            if isinstance(content, str):
+                blocks = [{"type": "text", "text": content}]
+            elif isinstance(content, list) and content and isinstance(content[-1], dict):
+                blocks = list(content)
+            else:
+                break
+            blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+            return messages[:index] + [{**message, "content": blocks}] + messages[index + 1:]
+        return messages
     
     async def submit_query(self, query: str, formatted_tools: List[Dict[str, Any]], conversation_history: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
         """Submit a query to Anthropic with the formatted tools.
@@ -60,8 +107,8 @@ class AnthropicBridge(LLMBridge):
         response = self.llm_client.messages.create(
             model=self.model,
             max_tokens=4096,
-            system="You are a helpful tool-using assistant.",
-            messages=messages,
+            system=self._system(),
+            messages=self._with_cache_breakpoint(messages),
             tools=formatted_tools
         )
         
@@ -70,18 +117,24 @@ class AnthropicBridge(LLMBridge):
     async def submit_query_without_tools(self, messages: List[Dict[str, Any]]) -> Any:
         """Submit a query to Anthropic without tools for final processing.
         
+        The tools of the first request are sent again, but may not be
+        called, so that the request starts with the same cached prefix.
+        
         Args:
             messages: Complete conversation including tool results
             
         Returns:
             Anthropic API response
         """
-        # Make the API call without tools
+        tool_options = {}
+        if self.prompt_caching and self.formatted_tools:
+            tool_options = {"tools": self.formatted_tools, "tool_choice": {"type": "none"}}
         response = self.llm_client.messages.create(
             model=self.model,
             max_tokens=4096,
-            messages=messages
-            # Note: No tools parameter - this is for final processing
+            system=self._system(),
+            messages=self._with_cache_breakpoint(messages),
+            **tool_options
         )
         
         return response
@@ -2,29 +2,86 @@
 Base class for LLM Bridge implementations.
 """
 import abc
-from typing import Dict, List, Any, Optional
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Any, Optional
+from ..argument_validation import ArgumentValidator, ValidationResult
 from ..client import MCPClient, ToolDef, ToolInvocationResult
+from ..format_converters import catalog_version
+from ..response_cache import LLMResponseCache
+from ..result_shaping import ResultShaper
+from ..tracing import get_tracer
+
+
+# Default for arguments where None has a meaning of its own
+_DEFAULT: Any = object()
+
+
+def _attribute(source: Any, name: str) -> Any:
+    """Field of a response, whether the SDK returns objects or dictionaries."""
+    if isinstance(source, dict):
+        return source.get(name)
+    return getattr(source, name, None)
+
+
+def _count(source: Any, name: str) -> int:
+    value = _attribute(source, name)
+    return value if isinstance(value, int) else 0
 
 
 class LLMBridge(abc.ABC):
     """Abstract base class for LLM bridge implementations."""
     
-    def __init__(self, mcp_client: MCPClient):
+    # Results longer than this are shaped on a worker thread
+    shape_in_thread_chars = 64 * 1024
+    
+    def __init__(self, mcp_client: MCPClient, result_shaper: Optional[ResultShaper] = _DEFAULT,
+                 response_cache: Optional[LLMResponseCache] = None):
         """Initialize the LLM bridge with an MCPClient instance.
         
         Args:
             mcp_client: An initialized MCPClient instance
+            result_shaper: Fits tool results into token budgets before they
+                are sent to the LLM (defaults to a ``ResultShaper``; None
+                sends them unchanged)
+            response_cache: Replays LLM responses to identical requests
+                instead of sending them (off unless given or set later)
         """
         self.mcp_client = mcp_client
         self.tools = None
+        # Tools as last sent to the LLM, resent unchanged for the final call
+        self.formatted_tools = None
+        self._formatted_version = None
+        # Check tool call arguments locally before sending them to the server
+        self.validate_arguments = True
+        self._validator: Optional[ArgumentValidator] = None
+        self._validator_version = None
+        self.result_shaper = ResultShaper() if result_shaper is _DEFAULT else result_shaper
+        self.response_cache = response_cache
+        # LLM responses served from the response cache
+        self.cached_responses = 0
+        # Share the client's tracer so tool calls nest under bridge spans
+        self.tracer = getattr(mcp_client, "tracer", None) or get_tracer()
+    
+    @property
+    def tools(self) -> Optional[List[ToolDef]]:
+        """Tools offered to the LLM, None until fetched."""
+        return self._tools
+    
+    @tools.setter
+    def tools(self, tools: Optional[List[ToolDef]]) -> None:
+        self._tools = tools
+        # Fingerprint of the catalog; formatted tools are reused until it changes
+        self.tools_version = catalog_version(tools) if tools is not None else None
     
     async def fetch_tools(self) -> List[ToolDef]:
         """Fetch available tools from the MCP endpoint.
         
         Returns:
-            List of ToolDef objects
+            List of ToolDef objects, sorted by name
         """
-        self.tools = await self.mcp_client.list_tools()
+        # A fixed order keeps the tools part of every prompt byte-identical,
+        # which provider-side prompt caches require
+        self.tools = sorted(await self.mcp_client.list_tools(), key=lambda tool: tool.name)
         return self.tools
     
     @abc.abstractmethod
@@ -77,6 +134,99 @@ class LLMBridge(abc.ABC):
         """
         pass
     
+    def extract_usage(self, llm_response: Any) -> Dict[str, int]:
+        """Token usage of an LLM response.
+        
+        Understands the usage reported by Anthropic, OpenAI-compatible APIs
+        and Ollama. ``input_tokens`` counts all prompt tokens, including
+        those read from (``cached_input_tokens``) or written to
+        (``cache_write_tokens``) the provider's prompt cache.
+        
+        Args:
+            llm_response: Response from the LLM
+            
+        Returns:
+            Dictionary of token counts, empty if the response has none
+        """
+        usage = _attribute(llm_response, "usage")
+        if usage is None:
+            if _count(llm_response, "prompt_eval_count") or _count(llm_response, "eval_count"):
+                # Ollama reports counts on the response itself
+                return {
+                    "input_tokens": _count(llm_response, "prompt_eval_count"),
+                    "output_tokens": _count(llm_response, "eval_count"),
+                    "cached_input_tokens": 0,
+                    "cache_write_tokens": 0
+                }
+            return {}
+        if _count(usage, "prompt_tokens") or _count(usage, "completion_tokens"):
+            return {
+                "input_tokens": _count(usage, "prompt_tokens"),
+                "output_tokens": _count(usage, "completion_tokens"),
+                "cached_input_tokens": _count(_attribute(usage, "prompt_tokens_details"), "cached_tokens"),
+                "cache_write_tokens": 0
+            }
+        cached = _count(usage, "cache_read_input_tokens")
+        written = _count(usage, "cache_creation_input_tokens")
+        return {
+            "input_tokens": _count(usage, "input_tokens") + cached + written,
+            "output_tokens": _count(usage, "output_tokens"),
+            "cached_input_tokens": cached,
+            "cache_write_tokens": written
+        }
+    
+    def validate_tool_call(self, tool_call: Dict[str, Any]) -> Optional[ValidationResult]:
+        """Check the arguments of a tool call against the tool's parameters.
+        
+        Validators are compiled once per version of the tool catalog.
+        
+        Args:
+            tool_call: Tool call as returned by ``parse_tool_call``
+            
+        Returns:
+            ValidationResult, or None if validation is off or there are no
+            tool definitions to validate against
+        """
+        if not self.validate_arguments or not self.tools:
+            return None
+        if self._validator is None or self._validator_version != self.tools_version:
+            self._validator = ArgumentValidator(self.tools)
+            self._validator_version = self.tools_version
+        return self._validator.validate(tool_call.get("name"), tool_call.get("parameters"))
+    
+    async def cached_llm_call(self, kind: str, request: Dict[str, Any],
+                              call: Callable[[], Awaitable[Any]]) -> Any:
+        """Make an LLM request, or replay its response from the response cache.
+        
+        Args:
+            kind: Which request of the flow this is ("query" or "final")
+            request: Everything sent to the LLM besides the bridge settings
+            call: Sends the request
+            
+        Returns:
+            LLM response
+        """
+        if self.response_cache is None:
+            return await call()
+        provider_info = getattr(self, 'provider_info', {})
+        key = self.response_cache.key(
+            kind=kind,
+            provider=provider_info.get('provider', type(self).__name__),
+            model=getattr(self, 'model', None),
+            system_prompt=getattr(self, 'system_prompt', None),
+            options=getattr(self, 'options', None),
+            **request
+        )
+        with self.tracer.span("bridge.response_cache", {"kind": kind}) as span:
+            hit, response = self.response_cache.get(key)
+            span.set_attribute("hit", hit)
+        if hit:
+            self.cached_responses += 1
+            return response
+        response = await call()
+        self.response_cache.put(key, response)
+        return response
+    
     async def execute_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> ToolInvocationResult:
         """Execute a tool with the given parameters.
         
@@ -111,84 +261,147 @@ class LLMBridge(abc.ABC):
         from datetime import datetime
         
         start_time = time.time()
+        cached_before = self.cached_responses
         processing_steps = []
-        
-        # 1. Fetch tools if not already fetched
-        if self.tools is None:
-            await self.fetch_tools()
-        
-        # 2. Format tools for the LLM
-        formatted_tools = await self.format_tools(self.tools)
-        
-        # 3. Submit query to LLM
-        step_start = time.time()
-        initial_llm_response = await self.submit_query(query, formatted_tools, conversation_history)
-        processing_steps.append({
-            "step": "initial_query",
-            "timestamp": datetime.now().isoformat(),
-            "duration": time.time() - step_start,
-            "data": "Initial LLM query submitted"
-        })
-        
-        # 4. Parse tool calls from LLM response
-        tool_call = await self.parse_tool_call(initial_llm_response)
-        
-        # Enhanced result structure
-        result = {
-            "initial_llm_response": initial_llm_response,
-            "final_llm_response": initial_llm_response,  # Will be updated if tools are used
-            "raw_initial_response": initial_llm_response,
-            "raw_final_response": initial_llm_response,  # Will be updated if tools are used
-            "tool_call": tool_call,
-            "tool_result": None,
-            "processing_steps": processing_steps,
-            "metadata": {
-                "provider": getattr(self, 'provider_info', {}).get('provider', 'unknown'),
-                "model": getattr(self, 'provider_info', {}).get('model', getattr(self, 'model', 'unknown')),
-                "base_url": getattr(self, 'provider_info', {}).get('base_url', 'unknown'),
-                "has_tools": bool(self.tools),
-                "execution_time": None  # Will be set at the end
-            }
+        provider_info = getattr(self, 'provider_info', {})
+        span_attributes = {
+            "provider": provider_info.get('provider', 'unknown'),
+            "model": provider_info.get('model', getattr(self, 'model', 'unknown'))
         }
         
-        # 5. Execute tool if needed
-        if tool_call:
-            tool_name = tool_call.get("name")
-            kwargs = tool_call.get("parameters", {})
+        with self.tracer.span("bridge.process_query", span_attributes) as query_span:
+            # 1. Fetch tools if not already fetched
+            if self.tools is None:
+                with self.tracer.span("bridge.fetch_tools"):
+                    await self.fetch_tools()
             
+            # 2. Format tools for the LLM, once per version of the tool catalog
+            if self.formatted_tools is None or self._formatted_version != self.tools_version:
+                with self.tracer.span("bridge.format_tools", {"tools": len(self.tools or [])}):
+                    self.formatted_tools = await self.format_tools(self.tools)
+                    self._formatted_version = self.tools_version
+            formatted_tools = self.formatted_tools
+            
+            # 3. Submit query to LLM
             step_start = time.time()
-            tool_result = await self.execute_tool(tool_name, kwargs)
+            with self.tracer.span("bridge.initial_query"):
+                initial_llm_response = await self.cached_llm_call(
+                    "query",
+                    {"query": query, "history": conversation_history, "tools": formatted_tools},
+                    lambda: self.submit_query(query, formatted_tools, conversation_history)
+                )
             processing_steps.append({
-                "step": "tool_execution",
+                "step": "initial_query",
                 "timestamp": datetime.now().isoformat(),
                 "duration": time.time() - step_start,
-                "data": f"Executed tool: {tool_name}"
+                "data": "Initial LLM query submitted"
             })
             
-            result["tool_result"] = tool_result
+            # 4. Parse tool calls from LLM response
+            with self.tracer.span("bridge.parse_tool_call"):
+                tool_call = await self.parse_tool_call(initial_llm_response)
             
-            # 6. Send tool result back to LLM for processing
-            if tool_result.error_code == 0:  # Only if tool succeeded
-                step_start = time.time()
-                final_response = await self.process_tool_result(
-                    query, tool_call, tool_result, conversation_history
-                )
-                processing_steps.append({
-                    "step": "final_processing",
-                    "timestamp": datetime.now().isoformat(),
-                    "duration": time.time() - step_start,
-                    "data": "Final LLM processing with tool results"
-                })
+            # Enhanced result structure
+            result = {
+                "initial_llm_response": initial_llm_response,
+                "final_llm_response": initial_llm_response,  # Will be updated if tools are used
+                "raw_initial_response": initial_llm_response,
+                "raw_final_response": initial_llm_response,  # Will be updated if tools are used
+                "tool_call": tool_call,
+                "tool_result": None,
+                "processing_steps": processing_steps,
+                "metadata": {
+                    "provider": provider_info.get('provider', 'unknown'),
+                    "model": provider_info.get('model', getattr(self, 'model', 'unknown')),
+                    "base_url": provider_info.get('base_url', 'unknown'),
+                    "has_tools": bool(self.tools),
+                    "execution_time": None,  # Will be set at the end
+                    "trace_id": query_span.context.trace_id,
+                    "usage": self.extract_usage(initial_llm_response)
+                }
+            }
+            
+            # 5. Execute tool if needed, unless its arguments are invalid
+            if tool_call:
+                tool_name = tool_call.get("name")
+                
+                with self.tracer.span("bridge.validate_arguments", {"tool": tool_name}) as validation_span:
+                    validation = self.validate_tool_call(tool_call)
+                    rejected = validation is not None and not validation.ok
+                    validation_span.set_attribute("valid", not rejected)
+                if not rejected:
+                    if validation is not None:
+                        tool_call["parameters"] = validation.arguments
+                    kwargs = tool_call.get("parameters", {})
+                    
+                    step_start = time.time()
+                    with self.tracer.span("bridge.tool_execution", {"tool": tool_name}):
+                        tool_result = await self.execute_tool(tool_name, kwargs)
+                    processing_steps.append({
+                        "step": "tool_execution",
+                        "timestamp": datetime.now().isoformat(),
+                        "duration": time.time() - step_start,
+                        "data": f"Executed tool: {tool_name}"
+                    })
+                else:
+                    # The server would reject the call; tell the LLM why without sending it
+                    tool_result = validation.to_result()
+                    result["validation_errors"] = validation.errors
+                    processing_steps.append({
+                        "step": "argument_validation",
+                        "timestamp": datetime.now().isoformat(),
+                        "duration": 0.0,
+                        "data": validation.message()
+                    })
                 
-                result["final_llm_response"] = final_response
-                result["raw_final_response"] = final_response
+                result["tool_result"] = tool_result
+                
+                # 6. Send tool result back to LLM for processing
+                if tool_result.error_code == 0 or rejected:  # Tool succeeded or its call was invalid
+                    step_start = time.time()
+                    with self.tracer.span("bridge.final_processing"):
+                        final_response = await self.process_tool_result(
+                            query, tool_call, tool_result, conversation_history
+                        )
+                    processing_steps.append({
+                        "step": "final_processing",
+                        "timestamp": datetime.now().isoformat(),
+                        "duration": time.time() - step_start,
+                        "data": "Final LLM processing with tool results"
+                    })
+                    
+                    result["final_llm_response"] = final_response
+                    result["raw_final_response"] = final_response
+                    usage = result["metadata"]["usage"]
+                    for key, count in self.extract_usage(final_response).items():
+                        usage[key] = usage.get(key, 0) + count
         
         # Update metadata
         result["metadata"]["execution_time"] = time.time() - start_time
+        result["metadata"]["cached_responses"] = self.cached_responses - cached_before
         result["processing_steps"] = processing_steps
         
         return result
     
+    def shape_tool_result(self, tool_call: Dict[str, Any], tool_result: Any) -> str:
+        """Turn a tool result into the message content sent to the LLM.
+        
+        Args:
+            tool_call: The tool call that was executed
+            tool_result: The result from the tool execution
+            
+        Returns:
+            The result, within the tool's token budget
+        """
+        content = str(tool_result.content)
+        if self.result_shaper is None:
+            return content
+        with self.tracer.span("bridge.shape_result", {"tool": tool_call.get("name")}) as span:
+            shaped = self.result_shaper.shape(tool_call.get("name"), tool_call.get("parameters"), content)
+            span.set_attribute("chars_in", len(content))
+            span.set_attribute("chars_out", len(shaped))
+        return shaped
+    
     async def process_tool_result(self, original_query: str, tool_call: Dict[str, Any],
                                 tool_result: Any, conversation_history: Optional[List[Dict[str, str]]] = None) -> Any:
         """Send tool result back to LLM for processing and response generation.
@@ -223,12 +436,24 @@ class LLMBridge(abc.ABC):
         })
         
         # Add tool result
+        if self.result_shaper is not None:
+            # Loading the tokenizer may download it; keep that off the event loop
+            await self.result_shaper.counter.load_async()
+        if self.result_shaper is not None and len(str(tool_result.content)) > self.shape_in_thread_chars:
+            # Parsing and tokenizing a large result would stall other requests
+            content = await asyncio.to_thread(self.shape_tool_result, tool_call, tool_result)
+        else:
+            content = self.shape_tool_result(tool_call, tool_result)
         messages.append({
             "role": "tool",
             "tool_call_id": tool_call.get("id", "call_1"),
-            "content": str(tool_result.content)
+            "content": content
         })
         
         # Get LLM's final response (without tools this time)
-        final_response = await self.submit_query_without_tools(messages)
+        final_response = await self.cached_llm_call(
+            "final",
+            {"messages": messages, "tools": self.formatted_tools},
+            lambda: self.submit_query_without_tools(messages)
+        )
         return final_response
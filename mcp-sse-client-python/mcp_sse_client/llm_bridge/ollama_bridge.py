@@ -1,22 +1,102 @@
 """
 Ollama-specific implementation of the LLM Bridge for local models.
 """
-from typing import Dict, List, Any, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
+import asyncio
 import json
+import logging
+import os
+import threading
 import ollama
 from ..client import ToolDef
 from ..format_converters import to_openai_format # Ollama uses OpenAI-like tool format
 from .base import LLMBridge
 from .models import OPENAI_MODELS # Re-use OpenAI format for tools
 
+logger = logging.getLogger(__name__)
+
 # Note: Ollama model names are user-defined (e.g., 'llama3', 'mistral')
 # We won't define a static list here, but allow users to specify.
 DEFAULT_OLLAMA_MODEL = "llama3" # A common default, user might need to change
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+
+# How long Ollama keeps a model loaded after a request (Ollama's own default is 5m)
+DEFAULT_KEEP_ALIVE = "30m"
+
+
+class OllamaScheduler:
+    """Limits the number of concurrent requests per Ollama model.
+
+    Ollama runs ``OLLAMA_NUM_PARALLEL`` requests per loaded model at once and
+    queues the rest on the server. Queuing them here instead keeps the
+    server's slots free for other clients, and with one request at a time a
+    conversation keeps landing on the slot whose KV cache already holds its
+    prompt prefix.
+
+    Bridges talking to the same server share a scheduler by default.
+    """
+
+    def __init__(self, parallel: Optional[int] = None):
+        """Initialize the scheduler.
+
+        Args:
+            parallel: Concurrent requests per model (defaults to the
+                ``OLLAMA_NUM_PARALLEL`` environment variable, or 1)
+        """
+        self.parallel = parallel or int(os.environ.get("OLLAMA_NUM_PARALLEL") or 1)
+        self.waiting: Dict[str, int] = {}
+        # Semaphores belong to an event loop; callers may run several loops in turn
+        self._slots: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[None]:
+        """Wait for a free request slot of a model and hold it."""
+        loop = asyncio.get_running_loop()
+        entry = self._slots.get(model)
+        if entry is None or entry[0] is not loop:
+            entry = self._slots[model] = (loop, asyncio.Semaphore(self.parallel))
+        self.waiting[model] = self.waiting.get(model, 0) + 1
+        try:
+            await entry[1].acquire()
+        finally:
+            self.waiting[model] -= 1
+        try:
+            yield
+        finally:
+            entry[1].release()
+
+
+_schedulers: Dict[str, OllamaScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(host: Optional[str] = None) -> OllamaScheduler:
+    """Scheduler shared by the bridges talking to an Ollama server."""
+    with _schedulers_lock:
+        return _schedulers.setdefault(host or DEFAULT_OLLAMA_HOST, OllamaScheduler())
+
 
 class OllamaBridge(LLMBridge):
-    """Ollama-specific implementation of the LLM Bridge."""
+    """Ollama-specific implementation of the LLM Bridge.
+
+    Every request asks Ollama to keep the model loaded for ``keep_alive``,
+    so turns do not pay for loading it again, and ``warm_up`` loads it
+    before the first one. Requests go through an
+    ``OllamaScheduler`` that limits how many run at once per model.
+
+    Ollama reuses the KV cache of a loaded model for a prompt starting with
+    the same tokens as the previous one, so conversations only re-evaluate
+    their new messages as long as the model stays loaded and ``options``
+    (in particular ``num_ctx``) do not change between requests, which would
+    reload the model.
+    """
     
-    def __init__(self, mcp_client, model=DEFAULT_OLLAMA_MODEL, host=None):
+    def __init__(self, mcp_client, model=DEFAULT_OLLAMA_MODEL, host=None,
+                 keep_alive: Optional[Union[str, float]] = DEFAULT_KEEP_ALIVE,
+                 options: Optional[Dict[str, Any]] = None,
+                 scheduler: Optional[OllamaScheduler] = None,
+                 warm_up: bool = False):
         """Initialize Ollama bridge with model and optional host.
         
         Args:
@@ -25,21 +105,69 @@ class OllamaBridge(LLMBridge):
                    Ensure the model is available locally in Ollama.
             host: Optional URL of the Ollama server (e.g., 'http://localhost:11434').
                   If None, the default host configured for the ollama library will be used.
+            keep_alive: How long Ollama keeps the model loaded after each
+                        request (e.g. '30m', -1 for ever, None for the server default).
+            options: Model options sent with every request (e.g. {'num_ctx': 8192}).
+            scheduler: Limits concurrent requests per model (defaults to
+                       the scheduler shared by all bridges of the host).
+            warm_up: Whether to start loading the model right away in a
+                     task (``warm_up_task``); only done when the bridge is
+                     created inside a running event loop.
         """
         super().__init__(mcp_client)
         # Initialize Ollama client, optionally specifying the host
         self.llm_client = ollama.AsyncClient(host=host)
         self.model = model
         self.host = host # Store host for potential display/debugging
+        self.keep_alive = keep_alive
+        self.options = options
+        self.scheduler = scheduler or get_scheduler(host)
+        self.warmed = False
+        self.warm_up_task: Optional[asyncio.Task] = None
         
         # Store provider info for metadata
         self.provider_info = {
             "provider": "ollama",
             "model": model,
-            "base_url": host or "http://localhost:11434"
+            "base_url": host or DEFAULT_OLLAMA_HOST
         }
         
         print(f"Ollama Bridge initialized. Model: {self.model}, Host: {self.host or 'default'}")
+        if warm_up:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                logger.debug("No running event loop; not warming up %s", model)
+            else:
+                self.warm_up_task = loop.create_task(self._warm_up_in_background())
+
+    async def warm_up(self) -> None:
+        """Load the model into memory without generating anything.
+
+        Awaiting this once before the first query, e.g. while the
+        application starts, takes the model load out of that query's time.
+        """
+        # A chat request without messages only loads the model
+        await self._chat([])
+        self.warmed = True
+
+    async def _warm_up_in_background(self) -> None:
+        try:
+            await self.warm_up()
+        except Exception as e:
+            # The first query loads the model instead
+            logger.warning("Could not load Ollama model %s: %s", self.model, e)
+
+    async def _chat(self, messages: List[Dict[str, Any]], **kwargs) -> Any:
+        """Send a chat request once the scheduler grants the model a slot."""
+        async with self.scheduler.slot(self.model):
+            return await self.llm_client.chat(
+                model=self.model,
+                messages=messages,
+                keep_alive=self.keep_alive,
+                options=self.options,
+                **kwargs
+            )
 
     async def format_tools(self, tools: List[ToolDef]) -> List[Dict[str, Any]]:
         """Format tools for Ollama (uses OpenAI-like format).
@@ -68,9 +196,8 @@ class OllamaBridge(LLMBridge):
         messages.append({"role": "user", "content": query})
         
         try:
-            response = await self.llm_client.chat(
-                model=self.model,
-                messages=messages,
+            response = await self._chat(
+                messages,
                 tools=formatted_tools,
                 # Ollama automatically decides on tool use if tools are provided
             )
@@ -94,10 +221,12 @@ class OllamaBridge(LLMBridge):
         Returns:
             Ollama API response
         """
+        # The base class builds tool calls in OpenAI format, with arguments as
+        # a JSON string; Ollama only accepts them as objects
+        messages = [self._with_object_arguments(message) for message in messages]
         try:
-            response = await self.llm_client.chat(
-                model=self.model,
-                messages=messages
+            response = await self._chat(
+                messages
                 # Note: No tools parameter - this is for final processing
             )
             return response
@@ -105,6 +234,24 @@ class OllamaBridge(LLMBridge):
             print(f"An unexpected error occurred with Ollama: {e}")
             raise e
 
+    @staticmethod
+    def _with_object_arguments(message: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a message whose tool call arguments are decoded from JSON strings."""
+        if not message.get("tool_calls"):
+            return message
+        tool_calls = []
+        for tool_call in message["tool_calls"]:
+            function_info = tool_call.get("function", {})
+            arguments = function_info.get("arguments")
+            if isinstance(arguments, str):
+                try:
+                    arguments = json.loads(arguments)
+                except json.JSONDecodeError:
+                    arguments = {}
+                tool_call = {**tool_call, "function": {**function_info, "arguments": arguments}}
+            tool_calls.append(tool_call)
+        return {**message, "tool_calls": tool_calls}
+
     async def parse_tool_call(self, llm_response: Any) -> Optional[Dict[str, Any]]:
         """Parse the Ollama response to extract tool calls.
         
@@ -130,8 +277,8 @@ class OllamaBridge(LLMBridge):
             try:
                 arguments = json.loads(arguments)
             except json.JSONDecodeError:
+                # Kept as they are, so that validation reports them to the LLM
                 print(f"Warning: Could not parse tool arguments as JSON: {arguments}")
-                arguments = {} # Fallback to empty dict
 
         return {
             "name": function_info.get('name'),
@@ -141,23 +288,20 @@ class OllamaBridge(LLMBridge):
     async def check_connection(self):
         """Check if the Ollama server is reachable and the model exists."""
         try:
-            # Simple check to see if server responds
-            await self.llm_client.list()
-            
-            # Check if the specific model exists locally
+            # One request both checks the server and lists the local models
             models_info = await self.llm_client.list()
             
-            # Debug the response structure
-            print(f"Ollama models response in check_connection: {models_info}")
-            
             # Handle different response structures
             model_names = []
             if isinstance(models_info, dict) and 'models' in models_info:
-                # New API format
+                # Older library versions return plain dictionaries
                 model_names = [m.get('name', m.get('model', '')) for m in models_info.get('models', [])]
             elif isinstance(models_info, list):
                 # Older API format or direct list
                 model_names = [m.get('name', m.get('model', '')) for m in models_info]
+            elif hasattr(models_info, 'models'):
+                # ListResponse of current library versions
+                model_names = [getattr(m, 'model', None) or '' for m in models_info.models]
             
             # Filter out empty names
             model_names = [name for name in model_names if name]
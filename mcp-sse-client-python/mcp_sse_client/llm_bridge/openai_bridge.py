@@ -11,19 +11,31 @@ from .models import DEFAULT_OPENAI_MODEL # Import default model
 
 
 class OpenAIBridge(LLMBridge):
-    """OpenAI-specific implementation of the LLM Bridge."""
+    """OpenAI-specific implementation of the LLM Bridge.
     
-    def __init__(self, mcp_client, api_key, model=DEFAULT_OPENAI_MODEL): # Use imported default
+    OpenAI caches long prompt prefixes automatically. Tools are sent sorted
+    by name, and sent again (but not callable) with the final request after
+    a tool call, so every request of a session starts with the same tokens.
+    """
+    
+    def __init__(self, mcp_client, api_key, model=DEFAULT_OPENAI_MODEL, # Use imported default
+                 prompt_cache_key: Optional[str] = None):
         """Initialize OpenAI bridge with API key and model.
         
         Args:
             mcp_client: An initialized MCPClient instance
             api_key: OpenAI API key
             model: OpenAI model to use (default: from models.py)
+            prompt_cache_key: Key grouping requests that share a prompt
+                prefix, to raise the rate of prompt cache hits
         """
         super().__init__(mcp_client)
         self.llm_client = openai.OpenAI(api_key=api_key)
         self.model = model
+        self.prompt_cache_key = prompt_cache_key
+    
+    def _cache_options(self) -> Dict[str, Any]:
+        return {"prompt_cache_key": self.prompt_cache_key} if self.prompt_cache_key else {}
     
     async def format_tools(self, tools: List[ToolDef]) -> List[Dict[str, Any]]:
         """Format tools for OpenAI.
@@ -55,7 +67,8 @@ class OpenAIBridge(LLMBridge):
             model=self.model,
             messages=messages,
             tools=formatted_tools,
-            tool_choice="auto"
+            tool_choice="auto",
+            **self._cache_options()
         )
         
         return response
@@ -63,17 +76,21 @@ class OpenAIBridge(LLMBridge):
     async def submit_query_without_tools(self, messages: List[Dict[str, Any]]) -> Any:
         """Submit a query to OpenAI without tools for final processing.
         
+        The tools of the first request are sent again, but may not be
+        called, so that the request starts with the same cached prefix.
+        
         Args:
             messages: Complete conversation including tool results
             
         Returns:
             OpenAI API response
         """
-        # Make the API call without tools
+        tool_options = {"tools": self.formatted_tools, "tool_choice": "none"} if self.formatted_tools else {}
         response = self.llm_client.chat.completions.create(
             model=self.model,
-            messages=messages
-            # Note: No tools parameter - this is for final processing
+            messages=messages,
+            **tool_options,
+            **self._cache_options()
         )
         
         return response
@@ -93,8 +110,14 @@ class OpenAIBridge(LLMBridge):
             return None
         
         tool_call = message.tool_calls[0]
+        arguments = tool_call.function.arguments
+        try:
+            arguments = json.loads(arguments)
+        except (TypeError, json.JSONDecodeError):
+            # Kept as they are, so that validation reports them to the LLM
+            pass
         
         return {
             "name": tool_call.function.name,
-            "parameters": json.loads(tool_call.function.arguments)
+            "parameters": arguments
         }
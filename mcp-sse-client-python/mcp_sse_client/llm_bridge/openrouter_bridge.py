@@ -2,6 +2,7 @@
 OpenRouter-based implementation of the LLM Bridge for unified provider access.
 """
 from typing import Dict, List, Any, Optional
+import json
 import openai
 from ..client import ToolDef
 from ..format_converters import to_openai_format
@@ -10,7 +11,12 @@ from .openrouter_client import OpenRouterClient
 
 
 class OpenRouterBridge(LLMBridge):
-    """OpenRouter-based implementation of the LLM Bridge."""
+    """OpenRouter-based implementation of the LLM Bridge.
+    
+    Tools are sent sorted by name, and sent again (but not callable) with the
+    final request after a tool call, so providers that cache prompt prefixes
+    see the same prefix in every request.
+    """
     
     def __init__(self, mcp_client, api_key: str, model: str, site_url: Optional[str] = None, site_name: Optional[str] = None):
         """Initialize OpenRouter bridge.
@@ -94,6 +100,9 @@ class OpenRouterBridge(LLMBridge):
     async def submit_query_without_tools(self, messages: List[Dict[str, Any]]) -> Any:
         """Submit a query to OpenRouter without tools for final processing.
         
+        The tools of the first request are sent again, but may not be
+        called, so that the request starts with the same cached prefix.
+        
         Args:
             messages: Complete conversation including tool results
             
@@ -103,12 +112,12 @@ class OpenRouterBridge(LLMBridge):
         # Prepare extra headers for OpenRouter
         extra_headers = self.openrouter_client.get_extra_headers()
         
-        # Make the API call without tools
+        tool_options = {"tools": self.formatted_tools, "tool_choice": "none"} if self.formatted_tools else {}
         response = self.llm_client.chat.completions.create(
             extra_headers=extra_headers,
             model=self.model,
-            messages=messages
-            # Note: No tools parameter - this is for final processing
+            messages=messages,
+            **tool_options
         )
         
         return response
@@ -127,14 +136,16 @@ class OpenRouterBridge(LLMBridge):
             if hasattr(choice, 'message') and hasattr(choice.message, 'tool_calls') and choice.message.tool_calls:
                 tool_call = choice.message.tool_calls[0]
                 if hasattr(tool_call, 'function'):
+                    arguments = tool_call.function.arguments
                     try:
-                        import json
-                        return {
-                            "name": tool_call.function.name,
-                            "parameters": json.loads(tool_call.function.arguments)
-                        }
-                    except (json.JSONDecodeError, AttributeError):
+                        arguments = json.loads(arguments)
+                    except (TypeError, json.JSONDecodeError):
+                        # Kept as they are, so that validation reports them to the LLM
                         pass
+                    return {
+                        "name": tool_call.function.name,
+                        "parameters": arguments
+                    }
         
         return None
     
@@ -0,0 +1,256 @@
+"""
+Caching LLM responses on disk for replayed conversations.
+
+When the same prompts are run again against the same repository state, as
+in CI or benchmark runs, the LLM's answers can be replayed from a local
+SQLite file instead of asking the provider again. Responses are keyed by a
+hash of everything that determines them: provider, model, bridge settings
+(system prompt, model options), the tools offered, the messages and a
+fingerprint of the workspace, so any change to these is a cache miss.
+
+Responses are stored as JSON. SDK response objects (pydantic models of the
+openai, anthropic and ollama packages) are stored with their class and
+rebuilt as the same class, so cached tool calls parse like live ones.
+Responses of any other type are not cached.
+"""
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Packages whose response classes may be rebuilt from the cache
+RESPONSE_PACKAGES = ("openai", "anthropic", "ollama")
+
+# Directories left out of workspace fingerprints outside git repositories
+_UNTRACKED_DIRS = {".git", ".hg", ".svn", "__pycache__", ".mypy_cache", ".pytest_cache", "node_modules", ".venv", "venv"}
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-compatible form of request parts that json cannot serialize."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    # Not stable across runs for most objects, which only costs cache misses
+    return repr(value)
+
+
+def workspace_fingerprint(root: Union[str, Path] = ".") -> str:
+    """Fingerprint of the state of a directory tree.
+
+    In a git work tree this is the commit plus any uncommitted changes and
+    untracked files, which is fast and the same for every clone of a
+    commit. Elsewhere it hashes the contents of every file.
+
+    Args:
+        root: Directory of the workspace
+
+    Returns:
+        Hex digest that changes whenever a file does
+    """
+    root = os.path.abspath(root)
+    digest = hashlib.sha256()
+    try:
+        for command in (
+            ["git", "rev-parse", "HEAD"],
+            ["git", "diff", "HEAD", "--binary"],
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"]
+        ):
+            output = subprocess.run(command, cwd=root, capture_output=True, check=True, timeout=60).stdout
+            digest.update(output)
+            digest.update(b"\0")
+        for path in filter(None, output.split(b"\0")):
+            # Untracked files are listed above; their contents count as well
+            with open(os.path.join(root, os.fsdecode(path)), "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()
+    except (OSError, subprocess.SubprocessError):
+        digest = hashlib.sha256()
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(name for name in dirs if name not in _UNTRACKED_DIRS)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "rb") as f:
+                    content = hashlib.sha256(f.read()).digest()
+            except OSError:
+                continue
+            digest.update(os.path.relpath(path, root).encode("utf-8", "surrogateescape"))
+            digest.update(content)
+    return digest.hexdigest()
+
+
+def _encode(response: Any) -> Optional[str]:
+    """JSON form of a response, or None if it cannot be cached."""
+    if isinstance(response, dict):
+        try:
+            return json.dumps({"type": None, "data": response})
+        except (TypeError, ValueError):
+            return None
+    response_type = type(response)
+    if hasattr(response, "model_dump") and response_type.__module__.split(".")[0] in RESPONSE_PACKAGES:
+        return json.dumps({
+            "type": f"{response_type.__module__}:{response_type.__qualname__}",
+            "data": response.model_dump(mode="json")
+        })
+    return None
+
+
+def _decode(value: str) -> Any:
+    stored = json.loads(value)
+    if stored["type"] is None:
+        return stored["data"]
+    module_name, qualname = stored["type"].split(":")
+    if module_name.split(".")[0] not in RESPONSE_PACKAGES:
+        raise ValueError(f"Refusing to rebuild a response of type {stored['type']}")
+    response_type: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        response_type = getattr(response_type, name)
+    return response_type.model_validate(stored["data"])
+
+
+class LLMResponseCache:
+    """LLM responses stored in an SQLite file, with a TTL and size limits.
+
+    The file can be shared by several processes. Entries expire ``ttl``
+    seconds after they were stored, and the least recently used ones are
+    evicted beyond ``max_entries`` or ``max_bytes``.
+
+    Example:
+        cache = LLMResponseCache(".llm-cache.sqlite3", workspace=workspace_fingerprint("."))
+        bridge.response_cache = cache
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: Optional[float] = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        workspace: Optional[str] = None
+    ):
+        """Open or create the cache.
+
+        Args:
+            path: SQLite file
+            ttl: Seconds a response stays valid, None for no expiry
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of the cached responses
+            workspace: Fingerprint of the workspace state the responses
+                belong to (see ``workspace_fingerprint``); part of every key
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.workspace = workspace
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def key(self, **parts: Any) -> str:
+        """Cache key of a request.
+
+        Args:
+            **parts: Everything the response depends on (model, tools,
+                messages, ...); the workspace fingerprint is added
+
+        Returns:
+            Hex digest of the canonical JSON of the parts
+        """
+        request = json.dumps(
+            {"workspace": self.workspace, **parts}, sort_keys=True, separators=(",", ":"), default=_canonical
+        )
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Cached response of a key.
+
+        Returns:
+            (True, response) on a hit, (False, None) otherwise
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and row[1] < now - self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        if row is not None:
+            try:
+                response = _decode(row[0])
+                self.hits += 1
+                return True, response
+            except Exception as e:
+                logger.warning(f"Dropping unreadable cached response: {e}")
+                with self._lock:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self.misses += 1
+        return False, None
+
+    def put(self, key: str, response: Any) -> bool:
+        """Store a response.
+
+        Returns:
+            False if the response cannot be cached
+        """
+        value = _encode(response)
+        if value is None:
+            return False
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return False
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(now)
+        return True
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, total size and hit counts of this cache instance."""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
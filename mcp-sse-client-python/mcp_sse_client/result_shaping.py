@@ -0,0 +1,287 @@
+"""
+Shaping tool results to a token budget before they are sent to an LLM.
+
+A single ``read_file`` of a large file, or a ``grep_search`` matching a
+common word, can fill most of a model's context window. ``ResultShaper``
+sits between the MCP tool output and the LLM: it unwraps the MCP content,
+then shrinks it to a per-tool token budget in a way that keeps it useful,
+and tells the model how to fetch what was left out.
+
+- File contents keep their head and tail, with the omitted line range,
+- grep matches keep the first few hits per file and count the rest,
+- long lines are cut in the middle,
+- anything else keeps its head and tail.
+
+Tokens are counted with tiktoken when it is installed and its encoding is
+available, and estimated from the text length otherwise.
+"""
+import asyncio
+import json
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Token budgets of the tools that tend to return the most text
+DEFAULT_BUDGETS = {
+    "read_file": 4000,
+    "view_file": 4000,
+    "grep_search": 2000,
+    "read_url": 3000,
+    "read_urls": 6000
+}
+
+# Tools returning file contents: path argument, first and last line arguments
+FILE_TOOLS = {
+    "read_file": ("target_file", "start_line_one_indexed", "end_line_one_indexed_inclusive"),
+    "view_file": ("file_path", "start_line", "end_line")
+}
+
+CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken, or estimates them without it.
+
+    tiktoken downloads its encoding files on first use, so the encoding is
+    only loaded when the first text is counted, and a failed load falls
+    back to the estimate for the lifetime of the counter. Async callers
+    should await ``load_async`` first, which loads it on a worker thread
+    instead of blocking the event loop.
+    """
+
+    def __init__(self, encoding: Optional[str] = "cl100k_base"):
+        """Initialize the counter.
+
+        Args:
+            encoding: tiktoken encoding name, or None to always estimate
+        """
+        self.encoding_name = encoding
+        self._encode: Optional[Callable[[str], List[int]]] = None
+        self._loaded = encoding is None
+        self._lock = threading.Lock()
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from tiktoken rather than an estimate."""
+        self._load()
+        return self._encode is not None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                import tiktoken
+                self._encode = tiktoken.get_encoding(self.encoding_name).encode_ordinary
+            except Exception as e:
+                logger.info(f"tiktoken unavailable ({e}), estimating token counts")
+            self._loaded = True
+
+    async def load_async(self) -> None:
+        """Load the encoding on a worker thread, if it is not loaded yet."""
+        if not self._loaded:
+            await asyncio.to_thread(self._load)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        if not text:
+            return 0
+        self._load()
+        if self._encode is not None:
+            return len(self._encode(text))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def unwrap_content(content: str) -> str:
+    """Text of an MCP tool result as joined by ``MCPClient.invoke_tool``.
+
+    Each line of ``content`` is a serialized content item; text items are
+    replaced by their text, other lines are kept as they are.
+    """
+    texts = []
+    for line in content.split("\n"):
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = None
+        if isinstance(item, dict) and item.get("type") == "text" and isinstance(item.get("text"), str):
+            texts.append(item["text"])
+        else:
+            texts.append(line)
+    return "\n".join(texts)
+
+
+class ResultShaper:
+    """Fits tool results into per-tool token budgets.
+
+    Results already within budget are only unwrapped, and their long lines
+    elided. Results produced by the ai_coding_agent MCP server (JSON with
+    ``success``, ``data`` and ``error``) are shaped by tool; any other text
+    is treated as plain text.
+
+    Example:
+        shaper = ResultShaper(budgets={"read_file": 8000})
+        text = shaper.shape("read_file", {"target_file": "app.py"}, tool_result.content)
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        default_budget: int = 4000,
+        max_line_chars: int = 400,
+        hits_per_file: int = 3,
+        counter: Optional[TokenCounter] = None
+    ):
+        """Initialize the shaper.
+
+        Args:
+            budgets: Token budget per tool name, on top of ``DEFAULT_BUDGETS``
+            default_budget: Token budget of other tools
+            max_line_chars: Lines longer than this are cut in the middle
+            hits_per_file: grep matches kept per file
+            counter: Token counter (defaults to tiktoken's cl100k_base)
+        """
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.default_budget = default_budget
+        self.max_line_chars = max_line_chars
+        self.hits_per_file = hits_per_file
+        self.counter = counter or TokenCounter()
+
+    def budget_for(self, tool_name: str) -> int:
+        """Token budget of a tool's results."""
+        return self.budgets.get(tool_name, self.default_budget)
+
+    def shape(self, tool_name: str, arguments: Optional[Dict[str, Any]], content: str) -> str:
+        """Shape a tool result for the LLM.
+
+        Args:
+            tool_name: Name of the tool that produced the result
+            arguments: Arguments the tool was called with
+            content: Result content as returned by ``MCPClient.invoke_tool``
+
+        Returns:
+            Text within the tool's token budget
+        """
+        arguments = arguments or {}
+        budget = self.budget_for(tool_name)
+        text = unwrap_content(str(content))
+        try:
+            result = json.loads(text)
+        except ValueError:
+            result = None
+        if not (isinstance(result, dict) and "success" in result and "data" in result):
+            return self._shape_text(text, budget, tool_name)
+        if not result["success"]:
+            return self._shape_text(f"Error: {result.get('error')}", budget, tool_name)
+
+        data = result["data"]
+        if tool_name in FILE_TOOLS:
+            if isinstance(data, str):
+                return self._shape_file(data, budget, tool_name, arguments)
+            if isinstance(data, dict) and isinstance(data.get("content"), str):
+                header = {key: value for key, value in data.items() if key != "content"}
+                shaped = self._shape_file(data["content"], budget, tool_name, arguments)
+                return f"{json.dumps(header)}\n{shaped}" if header else shaped
+        if isinstance(data, dict) and _is_grep_matches(data.get("matches")):
+            return self._shape_matches(data["matches"], budget, tool_name)
+        if isinstance(data, str):
+            return self._shape_text(data, budget, tool_name)
+        compact = json.dumps(data, default=str)
+        if len(compact) <= self.max_line_chars or self.counter.count(compact) <= budget:
+            return compact
+        # One item per line, so that whole items are kept or dropped
+        return self._shape_text(json.dumps(data, indent=1, default=str), budget, tool_name)
+
+    def elide_line(self, line: str) -> str:
+        """Cut the middle out of a line longer than ``max_line_chars``."""
+        if len(line) <= self.max_line_chars:
+            return line
+        keep = self.max_line_chars // 2
+        return f"{line[:keep]} ... [{len(line) - 2 * keep} characters omitted] ... {line[-keep:]}"
+
+    def _fit_lines(self, lines: List[str], budget: int) -> Optional[Tuple[int, int]]:
+        """Head and tail line counts fitting the budget, or None if all lines fit.
+
+        Only the lines that are kept are counted, so shaping a huge result
+        costs about as much as counting the budget.
+        """
+        if sum(len(line) + 1 for line in lines) <= budget:
+            # A token is at least one character
+            return None
+        head = tail = spent = 0
+        # Two thirds for the head, which usually holds imports and definitions
+        while head < len(lines):
+            cost = self.counter.count(lines[head]) + 1
+            if spent + cost > budget * 2 // 3:
+                break
+            spent += cost
+            head += 1
+        while tail < len(lines) - head:
+            cost = self.counter.count(lines[-1 - tail]) + 1
+            if spent + cost > budget:
+                break
+            spent += cost
+            tail += 1
+        return None if head + tail == len(lines) else (head, tail)
+
+    def _shape_file(self, text: str, budget: int, tool_name: str, arguments: Dict[str, Any]) -> str:
+        path_arg, start_arg, end_arg = FILE_TOOLS[tool_name]
+        lines = [self.elide_line(line) for line in text.split("\n")]
+        fit = self._fit_lines(lines, budget)
+        if fit is None:
+            return "\n".join(lines)
+        head, tail = fit
+        first = int(arguments.get(start_arg) or 1)
+        omitted_start = first + head
+        omitted_end = first + len(lines) - tail - 1
+        hint = (
+            f"... [lines {omitted_start}-{omitted_end} of {arguments.get(path_arg, 'the file')} omitted "
+            f"to fit {budget} tokens; call {tool_name} with {start_arg}={omitted_start} and "
+            f"{end_arg}={min(omitted_end, omitted_start + max(head, 1) - 1)} to read more] ..."
+        )
+        return "\n".join(lines[:head] + [hint] + (lines[len(lines) - tail:] if tail else []))
+
+    def _shape_matches(self, matches: List[Dict[str, Any]], budget: int, tool_name: str) -> str:
+        by_file: Dict[str, List[Dict[str, Any]]] = {}
+        for match in matches:
+            by_file.setdefault(str(match.get("file")), []).append(match)
+        lines = []
+        for path, hits in by_file.items():
+            lines.append(f"{path}:")
+            for hit in hits[:self.hits_per_file]:
+                lines.append(self.elide_line(f"  {hit.get('line')}: {hit.get('content', '')}"))
+            if len(hits) > self.hits_per_file:
+                lines.append(f"  ... {len(hits) - self.hits_per_file} more matches in this file")
+        collapsed = len(matches) - sum(min(len(hits), self.hits_per_file) for hits in by_file.values())
+        if collapsed:
+            lines.append(
+                f"[{collapsed} repeated matches collapsed; call {tool_name} with a narrower "
+                f"query or include_pattern to see them]"
+            )
+        return self._shape_text("\n".join(lines), budget, tool_name, elide=False)
+
+    def _shape_text(self, text: str, budget: int, tool_name: str, elide: bool = True) -> str:
+        lines = text.split("\n")
+        if elide:
+            lines = [self.elide_line(line) for line in lines]
+        fit = self._fit_lines(lines, budget)
+        if fit is None:
+            return "\n".join(lines)
+        head, tail = fit
+        hint = (
+            f"... [{len(lines) - head - tail} lines omitted to fit {budget} tokens; "
+            f"call {tool_name} with narrower arguments to see them] ..."
+        )
+        return "\n".join(lines[:head] + [hint] + (lines[len(lines) - tail:] if tail else []))
+
+
+def _is_grep_matches(matches: Any) -> bool:
+    return (
+        isinstance(matches, list) and bool(matches)
+        and all(isinstance(match, dict) and "file" in match and "line" in match for match in matches)
+    )
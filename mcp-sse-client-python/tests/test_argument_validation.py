@@ -0,0 +1,203 @@
+"""
+Tests for validating tool call arguments before dispatch.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from mcp_sse_client import MCPClient, ToolDef, ToolParameter
+from mcp_sse_client.client import schema_type
+from mcp_sse_client.argument_validation import ArgumentValidator, ToolValidator
+from mcp_sse_client.llm_bridge.ollama_bridge import OllamaBridge
+
+READ_FILE = ToolDef(
+    name="read_file",
+    description="Read a file",
+    parameters=[
+        ToolParameter(name="target_file", parameter_type="string", description="File path", required=True),
+        ToolParameter(name="start_line", parameter_type="integer", description="First line"),
+        ToolParameter(name="ratio", parameter_type="number", description="Ratio"),
+        ToolParameter(name="recursive", parameter_type="boolean", description="Recurse"),
+        ToolParameter(name="patterns", parameter_type="array", description="Patterns"),
+        ToolParameter(name="options", parameter_type="object", description="Options"),
+        ToolParameter(name="anything", parameter_type="custom", description="Not checked")
+    ]
+)
+
+
+def _run(coroutine):
+    """Run a coroutine on a loop of its own, leaving the current event loop in place."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestToolValidator(unittest.TestCase):
+    """Test cases for the ToolValidator class."""
+
+    def setUp(self):
+        self.validator = ToolValidator(READ_FILE)
+
+    def test_unambiguous_values_are_coerced(self):
+        """Test that values of the wrong type are converted when the intent is clear."""
+        result = self.validator.validate({
+            "target_file": 42,
+            "start_line": "10",
+            "ratio": "0.5",
+            "recursive": "True",
+            "patterns": '["*.py"]',
+            "options": '{"a": 1}',
+            "anything": object,
+        })
+
+        self.assertTrue(result.ok, result.errors)
+        self.assertEqual(result.arguments["target_file"], "42")
+        self.assertEqual(result.arguments["start_line"], 10)
+        self.assertEqual(result.arguments["ratio"], 0.5)
+        self.assertIs(result.arguments["recursive"], True)
+        self.assertEqual(result.arguments["patterns"], ["*.py"])
+        self.assertEqual(result.arguments["options"], {"a": 1})
+        self.assertIs(result.arguments["anything"], object)
+        self.assertTrue(self.validator.validate('{"target_file": "a.py", "start_line": null}').ok)
+
+    def test_errors_name_every_bad_parameter(self):
+        """Test that all problems of a call are reported at once."""
+        result = self.validator.validate({"start_line": "ten", "recursive": 1, "path": "a.py"})
+
+        self.assertFalse(result.ok)
+        self.assertEqual({error["parameter"] for error in result.errors},
+                         {"start_line", "recursive", "path", "target_file"})
+        message = result.message()
+        self.assertIn("target_file: required parameter is missing", message)
+        self.assertIn("start_line: expected an integer, got 'ten'", message)
+        self.assertIn("path: unknown parameter", message)
+
+    def test_malformed_json_is_reported(self):
+        """Test that arguments that are not a JSON object are rejected."""
+        self.assertIn("not valid JSON", self.validator.validate('{"target_file": ').message())
+        self.assertIn("must be a JSON object", self.validator.validate([1]).message())
+
+    def test_unknown_tools_are_reported(self):
+        """Test that calls of tools missing from the catalog are rejected."""
+        result = ArgumentValidator([READ_FILE]).validate("read_files", {})
+
+        self.assertIn("no such tool; available tools are read_file", result.message())
+        content = json.loads(result.to_result().content)
+        self.assertFalse(content["success"])
+        self.assertEqual(content["errors"], result.errors)
+
+
+# Sources of the ai_coding_agent MCP server, next to this package in the repository
+SERVER_SOURCES = Path(__file__).resolve().parents[2] / "ai_coding_agent" / "src"
+
+
+class TestServerSchemas(unittest.TestCase):
+    """Test cases for validating against the schemas the ai_coding_agent server lists."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not SERVER_SOURCES.is_dir():
+            raise unittest.SkipTest("ai_coding_agent sources not available")
+        sys.path.insert(0, str(SERVER_SOURCES))
+        try:
+            from ai_coding_agent.interfaces.mcp import MCPServer
+        except ImportError as e:
+            raise unittest.SkipTest(f"ai_coding_agent cannot be imported: {e}")
+        finally:
+            sys.path.remove(str(SERVER_SOURCES))
+        state_dir = tempfile.mkdtemp()
+        try:
+            server = MCPServer(state_dir=state_dir)
+            listed = _run(server.mcp.list_tools())
+        finally:
+            shutil.rmtree(state_dir)
+
+        # Tools are listed through MCPClient.list_tools, as the bridges get them
+        client = MCPClient("http://localhost:8000/sse")
+        session = SimpleNamespace(list_tools=AsyncMock(return_value=SimpleNamespace(tools=listed)))
+        client._safe_sse_operation = lambda operation: operation(session)
+        cls.tools = {tool.name: tool for tool in _run(client.list_tools())}
+        cls.validator = ArgumentValidator(list(cls.tools.values()))
+
+    def test_optional_parameters_keep_their_type(self):
+        """Test that parameters listed as anyOf with null are checked as their type."""
+        focus_files = next(p for p in self.tools["repo_map"].parameters if p.name == "focus_files")
+
+        self.assertEqual(focus_files.parameter_type, "array")
+        self.assertTrue(focus_files.description.startswith("Files of current interest"))
+        self.assertIsNone(schema_type({"anyOf": [{"type": "integer"}, {"type": "string"}]}))
+
+    def test_correct_calls_pass_unchanged(self):
+        """Test that well-formed calls of the real tools are accepted as they are."""
+        calls = [
+            ("repo_map", {"directory_path": ".", "focus_files": ["a.py"]}),
+            ("profiling", {"action": "enable", "tools": ["grep_search"], "memory": True, "sample_rate": 0.5}),
+            ("read_file", {"target_file": "a.py", "start_line_one_indexed": 3, "end_line_one_indexed_inclusive": None}),
+        ]
+        for tool_name, arguments in calls:
+            with self.subTest(tool=tool_name):
+                result = self.validator.validate(tool_name, arguments)
+                self.assertTrue(result.ok, result.errors)
+                self.assertEqual(result.arguments, arguments)
+
+    def test_optional_parameters_are_still_checked(self):
+        """Test that values of optional parameters are coerced and rejected by their type."""
+        result = self.validator.validate("read_file", {"target_file": "a.py", "start_line_one_indexed": "3"})
+        self.assertEqual(result.arguments["start_line_one_indexed"], 3)
+
+        result = self.validator.validate("profiling", {"action": "enable", "memory": "maybe"})
+        self.assertEqual([error["parameter"] for error in result.errors], ["memory"])
+
+
+class TestBridgeValidation(unittest.TestCase):
+    """Test cases for validation in process_query."""
+
+    def setUp(self):
+        client = MCPClient("http://localhost:8000/sse")
+        client.list_tools = AsyncMock(return_value=[READ_FILE])
+        client.invoke_tool = AsyncMock()
+        self.bridge = OllamaBridge(client, model="llama3")
+        self.bridge.llm_client = MagicMock()
+
+    def _respond(self, arguments):
+        tool_call = {"function": {"name": "read_file", "arguments": arguments}}
+        self.bridge.llm_client.chat = AsyncMock(side_effect=[
+            {"message": {"content": "", "tool_calls": [tool_call]}},
+            {"message": {"content": "Let me fix that"}}
+        ])
+
+    def test_invalid_call_goes_back_to_the_llm(self):
+        """Test that malformed arguments are answered locally without calling the server."""
+        self._respond('{"target_file": "a.py", ')
+
+        result = _run(self.bridge.process_query("Read a.py"))
+
+        self.bridge.mcp_client.invoke_tool.assert_not_awaited()
+        self.assertEqual(result["tool_result"].error_code, 1)
+        self.assertIn("not valid JSON", result["validation_errors"][0]["message"])
+        self.assertEqual(result["final_llm_response"], {"message": {"content": "Let me fix that"}})
+        tool_message = self.bridge.llm_client.chat.call_args.kwargs["messages"][-1]
+        self.assertEqual(tool_message["role"], "tool")
+        self.assertTrue(tool_message["content"].startswith("Error: Invalid arguments for tool 'read_file'"))
+
+    def test_valid_call_is_sent_coerced(self):
+        """Test that valid calls reach the server with coerced arguments."""
+        self._respond({"target_file": "a.py", "start_line": "3"})
+        self.bridge.mcp_client.invoke_tool.return_value = MagicMock(content="text", error_code=0)
+
+        _run(self.bridge.process_query("Read a.py"))
+
+        self.bridge.mcp_client.invoke_tool.assert_awaited_once_with("read_file", {"target_file": "a.py", "start_line": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the memoized tool format converters.
+"""
+
+import asyncio
+import copy
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_sse_client import MCPClient, ToolDef, ToolParameter
+from mcp_sse_client import format_converters
+from mcp_sse_client.format_converters import (
+    catalog_version, convert_tools, to_anthropic_format, to_openai_format, tools_json
+)
+from mcp_sse_client.llm_bridge.openai_bridge import OpenAIBridge
+
+
+def _tools(description="Read a file"):
+    return [ToolDef(
+        name="read_file",
+        description=description,
+        parameters=[
+            ToolParameter(name="target_file", parameter_type="str", description="File path", required=True),
+            ToolParameter(name="line_numbers", parameter_type="list", description="Lines", default=[1])
+        ]
+    )]
+
+
+class TestFormatConverters(unittest.TestCase):
+    """Test cases for converting tool definitions."""
+
+    def test_conversions_are_reused_per_catalog_version(self):
+        """Test that converting equal tools again returns the same frozen list."""
+        first = to_openai_format(_tools())
+
+        self.assertIs(to_openai_format(_tools()), first)
+        self.assertIs(to_openai_format(_tools(), catalog_version(_tools())), first)
+        self.assertIsNot(to_openai_format(_tools("Read any file")), first)
+        self.assertIsNot(to_anthropic_format(_tools()), first)
+        schema = first[0]["function"]["parameters"]
+        self.assertEqual(schema["required"], ["target_file"])
+        self.assertEqual(schema["properties"]["line_numbers"],
+                         {"type": "array", "description": "Lines", "items": {"type": "integer"}, "default": [1]})
+        self.assertEqual(to_anthropic_format(_tools())[0]["input_schema"], schema)
+
+    def test_converted_tools_are_frozen(self):
+        """Test that shared conversions cannot be modified, but their copies can."""
+        converted = to_anthropic_format(_tools())
+
+        with self.assertRaises(TypeError):
+            converted.append({})
+        with self.assertRaises(TypeError):
+            converted[0]["cache_control"] = {"type": "ephemeral"}
+        with self.assertRaises(TypeError):
+            converted[0]["input_schema"]["required"].append("line_numbers")
+        copied = copy.deepcopy(converted)
+        copied[0]["input_schema"]["required"].append("line_numbers")
+        self.assertEqual(converted[0]["input_schema"]["required"], ["target_file"])
+
+    def test_tools_json_is_serialized_once(self):
+        """Test that the serialized tools match the conversion and are reused."""
+        serialized = tools_json(_tools(), "openai")
+
+        self.assertEqual(json.loads(serialized), to_openai_format(_tools()))
+        self.assertIs(tools_json(_tools(), "openai"), serialized)
+        with self.assertRaises(ValueError):
+            convert_tools(_tools(), "gemini")
+
+
+class TestBridgeToolFormatting(unittest.TestCase):
+    """Test cases for formatting tools once per catalog version in the bridges."""
+
+    def test_tools_are_formatted_once_per_catalog(self):
+        """Test that process_query formats tools again only when they change."""
+        client = MCPClient("http://localhost:8000/sse")
+        client.list_tools = AsyncMock(return_value=_tools())
+        bridge = OpenAIBridge(client, api_key="test")
+        bridge.llm_client = MagicMock()
+        bridge.llm_client.chat.completions.create.return_value = MagicMock(
+            choices=[MagicMock(message=MagicMock(tool_calls=None))]
+        )
+
+        build = MagicMock(wraps=format_converters.FORMATS["openai"])
+        with patch.dict(format_converters.FORMATS, {"openai": build}), \
+                patch.dict(format_converters._converted, clear=True):
+            asyncio.run(bridge.process_query("first"))
+            asyncio.run(bridge.process_query("second"))
+            self.assertEqual(build.call_count, 1)
+
+            bridge.tools = _tools("Read any file")
+            asyncio.run(bridge.process_query("third"))
+            self.assertEqual(build.call_count, 2)
+
+        sent = bridge.llm_client.chat.completions.create.call_args.kwargs["tools"]
+        self.assertEqual(sent[0]["function"]["description"], "Read any file")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for the Ollama bridge.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_sse_client import MCPClient, ToolInvocationResult
+from mcp_sse_client.llm_bridge.ollama_bridge import OllamaBridge, OllamaScheduler
+
+
+class TestOllamaBridge(unittest.TestCase):
+    """Test cases for the OllamaBridge class."""
+
+    def setUp(self):
+        self.bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3")
+        self.bridge.llm_client = MagicMock()
+        self.bridge.llm_client.chat = AsyncMock(return_value={"message": {"content": "done"}})
+
+    def test_tool_result_sends_object_arguments(self):
+        """Test that the tool call sent back with its result has object arguments."""
+        tool_call = {"name": "list_dir", "parameters": {"directory_path": "."}}
+        result = ToolInvocationResult(content="[]", error_code=0)
+
+        response = asyncio.run(self.bridge.process_tool_result("What is here?", tool_call, result))
+
+        self.assertEqual(response, {"message": {"content": "done"}})
+        messages = self.bridge.llm_client.chat.call_args.kwargs["messages"]
+        self.assertEqual(messages[1]["tool_calls"][0]["function"]["arguments"], {"directory_path": "."})
+        self.assertEqual(messages[2], {"role": "tool", "tool_call_id": "call_1", "content": "[]"})
+
+    def test_requests_keep_the_model_loaded(self):
+        """Test that every request carries keep_alive and the same options."""
+        bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3", keep_alive=-1,
+                              options={"num_ctx": 8192})
+        bridge.llm_client = self.bridge.llm_client
+
+        asyncio.run(bridge.submit_query("hello", []))
+        asyncio.run(bridge.warm_up())
+
+        first, second = bridge.llm_client.chat.call_args_list
+        self.assertEqual(first.kwargs["keep_alive"], -1)
+        self.assertEqual(first.kwargs["options"], {"num_ctx": 8192})
+        self.assertEqual(second.kwargs["messages"], [])
+        self.assertTrue(bridge.warmed)
+
+    def test_creating_a_bridge_sends_nothing(self):
+        """Test that the model is only loaded when warm_up is awaited."""
+        with patch("mcp_sse_client.llm_bridge.ollama_bridge.ollama.Client") as client, \
+                patch("mcp_sse_client.llm_bridge.ollama_bridge.ollama.AsyncClient") as async_client:
+            bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3", host="http://gpu:11434")
+
+        client.assert_not_called()
+        async_client.return_value.chat.assert_not_called()
+        self.assertFalse(bridge.warmed)
+
+    def test_warm_up_task_loads_the_model(self):
+        """Test that warm_up=True loads the model in a task of the running loop."""
+        async def create_and_wait():
+            with patch("mcp_sse_client.llm_bridge.ollama_bridge.ollama.AsyncClient") as async_client:
+                async_client.return_value.chat = AsyncMock(return_value={})
+                bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3", warm_up=True)
+            self.assertFalse(bridge.warmed)
+            await bridge.warm_up_task
+            return bridge, async_client.return_value.chat
+
+        bridge, chat = asyncio.run(create_and_wait())
+
+        self.assertTrue(bridge.warmed)
+        self.assertEqual(chat.call_args.kwargs["messages"], [])
+
+    def test_warm_up_failures_are_logged(self):
+        """Test that a failed warm-up does not raise from its task."""
+        async def create_and_wait():
+            with patch("mcp_sse_client.llm_bridge.ollama_bridge.ollama.AsyncClient") as async_client:
+                async_client.return_value.chat = AsyncMock(side_effect=ConnectionError("refused"))
+                bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3", warm_up=True)
+            with self.assertLogs("mcp_sse_client.llm_bridge.ollama_bridge", "WARNING"):
+                await bridge.warm_up_task
+            return bridge
+
+        self.assertFalse(asyncio.run(create_and_wait()).warmed)
+
+    def test_warm_up_needs_a_running_loop(self):
+        """Test that warm_up=True outside an event loop starts nothing."""
+        with patch("mcp_sse_client.llm_bridge.ollama_bridge.ollama.AsyncClient") as async_client:
+            bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3", warm_up=True)
+
+        self.assertIsNone(bridge.warm_up_task)
+        async_client.return_value.chat.assert_not_called()
+
+    def test_check_connection_lists_models_once(self):
+        """Test that the connection check makes a single request."""
+        self.bridge.llm_client.list = AsyncMock(return_value={"models": [{"name": "llama3"}]})
+
+        self.assertTrue(asyncio.run(self.bridge.check_connection()))
+        self.bridge.llm_client.list.assert_awaited_once()
+
+
+class TestOllamaScheduler(unittest.TestCase):
+    """Test cases for the OllamaScheduler class."""
+
+    def _peak_concurrency(self, scheduler, models):
+        running = {"now": 0, "peak": 0}
+
+        async def request(model):
+            async with scheduler.slot(model):
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                await asyncio.sleep(0.01)
+                running["now"] -= 1
+
+        async def main():
+            await asyncio.gather(*(request(model) for model in models))
+
+        asyncio.run(main())
+        return running["peak"]
+
+    def test_requests_per_model_are_limited(self):
+        """Test that a model never runs more requests than its parallelism."""
+        self.assertEqual(self._peak_concurrency(OllamaScheduler(parallel=1), ["llama3"] * 4), 1)
+        self.assertEqual(self._peak_concurrency(OllamaScheduler(parallel=2), ["llama3"] * 4), 2)
+        # Each model has slots of its own
+        self.assertEqual(self._peak_concurrency(OllamaScheduler(parallel=1), ["llama3", "mistral"]), 2)
+
+    def test_scheduler_survives_event_loops(self):
+        """Test that a scheduler can be used from one event loop after another."""
+        scheduler = OllamaScheduler(parallel=1)
+
+        self.assertEqual(self._peak_concurrency(scheduler, ["llama3"] * 2), 1)
+        self.assertEqual(self._peak_concurrency(scheduler, ["llama3"] * 2), 1)
+        self.assertEqual(scheduler.waiting["llama3"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
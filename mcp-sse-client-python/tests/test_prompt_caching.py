@@ -0,0 +1,113 @@
+"""
+Tests for prompt prefix caching in the LLM bridges.
+"""
+
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from mcp_sse_client import MCPClient, ToolDef, ToolInvocationResult
+from mcp_sse_client.llm_bridge.anthropic_bridge import AnthropicBridge
+from mcp_sse_client.llm_bridge.openai_bridge import OpenAIBridge
+
+TOOLS = [
+    ToolDef(name="read_file", description="Read a file", parameters=[]),
+    ToolDef(name="grep_search", description="Search files", parameters=[])
+]
+
+
+def _mcp_client():
+    client = MCPClient("http://localhost:8000/sse")
+    client.list_tools = AsyncMock(side_effect=lambda: list(TOOLS))
+    client.invoke_tool = AsyncMock(return_value=ToolInvocationResult(content="found", error_code=0))
+    return client
+
+
+def _anthropic_response(tool_call=False, **usage):
+    content = [SimpleNamespace(type="tool_use", name="grep_search", input={"query": "x"})] if tool_call else []
+    return SimpleNamespace(content=content, usage=SimpleNamespace(**usage))
+
+
+class TestAnthropicPromptCaching(unittest.TestCase):
+    """Test cases for cache breakpoints in the AnthropicBridge."""
+
+    def setUp(self):
+        self.bridge = AnthropicBridge(_mcp_client(), api_key="test")
+        self.bridge.llm_client = MagicMock()
+        self.bridge.llm_client.messages.create.side_effect = [
+            _anthropic_response(True, input_tokens=20, output_tokens=10,
+                                cache_read_input_tokens=0, cache_creation_input_tokens=1500),
+            _anthropic_response(input_tokens=30, output_tokens=40,
+                                cache_read_input_tokens=1500, cache_creation_input_tokens=0)
+        ]
+
+    def test_requests_share_a_marked_prefix(self):
+        """Test that both requests start with the same tools and system prompt, marked for caching."""
+        asyncio.run(self.bridge.process_query("Find x", [{"role": "assistant", "content": "Hi"}]))
+
+        first, final = [call.kwargs for call in self.bridge.llm_client.messages.create.call_args_list]
+        self.assertEqual([tool["name"] for tool in first["tools"]], ["grep_search", "read_file"])
+        self.assertEqual(first["tools"][-1]["cache_control"], {"type": "ephemeral"})
+        self.assertEqual(first["system"][0]["cache_control"], {"type": "ephemeral"})
+        self.assertEqual(json.dumps(first["tools"]), json.dumps(final["tools"]))
+        self.assertEqual(first["system"], final["system"])
+        self.assertEqual(final["tool_choice"], {"type": "none"})
+        self.assertEqual(first["messages"][-1]["content"],
+                         [{"type": "text", "text": "Find x", "cache_control": {"type": "ephemeral"}}])
+        # The final request reads the prefix cached up to the same breakpoint
+        self.assertEqual(final["messages"][:2], first["messages"])
+        self.assertEqual(final["messages"][0], {"role": "assistant", "content": "Hi"})
+
+    def test_usage_reports_cached_tokens(self):
+        """Test that process_query sums the token usage of its requests."""
+        result = asyncio.run(self.bridge.process_query("Find x"))
+
+        self.assertEqual(result["metadata"]["usage"], {
+            "input_tokens": 20 + 1500 + 30 + 1500,
+            "output_tokens": 50,
+            "cached_input_tokens": 1500,
+            "cache_write_tokens": 1500
+        })
+
+    def test_caching_can_be_turned_off(self):
+        """Test that without prompt caching requests carry no breakpoints."""
+        self.bridge.prompt_caching = False
+
+        asyncio.run(self.bridge.process_query("Find x"))
+
+        first, final = [call.kwargs for call in self.bridge.llm_client.messages.create.call_args_list]
+        self.assertEqual(first["system"], "You are a helpful tool-using assistant.")
+        self.assertNotIn("cache_control", json.dumps(first))
+        self.assertNotIn("tools", final)
+
+
+class TestOpenAIPromptCaching(unittest.TestCase):
+    """Test cases for stable prefixes in the OpenAIBridge."""
+
+    def test_final_request_keeps_the_tools_prefix(self):
+        """Test that the final request resends the tools, sorted and not callable."""
+        bridge = OpenAIBridge(_mcp_client(), api_key="test", prompt_cache_key="session-1")
+        tool_call = SimpleNamespace(function=SimpleNamespace(name="grep_search", arguments='{"query": "x"}'))
+        usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=5,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=1792))
+        bridge.llm_client = MagicMock()
+        bridge.llm_client.chat.completions.create.side_effect = [
+            SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=[tool_call]))], usage=usage),
+            SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(tool_calls=None))], usage=usage)
+        ]
+
+        result = asyncio.run(bridge.process_query("Find x"))
+
+        first, final = [call.kwargs for call in bridge.llm_client.chat.completions.create.call_args_list]
+        self.assertEqual([tool["function"]["name"] for tool in first["tools"]], ["grep_search", "read_file"])
+        self.assertEqual(final["tools"], first["tools"])
+        self.assertEqual(final["tool_choice"], "none")
+        self.assertEqual(final["prompt_cache_key"], "session-1")
+        self.assertEqual(result["metadata"]["usage"]["cached_input_tokens"], 2 * 1792)
+        self.assertEqual(result["metadata"]["usage"]["input_tokens"], 4000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for the on-disk LLM response cache.
+"""
+
+import asyncio
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from openai.types.chat import ChatCompletion
+
+from mcp_sse_client import MCPClient, ToolDef, ToolInvocationResult, ToolParameter
+from mcp_sse_client.llm_bridge.ollama_bridge import OllamaBridge
+from mcp_sse_client.response_cache import LLMResponseCache, workspace_fingerprint
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test cases for the LLMResponseCache class."""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.cache = LLMResponseCache(self.dir / "cache.sqlite3", workspace="abc")
+        self.addCleanup(self.cache.close)
+
+    def test_responses_survive_reopening(self):
+        """Test that SDK responses are rebuilt as the same class from another instance."""
+        response = ChatCompletion.model_validate({
+            "id": "1", "object": "chat.completion", "created": 1, "model": "gpt-4o",
+            "choices": [{"index": 0, "finish_reason": "tool_calls", "message": {
+                "role": "assistant", "content": None,
+                "tool_calls": [{"id": "c", "type": "function",
+                                "function": {"name": "read_file", "arguments": "{\"target_file\": \"a.py\"}"}}]
+            }}]
+        })
+        key = self.cache.key(model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+
+        self.assertTrue(self.cache.put(key, response))
+        hit, cached = LLMResponseCache(self.dir / "cache.sqlite3").get(key)
+
+        self.assertTrue(hit)
+        self.assertIsInstance(cached, ChatCompletion)
+        self.assertEqual(cached, response)
+        self.assertFalse(self.cache.put(key, object()))
+
+    def test_key_covers_workspace_and_request(self):
+        """Test that any change to the request or workspace changes the key."""
+        key = self.cache.key(model="llama3", messages=[{"role": "user", "content": "hi"}])
+
+        self.assertEqual(key, self.cache.key(messages=[{"content": "hi", "role": "user"}], model="llama3"))
+        self.assertNotEqual(key, self.cache.key(model="llama3", messages=[{"role": "user", "content": "hi!"}]))
+        self.cache.workspace = "def"
+        self.assertNotEqual(key, self.cache.key(model="llama3", messages=[{"role": "user", "content": "hi"}]))
+
+    def test_ttl_and_size_limits(self):
+        """Test that expired entries miss and the least recently used are evicted."""
+        cache = LLMResponseCache(self.dir / "small.sqlite3", ttl=60, max_entries=2)
+        self.addCleanup(cache.close)
+        with patch("mcp_sse_client.response_cache.time.time", return_value=1000.0):
+            cache.put("a", {"n": 1})
+        with patch("mcp_sse_client.response_cache.time.time", return_value=1030.0):
+            cache.put("b", {"n": 2})
+        with patch("mcp_sse_client.response_cache.time.time", return_value=1040.0):
+            self.assertEqual(cache.get("a"), (True, {"n": 1}))
+        with patch("mcp_sse_client.response_cache.time.time", return_value=1050.0):
+            cache.put("c", {"n": 3})
+        # "b" was used least recently
+        self.assertEqual(cache.stats()["entries"], 2)
+        # "a" was stored more than a minute earlier
+        with patch("mcp_sse_client.response_cache.time.time", return_value=1070.0):
+            self.assertEqual(cache.get("b"), (False, None))
+            self.assertEqual(cache.get("a"), (False, None))
+            self.assertEqual(cache.get("c"), (True, {"n": 3}))
+
+    def test_workspace_fingerprint_follows_contents(self):
+        """Test that the fingerprint changes with file contents only."""
+        workspace = self.dir / "workspace"
+        (workspace / "src").mkdir(parents=True)
+        (workspace / "src" / "a.py").write_text("x = 1")
+        (workspace / "__pycache__").mkdir()
+        fingerprint = workspace_fingerprint(workspace)
+
+        (workspace / "__pycache__" / "a.pyc").write_bytes(b"\0")
+        self.assertEqual(workspace_fingerprint(workspace), fingerprint)
+        (workspace / "src" / "a.py").write_text("x = 2")
+        self.assertNotEqual(workspace_fingerprint(workspace), fingerprint)
+
+
+class TestBridgeResponseCache(unittest.TestCase):
+    """Test cases for replaying LLM responses in process_query."""
+
+    def test_identical_turns_are_replayed(self):
+        """Test that a repeated query is answered from the cache, tool calls included."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = LLMResponseCache(Path(directory) / "cache.sqlite3", workspace="commit-1")
+        self.addCleanup(cache.close)
+        client = MCPClient("http://localhost:8000/sse")
+        client.list_tools = AsyncMock(return_value=[ToolDef(
+            name="list_dir", description="List a directory",
+            parameters=[ToolParameter(name="directory_path", parameter_type="string", description="Path")]
+        )])
+        client.invoke_tool = AsyncMock(return_value=ToolInvocationResult(content="[]", error_code=0))
+        bridge = OllamaBridge(client, model="llama3")
+        bridge.response_cache = cache
+        bridge.llm_client = MagicMock()
+        bridge.llm_client.chat = AsyncMock(side_effect=[
+            {"message": {"content": "", "tool_calls": [
+                {"function": {"name": "list_dir", "arguments": {"directory_path": "."}}}
+            ]}},
+            {"message": {"content": "It is empty"}}
+        ])
+
+        first = asyncio.run(bridge.process_query("What is here?"))
+        second = asyncio.run(bridge.process_query("What is here?"))
+
+        self.assertEqual(bridge.llm_client.chat.await_count, 2)
+        self.assertEqual(first["metadata"]["cached_responses"], 0)
+        self.assertEqual(second["metadata"]["cached_responses"], 2)
+        self.assertEqual(second["tool_call"], first["tool_call"])
+        self.assertEqual(second["final_llm_response"], {"message": {"content": "It is empty"}})
+        # Tools still run; only the LLM is replayed
+        self.assertEqual(client.invoke_tool.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
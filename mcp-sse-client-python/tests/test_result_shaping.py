@@ -0,0 +1,176 @@
+"""
+Tests for shaping tool results to token budgets.
+"""
+
+import asyncio
+import json
+import threading
+import types
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_sse_client import MCPClient, ToolInvocationResult
+from mcp_sse_client.llm_bridge import LLMBridge
+from mcp_sse_client.llm_bridge.ollama_bridge import OllamaBridge
+from mcp_sse_client.result_shaping import ResultShaper, TokenCounter, unwrap_content
+
+
+def _mcp_content(data, success=True, error=None):
+    """Content as MCPClient.invoke_tool returns it for an ai_coding_agent tool."""
+    text = json.dumps({"success": success, "data": data, "error": error})
+    return json.dumps({"type": "text", "text": text, "annotations": None, "meta": None})
+
+
+class TestResultShaper(unittest.TestCase):
+    """Test cases for the ResultShaper class."""
+
+    def setUp(self):
+        self.shaper = ResultShaper(
+            budgets={"read_file": 200, "grep_search": 200},
+            max_line_chars=40,
+            counter=TokenCounter(None)
+        )
+
+    def test_small_results_are_only_unwrapped(self):
+        """Test that results within budget keep all their data."""
+        shaped = self.shaper.shape("list_dir", {"directory_path": "."}, _mcp_content({"contents": ["a.py"]}))
+
+        self.assertEqual(json.loads(shaped), {"contents": ["a.py"]})
+        self.assertEqual(self.shaper.shape("list_dir", {}, "[]"), "[]")
+        self.assertEqual(self.shaper.shape("read_file", {}, _mcp_content(None, False, "No such file")),
+                         "Error: No such file")
+
+    def test_large_file_keeps_head_and_tail(self):
+        """Test that a large file keeps its first and last lines and says how to read the rest."""
+        content = "\n".join(f"line {number}" for number in range(1, 1001))
+        arguments = {"target_file": "big.py", "start_line_one_indexed": 11, "end_line_one_indexed_inclusive": 1010}
+
+        shaped = self.shaper.shape("read_file", arguments, _mcp_content(content))
+        lines = shaped.split("\n")
+
+        self.assertLessEqual(TokenCounter(None).count(shaped), 200 + 60)
+        self.assertEqual(lines[0], "line 1")
+        self.assertEqual(lines[-1], "line 1000")
+        hint = next(line for line in lines if line.startswith("..."))
+        omitted_start = int(hint.split("lines ")[1].split("-")[0])
+        # Line numbers are those of the file, not of the returned range
+        self.assertEqual(omitted_start, 10 + lines.index(hint) + 1)
+        self.assertIn(f"start_line_one_indexed={omitted_start}", hint)
+
+    def test_long_lines_are_elided(self):
+        """Test that long lines are cut in the middle."""
+        shaped = self.shaper.shape("read_file", {"target_file": "min.js"}, _mcp_content("x" * 100 + "end"))
+
+        self.assertTrue(shaped.startswith("x" * 20))
+        self.assertTrue(shaped.endswith("end"))
+        self.assertIn("[63 characters omitted]", shaped)
+
+    def test_grep_hits_are_collapsed_per_file(self):
+        """Test that repeated grep matches in one file are counted rather than listed."""
+        matches = [{"file": "a.py", "line": line, "content": "TODO"} for line in range(1, 11)]
+        matches.append({"file": "b.py", "line": 3, "content": "TODO"})
+
+        shaped = self.shaper.shape("grep_search", {"query": "TODO"}, _mcp_content({"matches": matches}))
+
+        self.assertIn("a.py:\n  1: TODO\n  2: TODO\n  3: TODO\n  ... 7 more matches in this file", shaped)
+        self.assertIn("b.py:\n  3: TODO", shaped)
+        self.assertIn("7 repeated matches collapsed", shaped)
+
+    def test_unwrap_keeps_non_text_items(self):
+        """Test that content items other than text are passed through."""
+        image = json.dumps({"type": "image", "data": "...", "mimeType": "image/png"})
+        text = json.dumps({"type": "text", "text": "hello"})
+
+        self.assertEqual(unwrap_content(f"{text}\n{image}"), f"hello\n{image}")
+
+
+class FakeBridge(LLMBridge):
+    """Bridge whose LLM answers without asking for tools."""
+
+    async def format_tools(self, tools):
+        return tools
+
+    async def submit_query(self, query, formatted_tools, conversation_history=None):
+        return {"content": "done"}
+
+    async def parse_tool_call(self, llm_response):
+        return None
+
+    async def submit_query_without_tools(self, messages):
+        return {"content": "done"}
+
+
+class TestBridgeShaping(unittest.TestCase):
+    """Test cases for shaping in the LLM bridge."""
+
+    def test_bridge_sends_shaped_results(self):
+        """Test that the tool message carries the shaped result."""
+        bridge = OllamaBridge(MCPClient("http://localhost:8000/sse"), model="llama3")
+        bridge.result_shaper = ResultShaper(budgets={"read_file": 50}, counter=TokenCounter(None))
+        tool_call = {"name": "read_file", "parameters": {"target_file": "big.py"}}
+        content = "\n".join(f"line {number}" for number in range(1000))
+
+        shaped = bridge.shape_tool_result(tool_call, ToolInvocationResult(content=_mcp_content(content), error_code=0))
+
+        self.assertIn("call read_file with start_line_one_indexed=", shaped)
+        self.assertLess(len(shaped), len(content) / 10)
+        bridge.result_shaper = None
+        raw = ToolInvocationResult(content="raw", error_code=0)
+        self.assertEqual(bridge.shape_tool_result(tool_call, raw), "raw")
+
+    def test_explicit_none_disables_shaping(self):
+        """Test that passing result_shaper=None sends results unchanged."""
+        client = MCPClient("http://localhost:8000/sse")
+        self.assertIsInstance(FakeBridge(client).result_shaper, ResultShaper)
+        self.assertIsNone(FakeBridge(client, result_shaper=None).result_shaper)
+
+    def test_large_results_are_shaped_off_the_event_loop(self):
+        """Test that only results above the threshold are shaped on a worker thread."""
+        shaped_on = []
+        shaper = ResultShaper(counter=TokenCounter(None))
+        shape = shaper.shape
+
+        def recording_shape(*args):
+            shaped_on.append(threading.current_thread())
+            return shape(*args)
+
+        shaper.shape = recording_shape
+        bridge = FakeBridge(MCPClient("http://localhost:8000/sse"), result_shaper=shaper)
+        tool_call = {"name": "list_dir", "parameters": {"directory_path": "."}}
+
+        for content in ("small", "x" * (bridge.shape_in_thread_chars + 1)):
+            asyncio.run(bridge.process_tool_result(
+                "What is here?", tool_call, ToolInvocationResult(content=content, error_code=0)
+            ))
+
+        self.assertIs(shaped_on[0], threading.main_thread())
+        self.assertIsNot(shaped_on[1], threading.main_thread())
+
+    def test_tokenizer_loads_off_the_event_loop(self):
+        """Test that the tiktoken encoding is loaded on a worker thread before shaping."""
+        loaded_on = []
+
+        def get_encoding(name):
+            loaded_on.append(threading.current_thread())
+            return MagicMock(encode_ordinary=lambda text: text.split())
+
+        client = MCPClient("http://localhost:8000/sse")
+        bridge = OllamaBridge(client, model="llama3")
+        bridge.result_shaper = ResultShaper(counter=TokenCounter("cl100k_base"))
+        bridge.llm_client = MagicMock()
+        bridge.llm_client.chat = AsyncMock(return_value={"message": {"content": "done"}})
+        tool_call = {"name": "list_dir", "parameters": {"directory_path": "."}}
+        fake_tiktoken = types.SimpleNamespace(get_encoding=get_encoding)
+
+        with patch.dict("sys.modules", {"tiktoken": fake_tiktoken}):
+            asyncio.run(bridge.process_tool_result(
+                "What is here?", tool_call, ToolInvocationResult(content="a b c", error_code=0)
+            ))
+            self.assertEqual(bridge.result_shaper.counter.count("a b c"), 3)
+
+        self.assertEqual(len(loaded_on), 1)
+        self.assertIsNot(loaded_on[0], threading.main_thread())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for tracing in the MCP client and LLM bridge.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_sse_client import MCPClient, ToolInvocationResult
+from mcp_sse_client.llm_bridge import LLMBridge
+from mcp_sse_client.tracing import JSONLinesSink, MemorySink, SpanContext, Tracer
+
+
+class FakeBridge(LLMBridge):
+    """Bridge whose LLM always asks for one tool call."""
+
+    async def format_tools(self, tools):
+        return tools
+
+    async def submit_query(self, query, formatted_tools, conversation_history=None):
+        return {"tool": "echo"}
+
+    async def parse_tool_call(self, llm_response):
+        return {"name": "echo", "parameters": {"text": "hi"}}
+
+    async def submit_query_without_tools(self, messages):
+        return {"content": "done"}
+
+
+def mock_session(mock_session_class, mock_sse_client):
+    """Wire mocked SSE streams and session, returning the session."""
+    mock_sse_client.return_value.__aenter__.return_value = MagicMock()
+    session = AsyncMock()
+    mock_session_class.return_value.__aenter__.return_value = session
+    result = MagicMock()
+    result.content = []
+    result.isError = False
+    session.call_tool.return_value = result
+    return session
+
+
+class TestTracer(unittest.TestCase):
+    """Test cases for the tracer."""
+
+    def test_spans_nest(self):
+        """Test that spans opened inside others become their children."""
+        sink = MemorySink()
+        tracer = Tracer([sink])
+        with tracer.span("outer") as outer:
+            with tracer.span("inner") as inner:
+                self.assertEqual(tracer.current(), inner.context)
+        self.assertEqual(inner.parent_id, outer.context.span_id)
+        self.assertEqual(inner.context.trace_id, outer.context.trace_id)
+        self.assertEqual([span.name for span in sink.spans], ["inner", "outer"])
+
+    def test_traceparent_round_trip(self):
+        """Test that traceparent strings parse back to the same context."""
+        context = SpanContext(trace_id="0af7651916cd43dd8448eb211c80319c", span_id="b7ad6b7169203331")
+        self.assertEqual(context.traceparent, "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01")
+        self.assertEqual(SpanContext.from_traceparent(context.traceparent), context)
+        self.assertIsNone(SpanContext.from_traceparent("00-bad"))
+
+    def test_json_lines_sink(self):
+        """Test that spans are written one JSON object per line."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.jsonl")
+            tracer = Tracer([JSONLinesSink(path)])
+            with tracer.span("operation", {"attempt": 1}):
+                pass
+            with open(path, encoding="utf-8") as f:
+                spans = [json.loads(line) for line in f]
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]["name"], "operation")
+        self.assertEqual(spans[0]["attributes"], {"attempt": 1})
+        self.assertEqual(spans[0]["status"]["code"], "ok")
+
+
+class TestClientTracing(unittest.TestCase):
+    """Test cases for spans recorded by the client and bridge."""
+
+    def setUp(self):
+        self.sink = MemorySink()
+        self.client = MCPClient("http://localhost:8000/sse", max_retries=2, tracer=Tracer([self.sink]))
+
+    @patch("mcp_sse_client.client.sse_client")
+    @patch("mcp_sse_client.client.ClientSession")
+    def test_invoke_tool_propagates_trace(self, mock_session_class, mock_sse_client):
+        """Test that tool calls carry the traceparent of the client span."""
+        session = mock_session(mock_session_class, mock_sse_client)
+
+        asyncio.run(self.client.invoke_tool("echo", {"text": "hi"}))
+
+        spans = {span.name: span for span in self.sink.spans}
+        self.assertEqual(
+            set(spans), {"mcp.request", "mcp.attempt", "mcp.connect", "mcp.initialize", "mcp.call_tool"}
+        )
+        self.assertEqual(spans["mcp.attempt"].parent_id, spans["mcp.request"].context.span_id)
+        self.assertEqual(spans["mcp.call_tool"].parent_id, spans["mcp.attempt"].context.span_id)
+        meta = session.call_tool.call_args.kwargs["meta"]
+        self.assertEqual(SpanContext.from_traceparent(meta["traceparent"]), spans["mcp.call_tool"].context)
+
+    @patch("mcp_sse_client.client.asyncio.sleep", new_callable=AsyncMock)
+    @patch("mcp_sse_client.client.sse_client")
+    @patch("mcp_sse_client.client.ClientSession")
+    def test_retries_are_recorded(self, mock_session_class, mock_sse_client, mock_sleep):
+        """Test that each retry attempt is its own span."""
+        mock_session(mock_session_class, mock_sse_client)
+        streams = mock_sse_client.return_value.__aenter__.return_value
+        mock_sse_client.return_value.__aenter__.side_effect = [ConnectionError("refused"), streams]
+
+        asyncio.run(self.client.invoke_tool("echo", {"text": "hi"}))
+
+        attempts = [span for span in self.sink.spans if span.name == "mcp.attempt"]
+        self.assertEqual([span.attributes["attempt"] for span in attempts], [1, 2])
+        self.assertEqual([span.status for span in attempts], ["error", "ok"])
+
+    def test_bridge_steps_are_spans(self):
+        """Test that process_query records its steps under one trace."""
+        bridge = FakeBridge(self.client)
+        bridge.tools = []
+        bridge.mcp_client.invoke_tool = AsyncMock(return_value=ToolInvocationResult(content="hi", error_code=0))
+
+        result = asyncio.run(bridge.process_query("say hi"))
+
+        names = [span.name for span in self.sink.spans]
+        self.assertEqual(names[-1], "bridge.process_query")
+        for step in ("bridge.initial_query", "bridge.tool_execution", "bridge.final_processing"):
+            self.assertIn(step, names)
+        root = self.sink.spans[-1]
+        self.assertEqual(result["metadata"]["trace_id"], root.context.trace_id)
+        self.assertTrue(all(span.context.trace_id == root.context.trace_id for span in self.sink.spans))
+
+
+if __name__ == "__main__":
+    unittest.main()